@@ -0,0 +1,168 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import json
+import os
+import random
+import threading
+from time import sleep
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+BENCHMARK_ACCOUNT_ID = '123456789012'
+BENCHMARK_REGION = 'us-east-1'
+
+_AWS_ENV = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_SECURITY_TOKEN': 'testing',
+    'AWS_SESSION_TOKEN': 'testing',
+    'AWS_DEFAULT_REGION': BENCHMARK_REGION,
+    'MOTO_ACCOUNT_ID': BENCHMARK_ACCOUNT_ID,
+    # lambdas are never invoked, so docker is not needed
+    'MOTO_DOCKER_LAMBDA_DISABLED': 'true'
+}
+
+# responses for the operations syndicate uses and moto does not implement
+STUBBED_OPERATIONS = {
+    'lambda.ListProvisionedConcurrencyConfigs': {
+        'ProvisionedConcurrencyConfigs': []
+    }
+}
+
+
+class _RawBody:
+    def __init__(self, body):
+        self._body = body
+
+    def stream(self, **kwargs):
+        yield self._body
+
+
+def _throttling_response(request):
+    headers = {'x-amzn-ErrorType': 'ThrottlingException'}
+    content_type = request.headers.get('Content-Type', b'')
+    if isinstance(content_type, bytes):
+        content_type = content_type.decode()
+    if 'json' in content_type or 'X-Amz-Target' in request.headers:
+        headers['Content-Type'] = 'application/x-amz-json-1.1'
+        body = json.dumps({'__type': 'ThrottlingException',
+                           'message': 'Rate exceeded'}).encode()
+    else:
+        headers['Content-Type'] = 'text/xml'
+        body = (b'<ErrorResponse><Error><Code>Throttling</Code>'
+                b'<Message>Rate exceeded</Message></Error>'
+                b'<RequestId>benchmark</RequestId></ErrorResponse>')
+    return AWSResponse(request.url, 400, headers, _RawBody(body))
+
+
+class AwsStandIn:
+    """
+    In-process moto backed AWS stand-in.
+
+    Every request sent by a boto3 client is delayed by `latency_ms` and,
+    with `throttle_rate` probability, answered with a throttling error
+    before it reaches moto, so client side retries are exercised as well.
+    With `serialize` moto processes one request at a time, while the
+    latency of the requests still overlaps. Moto backends are not thread
+    safe, e.g. listing a bucket while its objects are being deleted fails.
+    """
+
+    def __init__(self, latency_ms=0, throttle_rate=0.0, seed=0,
+                 serialize=False):
+        self.latency_ms = latency_ms
+        self.throttle_rate = throttle_rate
+        self.serialize = serialize
+        self._stubber_call = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._mock = None
+        self._env_backup = {}
+        self.requests_sent = 0
+        self.requests_throttled = 0
+
+    def __enter__(self):
+        from moto import mock_aws
+
+        for key, value in _AWS_ENV.items():
+            self._env_backup[key] = os.environ.get(key)
+            os.environ[key] = value
+        self._mock = mock_aws()
+        self._mock.start()
+        # the resources cached as existing belong to the previous account
+        from syndicate.connection.dynamo_connection import \
+            TABLES_EXISTENCE_CACHE
+        from syndicate.connection.s3_connection import \
+            BUCKETS_EXISTENCE_CACHE
+        BUCKETS_EXISTENCE_CACHE.clear()
+        TABLES_EXISTENCE_CACHE.clear()
+        if self.serialize:
+            from moto.core.botocore_stubber import BotocoreStubber
+            self._stubber_call = BotocoreStubber.__call__
+            backend_lock = threading.Lock()
+            stubber_call = self._stubber_call
+
+            def serialized_call(stubber, *args, **kwargs):
+                with backend_lock:
+                    return stubber_call(stubber, *args, **kwargs)
+
+            BotocoreStubber.__call__ = serialized_call
+        if boto3.DEFAULT_SESSION is None:
+            boto3.setup_default_session()
+        events = boto3.DEFAULT_SESSION.events
+        events.register_first('before-send', self._before_send,
+                              unique_id='syndicate-benchmark-before-send')
+        for operation in STUBBED_OPERATIONS:
+            events.register(f'before-call.{operation}', self._stub_response,
+                            unique_id=f'syndicate-benchmark-{operation}')
+        return self
+
+    def __exit__(self, *exc_info):
+        events = boto3.DEFAULT_SESSION.events
+        events.unregister('before-send',
+                          unique_id='syndicate-benchmark-before-send')
+        for operation in STUBBED_OPERATIONS:
+            events.unregister(f'before-call.{operation}',
+                              unique_id=f'syndicate-benchmark-{operation}')
+        if self._stubber_call:
+            from moto.core.botocore_stubber import BotocoreStubber
+            BotocoreStubber.__call__ = self._stubber_call
+            self._stubber_call = None
+        self._mock.stop()
+        for key, value in self._env_backup.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    @staticmethod
+    def _stub_response(model, **kwargs):
+        operation = f'{model.service_model.endpoint_prefix}.{model.name}'
+        parsed = dict(STUBBED_OPERATIONS[operation])
+        parsed['ResponseMetadata'] = {'HTTPStatusCode': 200,
+                                      'RetryAttempts': 0}
+        return AWSResponse('', 200, {}, _RawBody(b'')), parsed
+
+    def _before_send(self, request, **kwargs):
+        with self._lock:
+            self.requests_sent += 1
+            throttle = self._random.random() < self.throttle_rate
+            if throttle:
+                self.requests_throttled += 1
+        if self.latency_ms:
+            sleep(self.latency_ms / 1000)
+        if throttle:
+            return _throttling_response(request)
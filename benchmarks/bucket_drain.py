@@ -0,0 +1,109 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.aws_stand_in import AwsStandIn, BENCHMARK_REGION
+
+DEFAULT_OBJECTS = 10000
+DEFAULT_WORKERS = (1, 4, 16)
+# close to the round trip of DeleteObjects with 1000 keys
+DEFAULT_LATENCY_MS = 300
+BUCKET_NAME = 'syndicate-benchmark-drain'
+PREFIXES = 8
+SEED_WORKERS = 32
+
+
+def _seed_bucket(s3_client, objects, versioned):
+    s3_client.create_bucket(Bucket=BUCKET_NAME)
+    if versioned:
+        s3_client.put_bucket_versioning(
+            Bucket=BUCKET_NAME,
+            VersioningConfiguration={'Status': 'Enabled'})
+
+    def put(index):
+        key = f'prefix-{index % PREFIXES}/{index:08d}'
+        s3_client.put_object(Bucket=BUCKET_NAME, Key=key, Body=b'')
+        # every tenth object of the versioned bucket gets a delete marker
+        if versioned and index % 10 == 0:
+            s3_client.delete_object(Bucket=BUCKET_NAME, Key=key)
+
+    with ThreadPoolExecutor(SEED_WORKERS) as executor:
+        list(executor.map(put, range(objects)))
+
+
+def run(objects, workers_counts, latency_ms, versioned):
+    """ Seeds the bucket with the objects and removes it with the given
+    numbers of delete workers.
+
+    :return: list of (workers, deleted objects, wall time) tuples
+    """
+    import syndicate.core # noqa: F401
+    from syndicate.connection.s3_connection import S3Connection
+
+    results = []
+    stand_in = AwsStandIn(serialize=True)
+    with stand_in:
+        connection = S3Connection(region=BENCHMARK_REGION)
+        for workers in workers_counts:
+            # the latency is added only to the measured requests
+            stand_in.latency_ms = 0
+            _seed_bucket(connection.client, objects, versioned)
+            stand_in.latency_ms = latency_ms
+            started_at = time.monotonic()
+            deleted = connection.empty_bucket(BUCKET_NAME, workers=workers)
+            connection.delete_bucket(BUCKET_NAME)
+            results.append((workers, deleted,
+                            round(time.monotonic() - started_at, 3)))
+    return results
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.bucket_drain',
+        description='Offline benchmark of the S3 bucket emptying against '
+                    'an in-process moto AWS stand-in')
+    parser.add_argument('--objects', type=int, default=DEFAULT_OBJECTS,
+                        help='Number of objects in the bucket')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=list(DEFAULT_WORKERS),
+                        help='Numbers of DeleteObjects workers to compare')
+    parser.add_argument('--latency-ms', type=int,
+                        default=DEFAULT_LATENCY_MS,
+                        help='Latency added to every AWS request')
+    parser.add_argument('--not-versioned', action='store_true',
+                        help='Do not enable the bucket versioning')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    from tabulate import tabulate
+
+    results = run(objects=args.objects, workers_counts=args.workers,
+                  latency_ms=args.latency_ms,
+                  versioned=not args.not_versioned)
+    print(tabulate(
+        [[workers, deleted, wall_sec, round(deleted / wall_sec)]
+         for workers, deleted, wall_sec in results],
+        headers=['Workers', 'Deleted', 'Wall time (s)', 'Objects/s']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
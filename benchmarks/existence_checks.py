@@ -0,0 +1,118 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.aws_stand_in import AwsStandIn, BENCHMARK_REGION
+
+DEFAULT_ACCOUNT_SIZES = (10, 100, 1000)
+DEFAULT_CHECKS = 20
+BUCKET_PREFIX = 'syndicate-benchmark-bucket'
+TABLE_PREFIX = 'syndicate-benchmark-table'
+
+
+def _seed_account(s3_client, dynamodb_client, start, stop):
+    for index in range(start, stop):
+        s3_client.create_bucket(Bucket=f'{BUCKET_PREFIX}-{index:05d}')
+        dynamodb_client.create_table(
+            TableName=f'{TABLE_PREFIX}-{index:05d}',
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'id',
+                                   'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST')
+
+
+def _measure(stand_in, names, check):
+    """ :returns requests per check and wall time of the checks """
+    stand_in.requests_sent = 0
+    started_at = time.monotonic()
+    for name in names:
+        check(name)
+    return (round(stand_in.requests_sent / len(names), 2),
+            round(time.monotonic() - started_at, 3))
+
+
+def run(account_sizes, checks):
+    """ Grows the account to each of the sizes and checks the existence of
+    the buckets and tables, half of which exist, by listing and by probing.
+
+    :return: list of (resource, account size, method, requests per check,
+        wall time) tuples
+    """
+    import syndicate.core # noqa: F401
+    from syndicate.connection.dynamo_connection import DynamoConnection
+    from syndicate.connection.s3_connection import S3Connection
+
+    results = []
+    with AwsStandIn() as stand_in:
+        s3_conn = S3Connection(region=BENCHMARK_REGION)
+        dynamodb_conn = DynamoConnection(region=BENCHMARK_REGION)
+        seeded = 0
+        for size in sorted(account_sizes):
+            _seed_account(s3_conn.client, dynamodb_conn.client, seeded, size)
+            seeded = size
+            # every second name does not exist
+            indexes = [index if index % 2 else size + index
+                       for index in range(checks)]
+            buckets = [f'{BUCKET_PREFIX}-{i:05d}' for i in indexes]
+            tables = [f'{TABLE_PREFIX}-{i:05d}' for i in indexes]
+            methods = (
+                ('bucket', 'listing', buckets, lambda name: name in [
+                    each['Name'] for each in s3_conn.get_list_buckets()]),
+                ('bucket', 'probe', buckets, lambda name:
+                    s3_conn.is_bucket_exists(name, use_cache=False)),
+                ('bucket', 'cached probe', buckets,
+                 s3_conn.is_bucket_exists),
+                ('table', 'listing', tables,
+                 lambda name: name in dynamodb_conn.get_tables_list()),
+                ('table', 'probe', tables, lambda name:
+                    dynamodb_conn.table_exists(name, use_cache=False)),
+                ('table', 'cached probe', tables, dynamodb_conn.table_exists)
+            )
+            for resource, method, names, check in methods:
+                results.append((resource, size, method,
+                                *_measure(stand_in, names, check)))
+    return results
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.existence_checks',
+        description='Offline benchmark of the S3 bucket and DynamoDB table '
+                    'existence checks against an in-process moto AWS '
+                    'stand-in')
+    parser.add_argument('--account-sizes', type=int, nargs='+',
+                        default=list(DEFAULT_ACCOUNT_SIZES),
+                        help='Numbers of buckets and tables in the account')
+    parser.add_argument('--checks', type=int, default=DEFAULT_CHECKS,
+                        help='Number of the checks of each kind')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    from tabulate import tabulate
+
+    results = run(account_sizes=args.account_sizes, checks=args.checks)
+    print(tabulate(
+        results, headers=['Resource', 'Account size', 'Method',
+                          'Requests/check', 'Wall time (s)']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
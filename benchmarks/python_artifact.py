@@ -0,0 +1,178 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import argparse
+import compileall
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+DEFAULT_MODULES = 200
+DEFAULT_IMPORT_RUNS = 5
+PACKAGE_NAME = 'bench_dependency'
+PYTHON_VERSION = f'{sys.version_info.major}.{sys.version_info.minor}'
+
+MODULE_CONTENT = '''"""Generated module {index}."""
+import json
+
+
+class Model{index}:
+
+    def __init__(self, **kwargs):
+        self.attributes = dict(kwargs)
+
+{functions}
+'''
+FUNCTION_CONTENT = '''    def method_{index}(self, value):
+        """Returns the value transformed for the case {index}."""
+        if value is None:
+            return json.dumps({{"case": {index}, "value": None}})
+        result = [item * {index} for item in range(value % 7)]
+        return json.dumps({{"case": {index}, "value": result}})
+'''
+IMPORT_CODE = f'''import time
+started_at = time.perf_counter()
+import {PACKAGE_NAME}
+print(time.perf_counter() - started_at)
+'''
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+def generate_artifact(path, modules):
+    """ Generates the content of an artifact with a dependency shaped like a
+    pip install: sources with stale bytecode, tests, type stubs,
+    documentation and the dist-info files. """
+    package_path = os.path.join(path, PACKAGE_NAME)
+    functions = ''.join(FUNCTION_CONTENT.format(index=i) for i in range(30))
+    imports = []
+    for index in range(modules):
+        module_name = f'module_{index:04d}'
+        _write(os.path.join(package_path, f'{module_name}.py'),
+               MODULE_CONTENT.format(index=index, functions=functions))
+        _write(os.path.join(package_path, f'{module_name}.pyi'),
+               f'class Model{index}: ...\n')
+        _write(os.path.join(package_path, 'tests', f'test_{module_name}.py'),
+               MODULE_CONTENT.format(index=index, functions=functions))
+        imports.append(f'from {PACKAGE_NAME} import {module_name}\n')
+    _write(os.path.join(package_path, '__init__.py'), ''.join(imports))
+    _write(os.path.join(package_path, 'tests', '__init__.py'), '')
+    _write(os.path.join(package_path, 'README.md'), '# Dependency\n' * 500)
+    compileall.compile_dir(package_path, quiet=1)
+    dist_info = os.path.join(path, f'{PACKAGE_NAME}-1.0.dist-info')
+    _write(os.path.join(dist_info, 'METADATA'), f'Name: {PACKAGE_NAME}\n')
+    _write(os.path.join(dist_info, 'RECORD'), ''.join(
+        f'{root}/{name},sha256=0,0\n'
+        for root, _, files in os.walk(package_path) for name in files))
+    _write(os.path.join(path, 'handler.py'),
+           f'import {PACKAGE_NAME}\n\n\ndef lambda_handler(event, context):'
+           f'\n    return {{}}\n')
+
+
+def measure_import(zip_path, runs):
+    """ Extracts the package and imports it in new interpreters which can
+    not write bytecode, like in the read-only Lambda task root.
+
+    :return: median import time in milliseconds
+    """
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as extract_dir:
+            with zipfile.ZipFile(zip_path) as package:
+                package.extractall(extract_dir)
+            result = subprocess.run(
+                [sys.executable, '-c', IMPORT_CODE], cwd=extract_dir,
+                env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1',
+                         PYTHONPATH=extract_dir),
+                capture_output=True, text=True, check=True)
+            timings.append(float(result.stdout) * 1000)
+    return round(statistics.median(timings), 1)
+
+
+def run(modules, import_runs, strip):
+    """ Builds the sample artifact with and without the optimization.
+
+    :return: list of (variant, files, unzipped bytes, zip bytes, import ms)
+    """
+    import syndicate.core # noqa: F401
+    from syndicate.core.build.helper import zip_dir
+    from syndicate.core.build.runtime.python import \
+        optimize_python_artifact, resolve_artifact_optimization, \
+        LAMBDA_TASK_ROOT
+
+    settings = resolve_artifact_optimization(
+        {'artifact_optimization': {'strip': strip}})
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_path = os.path.join(work_dir, 'source')
+        generate_artifact(source_path, modules)
+        for variant in ('default', 'optimized'):
+            artifact_path = os.path.join(work_dir, variant)
+            shutil.copytree(source_path, artifact_path)
+            if variant == 'optimized':
+                optimize_python_artifact(artifact_path, settings,
+                                         [PYTHON_VERSION], LAMBDA_TASK_ROOT,
+                                         variant)
+            zip_path = os.path.join(work_dir, f'{variant}.zip')
+            zip_dir(artifact_path, zip_path)
+            with zipfile.ZipFile(zip_path) as package:
+                infos = package.infolist()
+            results.append((
+                variant, len(infos), sum(info.file_size for info in infos),
+                os.path.getsize(zip_path),
+                measure_import(zip_path, import_runs)))
+    return results
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.python_artifact',
+        description='Benchmark of the python artifact optimization: zip '
+                    'size and import time of a sample artifact')
+    parser.add_argument('--modules', type=int, default=DEFAULT_MODULES,
+                        help='Number of modules in the sample dependency')
+    parser.add_argument('--import-runs', type=int,
+                        default=DEFAULT_IMPORT_RUNS,
+                        help='Number of the import time measurements')
+    parser.add_argument('--strip', action='store_true',
+                        help='Strip the native extensions')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    from tabulate import tabulate
+
+    results = run(modules=args.modules, import_runs=args.import_runs,
+                  strip=args.strip)
+    print(tabulate(
+        [[variant, files, round(unzipped / 1024), round(zipped / 1024),
+          import_ms]
+         for variant, files, unzipped, zipped, import_ms in results],
+        headers=['Variant', 'Files', 'Unzipped (KB)', 'Zip (KB)',
+                 'Import time (ms)']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+DEFAULT_SCALES = (5, 20)
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__),
+                                     'baseline.json')
+# wall time differences below this value are treated as noise
+MIN_WALL_TIME_REGRESSION_SEC = 1.0
+
+
+def find_regressions(results, baseline, max_calls_regression,
+                     max_time_regression):
+    regressions = []
+    for scale, operations in results.items():
+        for operation, current in operations.items():
+            expected = baseline.get(scale, {}).get(operation)
+            if not expected:
+                continue
+            if not current['succeeded']:
+                regressions.append(
+                    f'scale {scale}, {operation}: operation failed')
+            calls_limit = expected['api_calls'] * (1 + max_calls_regression)
+            if current['api_calls'] > calls_limit:
+                regressions.append(
+                    f"scale {scale}, {operation}: {current['api_calls']} API "
+                    f"calls, baseline {expected['api_calls']}")
+            time_limit = expected['wall_sec'] * (1 + max_time_regression)
+            if current['wall_sec'] > time_limit and \
+                    current['wall_sec'] - expected['wall_sec'] > \
+                    MIN_WALL_TIME_REGRESSION_SEC:
+                regressions.append(
+                    f"scale {scale}, {operation}: {current['wall_sec']}s "
+                    f"wall time, baseline {expected['wall_sec']}s")
+    return regressions
+
+
+def format_results(results):
+    from tabulate import tabulate
+    rows = []
+    for scale, operations in results.items():
+        for operation, result in operations.items():
+            rows.append([scale, operation, result['wall_sec'],
+                         result['api_calls'], result['retries'],
+                         'yes' if result['succeeded'] else 'no'])
+    return tabulate(rows, headers=['Scale', 'Operation', 'Wall time (s)',
+                                   'API calls', 'Retries', 'Succeeded'])
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description='Offline benchmark of the syndicate deploy lifecycle '
+                    'against an in-process moto AWS stand-in')
+    parser.add_argument('--scales', type=int, nargs='+',
+                        default=list(DEFAULT_SCALES),
+                        help='Numbers of lambdas, roles, tables, queues and '
+                             'API paths in the synthetic bundles')
+    parser.add_argument('--latency-ms', type=int, default=0,
+                        help='Latency added to every AWS request')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='Share of AWS requests answered with a '
+                             'throttling error')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help='Path to the baseline results file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Save the results as the new baseline')
+    parser.add_argument('--max-calls-regression', type=float, default=0.0,
+                        help='Allowed share of API calls above baseline')
+    parser.add_argument('--max-time-regression', type=float, default=0.5,
+                        help='Allowed share of wall time above baseline')
+    parser.add_argument('--output', help='Path to save the results to')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+    from benchmarks.scenarios import run_scale
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='syndicate-benchmark-') \
+            as work_dir:
+        for scale in args.scales:
+            results[str(scale)] = run_scale(
+                work_dir=work_dir, scale=scale, latency_ms=args.latency_ms,
+                throttle_rate=args.throttle_rate, seed=args.seed)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f'Baseline {args.baseline} not found, nothing to compare with')
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = find_regressions(
+        results, baseline,
+        max_calls_regression=args.max_calls_regression,
+        max_time_regression=args.max_time_regression)
+    for regression in regressions:
+        print(f'REGRESSION: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import getpass
+import os
+from collections import Counter
+from concurrent.futures import wait
+from datetime import datetime
+from time import perf_counter
+
+from benchmarks.aws_stand_in import AwsStandIn
+from benchmarks.project_generator import generate_project, \
+    bump_lambdas_timeout
+
+DEPLOY_NAME = 'benchmark'
+ASSEMBLE = 'assemble'
+CREATE_META = 'create_meta'
+DEPLOY = 'deploy'
+UPDATE = 'update'
+CLEAN = 'clean'
+OPERATIONS = (ASSEMBLE, CREATE_META, DEPLOY, UPDATE, CLEAN)
+
+
+def _measure(operation, func):
+    from syndicate.commons.tracing import TRACER
+    TRACER.start(action=operation)
+    start = perf_counter()
+    try:
+        result = func()
+    finally:
+        wall_sec = perf_counter() - start
+        TRACER.stop()
+    calls_by_operation = Counter(
+        f"{call['service']}.{call['operation']}" for call in TRACER.calls)
+    return {
+        'succeeded': result is not False,
+        'wall_sec': round(wall_sec, 3),
+        'api_calls': TRACER.calls_count,
+        'retries': sum(call['retries'] for call in TRACER.calls),
+        'calls_by_operation': dict(sorted(calls_by_operation.items()))
+    }
+
+
+def _initialize_syndicate(config_path):
+    import syndicate.core as core
+    from syndicate.core.build.bundle_processor import create_bundles_bucket
+    from syndicate.core.resources.resources_provider import ResourceProvider
+
+    # the resources provider is a process wide singleton, a new project
+    # must not reuse the connections of the previous one
+    ResourceProvider.instance = None
+    core.CONF_PATH = config_path
+    core.PROJECT_STATE = None
+    core.initialize_connection()
+    core.initialize_project_state(do_not_sync_state=True)
+    create_bundles_bucket()
+
+
+def _build_bundle(project_path, bundle_name, results=None):
+    from syndicate.core.build.artifact_processor import assemble_artifacts
+    from syndicate.core.build.bundle_processor import upload_bundle_to_s3
+    from syndicate.core.build.meta_processor import create_meta
+    from syndicate.core.groups import RUNTIME_PYTHON, PYTHON_ROOT_DIR_PYAPP
+
+    def assemble():
+        assemble_artifacts(bundle_name=bundle_name,
+                           runtime_root_dir=PYTHON_ROOT_DIR_PYAPP,
+                           runtime=RUNTIME_PYTHON)
+
+    def package_meta():
+        create_meta(project_path=project_path, bundle_name=bundle_name)
+
+    if results is None:
+        assemble()
+        package_meta()
+    else:
+        results[ASSEMBLE] = _measure(ASSEMBLE, assemble)
+        results[CREATE_META] = _measure(CREATE_META, package_meta)
+    futures = upload_bundle_to_s3(bundle_name=bundle_name, force=True)
+    wait(futures)
+    for future in futures:
+        future.result()
+
+
+def _log_event(operation, bundle_name, succeeded):
+    from syndicate.core import PROJECT_STATE
+    from syndicate.core.constants import OK_RETURN_CODE, \
+        FAILED_RETURN_CODE, DATE_FORMAT_ISO_8601
+    now = datetime.now().strftime(DATE_FORMAT_ISO_8601)
+    PROJECT_STATE.log_execution_event(
+        operation=operation, initiator=getpass.getuser(),
+        bundle_name=bundle_name, deploy_name=DEPLOY_NAME,
+        time_start=now, time_end=now, duration_sec=0,
+        status=OK_RETURN_CODE if succeeded else FAILED_RETURN_CODE,
+        rollback_on_error=False)
+
+
+def run_scale(work_dir, scale, latency_ms=0, throttle_rate=0.0, seed=0):
+    """ Runs the deploy lifecycle of a synthetic project of the given scale
+    against the AWS stand-in.
+
+    :return: dict of measurements by operation name
+    """
+    from syndicate.core.build.deployment_processor import \
+        create_deployment_resources, update_deployment_resources, \
+        remove_deployment_resources
+
+    project_path = os.path.join(work_dir, f'scale-{scale}')
+    config_path = generate_project(project_path, scale)
+    results = {}
+    # moto backends are not thread safe, the requests sent concurrently by
+    # the deployment pools make the number of the API calls vary run to run
+    with AwsStandIn(latency_ms=latency_ms, throttle_rate=throttle_rate,
+                    seed=seed, serialize=True):
+        _initialize_syndicate(config_path)
+
+        bundle_name = f'bundle-{scale}-v1'
+        _build_bundle(project_path, bundle_name, results)
+
+        results[DEPLOY] = _measure(DEPLOY, lambda: create_deployment_resources(
+            deploy_name=DEPLOY_NAME, bundle_name=bundle_name))
+        _log_event(DEPLOY, bundle_name, results[DEPLOY]['succeeded'])
+
+        bump_lambdas_timeout(project_path, scale, timeout=60)
+        updated_bundle_name = f'bundle-{scale}-v2'
+        _build_bundle(project_path, updated_bundle_name)
+        results[UPDATE] = _measure(UPDATE, lambda: update_deployment_resources(
+            bundle_name=updated_bundle_name, deploy_name=DEPLOY_NAME,
+            replace_output=True, force=True))
+        _log_event(UPDATE, updated_bundle_name, results[UPDATE]['succeeded'])
+
+        results[CLEAN] = _measure(CLEAN, lambda: remove_deployment_resources(
+            deploy_name=DEPLOY_NAME, bundle_name=updated_bundle_name))
+    return results
@@ -0,0 +1,389 @@
+"""
+    Copyright 2018 EPAM Systems, Inc.
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+"""
+import json
+import math
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from time import perf_counter
+
+from syndicate.commons.log_helper import get_logger
+
+_LOG = get_logger(__name__)
+
+TRACE_CONTEXT_KEY = 'syndicate_trace'
+TRACE_FILE_NAME = 'trace-{action}-%Y%m%d-%H%M%S.json'
+
+UNKNOWN = 'n/a'
+JOB_CATEGORY = 'job'
+STAGE_CATEGORY = 'stage'
+AWS_CALL_CATEGORY = 'aws'
+
+THROTTLING_ERROR_CODES = {
+    'Throttling', 'ThrottlingException', 'ThrottledException',
+    'RequestThrottledException', 'TooManyRequestsException',
+    'ProvisionedThroughputExceededException', 'RequestLimitExceeded',
+    'BandwidthLimitExceeded', 'LimitExceededException',
+    'RequestThrottled', 'SlowDown', 'PriorRequestNotComplete',
+    'EC2ThrottledException'
+}
+
+# request parameters which identify the resource an API call is made for,
+# in the order of preference
+RESOURCE_PARAM_NAMES = (
+    'FunctionName', 'LayerName', 'TableName', 'RoleName', 'PolicyArn',
+    'PolicyName', 'Bucket', 'QueueUrl', 'QueueName', 'TopicArn', 'StreamName',
+    'DeliveryStreamName', 'StateMachineArn', 'UserPoolId', 'IdentityPoolId',
+    'restApiId', 'ApiId', 'apiId', 'Rule', 'Name', 'name',
+    'ApplicationName', 'EnvironmentName', 'DBClusterIdentifier',
+    'DBInstanceIdentifier', 'ClusterName', 'computeEnvironment', 'jobQueue',
+    'jobDefinition', 'AlarmName', 'DashboardName', 'LogGroupName',
+    'ResourceArn', 'Arn'
+)
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = max(int(math.ceil(percent / 100 * len(ordered))) - 1, 0)
+    return ordered[index]
+
+
+def _resolve_resource(params):
+    if not isinstance(params, dict):
+        return UNKNOWN
+    for param_name in RESOURCE_PARAM_NAMES:
+        value = params.get(param_name)
+        if isinstance(value, str) and value:
+            return value
+    return UNKNOWN
+
+
+class ApiCallTracer:
+    """
+    Collects per AWS API call and per resource job timings.
+
+    The tracer hooks the botocore `before-parameter-build`, `after-call`,
+    `after-call-error` and `needs-retry` events of the default boto3 session,
+    so it has to be installed before the clients are created. Handlers are
+    no-op until the tracer is started.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._installed_on = set()
+        self.enabled = False
+        self.action = None
+        self.origin = None
+        self.calls = []
+        self.spans = []
+        self.current_stage = None
+
+    def install(self, session=None):
+        """ Registers the tracer handlers on the given boto3 session or on
+        the default one.
+        """
+        if session is None:
+            import boto3
+            if boto3.DEFAULT_SESSION is None:
+                boto3.setup_default_session()
+            session = boto3.DEFAULT_SESSION
+        events = session.events
+        if id(events) in self._installed_on:
+            return
+        # unlike `before-call`, this event carries the API parameters and
+        # can not be short-circuited by another handler
+        events.register('before-parameter-build', self._before_call,
+                        unique_id='syndicate-trace-before-call')
+        events.register('needs-retry', self._needs_retry,
+                        unique_id='syndicate-trace-needs-retry')
+        events.register('after-call', self._after_call,
+                        unique_id='syndicate-trace-after-call')
+        events.register('after-call-error', self._after_call_error,
+                        unique_id='syndicate-trace-after-call-error')
+        self._installed_on.add(id(events))
+
+    def start(self, action=None):
+        with self._lock:
+            self.calls = []
+            self.spans = []
+            self.current_stage = None
+            self.action = action
+            self.origin = perf_counter()
+            self.enabled = True
+        _LOG.debug(f'AWS API calls tracing started for \'{action}\'')
+
+    def stop(self):
+        self.enabled = False
+        _LOG.debug(f'AWS API calls tracing stopped for \'{self.action}\'')
+
+    @property
+    def calls_count(self):
+        return len(self.calls)
+
+    def count_calls(self, service=None, operation=None):
+        return sum(1 for call in self.calls
+                   if (service is None or call['service'] == service) and
+                   (operation is None or call['operation'] == operation))
+
+    # spans -------------------------------------------------------------------
+
+    @contextmanager
+    def span(self, name, category=JOB_CATEGORY, resource_type=None):
+        """ Records a duration of the wrapped block. Calls made in the same
+        thread inside the block are attributed to the given resource type.
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = self._job_stack()
+        stack.append(resource_type)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            self._append_span(name=name, category=category,
+                              resource_type=resource_type, start=start,
+                              end=perf_counter())
+
+    @contextmanager
+    def stage(self, resource_type):
+        """ Marks the sequential processing of the given resource type.
+        Calls which are not made inside a job are attributed to it.
+        """
+        if not self.enabled:
+            yield
+            return
+        previous, self.current_stage = self.current_stage, resource_type
+        try:
+            with self.span(resource_type, STAGE_CATEGORY, resource_type):
+                yield
+        finally:
+            self.current_stage = previous
+
+    def record(self, name, start, category=JOB_CATEGORY,
+               resource_type=None):
+        """ Records a span which started at `start` (`perf_counter` time)
+        and ends now. Unlike `span`, it can end in another thread, e.g. when
+        a resource watcher reports that the resource is ready.
+        """
+        if self.enabled:
+            self._append_span(name=name, category=category,
+                              resource_type=resource_type, start=start,
+                              end=perf_counter())
+
+    def _job_stack(self):
+        stack = getattr(self._local, 'jobs', None)
+        if stack is None:
+            stack = self._local.jobs = []
+        return stack
+
+    def _current_resource_type(self):
+        stack = self._job_stack()
+        for resource_type in reversed(stack):
+            if resource_type:
+                return resource_type
+        return self.current_stage or UNKNOWN
+
+    def _append_span(self, name, category, resource_type, start, end):
+        thread = threading.current_thread()
+        with self._lock:
+            self.spans.append({
+                'name': name,
+                'category': category,
+                'resource_type': resource_type or UNKNOWN,
+                'thread': thread.name,
+                'thread_id': thread.ident,
+                'start': start - self.origin,
+                'duration': end - start
+            })
+
+    # botocore event handlers -------------------------------------------------
+
+    def _before_call(self, model, params, context, **kwargs):
+        if not self.enabled or context is None:
+            return
+        context[TRACE_CONTEXT_KEY] = {
+            'start': perf_counter(),
+            'resource': _resolve_resource(params),
+            'resource_type': self._current_resource_type(),
+            'throttled': False
+        }
+
+    def _needs_retry(self, response=None, request_dict=None, **kwargs):
+        if not self.enabled or not request_dict:
+            return
+        trace = request_dict.get('context', {}).get(TRACE_CONTEXT_KEY)
+        if trace is None or not response:
+            return
+        error_code = (response[1] or {}).get('Error', {}).get('Code')
+        if error_code in THROTTLING_ERROR_CODES:
+            trace['throttled'] = True
+
+    def _after_call(self, model, context, parsed=None, **kwargs):
+        error_code = None
+        if isinstance(parsed, dict):
+            error_code = parsed.get('Error', {}).get('Code')
+        self._record_call(model=model, context=context, parsed=parsed,
+                          error=error_code)
+
+    def _after_call_error(self, model, context, exception=None, **kwargs):
+        self._record_call(model=model, context=context,
+                          error=exception.__class__.__name__
+                          if exception else None)
+
+    def _record_call(self, model, context, parsed=None, error=None):
+        if not self.enabled or context is None:
+            return
+        trace = context.pop(TRACE_CONTEXT_KEY, None)
+        if trace is None:
+            return
+        end = perf_counter()
+        retries = 0
+        if isinstance(parsed, dict):
+            retries = parsed.get('ResponseMetadata', {}).get(
+                'RetryAttempts', 0)
+        thread = threading.current_thread()
+        with self._lock:
+            self.calls.append({
+                'service': model.service_model.service_name,
+                'operation': model.name,
+                'resource': trace['resource'],
+                'resource_type': trace['resource_type'],
+                'thread': thread.name,
+                'thread_id': thread.ident,
+                'start': trace['start'] - self.origin,
+                'duration': end - trace['start'],
+                'retries': retries,
+                'throttled': trace['throttled'] or
+                error in THROTTLING_ERROR_CODES,
+                'error': error
+            })
+
+    # reporting ---------------------------------------------------------------
+
+    def to_chrome_trace(self):
+        """ Returns the collected data in the Chrome trace event format
+        which can be opened in Perfetto UI or chrome://tracing
+        """
+        events = []
+        threads = {}
+        for span in self.spans:
+            threads[span['thread_id']] = span['thread']
+            events.append({
+                'name': span['name'],
+                'cat': span['category'],
+                'ph': 'X',
+                'pid': 1,
+                'tid': span['thread_id'],
+                'ts': round(span['start'] * 1e6),
+                'dur': round(span['duration'] * 1e6),
+                'args': {'resource_type': span['resource_type']}
+            })
+        for call in self.calls:
+            threads[call['thread_id']] = call['thread']
+            events.append({
+                'name': f"{call['service']}.{call['operation']}",
+                'cat': AWS_CALL_CATEGORY,
+                'ph': 'X',
+                'pid': 1,
+                'tid': call['thread_id'],
+                'ts': round(call['start'] * 1e6),
+                'dur': round(call['duration'] * 1e6),
+                'args': {
+                    'resource': call['resource'],
+                    'resource_type': call['resource_type'],
+                    'retries': call['retries'],
+                    'throttled': call['throttled'],
+                    'error': call['error']
+                }
+            })
+        events.append({
+            'name': 'process_name', 'ph': 'M', 'pid': 1,
+            'args': {'name': f'syndicate {self.action or ""}'.strip()}
+        })
+        for thread_id, thread_name in threads.items():
+            events.append({
+                'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': thread_id,
+                'args': {'name': thread_name}
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def summary(self, group_by):
+        """ Aggregates the recorded calls by the given call attribute.
+
+        :param group_by: one of 'resource_type', 'service', 'operation'
+        :return: list of rows sorted by total time, descending
+        """
+        groups = defaultdict(list)
+        for call in self.calls:
+            key = call[group_by]
+            if group_by == 'operation':
+                key = f"{call['service']}.{call['operation']}"
+            groups[key].append(call)
+
+        rows = []
+        for key, calls in groups.items():
+            durations = [call['duration'] for call in calls]
+            rows.append({
+                group_by: key,
+                'calls': len(calls),
+                'total_sec': round(sum(durations), 3),
+                'p95_ms': round(_percentile(durations, 95) * 1000, 1),
+                'retries': sum(call['retries'] for call in calls),
+                'throttled': sum(1 for call in calls if call['throttled'])
+            })
+        rows.sort(key=lambda row: row['total_sec'], reverse=True)
+        return rows
+
+    def format_summary(self):
+        from tabulate import tabulate
+        tables = []
+        for group_by in ('resource_type', 'service', 'operation'):
+            rows = self.summary(group_by)
+            if not rows:
+                continue
+            headers = {
+                group_by: group_by.replace('_', ' ').capitalize(),
+                'calls': 'Calls',
+                'total_sec': 'Total time (s)',
+                'p95_ms': 'p95 (ms)',
+                'retries': 'Retries',
+                'throttled': 'Throttled'
+            }
+            tables.append(tabulate(rows, headers=headers))
+        return '\n\n'.join(tables)
+
+    def export(self, directory):
+        """ Writes the chrome trace file to the given directory.
+
+        :return: path to the written file
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_name = datetime.now().strftime(
+            TRACE_FILE_NAME.format(action=self.action or 'syndicate'))
+        path = os.path.join(directory, file_name)
+        with open(path, 'w') as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+        return path
+
+
+TRACER = ApiCallTracer()
@@ -13,12 +13,14 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-import time
+import threading
 
 from boto3 import client
 
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    Poller, RateLimiter
+from syndicate.exceptions import ResourceProcessingTimeoutError
 from syndicate.core.helper import dict_keys_to_camel_case
 
 _LOG = get_logger(__name__)
@@ -33,10 +35,29 @@ DATA_SOURCE_TYPE_CONFIG_MAPPING = {
     'AMAZON_EVENTBRIDGE': 'eventBridgeConfig'
 }
 
+SCHEMA_CREATION_TIMEOUT_SEC = 600
+SCHEMA_STATUS_POLL_INTERVAL_SEC = 1
+SCHEMA_STATUS_POLL_MAX_INTERVAL_SEC = 15
+SCHEMA_PROCESSING_STATUS = 'PROCESSING'
+
 REDUNDANT_RESOLVER_EXCEPTION_TEXT = 'Only one resolver is allowed per field'
 DATA_SOURCE_EXISTS_EXCEPTION_TEXT = \
     'Data source with name {name} already exists'
 
+# the data sources, functions and resolvers of an API are reconciled
+# concurrently, the connections to the same region share the limiter
+APPSYNC_REQUESTS_PER_SECOND = 10
+_APPSYNC_RATE_LIMITERS = {}
+_APPSYNC_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_appsync_rate_limiter(region):
+    with _APPSYNC_RATE_LIMITERS_LOCK:
+        if region not in _APPSYNC_RATE_LIMITERS:
+            _APPSYNC_RATE_LIMITERS[region] = RateLimiter(
+                rate=APPSYNC_REQUESTS_PER_SECOND)
+        return _APPSYNC_RATE_LIMITERS[region]
+
 
 @apply_methods_decorator(retry())
 class AppSyncConnection(object):
@@ -49,6 +70,8 @@ class AppSyncConnection(object):
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
         self.region = region
+        _get_appsync_rate_limiter(self.client.meta.region_name).register(
+            self.client)
         _LOG.debug('Opened new AppSync connection.')
 
 # ------------------------ Create ------------------------
@@ -97,21 +120,47 @@ class AppSyncConnection(object):
 
         return self.client.create_graphql_api(**params)['graphqlApi']['apiId']
 
-    def create_schema(self, api_id: str, definition: str):
+    def create_schema(self, api_id: str, definition: str,
+                      timeout: int = SCHEMA_CREATION_TIMEOUT_SEC,
+                      progress_callback=None):
+        """ Uploads the schema and polls its creation status with a
+        growing interval until it is not processing.
+
+        :param timeout: seconds to wait for the schema creation
+        :param progress_callback: function of the status and details
+            called on every status check
+        :returns tuple of the final status and details
+        """
         response = self.client.start_schema_creation(
             apiId=api_id,
             definition=str.encode(definition)
         )
-        status = response['status']
-        details = response.get('details', '')
-        while status == 'PROCESSING':
-            time.sleep(2)
-            response = self.client.get_schema_creation_status(
-                apiId=api_id
-            )
-            status = response['status']
-            details = response.get('details', '')
-        return status, details
+        if response['status'] == SCHEMA_PROCESSING_STATUS:
+            def get_status():
+                status_response = self.client.get_schema_creation_status(
+                    apiId=api_id)
+                if progress_callback:
+                    progress_callback(status_response['status'],
+                                      status_response.get('details', ''))
+                return status_response
+
+            result = Poller(
+                interval=SCHEMA_STATUS_POLL_INTERVAL_SEC,
+                max_interval=SCHEMA_STATUS_POLL_MAX_INTERVAL_SEC,
+                timeout=timeout).poll(
+                get_status,
+                is_done=lambda status_response:
+                status_response['status'] != SCHEMA_PROCESSING_STATUS)
+            if not result.done:
+                raise ResourceProcessingTimeoutError(
+                    f"Schema creation of the AppSync API '{api_id}' did not "
+                    f"finish in {timeout} seconds, {result.calls} status "
+                    f"checks made. Last details: "
+                    f"'{result.value.get('details', '')}'")
+            _LOG.debug(f"Schema creation of the AppSync API '{api_id}' took "
+                       f"{result.elapsed:.1f}s, {result.calls} status checks")
+            response = result.value
+        return response['status'], response.get('details', '')
 
     def create_type(self, api_id: str, definition: str, format: str):
         params = dict(
@@ -413,6 +462,9 @@ class AppSyncConnection(object):
 
         return self.client.update_graphql_api(**params)['graphqlApi']['apiId']
 
+    def tag_graphql_api(self, api_arn: str, tags: dict):
+        self.client.tag_resource(resourceArn=api_arn, tags=tags)
+
 # ------------------------ Delete ------------------------
 
     def delete_graphql_api(self, api_id: str):
@@ -13,16 +13,66 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-
 from boto3 import client
 from botocore.waiter import WaiterModel, create_waiter_with_client
 
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    StatusWatcher
 from syndicate.core.helper import dict_keys_to_camel_case
 
 _LOG = get_logger(__name__)
 
+COMPUTE_ENVIRONMENTS_POLL_INTERVAL_SEC = 3
+COMPUTE_ENVIRONMENT_TIMEOUT_SEC = 600
+# max number of the environments in the DescribeComputeEnvironments request
+DESCRIBE_COMPUTE_ENVIRONMENTS_LIMIT = 100
+
+
+class ComputeEnvironmentsWatcher(StatusWatcher):
+    """ Shares the DescribeComputeEnvironments polls between the threads
+    waiting for the compute environments """
+    kind = 'compute environment'
+
+    def __init__(self, batch_conn,
+                 interval=COMPUTE_ENVIRONMENTS_POLL_INTERVAL_SEC, **kwargs):
+        super().__init__(interval=interval, **kwargs)
+        self._batch_conn = batch_conn
+
+    def _describe(self, ids):
+        found = {}
+        for i in range(0, len(ids), DESCRIBE_COMPUTE_ENVIRONMENTS_LIMIT):
+            for description in self._batch_conn.describe_compute_environments(
+                    ids[i:i + DESCRIBE_COMPUTE_ENVIRONMENTS_LIMIT]
+            )['computeEnvironments']:
+                # the environments are referenced both by names and ARNs
+                found[description['computeEnvironmentName']] = description
+                found[description['computeEnvironmentArn']] = description
+        return found
+
+    def _status(self, description):
+        return description['status']
+
+    def _failure_reason(self, description):
+        return f"{description['status']}, {description.get('statusReason')}"
+
+    def wait(self, environments, timeout=COMPUTE_ENVIRONMENT_TIMEOUT_SEC):
+        """ Waits until all the environments are VALID.
+
+        :param environments: names or ARNs of the compute environments
+        :returns dict of the environments to their descriptions
+        """
+        return self.watch(environments, timeout).result()
+
+    def watch(self, environments, timeout=COMPUTE_ENVIRONMENT_TIMEOUT_SEC):
+        """ The same as `wait`, but does not block the calling thread.
+
+        :returns Future of the dict of the environments to their
+            descriptions
+        """
+        return super().watch(environments, ready_statuses=('VALID',),
+                             failed_statuses=('INVALID',), timeout=timeout)
+
 
 @apply_methods_decorator(retry())
 class BatchConnection(object):
@@ -34,6 +84,7 @@ class BatchConnection(object):
                              aws_access_key_id=aws_access_key_id,
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
+        self.compute_environments_watcher = ComputeEnvironmentsWatcher(self)
         _LOG.debug('Opened new Batch connection.')
 
     def create_compute_environment(self, compute_environment_name,
@@ -82,6 +133,16 @@ class BatchConnection(object):
             params['computeEnvironments'] = compute_environments
         return self.client.describe_compute_environments(**params)
 
+    def wait_for_compute_environments(self, compute_environments,
+                                      timeout=COMPUTE_ENVIRONMENT_TIMEOUT_SEC):
+        return self.compute_environments_watcher.wait(compute_environments,
+                                                      timeout)
+
+    def watch_compute_environments(self, compute_environments,
+                                   timeout=COMPUTE_ENVIRONMENT_TIMEOUT_SEC):
+        return self.compute_environments_watcher.watch(compute_environments,
+                                                       timeout)
+
     def delete_compute_environment(self, compute_environment):
         return self.client.delete_compute_environment(
             computeEnvironment=compute_environment)
@@ -232,7 +293,7 @@ class BatchConnection(object):
                 waiter_id: {
                     'delay': 1,
                     'operation': 'DescribeJobQueues',
-                    'maxAttempts': 10,
+                    'maxAttempts': 60,
                     'acceptors': [
                         {
                             'expected': 'VALID',
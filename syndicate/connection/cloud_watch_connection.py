@@ -14,6 +14,7 @@
     limitations under the License.
 """
 import json
+import threading
 import uuid
 from json import dumps
 from typing import Optional
@@ -21,15 +22,41 @@ from typing import Optional
 from boto3 import client
 from botocore.exceptions import ClientError
 
-from syndicate.exceptions import ParameterError
+from syndicate.exceptions import ParameterError, ResourceProcessingError
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    RateLimiter
 from syndicate.core.constants import (
     POSSIBLE_RETENTION_DAYS, DEFAULT_LOGS_EXPIRATION
 )
 
 _LOG = get_logger(__name__)
 
+# the limits of the PutTargets and RemoveTargets requests
+PUT_TARGETS_BATCH_SIZE = 10
+REMOVE_TARGETS_BATCH_SIZE = 100
+
+# EventBridge control plane quotas are per region, so the connections to
+# the same region share the limiter
+EVENTS_REQUESTS_PER_SECOND = 40
+_EVENTS_RATE_LIMITERS = {}
+_EVENTS_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_events_rate_limiter(region):
+    with _EVENTS_RATE_LIMITERS_LOCK:
+        if region not in _EVENTS_RATE_LIMITERS:
+            _EVENTS_RATE_LIMITERS[region] = RateLimiter(
+                rate=EVENTS_REQUESTS_PER_SECOND)
+        return _EVENTS_RATE_LIMITERS[region]
+
+
+def build_rule_target(target_arn, input_=None, id_prefix=''):
+    target = {'Id': f'{id_prefix}{uuid.uuid1()}', 'Arn': target_arn}
+    if input_ and isinstance(input_, dict):
+        target['Input'] = json.dumps(input_)
+    return target
+
 
 def get_lambda_log_group_name(lambda_name):
     return '/aws/lambda/' + lambda_name
@@ -158,16 +185,14 @@ class LogsConnection(object):
         return groups
 
     def get_log_group_by_lambda_name(self, lambda_name: str):
-        group = None
+        # the name pattern matches the groups of the other lambdas whose
+        # names contain this one
+        log_group_name = get_lambda_log_group_name(lambda_name)
         response = self.client.describe_log_groups(
-            logGroupNamePattern=lambda_name
+            logGroupNamePrefix=log_group_name
         )
-        group_data = response.get("logGroups")
-
-        if group_data:
-            group = group_data[0]
-
-        return group
+        return next((group for group in response.get('logGroups', [])
+                     if group['logGroupName'] == log_group_name), None)
 
 
 @apply_methods_decorator(retry())
@@ -180,6 +205,8 @@ class EventConnection(object):
                              aws_access_key_id=aws_access_key_id,
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
+        _get_events_rate_limiter(self.client.meta.region_name).register(
+            self.client)
         _LOG.debug('Opened new Cloudwatch events connection.')
 
     def create_schedule_rule(self, name, expression, tags=None,
@@ -308,10 +335,38 @@ class EventConnection(object):
         :type target_arn: str
         :type input_: Optional[dict]
         """
-        target = {'Id': str(uuid.uuid1()), 'Arn': target_arn}
-        if input_ and isinstance(input_, dict):
-            target['Input'] = json.dumps(input_)
-        self.client.put_targets(Rule=rule_name, Targets=[target, ])
+        self.client.put_targets(
+            Rule=rule_name, Targets=[build_rule_target(target_arn, input_)])
+
+    def put_rule_targets(self, rule_name, targets):
+        """ Adds or updates the targets of the rule in batches.
+
+        :type rule_name: str
+        :type targets: list of dicts with Id and Arn
+        """
+        for i in range(0, len(targets), PUT_TARGETS_BATCH_SIZE):
+            response = self.client.put_targets(
+                Rule=rule_name,
+                Targets=targets[i:i + PUT_TARGETS_BATCH_SIZE])
+            if response.get('FailedEntryCount'):
+                raise ResourceProcessingError(
+                    f"Failed to put targets of the rule '{rule_name}': "
+                    f"{response['FailedEntries']}")
+
+    def remove_rule_targets(self, rule_name, target_ids):
+        """ Removes the targets of the rule in batches.
+
+        :type rule_name: str
+        :type target_ids: list of str
+        """
+        for i in range(0, len(target_ids), REMOVE_TARGETS_BATCH_SIZE):
+            response = self.client.remove_targets(
+                Rule=rule_name,
+                Ids=target_ids[i:i + REMOVE_TARGETS_BATCH_SIZE])
+            if response.get('FailedEntryCount'):
+                raise ResourceProcessingError(
+                    f"Failed to remove targets of the rule '{rule_name}': "
+                    f"{response['FailedEntries']}")
 
     def add_rule_sf_target(self, rule_name, target_arn, input, role_arn):
         """ Add to CloudWatch rule targets for invocations.
@@ -365,11 +420,14 @@ class EventConnection(object):
         :type log_not_found_error: boolean, parameter is needed for proper log
         handling in the retry decorator
         """
-        response = self.client.list_targets_by_rule(Rule=rule_name)
-        if response['Targets']:
-            targets = response['Targets']
-            target_ids = [target['Id'] for target in targets]
-            self.client.remove_targets(Rule=rule_name, Ids=target_ids)
+        targets = self.list_targets_by_rule(rule_name)
+        if targets:
+            self.remove_rule_targets(
+                rule_name, [target['Id'] for target in targets])
+        self.client.delete_rule(Name=rule_name)
+
+    def delete_rule(self, rule_name):
+        """ Removes the rule which has no targets """
         self.client.delete_rule(Name=rule_name)
 
     def list_targets_by_rule(self, rule_name):
@@ -13,6 +13,8 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+from threading import Lock
+
 from boto3 import client
 
 from syndicate.commons.log_helper import get_logger
@@ -20,6 +22,18 @@ from syndicate.connection.helper import apply_methods_decorator, retry
 
 _LOG = get_logger(__name__)
 
+LIST_USER_POOLS_MAX_RESULTS = 60
+LIST_USER_POOL_CLIENTS_MAX_RESULTS = 60
+
+# name -> ids indexes of the user pools by the region and access key, each
+# one is built with a single listing and kept up to date on create and
+# delete. The user pool names are not unique, so a name can have several ids
+_POOLS_INDEXES = {}
+# client ids by the region, access key and user pool id, listed once
+_CLIENTS_INDEXES = {}
+_INDEXES_LOCK = Lock()
+_INDEX_BUILD_LOCKS = {}
+
 
 @apply_methods_decorator(retry())
 class CognitoIdentityProviderConnection(object):
@@ -36,6 +50,7 @@ class CognitoIdentityProviderConnection(object):
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token,
                              config=client_config)
+        self._index_key = (self.client.meta.region_name, aws_access_key_id)
         _LOG.debug('Opened new Cognito identity connection.')
 
     def create_user_pool(self, pool_name, auto_verified_attributes=None,
@@ -57,7 +72,13 @@ class CognitoIdentityProviderConnection(object):
             params['UserPoolTags'] = tags
 
         response = self.client.create_user_pool(**params)
-        return response['UserPool'].get('Id')
+        pool_id = response['UserPool'].get('Id')
+        with _INDEXES_LOCK:
+            index = _POOLS_INDEXES.get(self._index_key)
+            if index is not None:
+                index.setdefault(pool_name, []).append(pool_id)
+            _CLIENTS_INDEXES[(*self._index_key, pool_id)] = []
+        return pool_id
 
     def create_user_pool_client(
             self, user_pool_id, client_name, generate_secret=True,
@@ -105,30 +126,33 @@ class CognitoIdentityProviderConnection(object):
             params.update(EnableTokenRevocation=enable_token_revocation)
 
         response = self.client.create_user_pool_client(**params)
-        return response['UserPoolClient'].get('ClientId')
+        client_id = response['UserPoolClient'].get('ClientId')
+        with _INDEXES_LOCK:
+            client_ids = _CLIENTS_INDEXES.get(
+                (*self._index_key, user_pool_id))
+            if client_ids is not None:
+                client_ids.append(client_id)
+        return client_id
 
     def list_user_pool_clients(self, cup_id):
-
-        response = self.client.list_user_pool_clients(
-            UserPoolId=cup_id,
-            MaxResults=5
-        )
-
-        client_ids = [cup_client['ClientId'] for
-                      cup_client in response['UserPoolClients']]
-        next_token = response.get('NextToken')
-
-        while next_token:
-            response = self.client.list_user_pool_clients(
+        """ Lists the client ids of the user pool, the result is kept for
+        the run and updated when a client is created """
+        key = (*self._index_key, cup_id)
+        with _INDEXES_LOCK:
+            if key in _CLIENTS_INDEXES:
+                return list(_CLIENTS_INDEXES[key])
+
+        client_ids = []
+        paginator = self.client.get_paginator('list_user_pool_clients')
+        for page in paginator.paginate(
                 UserPoolId=cup_id,
-                MaxResults=5,
-                NextToken=next_token
-            )
+                PaginationConfig={
+                    'PageSize': LIST_USER_POOL_CLIENTS_MAX_RESULTS}):
             client_ids.extend([cup_client['ClientId'] for
-                               cup_client in response['UserPoolClients']])
-            next_token = response.get('NextToken')
-
-        return client_ids
+                               cup_client in page['UserPoolClients']])
+        with _INDEXES_LOCK:
+            _CLIENTS_INDEXES[key] = client_ids
+        return list(client_ids)
 
     def if_cup_client_exist(self, cup_name):
 
@@ -150,35 +174,9 @@ class CognitoIdentityProviderConnection(object):
                       f'name "{cup_name}"')
 
     def if_pool_exists_by_name(self, user_pool_name):
-        ids = []
-        paginator = self.client.get_paginator('list_user_pools')
-        response = paginator.paginate(
-            PaginationConfig={
-                'MaxItems': 60,
-                'PageSize': 10
-            }
-        )
-        for page in response:
-            ids.extend(
-                [user_pool['Id'] for user_pool in page['UserPools'] if
-                 user_pool['Name'] == user_pool_name]
-            )
-        next_token = response.resume_token
-        while next_token:
-            response = paginator.paginate(
-                PaginationConfig={
-                    'MaxItems': 60,
-                    'PageSize': 10,
-                    'StartingToken': next_token
-                }
-            )
-            for page in response:
-                ids.extend(
-                    [user_pool['Id'] for user_pool in page['UserPools'] if
-                     user_pool['Name'] == user_pool_name]
-                )
-            next_token = response.resume_token
-
+        """ Resolves the user pool id by the name with the user pools index
+        of the region """
+        ids = self._get_pool_ids(user_pool_name)
         if len(ids) == 1:
             return ids[0]
         if len(ids) > 1:
@@ -190,6 +188,24 @@ class CognitoIdentityProviderConnection(object):
             _LOG.warn(f'Cognito User Pool with the name "{user_pool_name}" '
                       f'not found in the region {self.region}')
 
+    def _get_pool_ids(self, user_pool_name):
+        with _INDEXES_LOCK:
+            build_lock = _INDEX_BUILD_LOCKS.setdefault(self._index_key, Lock())
+        with build_lock:
+            if self._index_key not in _POOLS_INDEXES:
+                index = {}
+                paginator = self.client.get_paginator('list_user_pools')
+                for page in paginator.paginate(PaginationConfig={
+                        'PageSize': LIST_USER_POOLS_MAX_RESULTS}):
+                    for user_pool in page['UserPools']:
+                        index.setdefault(user_pool['Name'], []).append(
+                            user_pool['Id'])
+                with _INDEXES_LOCK:
+                    _POOLS_INDEXES[self._index_key] = index
+        with _INDEXES_LOCK:
+            return list(_POOLS_INDEXES[self._index_key].get(user_pool_name,
+                                                             []))
+
     def describe_user_pool(self, user_pool_id):
         return self.client.describe_user_pool(UserPoolId=user_pool_id)
 
@@ -202,6 +218,14 @@ class CognitoIdentityProviderConnection(object):
         handling in the retry decorator
         """
         self.client.delete_user_pool(UserPoolId=user_pool_id)
+        with _INDEXES_LOCK:
+            index = _POOLS_INDEXES.get(self._index_key, {})
+            for name, ids in list(index.items()):
+                if user_pool_id in ids:
+                    ids.remove(user_pool_id)
+                    if not ids:
+                        del index[name]
+            _CLIENTS_INDEXES.pop((*self._index_key, user_pool_id), None)
 
     def add_custom_attributes(self, user_pool_id, attributes):
         self.client.add_custom_attributes(UserPoolId=user_pool_id,
@@ -14,25 +14,58 @@
     limitations under the License.
 """
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, Future, \
+    FIRST_COMPLETED, wait as wait_futures
 from operator import itemgetter
+from queue import Queue, Empty, Full
+from threading import Event
 
 from boto3 import client, resource
 from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from syndicate.exceptions import ResourceProcessingError, \
-    ParameterError
+    ResourceNotFoundError, ParameterError
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    backoff_delay, ExistenceCache, StatusWatcher
 
 
 _LOG = get_logger(__name__)
 
+TABLES_EXISTENCE_CACHE = ExistenceCache()
+
 DEFAULT_READ_CAPACITY = DEFAULT_WRITE_CAPACITY = 5
 DEFAULT_GI_READ_CAPACITY = DEFAULT_GI_WRITE_CAPACITY = 1
 
 UNLIMITED_REQUEST_UNIT = -1
 
+BATCH_GET_MAX_KEYS = 100
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_MAX_RETRIES = 10
+
+DEFAULT_SCAN_TOTAL_SEGMENTS = 4
+# number of pages each segment may scan ahead of the consumer
+SCAN_PREFETCH_PAGES = 2
+_SEGMENT_DONE = object()
+
+# the first poll happens shortly after the update was requested, then the
+# interval grows while the table is still being updated
+STATUS_POLL_MIN_INTERVAL_SEC = 2
+STATUS_POLL_MAX_INTERVAL_SEC = 20
+STATUS_POLL_BACKOFF_FACTOR = 1.5
+TABLE_UPDATE_TIMEOUT_SEC = 1500
+INDEX_UPDATE_TIMEOUT_SEC = 500
+TABLE_DELETE_TIMEOUT_SEC = 500
+
+# the number of tables DynamoDB allows to create, update or delete
+# simultaneously is limited
+MAX_CONCURRENT_TABLE_OPERATIONS = 10
+
+TableUpdateStep = namedtuple(
+    'TableUpdateStep', ['description', 'params', 'is_ready', 'timeout'])
+
 
 def _append_attr_definition(definition, attr_name, attr_type):
     """ Adds an attribute definition if it is not already present.
@@ -105,6 +138,145 @@ def _build_index_definition(index):
     return index_def
 
 
+def _wait_before_unprocessed_retry(table_name, unprocessed, attempt):
+    if attempt >= BATCH_MAX_RETRIES:
+        raise ResourceProcessingError(
+            f"Batch request to the table '{table_name}' still has "
+            f"unprocessed items after {attempt} retries")
+    delay = backoff_delay(attempt)
+    _LOG.debug(f"Batch request to the table '{table_name}' has "
+               f"unprocessed items, going to retry in {delay:.2f}s")
+    time.sleep(delay)
+    return unprocessed
+
+
+def _table_is_active(table):
+    return table.get('TableStatus') == 'ACTIVE' and all(
+        index.get('IndexStatus') == 'ACTIVE'
+        for index in table.get('GlobalSecondaryIndexes', []))
+
+
+def _index_is_deleted(index_name):
+    def is_ready(table):
+        return all(index['IndexName'] != index_name
+                   for index in table.get('GlobalSecondaryIndexes', []))
+    return is_ready
+
+
+def _index_is_created(index_name):
+    def is_ready(table):
+        index = next((index for index in
+                      table.get('GlobalSecondaryIndexes', [])
+                      if index['IndexName'] == index_name), None)
+        # the index in backfilling state allows to continue table update
+        return index is not None and (
+            index.get('Backfilling') or index.get('IndexStatus') == 'ACTIVE')
+    return is_ready
+
+
+def _build_capacity_update_params(billing_mode, read_capacity,
+                                  write_capacity, existing_billing_mode,
+                                  existing_provisioned_throughput,
+                                  existing_on_demand_throughput,
+                                  global_indexes):
+    if billing_mode == 'PROVISIONED':
+        throughput_key = 'ProvisionedThroughput'
+        read_key, write_key = 'ReadCapacityUnits', 'WriteCapacityUnits'
+        existing_throughput = existing_provisioned_throughput
+        default_read, default_write = \
+            DEFAULT_READ_CAPACITY, DEFAULT_WRITE_CAPACITY
+        default_gi_read, default_gi_write = \
+            DEFAULT_GI_READ_CAPACITY, DEFAULT_GI_WRITE_CAPACITY
+    else:
+        throughput_key = 'OnDemandThroughput'
+        read_key, write_key = 'MaxReadRequestUnits', 'MaxWriteRequestUnits'
+        existing_throughput = existing_on_demand_throughput
+        default_read = default_write = default_gi_read = default_gi_write = \
+            UNLIMITED_REQUEST_UNIT
+
+    if billing_mode == existing_billing_mode and (
+            read_capacity == existing_throughput.get(read_key) and
+            write_capacity == existing_throughput.get(write_key)):
+        return {}
+
+    params = {
+        'BillingMode': billing_mode,
+        throughput_key: {
+            read_key: read_capacity or default_read,
+            write_key: write_capacity or default_write
+        }
+    }
+    global_secondary_indexes_updates = [{
+        'Update': {
+            'IndexName': gsi.get('IndexName'),
+            throughput_key: {
+                read_key: gsi.get('read_capacity') or read_capacity or
+                default_gi_read,
+                write_key: gsi.get('write_capacity') or write_capacity or
+                default_gi_write
+            }
+        }
+    } for gsi in global_indexes]
+    if global_secondary_indexes_updates:
+        params['GlobalSecondaryIndexUpdates'] = \
+            global_secondary_indexes_updates
+    return params
+
+
+class TablesWatcher(StatusWatcher):
+    """ Polls the statuses of the tables being updated and removed from the
+    single watcher thread. DynamoDB describes one table per request, so
+    every poll makes a `DescribeTable` call per watched table and the
+    interval between the polls grows while the tables are being updated.
+    """
+    kind = 'table'
+
+    def __init__(self, connection, interval=STATUS_POLL_MIN_INTERVAL_SEC,
+                 max_interval=STATUS_POLL_MAX_INTERVAL_SEC,
+                 backoff=STATUS_POLL_BACKOFF_FACTOR, **kwargs):
+        super().__init__(interval=interval, max_interval=max_interval,
+                         backoff=backoff, **kwargs)
+        self.connection = connection
+
+    def _describe(self, ids):
+        descriptions = {}
+        for table_name in ids:
+            table = self.connection.describe_table(table_name)
+            if table is not None:
+                descriptions[table_name] = table
+        return descriptions
+
+    def _status(self, description):
+        return description.get('TableStatus')
+
+    def watch_table(self, table_name, is_ready, timeout):
+        """ Watches the table until its description satisfies `is_ready`
+
+        :param is_ready: predicate which takes the table description,
+            None to wait until the table does not exist
+        :param timeout: time in seconds to wait for
+        :returns Future of the table description
+        """
+        def check(descriptions):
+            table = descriptions.get(table_name)
+            if is_ready is None:
+                return table is None
+            if table is None:
+                raise ResourceNotFoundError(
+                    f"The table '{table_name}' does not exist")
+            return is_ready(table)
+
+        def on_done(watch):
+            if watch.exception() is not None:
+                table.set_exception(watch.exception())
+            else:
+                table.set_result(watch.result().get(table_name))
+
+        table = Future()
+        self._watch([table_name], check, timeout).add_done_callback(on_done)
+        return table
+
+
 @apply_methods_decorator(retry())
 class DynamoConnection(object):
     """ DynamoDB class."""
@@ -122,6 +294,9 @@ class DynamoConnection(object):
                              aws_secret_access_key=aws_secret_access_key,
                              endpoint_url=endpoint,
                              aws_session_token=aws_session_token)
+        self.tables_watcher = TablesWatcher(self)
+        self._cache_key_prefix = (self.client.meta.region_name,
+                                  aws_access_key_id, endpoint)
         _LOG.debug('Opened new DynamoDB connection.')
 
     def create_table(self, table_name, hash_key_name, hash_key_type,
@@ -200,20 +375,22 @@ class DynamoConnection(object):
         if tags:
             params['Tags'] = tags
         table = self.conn.create_table(**params)
+        TABLES_EXISTENCE_CACHE.set(self._table_cache_key(table_name), True)
         if wait:
             waiter = table.meta.client.get_waiter('table_exists')
             waiter.wait(TableName=table_name)
         return table
 
-    def update_table_ttl(self, table_name, ttl_attribute_name, wait=True):
-        """ Updates table ttl attribute
+    def update_table_ttl(self, table_name, ttl_attribute_name, wait=False):
+        """ Updates table ttl attribute. The ttl update does not change
+        the table status, so the other table updates can be made right away.
 
         :param table_name: DynamoDB table name
         :type table_name: str
         :param ttl_attribute_name: name of the table's attribute that holds
             ttl value
         :type ttl_attribute_name: str
-        :param wait: to wait for table update to finish or not
+        :param wait: to wait for table to be active or not
         :type wait: bool
         :returns update_time_to_live response as dict
         """
@@ -245,10 +422,172 @@ class DynamoConnection(object):
                 self._wait_for_table_update(table_name=table_name)
             return response
 
+    def plan_table_update(self, table_name, billing_mode, read_capacity,
+                          write_capacity, existing_billing_mode,
+                          existing_provisioned_throughput,
+                          existing_on_demand_throughput,
+                          existing_global_indexes, global_indexes_meta=None,
+                          table_read_capacity=None,
+                          table_write_capacity=None):
+        """ Splits the table update into the minimal sequence of
+        `UpdateTable` calls. DynamoDB allows only one global secondary index
+        to be created or deleted per call and does not allow to combine it
+        with the capacity change, while the capacity of the table and all
+        its indexes is changed with a single call. The indexes are deleted
+        first, so the capacity is not updated for them and the billing mode
+        can be switched for the remaining ones.
+
+        :param table_name: DynamoDB table name
+        :type table_name: str
+        :param billing_mode: capacity mode to set for the table
+        :type billing_mode: str
+        :param read_capacity: read capacity to assign for the table
+        :type read_capacity: int
+        :param write_capacity: write capacity to assign for the table
+        :type write_capacity: int
+        :param existing_billing_mode: capacity mode currently set in the table
+        :type existing_billing_mode: str
+        :param existing_provisioned_throughput: provisioned throughput
+                                                currently set in the table
+        :type existing_provisioned_throughput: dict
+        :param existing_on_demand_throughput: on demand throughput currently
+                                              set in the table
+        :type existing_on_demand_throughput: dict
+        :param existing_global_indexes: global secondary indexes already
+            present in the table
+        :type existing_global_indexes: list
+        :param global_indexes_meta: list of global indexes definitions in
+            meta, the indexes are not changed if not specified
+        :type global_indexes_meta: list
+        :param table_read_capacity: default read capacity for the created
+            global indexes
+        :type table_read_capacity: int
+        :param table_write_capacity: default write capacity for the created
+            global indexes
+        :type table_write_capacity: int
+        :returns list of TableUpdateStep
+        """
+        plan = []
+        global_indexes = list(existing_global_indexes)
+        existing_gsi_names = {gsi.get('IndexName')
+                              for gsi in existing_global_indexes}
+        if global_indexes_meta is not None:
+            gsi_names = {gsi.get('name') for gsi in global_indexes_meta}
+            global_indexes = [gsi for gsi in existing_global_indexes
+                              if gsi.get('IndexName') in gsi_names]
+            for gsi in existing_global_indexes:
+                index_name = gsi.get('IndexName')
+                if index_name in gsi_names:
+                    continue
+                plan.append(TableUpdateStep(
+                    description=f'Removed global secondary index '
+                                f'{index_name} for table {table_name}',
+                    params={'GlobalSecondaryIndexUpdates': [
+                        {'Delete': {'IndexName': index_name}}]},
+                    is_ready=_index_is_deleted(index_name),
+                    timeout=INDEX_UPDATE_TIMEOUT_SEC))
+
+        capacity_params = _build_capacity_update_params(
+            billing_mode=billing_mode,
+            read_capacity=read_capacity,
+            write_capacity=write_capacity,
+            existing_billing_mode=existing_billing_mode,
+            existing_provisioned_throughput=existing_provisioned_throughput,
+            existing_on_demand_throughput=existing_on_demand_throughput,
+            global_indexes=global_indexes)
+        if capacity_params:
+            plan.append(TableUpdateStep(
+                description=f'Updated {table_name} table capacity. Table '
+                            f'capacity mode: {billing_mode}, meta read/write '
+                            f'capacities: {read_capacity}/{write_capacity}',
+                params=capacity_params,
+                is_ready=_table_is_active,
+                timeout=TABLE_UPDATE_TIMEOUT_SEC))
+
+        for gsi in global_indexes_meta or []:
+            if gsi.get('name') in existing_gsi_names:
+                continue
+            index_info = _build_global_index_definition(
+                index=gsi,
+                # the capacity mode is already updated by the previous step
+                billing_mode=billing_mode,
+                read_throughput=gsi.get('read_capacity') or
+                table_read_capacity,
+                write_throughput=gsi.get('write_capacity') or
+                table_write_capacity
+            )
+            definitions = []
+            _add_index_keys_to_definition(definition=definitions, index=gsi)
+            plan.append(TableUpdateStep(
+                description=f'Created global secondary index '
+                            f'{gsi.get("name")} for table {table_name}',
+                params={'AttributeDefinitions': definitions,
+                        'GlobalSecondaryIndexUpdates': [
+                            {'Create': index_info}]},
+                is_ready=_index_is_created(gsi.get('name')),
+                timeout=INDEX_UPDATE_TIMEOUT_SEC))
+        return plan
+
+    def apply_table_update_plan(self, table_name, plan, wait=True):
+        """ Makes the planned `UpdateTable` calls one by one. Every next call
+        is made as soon as the tables watcher reports that the table allows
+        it.
+
+        :param table_name: DynamoDB table name
+        :type table_name: str
+        :param plan: steps returned by `plan_table_update`
+        :type plan: list
+        :param wait: to wait for the last step to finish or not
+        :type wait: bool
+        :returns the table description after the last step or None if
+            there was nothing to update
+        """
+        return self.start_table_update(table_name, plan, wait).result()
+
+    def start_table_update(self, table_name, plan, wait=True):
+        """ The same as `apply_table_update_plan`, but does not block the
+        calling thread: the steps after the first one are made by the
+        tables watcher thread.
+
+        :returns Future of the table description after the last step
+        """
+        result = Future()
+
+        def make_step(position, table=None):
+            if position > len(plan):
+                result.set_result(table)
+                return
+            step = plan[position - 1]
+            _LOG.debug(f'Updating the table {table_name}, step {position} '
+                       f'of {len(plan)}. Update params: {step.params}')
+            try:
+                self.client.update_table(TableName=table_name, **step.params)
+            except Exception as e:
+                result.set_exception(e)
+                return
+            if not wait and position == len(plan):
+                _LOG.info(step.description)
+                result.set_result(table)
+                return
+
+            def on_ready(future):
+                if future.exception() is not None:
+                    result.set_exception(future.exception())
+                    return
+                _LOG.info(step.description)
+                make_step(position + 1, future.result())
+
+            self.tables_watcher.watch_table(
+                table_name, step.is_ready, step.timeout).add_done_callback(
+                on_ready)
+
+        make_step(1)
+        return result
+
     def update_global_indexes(self, table_name, global_indexes_meta,
                               existing_global_indexes, table_read_capacity,
                               table_write_capacity, existing_capacity_mode):
-        """ Creates, Deletes or Updates global indexes for the table
+        """ Creates or Deletes global indexes for the table
 
         :param table_name: DynamoDB table name
         :type table_name: str
@@ -265,96 +604,34 @@ class DynamoConnection(object):
         :type existing_capacity_mode: str
         :returns None
         """
-        gsi_names = [gsi.get('name') for gsi in global_indexes_meta]
-        existing_gsi_names = [gsi.get('IndexName')
-                              for gsi in existing_global_indexes]
-
-        global_indexes_to_delete = []
-        for gsi in existing_global_indexes:
-            if gsi.get('IndexName') not in gsi_names:
-                global_indexes_to_delete.append(gsi)
-
-        global_indexes_to_create = []
-        for gsi in global_indexes_meta:
-            if gsi.get('name') not in existing_gsi_names:
-                global_indexes_to_create.append(gsi)
-
-        for gsi in global_indexes_to_delete:
-            index_name = gsi.get('IndexName')
-            self.delete_global_secondary_index(table_name=table_name,
-                                               index_name=index_name)
-            self._wait_for_index_update(table_name, index_name)
-            _LOG.info(
-                'Removed global secondary index {0} for table {1}'.format(
-                    index_name, table_name))
-
-        for gsi in global_indexes_to_create:
-            read_capacity = \
-                gsi.get('read_capacity') or table_read_capacity
-            write_capacity = \
-                gsi.get('write_capacity') or table_write_capacity
-            self.create_global_secondary_index(
-                table_name=table_name, index_meta=gsi,
-                existing_capacity_mode=existing_capacity_mode,
-                read_throughput=read_capacity, write_throughput=write_capacity
-            )
-            self._wait_for_index_update(table_name, gsi.get('name'))
-            _LOG.info(
-                'Created global secondary index {0} for table {1}'.format(
-                    gsi.get('name'), table_name))
-
-    def _wait_for_table_update(self, table_name, sleep_amount=20,
-                               max_attempts=25):
-        """ Waits for table to go into ACTIVE state.
-
-        :param table_name: DynamoDB table name
-        :type table_name: str
-        :param sleep_amount: time in seconds to wait for the next attempt
-        :type sleep_amount: int
-        :param max_attempts: maximum attempts to ping the table
-        :type max_attempts: int
-        :returns None
-        """
-        table = self.get_table_by_name(table_name)
-        table.wait_until_exists(
-            WaiterConfig={
-                'Delay': sleep_amount,
-                'MaxAttempts': max_attempts
-            }
+        # the capacity is left as is, so only the index steps are planned
+        plan = self.plan_table_update(
+            table_name=table_name,
+            billing_mode=existing_capacity_mode,
+            read_capacity=None,
+            write_capacity=None,
+            existing_billing_mode=existing_capacity_mode,
+            existing_provisioned_throughput={},
+            existing_on_demand_throughput={},
+            existing_global_indexes=existing_global_indexes,
+            global_indexes_meta=global_indexes_meta,
+            table_read_capacity=table_read_capacity,
+            table_write_capacity=table_write_capacity
         )
+        self.apply_table_update_plan(table_name, plan)
 
-    def _wait_for_index_update(self, table_name, index_name, sleep_amount=20,
-                               max_attempts=25):
-        """ Waits for global secondary index
-        to be able to continue table update.
+    def _wait_for_table_update(self, table_name,
+                               timeout=TABLE_UPDATE_TIMEOUT_SEC):
+        """ Waits for table and its indexes to go into ACTIVE state.
 
         :param table_name: DynamoDB table name
         :type table_name: str
-        :param index_name: name of the global index to wait for
-        :type index_name: str
-        :param sleep_amount: time in seconds to wait for the next attempt
-        :type sleep_amount: int
-        :param max_attempts: maximum attempts to ping the table
-        :type max_attempts: int
-        :returns None
+        :param timeout: time in seconds to wait for
+        :type timeout: int
+        :returns table description as dict
         """
-        num_attempts = 0
-        while True:
-            num_attempts += 1
-            table = self.describe_table(table_name)
-            indexes = table.get('GlobalSecondaryIndexes', [])
-            index = next(
-                (idx for idx in indexes if idx['IndexName'] == index_name),
-                None
-            )
-            # there is no index which means it was successfully deleted or
-            # the index is in backfilling state which allows
-            # to continue table update
-            if index is None or index.get('Backfilling'):
-                return
-            if num_attempts >= max_attempts:
-                raise ResourceProcessingError('Max attempts exceeded')
-            time.sleep(sleep_amount)
+        return self.tables_watcher.watch_table(
+            table_name, _table_is_active, timeout).result()
 
     def delete_global_secondary_index(self, table_name, index_name):
         """ Deletes global secondary index from the specified table.
@@ -516,130 +793,18 @@ class DynamoConnection(object):
         :returns update_table response as boto3.DynamoDB.Table object or None
             if there were no changes made
         """
-        params = {}
-
-        global_secondary_indexes_updates = []
-
-        if billing_mode != existing_billing_mode:
-            if billing_mode == 'PROVISIONED':
-                params['ProvisionedThroughput'] = dict(
-                    ReadCapacityUnits=read_capacity or DEFAULT_READ_CAPACITY,
-                    WriteCapacityUnits=write_capacity or DEFAULT_WRITE_CAPACITY
-                )
-
-                for gsi in existing_global_indexes:
-                    ind_rcu = gsi.get('read_capacity')
-                    ind_wcu = gsi.get('write_capacity')
-                    global_secondary_indexes_updates.append({
-                        'Update': {
-                            'IndexName': gsi.get('IndexName'),
-                            'ProvisionedThroughput': dict(
-                                ReadCapacityUnits=
-                                ind_rcu or read_capacity or
-                                DEFAULT_GI_READ_CAPACITY,
-                                WriteCapacityUnits=
-                                ind_wcu or write_capacity or
-                                DEFAULT_GI_WRITE_CAPACITY
-                            )
-                        }
-                    })
-            else:
-                params['OnDemandThroughput'] = dict(
-                    MaxReadRequestUnits=
-                    read_capacity or UNLIMITED_REQUEST_UNIT,
-                    MaxWriteRequestUnits=
-                    write_capacity or UNLIMITED_REQUEST_UNIT
-                )
-
-                for gsi in existing_global_indexes:
-                    ind_rcu = gsi.get('read_capacity')
-                    ind_wcu = gsi.get('write_capacity')
-                    global_secondary_indexes_updates.append({
-                        'Update': {
-                            'IndexName': gsi.get('IndexName'),
-                            'OnDemandThroughput': dict(
-                                MaxReadRequestUnits=
-                                ind_rcu or read_capacity or
-                                UNLIMITED_REQUEST_UNIT,
-                                MaxWriteRequestUnits=
-                                ind_wcu or write_capacity or
-                                UNLIMITED_REQUEST_UNIT
-                            )
-                        }
-                    })
-        else:
-            if billing_mode == 'PROVISIONED':
-                if (read_capacity !=
-                        existing_provisioned_throughput['ReadCapacityUnits']
-                        or write_capacity !=
-                        existing_provisioned_throughput['WriteCapacityUnits']):
-                    params['ProvisionedThroughput'] = dict(
-                        ReadCapacityUnits=
-                        read_capacity or DEFAULT_READ_CAPACITY,
-                        WriteCapacityUnits=
-                        write_capacity or DEFAULT_WRITE_CAPACITY)
-
-                    for gsi in existing_global_indexes:
-                        ind_rcu = gsi.get('read_capacity')
-                        ind_wcu = gsi.get('write_capacity')
-                        global_secondary_indexes_updates.append({
-                            'Update': {
-                                'IndexName': gsi.get('IndexName'),
-                                'ProvisionedThroughput': dict(
-                                    ReadCapacityUnits=
-                                    ind_rcu or read_capacity or
-                                    DEFAULT_GI_READ_CAPACITY,
-                                    WriteCapacityUnits=
-                                    ind_wcu or write_capacity or
-                                    DEFAULT_GI_WRITE_CAPACITY
-                                )
-                            }
-                        })
-            else:
-                if (read_capacity !=
-                        existing_on_demand_throughput['MaxReadRequestUnits']
-                        or write_capacity !=
-                        existing_on_demand_throughput['MaxWriteRequestUnits']):
-                    params['OnDemandThroughput'] = dict(
-                        MaxReadRequestUnits=
-                        read_capacity or UNLIMITED_REQUEST_UNIT,
-                        MaxWriteRequestUnits=
-                        write_capacity or UNLIMITED_REQUEST_UNIT
-                    )
-
-                    for gsi in existing_global_indexes:
-                        ind_rcu = gsi.get('read_capacity')
-                        ind_wcu = gsi.get('write_capacity')
-                        global_secondary_indexes_updates.append({
-                            'Update': {
-                                'IndexName': gsi.get('IndexName'),
-                                'OnDemandThroughput': dict(
-                                    MaxReadRequestUnits=
-                                    ind_rcu or read_capacity or
-                                    UNLIMITED_REQUEST_UNIT,
-                                    MaxWriteRequestUnits=
-                                    ind_wcu or write_capacity or
-                                    UNLIMITED_REQUEST_UNIT
-                                )
-                            }
-                        })
-
-        if global_secondary_indexes_updates:
-            params['GlobalSecondaryIndexUpdates'] = \
-                global_secondary_indexes_updates
-
-        if params:
-            params.update(TableName=table_name,
-                          BillingMode=billing_mode)
-            _LOG.debug(f'Updating {table_name} table capacity. Table capacity '
-                       f'mode: {billing_mode}, meta read/write '
-                       f'capacities: {read_capacity}/{write_capacity}. '
-                       f'Update params: {params}')
-            self.client.update_table(**params)
-            if wait:
-                self._wait_for_table_update(table_name=table_name,
-                                            sleep_amount=30,
-                                            max_attempts=50)
+        plan = self.plan_table_update(
+            table_name=table_name,
+            billing_mode=billing_mode,
+            read_capacity=read_capacity,
+            write_capacity=write_capacity,
+            existing_billing_mode=existing_billing_mode,
+            existing_provisioned_throughput=existing_provisioned_throughput,
+            existing_on_demand_throughput=existing_on_demand_throughput,
+            existing_global_indexes=existing_global_indexes
+        )
+        if plan:
+            self.apply_table_update_plan(table_name, plan, wait=wait)
             return self.get_table_by_name(table_name)
 
     def get_table_by_name(self, table_name):
@@ -703,17 +868,49 @@ class DynamoConnection(object):
         :type items: list
         """
         if items:
-            table = self.conn.Table(table_name)
-            with table.batch_writer() as batch:
-                for each in items:
-                    if isinstance(each, dict):
-                        batch.put_item(Item=each)
+            self._batch_write(table_name, [
+                {'PutRequest': {'Item': each}} for each in items
+                if isinstance(each, dict)
+            ])
+
+    def _batch_write(self, table_name, requests):
+        """ Sends write requests in chunks of 25 items and re-sends only
+        the unprocessed ones with exponential backoff.
+
+        :type table_name: str
+        :type requests: list of PutRequest/DeleteRequest dicts
+        """
+        for i in range(0, len(requests), BATCH_WRITE_MAX_ITEMS):
+            request_items = {
+                table_name: requests[i:i + BATCH_WRITE_MAX_ITEMS]
+            }
+            attempt = 0
+            while request_items:
+                response = self.conn.batch_write_item(
+                    RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if request_items:
+                    request_items = _wait_before_unprocessed_retry(
+                        table_name, request_items, attempt)
+                    attempt += 1
 
     def items_batch_get(self, table_name, hash_key_name, hash_keys_values,
                         sort_key_name=None, sort_key_value=None):
+        """ Get items by the hash keys values. Keys are requested in chunks
+        of 100 and only the unprocessed keys are requested again with
+        exponential backoff.
+
+        :type table_name: str
+        :type hash_key_name: str
+        :type hash_keys_values: list
+        :type sort_key_name: str
+        :param sort_key_value: value of the sort key for all the items
+        :return: list of items
+        """
         if hash_keys_values:
             hash_values_list = list()
-            for hash_value in hash_keys_values:
+            # batch get rejects a request with duplicated keys
+            for hash_value in dict.fromkeys(hash_keys_values):
                 if sort_key_name and sort_key_value:
                     key = {
                         hash_key_name: hash_value,
@@ -725,23 +922,20 @@ class DynamoConnection(object):
                     }
                 hash_values_list.append(key)
             results = []
-            response = self.conn.batch_get_item(
-                RequestItems={
-                    table_name: {
-                        'Keys': hash_values_list
-                    }
-                }
-            )
-            results.extend(response['Responses'][table_name])
-            while response['UnprocessedKeys']:
-                response = self.conn.batch_get_item(
-                    RequestItems={
-                        table_name: {
-                            'Keys': hash_values_list
-                        }
-                    }
-                )
-                results.extend(response['Responses'][table_name])
+            for i in range(0, len(hash_values_list), BATCH_GET_MAX_KEYS):
+                keys_chunk = hash_values_list[i:i + BATCH_GET_MAX_KEYS]
+                request_items = {table_name: {'Keys': keys_chunk}}
+                attempt = 0
+                while request_items:
+                    response = self.conn.batch_get_item(
+                        RequestItems=request_items)
+                    results.extend(
+                        response.get('Responses', {}).get(table_name, []))
+                    request_items = response.get('UnprocessedKeys')
+                    if request_items:
+                        request_items = _wait_before_unprocessed_retry(
+                            table_name, request_items, attempt)
+                        attempt += 1
             return results
 
     def get_item(self, table_name, hash_key_name, hash_key_value,
@@ -764,7 +958,8 @@ class DynamoConnection(object):
             return result['Item']
 
     def scan(self, table_name=None, table=None, token=None,
-             filter_expr=None, limit=None, attr_to_select='ALL_ATTRIBUTES'):
+             filter_expr=None, limit=None, attr_to_select='ALL_ATTRIBUTES',
+             segment=None, total_segments=None, consistent_read=True):
         """ DynamoDB table scan with consistent read and custom retry.
 
         :type table_name: str
@@ -773,6 +968,10 @@ class DynamoConnection(object):
         :type filter_expr: Attr
         :type limit: int
         :type attr_to_select: str
+        :type segment: int
+        :param total_segments: number of segments of a parallel scan,
+            `segment` is the one to scan with the current request
+        :type consistent_read: bool
         """
         if table and table_name:
             raise ParameterError("'table' OR 'table_name' must be set.")
@@ -783,40 +982,114 @@ class DynamoConnection(object):
         else:
             raise ParameterError("'table' or 'table_name' must be set.")
 
-        params = {'ConsistentRead': True, 'Select': attr_to_select}
+        params = {'ConsistentRead': consistent_read, 'Select': attr_to_select}
         if token:
             params['ExclusiveStartKey'] = token
         if filter_expr:
             params['FilterExpression'] = filter_expr
         if limit:
             params['Limit'] = limit
+        if total_segments and total_segments > 1:
+            params['Segment'] = segment
+            params['TotalSegments'] = total_segments
 
         return table.scan(**params)
 
-    def get_all_items(self, table_name, filter_expr=None):
+    def iter_items(self, table_name, filter_expr=None, limit=None,
+                   total_segments=DEFAULT_SCAN_TOTAL_SEGMENTS,
+                   consistent_read=True):
+        """ Streams all items of the table. With `total_segments` greater
+        than 1 the segments are scanned in parallel, pages are yielded in
+        the order they are received, so the items order is not stable.
+
+        :type table_name: str
+        :type filter_expr: Attr
+        :param limit: max number of items evaluated by a single request
+        :type total_segments: int
+        :type consistent_read: bool
+        :return: generator of items
+        """
+        table = self.get_table_by_name(table_name)
+        scan_params = dict(table=table, filter_expr=filter_expr, limit=limit,
+                           consistent_read=consistent_read)
+        if not total_segments or total_segments <= 1:
+            for page in self._scan_segment_pages(**scan_params):
+                yield from page
+            return
+
+        pages = Queue(maxsize=total_segments * SCAN_PREFETCH_PAGES)
+        stop_event = Event()
+
+        def scan_segment(segment):
+            try:
+                for page in self._scan_segment_pages(
+                        segment=segment, total_segments=total_segments,
+                        **scan_params):
+                    while not stop_event.is_set():
+                        try:
+                            pages.put(page, timeout=0.1)
+                            break
+                        except Full:
+                            continue
+                    if stop_event.is_set():
+                        return
+            finally:
+                pages.put(_SEGMENT_DONE)
+
+        executor = ThreadPoolExecutor(max_workers=total_segments)
+        futures = [executor.submit(scan_segment, segment)
+                   for segment in range(total_segments)]
+        try:
+            segments_done = 0
+            while segments_done < total_segments:
+                page = pages.get()
+                if page is _SEGMENT_DONE:
+                    segments_done += 1
+                    continue
+                yield from page
+            for future in futures:
+                future.result()  # re-raises a segment scan error
+        finally:
+            stop_event.set()
+            # unblock the segments waiting for the queue space
+            while any(not future.done() for future in futures):
+                try:
+                    pages.get(timeout=0.1)
+                except Empty:
+                    pass
+            executor.shutdown(wait=True)
+
+    def _scan_segment_pages(self, table, filter_expr=None, limit=None,
+                            segment=None, total_segments=None,
+                            consistent_read=True):
+        token = None
+        while True:
+            response = self.scan(table=table, token=token, limit=limit,
+                                 filter_expr=filter_expr, segment=segment,
+                                 total_segments=total_segments,
+                                 consistent_read=consistent_read)
+            yield response.get('Items', [])
+            token = response.get('LastEvaluatedKey')
+            if not token:
+                return
+
+    def get_all_items(self, table_name, filter_expr=None,
+                      total_segments=DEFAULT_SCAN_TOTAL_SEGMENTS):
         """ Get all items from table.
 
         :type table_name: str
         :type filter_expr: Attr
+        :type total_segments: int
         :return list(if items exist)
         """
-        table = self.get_table_by_name(table_name)
-        response = self.scan(table=table, filter_expr=filter_expr)
-        do_continue = response.get('LastEvaluatedKey')
-        items = []
-        if 'Items' in response:
-            items.extend(response['Items'])
-        while do_continue:
-            response = self.scan(table=table, token=do_continue,
-                                 filter_expr=filter_expr)
-            do_continue = response.get('LastEvaluatedKey')
-            if 'Items' in response:
-                items.extend(response['Items'])
-        return items
+        return list(self.iter_items(table_name, filter_expr=filter_expr,
+                                    total_segments=total_segments))
 
     def _scan_all(self, table_name, func, limit=None, filter_expr=None, *args,
                   **kwargs):
-        """ Calls a function for each item in the table.
+        """ Calls a function for each item in the table. The function is
+        called in the current thread, while the segments are scanned in
+        parallel.
 
         :type table_name: str
         :param func: Function to call for each item.
@@ -825,19 +1098,9 @@ class DynamoConnection(object):
         :param args: any args the function takes after the item
         :param kwargs: any kwargs the func takes after the item and args
         """
-        table = self.get_table_by_name(table_name)
-        response = self.scan(table=table, filter_expr=filter_expr, limit=limit)
-        do_continue = response.get('LastEvaluatedKey')
-        if 'Items' in response:
-            for each in response['Items']:
-                func(each, *args, **kwargs)
-        while do_continue:
-            response = self.scan(table=table, token=do_continue, limit=limit,
-                                 filter_expr=filter_expr)
-            do_continue = response.get('LastEvaluatedKey')
-            if 'Items' in response:
-                for each in response['Items']:
-                    func(each, *args, **kwargs)
+        for each in self.iter_items(table_name, filter_expr=filter_expr,
+                                    limit=limit):
+            func(each, *args, **kwargs)
 
     def for_each_item(self, table_name, func, *args, **kwargs):
         """ Go through all items in table and perform func.
@@ -862,25 +1125,10 @@ class DynamoConnection(object):
         :param args: any args the function takes after the item
         :param kwargs: any kwargs the func takes after the item and args
         """
-        table = self.get_table_by_name(table_name)
         start = start_interval
-        count = 0
         while start < end_interval:
-            response = self.scan(table=table,
-                                 filter_expr=Attr('d').eq(start))
-            do_continue = response.get('LastEvaluatedKey')
-            if 'Items' in response:
-                for each in response['Items']:
-                    count += 1
-                    func(each, *args, **kwargs)
-            while do_continue:
-                response = self.scan(table=table, token=do_continue,
-                                     filter_expr=Attr('d').eq(start))
-                do_continue = response.get('LastEvaluatedKey')
-                if 'Items' in response:
-                    for each in response['Items']:
-                        count += 1
-                        func(each, *args, **kwargs)
+            self._scan_all(table_name, func, None, Attr('d').eq(start),
+                           *args, **kwargs)
             start += interval_time
 
     def get_items_with_attribute_contains(self, table_name, attr_name, val):
@@ -903,20 +1151,7 @@ class DynamoConnection(object):
         :param attr_value: attr value in table
         :return: list(if items exist)
         """
-        table = self.get_table_by_name(table_name)
-        result = []
-        response = self.scan(table=table,
-                             filter_expr=Attr(attr_name).eq(attr_value))
-        do_continue = response.get('LastEvaluatedKey')
-        if 'Items' in response:
-            result.extend(response['Items'])
-        while do_continue:
-            response = self.scan(table=table, token=do_continue,
-                                 filter_expr=Attr(attr_name).eq(attr_value))
-            do_continue = response.get('LastEvaluatedKey')
-            if 'Items' in response:
-                result.extend(response['Items'])
-        return result
+        return self.get_all_items(table_name, Attr(attr_name).eq(attr_value))
 
     def get_items_with_attr_between(self, table_name, attr_name,
                                     start, end):
@@ -979,33 +1214,40 @@ class DynamoConnection(object):
                           ExpressionAttributeValues=expr_values)
 
     def remove_specified_tables(self, table_names):
-        """ Only 10 tables can be created, updated or deleted simultaneously.
+        """ Removes the tables keeping at most
+        MAX_CONCURRENT_TABLE_OPERATIONS of them being deleted simultaneously.
 
         :type table_names: list of strings
         """
-        waiters = {}
-        start = 0
-        end = 9
-        while start < table_names:
-            for name in table_names[:9]:
-                table = self.get_table_by_name(name)
-                waiters[table.name] = table.meta.client.get_waiter(
-                    'table_not_exists')
-                table.delete()
-            for table_name in waiters:
-                waiters[table_name].wait(TableName=table_name)
-
-            start = end
-            end += 9
-
-    def table_exists(self, table_name):
-        """ Check if table exists.
+        _, exceptions = self.remove_tables_by_names(table_names)
+        if exceptions:
+            raise ResourceProcessingError('; '.join(exceptions))
+
+    def table_exists(self, table_name, use_cache=True):
+        """ Check if table exists with a single DescribeTable request.
 
         :type table_name: str
+        :param use_cache: whether the result of the previous check in this
+            run can be used
         :return boolean
         """
-        if table_name in self.get_tables_list():
-            return True
+        cache_key = self._table_cache_key(table_name)
+        if use_cache:
+            exists = TABLES_EXISTENCE_CACHE.get(cache_key)
+            if exists is not None:
+                return exists
+        try:
+            self.client.describe_table(TableName=table_name)
+            exists = True
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                raise e
+            exists = False
+        TABLES_EXISTENCE_CACHE.set(cache_key, exists)
+        return exists
+
+    def _table_cache_key(self, table_name):
+        return *self._cache_key_prefix, table_name
 
     def get_table_stream_arn(self, table_name):
         """ Get table stream arn.
@@ -1045,59 +1287,88 @@ class DynamoConnection(object):
         table.delete_item(Key=key)
 
     def batch_remove_items(self, table_name, keys):
-        table = self.get_table_by_name(table_name)
-        with table.batch_writer() as batch:
-            for key in keys:
-                batch.delete_item(Key=key)
+        self._batch_write(table_name, [
+            {'DeleteRequest': {'Key': key}} for key in keys
+        ])
 
     def remove_table(self, table_name):
         """ Remove table and wait until AWS will perform operation.
 
         :type table_name: str
         """
-        table = self.get_table_by_name(table_name)
+        self.start_table_removal(table_name).result()
+
+    def start_table_removal(self, table_name):
+        """ Requests the table removal, the tables watcher thread waits
+        until the table is removed.
+
+        :type table_name: str
+        :returns Future resolved when the table does not exist
+        """
+        cache_key = self._table_cache_key(table_name)
+        TABLES_EXISTENCE_CACHE.forget(cache_key)
         try:
-            waiter = table.meta.client.get_waiter('table_not_exists')
-            table.delete()
-            waiter.wait(TableName=table_name)
+            self.client.delete_table(TableName=table_name)
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                _LOG.warn('Table %s is not found', table.name)
-            else:
-                raise e
-
-    def remove_tables_by_names(self, table_names, log_not_found_error=True):
+                _LOG.warn('Table %s is not found', table_name)
+                TABLES_EXISTENCE_CACHE.set(cache_key, False)
+                removed = Future()
+                removed.set_result(None)
+                return removed
+            raise e
+
+        def on_removed(future):
+            if future.exception() is None:
+                TABLES_EXISTENCE_CACHE.set(cache_key, False)
+
+        removed = self.tables_watcher.watch_table(
+            table_name, None, TABLE_DELETE_TIMEOUT_SEC)
+        removed.add_done_callback(on_removed)
+        return removed
+
+    def remove_tables_by_names(self, table_names, log_not_found_error=True,
+                               max_in_progress=MAX_CONCURRENT_TABLE_OPERATIONS):
         """ Remove tables by names. AWS restricts simultaneous amount of
-        tables, so after 10 requests sent we're waiting when operations finish
-        and then continue.
+        tables, so the next table is deleted as soon as one of the
+        `max_in_progress` tables being deleted is removed. The removals are
+        awaited by the tables watcher thread.
 
         :type table_names: list
         :type log_not_found_error: boolean, parameter is needed for proper log
         handling in the retry decorator
+        :type max_in_progress: int
+        :returns tuple of the removed tables names and errors
         """
         removed_tables = []
         exceptions = []
-        waiters = {}
-        count = 0
-        while count < len(table_names):
-            tables_to_remove = table_names[count: count + 9]
-            for name in tables_to_remove:
-                table = self.get_table_by_name(name)
-                waiters[table.name] = table.meta.client.get_waiter(
-                    'table_not_exists')
+        pending = list(table_names)
+        in_progress = {}
+        while pending or in_progress:
+            while pending and len(in_progress) < max_in_progress:
+                name = pending.pop(0)
+                try:
+                    in_progress[self.start_table_removal(name)] = \
+                        name, time.monotonic()
+                except ClientError as e:
+                    exceptions.append(str(e))
+            if not in_progress:
+                continue
+            done, _ = wait_futures(in_progress,
+                                   return_when=FIRST_COMPLETED)
+            for future in done:
+                name, started_at = in_progress.pop(future)
                 try:
-                    table.delete()
-                    removed_tables.append(name)
+                    future.result()
                 except ClientError as e:
-                    exception_type = e.response['Error']['Code']
-                    if exception_type == 'ResourceNotFoundException':
-                        _LOG.warn('Table %s is not found', table.name)
-                        removed_tables.append(name)
-                    else:
-                        exceptions.append(str(e))
-            count += 9
-            for table_name in waiters:
-                waiters[table_name].wait(TableName=table_name)
+                    exceptions.append(str(e))
+                    continue
+                except ResourceProcessingError as e:
+                    exceptions.append(f'{name}: {e}')
+                    continue
+                _LOG.info(f"Table '{name}' removed in "
+                          f"{time.monotonic() - started_at:.1f}s")
+                removed_tables.append(name)
         return removed_tables, exceptions
 
     def _query(self, table_name=None, table=None, key_expr=None, token=None,
@@ -13,13 +13,19 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+import random
+import threading
 import traceback
+from collections import namedtuple, Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
 from functools import wraps
-from time import sleep
+from time import sleep, monotonic
 
 from botocore.exceptions import ClientError
 
-from syndicate.exceptions import ResourceProcessingError
+from syndicate.exceptions import ResourceProcessingError, \
+    ResourceProcessingTimeoutError, ResourceNotFoundError
 from syndicate.commons.log_helper import get_logger
 
 _LOG = get_logger(__name__)
@@ -29,6 +35,420 @@ LOG_NOT_FOUND_ERROR = 'log_not_found_error'
 DEFAULT_RETRY_TIMEOUT_SEC = 35
 DEFAULT_RETRY_TIMEOUT_STEP = 3
 
+DEFAULT_BACKOFF_BASE_SEC = 0.05
+DEFAULT_BACKOFF_CAP_SEC = 20
+
+DEFAULT_POLL_INTERVAL_SEC = 5
+DEFAULT_POLL_MAX_INTERVAL_SEC = 30
+DEFAULT_POLL_BACKOFF_FACTOR = 1.5
+DEFAULT_POLL_JITTER = 0.2
+
+PollResult = namedtuple('PollResult', ('value', 'done', 'calls', 'elapsed'))
+
+
+def backoff_delay(attempt, base=DEFAULT_BACKOFF_BASE_SEC,
+                  cap=DEFAULT_BACKOFF_CAP_SEC, jitter=True):
+    """ Returns the delay before the given retry attempt: exponential
+    backoff capped by `cap` with full jitter.
+
+    :param attempt: number of the attempt, starting from 0
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return random.uniform(0, delay) if jitter else delay
+
+
+class RateLimiter:
+    """ Token bucket shared by the threads that call the same API.
+
+    :param rate: number of requests per second
+    :param burst: number of requests that can be made at once after idle
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._updated_at = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """ Takes a token, waits for it if the bucket is empty """
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            # the token is reserved, so the waiting threads are served in
+            # the order they came
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+        if delay:
+            sleep(delay)
+
+    def register(self, boto_client):
+        """ Limits every request the client sends, including the retries
+        """
+        boto_client.meta.events.register(
+            f'before-send.{boto_client.meta.service_model.service_name}',
+            self._before_send, unique_id=f'syndicate-rate-limit-{id(self)}')
+
+    def _before_send(self, **kwargs):
+        self.acquire()
+
+
+class Poller:
+    """ Calls a function until its result is done or the deadline passes.
+    The interval between the calls starts with `interval`, grows by
+    `backoff` up to `max_interval` and is randomized by `jitter` share.
+
+    :param timeout: seconds from the start after which the polling stops,
+        None to poll until done
+    :param rate_limiter: RateLimiter shared by the pollers of the same API
+    :param clock: function returning the current time in seconds
+    :param sleep: function sleeping for the given number of seconds
+    """
+
+    def __init__(self, interval=DEFAULT_POLL_INTERVAL_SEC,
+                 max_interval=DEFAULT_POLL_MAX_INTERVAL_SEC,
+                 backoff=DEFAULT_POLL_BACKOFF_FACTOR,
+                 jitter=DEFAULT_POLL_JITTER, timeout=None,
+                 rate_limiter=None, clock=monotonic, sleep=sleep):
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self._clock = clock
+        self._sleep = sleep
+        # totals of all the polls made by the poller
+        self.calls = 0
+        self.elapsed = 0
+
+    def poll(self, func, is_done):
+        """ Calls `func` until `is_done` returns True for its result.
+
+        :returns PollResult with the last result, whether it is done, the
+            number of calls and the seconds spent
+        """
+        started_at = self._clock()
+        deadline = started_at + self.timeout \
+            if self.timeout is not None else None
+        interval = self.interval
+        calls = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            value = func()
+            calls += 1
+            done = bool(is_done(value))
+            now = self._clock()
+            if done or (deadline is not None and now >= deadline):
+                break
+            delay = interval * (
+                1 + random.uniform(-self.jitter, self.jitter))
+            if deadline is not None:
+                delay = min(delay, deadline - now)
+            self._sleep(delay)
+            interval = min(self.max_interval, interval * self.backoff)
+        elapsed = self._clock() - started_at
+        self.calls += calls
+        self.elapsed += elapsed
+        return PollResult(value=value, done=done, calls=calls,
+                          elapsed=elapsed)
+
+
+class _Watch:
+    """ Resources one caller is waiting for """
+
+    def __init__(self, ids, check, deadline, timeout):
+        self.ids = ids
+        self.check = check
+        self.deadline = deadline
+        self.timeout = timeout
+        self.future = Future()
+
+
+class StatusWatcher:
+    """ Tracks the statuses of the resources of one kind the callers are
+    waiting for. All the watched resources are described by one poller
+    thread, which is started with the first watch and stops when nothing is
+    watched, so neither the number of the requests nor the number of the
+    blocked threads grows with the number of the resources being
+    provisioned. Every watch is resolved as soon as its own resources are
+    ready.
+
+    The subclasses implement `_describe` and `_status`.
+
+    :param interval: seconds between the polls
+    :param max_interval: the interval grows by `backoff` up to it while
+        no resources are added
+    :param clock: function returning the current time in seconds
+    :param sleep: function sleeping for the given number of seconds
+    """
+    kind = 'resource'
+
+    def __init__(self, interval=DEFAULT_POLL_INTERVAL_SEC, max_interval=None,
+                 backoff=1, clock=monotonic, sleep=sleep):
+        self.interval = interval
+        self.max_interval = max(interval, max_interval or interval)
+        self.backoff = backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._watches = []
+        self._waited = Counter()
+        self._delay = interval
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _describe(self, ids):
+        """ :returns dict of the ids to the descriptions of the found
+        resources """
+        raise NotImplementedError()
+
+    def _status(self, description):
+        raise NotImplementedError()
+
+    def _failure_reason(self, description):
+        return self._status(description)
+
+    def wait(self, ids, ready_statuses, failed_statuses=(), timeout=None):
+        """ Waits until all the resources are in one of `ready_statuses`.
+
+        :raises ResourceProcessingError if a resource is in one of
+            `failed_statuses`
+        :raises ResourceNotFoundError if a resource is not returned by the
+            poll made after the wait started
+        :returns dict of the ids to the descriptions of the resources
+        """
+        return self.watch(ids, ready_statuses, failed_statuses,
+                          timeout).result()
+
+    def watch(self, ids, ready_statuses, failed_statuses=(), timeout=None):
+        """ The same as `wait`, but does not block the calling thread.
+
+        :returns Future resolved by the poller thread
+        """
+        ids = set(ids)
+
+        def check(descriptions):
+            missing = ids.difference(descriptions)
+            if missing:
+                raise ResourceNotFoundError(
+                    f'The {self.kind}s {sorted(missing)} are not found')
+            failed = [_id for _id in ids if self._status(
+                descriptions[_id]) in failed_statuses]
+            if failed:
+                raise ResourceProcessingError('; '.join(
+                    f"The {self.kind} '{_id}' failed: "
+                    f"{self._failure_reason(descriptions[_id])}"
+                    for _id in sorted(failed)))
+            return all(self._status(descriptions[_id]) in ready_statuses
+                       for _id in ids)
+
+        return self._watch(ids, check, timeout)
+
+    def _watch(self, ids, check, timeout=None):
+        """ Watches the resources until `check` returns True for their
+        descriptions. `check` is called by the poller thread after every
+        poll made after the watch started, the resources which are not
+        found are absent from the descriptions.
+
+        :returns Future of the dict of the ids to the descriptions
+        """
+        deadline = self._clock() + timeout if timeout is not None else None
+        watch = _Watch(set(ids), check, deadline, timeout)
+        with self._lock:
+            self._watches.append(watch)
+            self._waited.update(watch.ids)
+            # the resources were just changed, so they are polled more
+            # often again
+            self._delay = self.interval
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True,
+                    name=f'{self.kind} watcher')
+                self._thread.start()
+        return watch.future
+
+    def _run(self):
+        while True:
+            with self._lock:
+                watches = list(self._watches)
+                ids = sorted(self._waited)
+            try:
+                found, error = self._describe(ids), None
+            except Exception as e:
+                found, error = {}, e
+            statuses = {_id: self._status(desc) for _id, desc in found.items()}
+            _LOG.debug(f'Polled {self.kind}s statuses: {statuses}')
+            now = self._clock()
+            resolved = []
+            with self._lock:
+                for watch in watches:
+                    outcome = self._resolve(watch, found, error, now)
+                    if outcome is not None:
+                        self._watches.remove(watch)
+                        self._waited.subtract(watch.ids)
+                        resolved.append((watch.future, outcome))
+                self._waited += Counter()  # drops the zero counts
+                if not self._watches:
+                    self._thread = None
+                delay = self._delay
+                self._delay = min(self.max_interval, delay * self.backoff)
+                deadlines = [watch.deadline for watch in self._watches
+                             if watch.deadline is not None]
+                stopped = self._thread is None
+            # the futures callbacks may start new watches
+            for future, (result, exception) in resolved:
+                if exception is not None:
+                    future.set_exception(exception)
+                else:
+                    future.set_result(result)
+            if stopped:
+                return
+            if deadlines:
+                delay = min(delay, max(0, min(deadlines) - now))
+            self._sleep(delay)
+
+    def _resolve(self, watch, found, error, now):
+        """ :returns tuple of the result and the exception of the watch or
+        None if it is still pending """
+        if error is not None:
+            return None, error
+        descriptions = {_id: found[_id] for _id in watch.ids if _id in found}
+        try:
+            if watch.check(descriptions):
+                return descriptions, None
+        except Exception as e:
+            return None, e
+        if watch.deadline is not None and now >= watch.deadline:
+            return None, ResourceProcessingTimeoutError(
+                f'The {self.kind}s {sorted(watch.ids)} are not ready in '
+                f'{watch.timeout}s')
+        return None
+
+
+def resolved(result=None):
+    """ :returns done Future with the given result """
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def then(future, func):
+    """ :returns Future of `func` applied to the result of `future` """
+    result = Future()
+
+    def on_done(_):
+        if future.exception() is not None:
+            result.set_exception(future.exception())
+            return
+        try:
+            result.set_result(func(future.result()))
+        except Exception as e:
+            result.set_exception(e)
+
+    future.add_done_callback(on_done)
+    return result
+
+
+def gather(futures):
+    """ :returns Future of the list of the results of `futures`, which fails
+    with the first of their exceptions when all of them are done """
+    futures = list(futures)
+    gathered = Future()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        exception = next((future.exception() for future in futures
+                          if future.exception() is not None), None)
+        if exception is not None:
+            gathered.set_exception(exception)
+        else:
+            gathered.set_result([future.result() for future in futures])
+
+    if not futures:
+        gathered.set_result([])
+    for future in futures:
+        future.add_done_callback(on_done)
+    return gathered
+
+
+class ConcurrencyBudget:
+    """ Limits the total number of the threads doing the same kind of I/O
+    across all the pools. Every operation reserves as many units as
+    threads it is going to use.
+
+    :param capacity: total number of units
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._available = capacity
+        self._condition = threading.Condition()
+
+    def acquire(self, units=1):
+        """ Waits until the units are available and takes them
+
+        :returns the number of taken units, not more than the capacity
+        """
+        units = max(1, min(units, self.capacity))
+        with self._condition:
+            self._condition.wait_for(lambda: self._available >= units)
+            self._available -= units
+        return units
+
+    def release(self, units=1):
+        with self._condition:
+            self._available += units
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, units=1):
+        units = self.acquire(units)
+        try:
+            yield units
+        finally:
+            self.release(units)
+
+
+class ExistenceCache:
+    """ Run-scoped cache of the resource existence checks shared by the
+    connections. The connection methods that create or remove a resource
+    update it, so the repeated checks of the same resource are free.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ :returns True or False if the existence is known, else None """
+        if not self.enabled:
+            return
+        with self._lock:
+            return self._states.get(key)
+
+    def set(self, key, exists):
+        with self._lock:
+            self._states[key] = exists
+
+    def forget(self, key):
+        with self._lock:
+            self._states.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
 
 def apply_methods_decorator(decorator):
     # todo after applying this decorator static methods do not work if they
@@ -21,10 +21,18 @@ from botocore.exceptions import ClientError
 
 from syndicate.exceptions import InvalidValueError
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    RateLimiter
 
 _LOG = get_logger(__name__)
 
+# IAM is a global service with the low account-wide request quotas, so all
+# the IAM connections share the same limiter
+IAM_REQUESTS_PER_SECOND = 20
+IAM_REQUESTS_BURST = 40
+IAM_RATE_LIMITER = RateLimiter(rate=IAM_REQUESTS_PER_SECOND,
+                               burst=IAM_REQUESTS_BURST)
+
 
 def get_account_role_arn(account_number):
     return "arn:aws:iam::{0}:root".format(account_number)
@@ -49,6 +57,8 @@ class IAMConnection(object):
                                  aws_access_key_id=aws_access_key_id,
                                  aws_secret_access_key=aws_secret_access_key,
                                  aws_session_token=aws_session_token)
+        IAM_RATE_LIMITER.register(self.client)
+        IAM_RATE_LIMITER.register(self.resource.meta.client)
         _LOG.debug('Opened new IAM connection.')
 
     def check_if_role_exists(self, role_name):
@@ -264,6 +274,14 @@ class IAMConnection(object):
             if each['PolicyName'] == name:
                 return each['Arn']
 
+    def get_policies_arns(self, policy_scope='All'):
+        """ Returns the map of the policies names to their arns.
+
+        :param policy_scope: 'All'|'AWS'|'Local'
+        """
+        return {policy['PolicyName']: policy['Arn']
+                for policy in self.get_policies(policy_scope)}
+
     def get_policy(self, arn):
         try:
             return self.client.get_policy(PolicyArn=arn)['Policy']
@@ -14,14 +14,24 @@
     limitations under the License.
 """
 from boto3 import client
-from botocore.exceptions import ClientError
+from botocore.exceptions import ClientError, WaiterError
 
-from syndicate.exceptions import InvalidValueError
+from syndicate.exceptions import InvalidValueError, \
+    ResourceProcessingTimeoutError
 from syndicate.commons.log_helper import get_logger
 from syndicate.connection.helper import apply_methods_decorator, retry
 
 _LOG = get_logger(__name__)
 
+ON_DEMAND_STREAM_MODE = 'ON_DEMAND'
+PROVISIONED_STREAM_MODE = 'PROVISIONED'
+STREAM_MODES = (ON_DEMAND_STREAM_MODE, PROVISIONED_STREAM_MODE)
+
+# the stream becomes active or is deleted in tens of seconds, the default
+# waiter delay of 10 seconds makes every wait longer than needed
+STREAM_WAITER_DELAY_SEC = 2
+STREAM_WAIT_TIMEOUT_SEC = 600
+
 
 def validate_shard_count(shard_count):
     if not isinstance(shard_count, int) or shard_count > 25:
@@ -32,6 +42,30 @@ def validate_shard_count(shard_count):
         )
 
 
+def shard_count_steps(shard_count, target_shard_count):
+    """ UpdateShardCount with UNIFORM_SCALING can at most double or halve
+    the number of the open shards at once.
+
+    :returns list of the shard counts to go through to reach the target
+    """
+    steps = []
+    while shard_count != target_shard_count:
+        if target_shard_count > shard_count:
+            shard_count = min(target_shard_count, shard_count * 2)
+        else:
+            shard_count = max(target_shard_count, -(-shard_count // 2))
+        steps.append(shard_count)
+    return steps
+
+
+def validate_stream_mode(stream_mode):
+    if stream_mode not in STREAM_MODES:
+        raise InvalidValueError(
+            f"Stream mode must be one of {list(STREAM_MODES)}. "
+            f"Actual value: '{stream_mode}'"
+        )
+
+
 @apply_methods_decorator(retry())
 class KinesisConnection(object):
     def __init__(self, region=None, aws_access_key_id=None,
@@ -42,11 +76,50 @@ class KinesisConnection(object):
                              aws_session_token=aws_session_token)
         _LOG.debug('Opened new Kinesis connection.')
 
-    def create_stream(self, stream_name, shard_count):
-        validate_shard_count(shard_count)
-        params = dict(StreamName=stream_name, ShardCount=shard_count)
+    def create_stream(self, stream_name, shard_count=None,
+                      stream_mode=PROVISIONED_STREAM_MODE):
+        validate_stream_mode(stream_mode)
+        params = dict(StreamName=stream_name,
+                      StreamModeDetails={'StreamMode': stream_mode})
+        if stream_mode == PROVISIONED_STREAM_MODE:
+            validate_shard_count(shard_count)
+            params['ShardCount'] = shard_count
         return self.client.create_stream(**params)
 
+    def update_shard_count(self, stream_name, shard_count):
+        validate_shard_count(shard_count)
+        return self.client.update_shard_count(
+            StreamName=stream_name, TargetShardCount=shard_count,
+            ScalingType='UNIFORM_SCALING')
+
+    def update_stream_mode(self, stream_arn, stream_mode):
+        validate_stream_mode(stream_mode)
+        return self.client.update_stream_mode(
+            StreamARN=stream_arn,
+            StreamModeDetails={'StreamMode': stream_mode})
+
+    def wait_for_stream_active(self, stream_name,
+                               timeout=STREAM_WAIT_TIMEOUT_SEC):
+        """ Waits until the stream is ACTIVE after it is created or its
+        capacity is changed """
+        self._wait('stream_exists', stream_name, timeout)
+
+    def wait_for_stream_deleted(self, stream_name,
+                                timeout=STREAM_WAIT_TIMEOUT_SEC):
+        self._wait('stream_not_exists', stream_name, timeout)
+
+    def _wait(self, waiter_name, stream_name, timeout):
+        waiter = self.client.get_waiter(waiter_name)
+        try:
+            waiter.wait(StreamName=stream_name, WaiterConfig={
+                'Delay': STREAM_WAITER_DELAY_SEC,
+                'MaxAttempts': max(1, timeout // STREAM_WAITER_DELAY_SEC)
+            })
+        except WaiterError as e:
+            raise ResourceProcessingTimeoutError(
+                f"Kinesis stream '{stream_name}' did not reach the expected "
+                f"state in {timeout}s: {e}") from e
+
     def get_stream(self, stream_name):
         try:
             return self.client.describe_stream(StreamName=stream_name)[
@@ -57,6 +130,16 @@ class KinesisConnection(object):
             else:
                 raise e
 
+    def get_stream_summary(self, stream_name):
+        try:
+            return self.client.describe_stream_summary(
+                StreamName=stream_name)['StreamDescriptionSummary']
+        except ClientError as e:
+            if 'ResourceNotFoundException' in str(e):
+                pass  # valid exception
+            else:
+                raise e
+
     def get_list_streams(self):
         result = []
         response = self.client.list_streams()
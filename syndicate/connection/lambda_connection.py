@@ -14,6 +14,7 @@
     limitations under the License.
 """
 import json
+import threading
 import uuid
 from typing import Optional, List, Tuple, Iterable
 
@@ -38,6 +39,25 @@ INVOKE_FUNCTION_STATEMENT_ID = 'InvokeFunction-Syndicate'
 INVOKE_FUNCTION_ACTION = 'lambda:InvokeFunction'
 INVOKE_FUNCTION_URL_ACTION = 'lambda:InvokeFunctionUrl'
 
+# the policy of a function is changed by one request at a time, the
+# overlapping AddPermission and RemovePermission fail with
+# ResourceConflictException: An update is in progress
+_POLICY_LOCKS = {}
+_POLICY_LOCKS_LOCK = threading.Lock()
+
+
+def _function_policy_lock(name):
+    """ :param name: the function name or arn, optionally qualified """
+    parts = name.split(':')
+    function_name = parts[6] if name.startswith('arn:') else parts[0]
+    with _POLICY_LOCKS_LOCK:
+        return _POLICY_LOCKS.setdefault(function_name, threading.Lock())
+
+
+def _is_statement_exists_error(error):
+    return error.response['Error']['Code'] == 'ResourceConflictException' \
+        and 'already exists' in error.response['Error'].get('Message', '')
+
 
 def _str_list_to_list(param, param_name):
     if isinstance(param, list):
@@ -144,10 +164,11 @@ class LambdaConnection(object):
     def remove_permissions(self, lambda_arn, permissions_sids):
         for permission_sid in permissions_sids:
             try:
-                self.client.remove_permission(
-                    FunctionName=lambda_arn,
-                    StatementId=permission_sid
-                )
+                with _function_policy_lock(lambda_arn):
+                    self.client.remove_permission(
+                        FunctionName=lambda_arn,
+                        StatementId=permission_sid
+                    )
                 _LOG.debug(f"Permissions deleted: {permission_sid},"
                            f" from lambda: {lambda_arn}")
             except self.client.exceptions.ClientError as e:
@@ -395,7 +416,10 @@ class LambdaConnection(object):
         token = response.get('NextMarker')
         mappings.extend(response.get('EventSourceMappings'))
         while token:
-            response = self.client.list_event_source_mappings(Marker=token)
+            # the marker does not keep the filter, without it the next pages
+            # list the mappings of all the functions in the account
+            response = self.client.list_event_source_mappings(
+                FunctionName=lambda_name, Marker=token)
             token = response.get('NextMarker')
             mappings.extend(response.get('EventSourceMappings'))
         return mappings
@@ -492,7 +516,8 @@ class LambdaConnection(object):
         if qualifier:
             params['Qualifier'] = qualifier
         try:
-            self.client.remove_permission(**params)
+            with _function_policy_lock(function_name):
+                self.client.remove_permission(**params)
         except ClientError as e:
             if e.response["Error"]["Code"] == 'ResourceNotFoundException' \
                     and soft:
@@ -519,6 +544,8 @@ class LambdaConnection(object):
         :type auth_type: str, NONE|AWS_IAM
         :type qualifier: str,
         :type exists_ok: bool
+        :param exists_ok: whether to return None when the permission with
+            the statement id already exists
         """
         if not statement_id:
             statement_id = str(uuid.uuid1())
@@ -535,10 +562,10 @@ class LambdaConnection(object):
         if qualifier:
             params['Qualifier'] = qualifier
         try:
-            return self.client.add_permission(**params)
+            with _function_policy_lock(name):
+                return self.client.add_permission(**params)
         except ClientError as e:
-            if e.response["Error"]["Code"] == 'ResourceConflictException' \
-                    and exists_ok:
+            if exists_ok and _is_statement_exists_error(e):
                 return None
             raise e
 
@@ -733,16 +760,18 @@ class LambdaConnection(object):
         return self.client.publish_layer_version(**kwargs)
 
     def get_lambda_layer_arn(self, name):
-        lambda_layers = self.client.list_layers()
-        for each in lambda_layers['Layers']:
-            if each['LayerName'] == name:
-                return each['LatestMatchingVersion']['LayerVersionArn']
-        while lambda_layers.get('NextMarker'):
-            lambda_layers = self.client.list_layers(
-                Marker=lambda_layers.get('NextMarker'))
-            for each in lambda_layers['Layers']:
-                if each['LayerName'] == name:
-                    return each['LatestMatchingVersion']['LayerVersionArn']
+        """ Returns the arn of the latest version of the layer """
+        try:
+            # versions are listed starting from the latest one
+            response = self.client.list_layer_versions(LayerName=name,
+                                                       MaxItems=1)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                return
+            raise e
+        versions = response.get('LayerVersions')
+        if versions:
+            return versions[0]['LayerVersionArn']
 
     def get_lambda_layer_by_arn(self, arn):
         return self.client.get_layer_version_by_arn(Arn=arn)
@@ -13,15 +13,90 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+from concurrent.futures import Future
+
 from boto3 import client
 from botocore.exceptions import ClientError
 
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    StatusWatcher, then
 from syndicate.core.helper import prettify_json
 
 _LOG = get_logger(__name__)
 
+DB_STATUS_POLL_INTERVAL_SEC = 15
+DB_CREATION_TIMEOUT_SEC = 3600
+DB_AVAILABLE_STATUS = 'available'
+DB_CLUSTER_FAILED_STATUSES = (
+    'failed', 'inaccessible-encryption-credentials',
+    'incompatible-parameters'
+)
+DB_INSTANCE_FAILED_STATUSES = (
+    'failed', 'inaccessible-encryption-credentials',
+    'incompatible-parameters', 'incompatible-network', 'incompatible-restore',
+    'storage-full'
+)
+# max number of the values of the describe request filter
+DESCRIBE_FILTER_VALUES_LIMIT = 100
+
+
+class DBClustersWatcher(StatusWatcher):
+    """ Shares the DescribeDBClusters polls between the threads waiting for
+    the DB clusters """
+    kind = 'RDS DB cluster'
+
+    def __init__(self, rds_client, interval=DB_STATUS_POLL_INTERVAL_SEC,
+                 **kwargs):
+        super().__init__(interval=interval, **kwargs)
+        self._client = rds_client
+
+    def _describe(self, ids):
+        # RDS stores the identifiers in lowercase
+        found = {}
+        paginator = self._client.get_paginator('describe_db_clusters')
+        for i in range(0, len(ids), DESCRIBE_FILTER_VALUES_LIMIT):
+            for page in paginator.paginate(Filters=[{
+                'Name': 'db-cluster-id',
+                'Values': [_id.lower() for _id in
+                           ids[i:i + DESCRIBE_FILTER_VALUES_LIMIT]]
+            }]):
+                for cluster in page['DBClusters']:
+                    found[cluster['DBClusterIdentifier'].lower()] = cluster
+        return found
+
+    def _status(self, description):
+        return description['Status']
+
+
+class DBInstancesWatcher(StatusWatcher):
+    """ Shares the DescribeDBInstances polls between the threads waiting for
+    the DB instances """
+    kind = 'RDS DB instance'
+
+    def __init__(self, rds_client, interval=DB_STATUS_POLL_INTERVAL_SEC,
+                 **kwargs):
+        super().__init__(interval=interval, **kwargs)
+        self._client = rds_client
+
+    def _describe(self, ids):
+        # RDS stores the identifiers in lowercase
+        found = {}
+        paginator = self._client.get_paginator('describe_db_instances')
+        for i in range(0, len(ids), DESCRIBE_FILTER_VALUES_LIMIT):
+            for page in paginator.paginate(Filters=[{
+                'Name': 'db-instance-id',
+                'Values': [_id.lower() for _id in
+                           ids[i:i + DESCRIBE_FILTER_VALUES_LIMIT]]
+            }]):
+                for instance in page['DBInstances']:
+                    found[instance['DBInstanceIdentifier'].lower()] = \
+                        instance
+        return found
+
+    def _status(self, description):
+        return description['DBInstanceStatus']
+
 
 @apply_methods_decorator(retry())
 class RDSConnection(object):
@@ -34,6 +109,8 @@ class RDSConnection(object):
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
         self.region = region
+        self.db_clusters_watcher = DBClustersWatcher(self.client)
+        self.db_instances_watcher = DBInstancesWatcher(self.client)
         _LOG.debug('Opened new RDS connection.')
 
     def create_db_cluster(self, name: str, params: dict) -> dict:
@@ -117,6 +194,55 @@ class RDSConnection(object):
         if secret_arn := secret.get('SecretArn'):
             return self.extract_secret_name_from_arn(secret_arn)
 
+    def wait_for_db_clusters_available(
+            self, names: list, timeout: int = DB_CREATION_TIMEOUT_SEC) -> dict:
+        """ Waits for the clusters with the DescribeDBClusters polls shared
+        by all the waiting threads.
+
+        :returns dict of the names to the cluster descriptions
+        """
+        return self.watch_db_clusters_available(names, timeout).result()
+
+    def watch_db_clusters_available(
+            self, names: list,
+            timeout: int = DB_CREATION_TIMEOUT_SEC) -> Future:
+        """ The same as `wait_for_db_clusters_available`, but does not
+        block the calling thread.
+
+        :returns Future of the dict of the names to the cluster descriptions
+        """
+        return then(self.db_clusters_watcher.watch(
+            [name.lower() for name in names],
+            ready_statuses=(DB_AVAILABLE_STATUS,),
+            failed_statuses=DB_CLUSTER_FAILED_STATUSES, timeout=timeout),
+            lambda descriptions: {name: descriptions[name.lower()]
+                                  for name in names})
+
+    def wait_for_db_instances_available(
+            self, names: list, timeout: int = DB_CREATION_TIMEOUT_SEC) -> dict:
+        """ Waits for the instances with the DescribeDBInstances polls shared
+        by all the waiting threads.
+
+        :returns dict of the names to the instance descriptions
+        """
+        return self.watch_db_instances_available(names, timeout).result()
+
+    def watch_db_instances_available(
+            self, names: list,
+            timeout: int = DB_CREATION_TIMEOUT_SEC) -> Future:
+        """ The same as `wait_for_db_instances_available`, but does not
+        block the calling thread.
+
+        :returns Future of the dict of the names to the instance
+            descriptions
+        """
+        return then(self.db_instances_watcher.watch(
+            [name.lower() for name in names],
+            ready_statuses=(DB_AVAILABLE_STATUS,),
+            failed_statuses=DB_INSTANCE_FAILED_STATUSES, timeout=timeout),
+            lambda descriptions: {name: descriptions[name.lower()]
+                                  for name in names})
+
     def get_waiter(self, waiter_name: str):
         return self.client.get_waiter(waiter_name)
 
@@ -13,19 +13,215 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+import os
+from concurrent.futures import ThreadPoolExecutor
 from json import dumps
+from threading import BoundedSemaphore, Event, Lock
+from time import monotonic, sleep
 
 from boto3 import resource
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
 from syndicate.commons import deep_get
-from syndicate.exceptions import InvalidValueError
+from syndicate.exceptions import InvalidValueError, ResourceProcessingError
 from syndicate.commons.log_helper import get_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    backoff_delay, ConcurrencyBudget, ExistenceCache
+from syndicate.core.helper import compute_file_hash
 
 _LOG = get_logger(__name__)
 
+DELETE_OBJECTS_MAX_KEYS = 1000
+DEFAULT_BUCKET_DRAIN_WORKERS = 8
+DEFAULT_BUCKET_DRAIN_LISTERS = 4
+BUCKET_DRAIN_MAX_RETRIES = 8
+BUCKET_DRAIN_BACKOFF_BASE_SEC = 0.5
+RETRYABLE_DELETE_ERRORS = ('SlowDown', 'InternalError', 'ServiceUnavailable')
+
+# HeadBucket has no body, so the error code is the HTTP status code
+BUCKET_FORBIDDEN_ERROR_CODES = ('403', 'Forbidden', 'AccessDenied')
+BUCKET_MISSING_ERROR_CODES = ('404', 'NoSuchBucket',
+                              *BUCKET_FORBIDDEN_ERROR_CODES)
+BUCKETS_EXISTENCE_CACHE = ExistenceCache()
+
+MB = 1024 ** 2
+# smaller files are transferred with a single request in the calling thread
+SINGLE_REQUEST_TRANSFER_MAX_SIZE = 16 * MB
+MEDIUM_TRANSFER_MAX_SIZE = 256 * MB
+MEDIUM_TRANSFER_CHUNK_SIZE = 8 * MB
+MEDIUM_TRANSFER_CONCURRENCY = 4
+LARGE_TRANSFER_CHUNK_SIZE = 32 * MB
+LARGE_TRANSFER_CONCURRENCY = 8
+MULTIPART_MAX_PARTS = 10000
+# total number of threads transferring files to and from S3, shared by
+# all the connections and pools
+S3_IO_CONCURRENCY = 16
+S3_IO_BUDGET = ConcurrencyBudget(S3_IO_CONCURRENCY)
+# number of the small files, e.g. static website files, uploaded at once
+FILES_UPLOAD_CONCURRENCY = 8
+# the upload args returned by HeadObject, compared to find the changed objects
+OBJECT_HEADERS = ('ContentType', 'ContentEncoding', 'ContentDisposition',
+                  'CacheControl')
+# the SHA256 checksum of an object uploaded with a single request is the
+# same hash lambda reports as CodeSha256
+ARTIFACT_CHECKSUM_ALGORITHM = 'SHA256'
+
+
+def _is_lambda_notification_of(lambda_config, lambda_arn, event_source):
+    filter_rules = deep_get(
+        lambda_config, ['Filter', 'Key', 'FilterRules'], [])
+    return lambda_config['LambdaFunctionArn'] == lambda_arn and \
+        filter_rules == event_source.get('filter_rules', []) and \
+        lambda_config['Events'] == event_source['s3_events']
+
+
+def build_transfer_config(size=None):
+    """ Returns the managed transfer settings for a file of the given size.
+    Small files do not use the multipart transfer and the extra threads,
+    the parts of large files are bigger, so the number of the requests
+    stays low.
+
+    :param size: size of the file in bytes, None if it is unknown
+    """
+    if size is not None and size < SINGLE_REQUEST_TRANSFER_MAX_SIZE:
+        return TransferConfig(
+            multipart_threshold=SINGLE_REQUEST_TRANSFER_MAX_SIZE,
+            max_concurrency=1, use_threads=False)
+    if size is None or size < MEDIUM_TRANSFER_MAX_SIZE:
+        return TransferConfig(
+            multipart_threshold=SINGLE_REQUEST_TRANSFER_MAX_SIZE,
+            multipart_chunksize=MEDIUM_TRANSFER_CHUNK_SIZE,
+            max_concurrency=MEDIUM_TRANSFER_CONCURRENCY)
+    return TransferConfig(
+        multipart_threshold=SINGLE_REQUEST_TRANSFER_MAX_SIZE,
+        multipart_chunksize=max(LARGE_TRANSFER_CHUNK_SIZE,
+                                -(-size // MULTIPART_MAX_PARTS)),
+        max_concurrency=LARGE_TRANSFER_CONCURRENCY)
+
+
+class _BucketDrainer:
+    """ Empties the bucket with several listers and a pool of `DeleteObjects`
+    workers. The root of the bucket is listed with the '/' delimiter and
+    every top-level prefix is listed by its own lister. Every listed page
+    becomes a single delete batch, the number of the batches waiting for
+    a worker is limited, so the listers do not outrun the deletion.
+    """
+
+    def __init__(self, client, bucket_name, versioned,
+                 workers=DEFAULT_BUCKET_DRAIN_WORKERS,
+                 listers=DEFAULT_BUCKET_DRAIN_LISTERS):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.versioned = versioned
+        self.workers = workers
+        self.listers = listers
+        self.deleted = 0
+        self._slots = BoundedSemaphore(workers * 2)
+        self._stop = Event()
+        self._lock = Lock()
+        self._futures = []
+        self._list_executor = None
+        self._delete_executor = None
+
+    def drain(self):
+        """ :returns the number of deleted objects and versions """
+        self._list_executor = ThreadPoolExecutor(
+            self.listers, thread_name_prefix=f's3-list-{self.bucket_name}')
+        self._delete_executor = ThreadPoolExecutor(
+            self.workers, thread_name_prefix=f's3-delete-{self.bucket_name}')
+        try:
+            self._track(self._list_executor.submit(self._list, '', '/'))
+            while True:
+                with self._lock:
+                    futures, self._futures = self._futures, []
+                if not futures:
+                    break
+                for future in futures:
+                    future.result()
+        finally:
+            self._stop.set()
+            self._list_executor.shutdown(wait=True, cancel_futures=True)
+            self._delete_executor.shutdown(wait=True, cancel_futures=True)
+        return self.deleted
+
+    def _track(self, future):
+        with self._lock:
+            self._futures.append(future)
+
+    def _list(self, prefix, delimiter=None):
+        params = dict(Bucket=self.bucket_name, Prefix=prefix)
+        if delimiter:
+            params['Delimiter'] = delimiter
+        operation = 'list_object_versions' if self.versioned \
+            else 'list_objects_v2'
+        for page in self.client.get_paginator(operation).paginate(**params):
+            if self._stop.is_set():
+                return
+            for common_prefix in page.get('CommonPrefixes', []):
+                self._track(self._list_executor.submit(
+                    self._list, common_prefix['Prefix']))
+            if self.versioned:
+                objects = [
+                    {'Key': item['Key'], 'VersionId': item['VersionId']}
+                    for item in page.get('Versions', []) +
+                    page.get('DeleteMarkers', [])]
+            else:
+                objects = [{'Key': item['Key']}
+                           for item in page.get('Contents', [])]
+            for i in range(0, len(objects), DELETE_OBJECTS_MAX_KEYS):
+                # the slot is released when the batch is deleted
+                while not self._slots.acquire(timeout=1):
+                    if self._stop.is_set():
+                        return
+                self._track(self._delete_executor.submit(
+                    self._delete, objects[i:i + DELETE_OBJECTS_MAX_KEYS]))
+
+    def _delete(self, objects):
+        try:
+            attempt = 0
+            while objects:
+                deleted = len(objects)
+                try:
+                    response = self.client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': objects, 'Quiet': True})
+                    errors = response.get('Errors', [])
+                except ClientError as e:
+                    if e.response['Error']['Code'] not in \
+                            RETRYABLE_DELETE_ERRORS:
+                        raise
+                    errors = [dict(obj, Code=e.response['Error']['Code'])
+                              for obj in objects]
+                failed = [error for error in errors
+                          if error.get('Code') not in RETRYABLE_DELETE_ERRORS]
+                if failed:
+                    raise ResourceProcessingError(
+                        f"Failed to delete {len(failed)} objects from the "
+                        f"bucket '{self.bucket_name}', the first one "
+                        f"'{failed[0].get('Key')}': "
+                        f"{failed[0].get('Message')}")
+                with self._lock:
+                    self.deleted += deleted - len(errors)
+                objects = [{key: error[key] for key in ('Key', 'VersionId')
+                            if error.get(key)} for error in errors]
+                if not objects:
+                    return
+                if attempt >= BUCKET_DRAIN_MAX_RETRIES:
+                    raise ResourceProcessingError(
+                        f"Failed to delete {len(objects)} objects from the "
+                        f"bucket '{self.bucket_name}' after {attempt} "
+                        f"retries, the bucket keeps slowing down the "
+                        f"requests")
+                _LOG.debug(f"Bucket '{self.bucket_name}' slowed down the "
+                           f"deletion of {len(objects)} objects, retrying")
+                sleep(backoff_delay(attempt,
+                                    base=BUCKET_DRAIN_BACKOFF_BASE_SEC))
+                attempt += 1
+        finally:
+            self._slots.release()
+
 
 @apply_methods_decorator(retry())
 class S3Connection(object):
@@ -48,11 +244,22 @@ class S3Connection(object):
     def load_file_body(self, bucket_name, key):
         return self.resource.Object(bucket_name, key).get()['Body'].read()
 
-    def download_file(self, bucket_name, key, file_path):
-        self.resource.Bucket(bucket_name).download_file(key, file_path)
+    def download_file(self, bucket_name, key, file_path, size=None):
+        """ Downloads the object to the file within the shared S3 I/O budget
+
+        :param size: size of the object if it is known, to choose the
+            transfer settings
+        """
+        config = build_transfer_config(size)
+        with S3_IO_BUDGET.reserve(config.max_concurrency):
+            self.client.download_file(bucket_name, key, file_path,
+                                      Config=config)
 
-    def download_to_file(self, bucket_name, key, file):
-        self.resource.Bucket(bucket_name).download_fileobj(key, file)
+    def download_to_file(self, bucket_name, key, file, size=None):
+        config = build_transfer_config(size)
+        with S3_IO_BUDGET.reserve(config.max_concurrency):
+            self.client.download_fileobj(bucket_name, key, file,
+                                         Config=config)
 
     def upload_file(self, storage, file_name, bucket_name, folder=''):
         """ Upload specific file to s3.
@@ -63,10 +270,11 @@ class S3Connection(object):
         :param storage: path (e.g. '/tmp/')
         :param folder: str
         """
-        self.client.upload_file(storage + file_name, bucket_name,
-                                folder + file_name)
+        self.upload_single_file(storage + file_name, folder + file_name,
+                                bucket_name)
 
-    def upload_single_file(self, path, key, bucket, extra_args=None):
+    def upload_single_file(self, path, key, bucket, extra_args=None,
+                           checksum_algorithm=None):
         """ Uploads file just like method above, but allows to specify
         object key as argument
 
@@ -75,8 +283,73 @@ class S3Connection(object):
         :param bucket: just bucket name
         :param extra_args: Extra arguments that may be passed to the client
         operation
+        :param checksum_algorithm: algorithm of the checksum computed while
+        the file is uploaded and saved with the object, e.g. CRC32 or SHA256
         """
-        self.client.upload_file(path, bucket, key, ExtraArgs=extra_args)
+        if checksum_algorithm:
+            extra_args = dict(extra_args or {},
+                              ChecksumAlgorithm=checksum_algorithm)
+        config = build_transfer_config(os.path.getsize(path))
+        with S3_IO_BUDGET.reserve(config.max_concurrency):
+            self.client.upload_file(str(path), bucket, key,
+                                    ExtraArgs=extra_args, Config=config)
+
+    def is_object_content_equal(self, bucket_name, key, path,
+                                extra_args=None):
+        """ Checks whether the object has the same content as the file by
+        the MD5 ETag of the object. The ETag of the object uploaded in parts
+        or encrypted with KMS is not the MD5, such objects are treated as
+        different.
+
+        :param extra_args: the upload args, the object with other headers
+            (e.g. ContentEncoding or CacheControl) is treated as different
+        """
+        metadata = self.retrieve_object_metadata(bucket_name, key)
+        if not metadata:
+            return False
+        if any(metadata.get(header) != value
+               for header, value in (extra_args or {}).items()
+               if header in OBJECT_HEADERS):
+            return False
+        etag = metadata.get('ETag', '').strip('"')
+        if '-' in etag or \
+                metadata.get('ContentLength') != os.path.getsize(path):
+            return False
+        return etag == compute_file_hash(path, algorithm='md5')
+
+    def upload_files(self, files, bucket, skip_unchanged=True):
+        """ Uploads the files concurrently.
+
+        :param files: list of tuples of the file path, the object key and
+            the extra args of the upload
+        :param skip_unchanged: whether to skip the files with the same
+            content as the existing objects
+        :returns list of the uploaded keys
+        """
+        def upload(file):
+            path, key, extra_args = file
+            if skip_unchanged and self.is_object_content_equal(
+                    bucket, key, path, extra_args):
+                _LOG.debug(f'Object {key} is not changed, skipping upload')
+                return
+            self.upload_single_file(path=path, key=key, bucket=bucket,
+                                    extra_args=extra_args)
+            return key
+
+        if not files:
+            return []
+        with ThreadPoolExecutor(min(len(files),
+                                    FILES_UPLOAD_CONCURRENCY)) as executor:
+            return [key for key in executor.map(upload, files) if key]
+
+    def get_object_checksums(self, bucket_name, key):
+        """ Returns the object metadata with the checksums computed on
+        upload, so the object does not need to be downloaded to hash it.
+        The checksum of an object uploaded in parts is a checksum of the
+        parts checksums, it has the number of the parts after '-'.
+        """
+        return self.client.head_object(Bucket=bucket_name, Key=key,
+                                       ChecksumMode='ENABLED')
 
     def put_object(self, file_obj, key, bucket,
                    content_type, content_encoding=None):
@@ -91,14 +364,36 @@ class S3Connection(object):
                 Key=key,
                 ContentEncoding=content_encoding)
 
-    def is_bucket_exists(self, name):
-        """ Check if bucket exists by name.
+    def is_bucket_exists(self, name, use_cache=True):
+        """ Check if bucket exists by name with a single HeadBucket request.
+        The bucket of another account, which is not accessible, is treated
+        as not existing.
 
         :type name: str
+        :param use_cache: whether the result of the previous check in this
+            run can be used
         """
-        res = self.get_list_buckets()
-        existing_buckets = [each['Name'] for each in res]
-        return name in existing_buckets
+        cache_key = self._bucket_cache_key(name)
+        if use_cache:
+            exists = BUCKETS_EXISTENCE_CACHE.get(cache_key)
+            if exists is not None:
+                return exists
+        try:
+            self.client.head_bucket(Bucket=name)
+            exists = True
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code not in BUCKET_MISSING_ERROR_CODES:
+                raise e
+            if error_code in BUCKET_FORBIDDEN_ERROR_CODES:
+                _LOG.debug(f"Bucket '{name}' is not accessible")
+            exists = False
+        BUCKETS_EXISTENCE_CACHE.set(cache_key, exists)
+        return exists
+
+    def _bucket_cache_key(self, name):
+        # bucket names are global, the access to them depends on the account
+        return self.aws_access_key_id, name
 
     def get_bucket_acl(self, bucket_name):
         try:
@@ -174,22 +469,46 @@ class S3Connection(object):
                 'LocationConstraint': location
             }
         self.client.create_bucket(**param)
+        BUCKETS_EXISTENCE_CACHE.set(self._bucket_cache_key(bucket_name),
+                                    True)
 
     def remove_bucket(self, bucket_name, log_not_found_error=True):
         """ Remove bucket by name. To remove bucket it must be empty.
         log_not_found_error parameter is needed for proper log handling in the
         retry decorator
         """
-        bucket = self.resource.Bucket(bucket_name)
-        bucket_versioning = self.resource.BucketVersioning(bucket_name)
-        if bucket_versioning.status == 'Enabled':
-            bucket.object_versions.delete()
-        else:
-            bucket.objects.all().delete()
-        bucket.delete()
+        self.empty_bucket(bucket_name)
+        self.delete_bucket(bucket_name)
+
+    def empty_bucket(self, bucket_name,
+                     workers=DEFAULT_BUCKET_DRAIN_WORKERS,
+                     listers=DEFAULT_BUCKET_DRAIN_LISTERS):
+        """ Deletes all the objects, their versions and delete markers from
+        the bucket using parallel listers and `DeleteObjects` workers.
+
+        :param workers: number of simultaneous `DeleteObjects` requests
+        :param listers: number of simultaneous listing requests
+        :returns the number of deleted objects and versions
+        """
+        # versions may remain in the bucket with suspended versioning
+        versioned = self.client.get_bucket_versioning(
+            Bucket=bucket_name).get('Status') in ('Enabled', 'Suspended')
+        started_at = monotonic()
+        deleted = _BucketDrainer(self.client, bucket_name, versioned,
+                                 workers=workers, listers=listers).drain()
+        elapsed = monotonic() - started_at
+        if deleted:
+            _LOG.info(f"Deleted {deleted} objects from the bucket "
+                      f"'{bucket_name}' in {elapsed:.1f}s "
+                      f"({deleted / max(elapsed, 0.001):.0f} objects/s)")
+        return deleted
 
     def delete_bucket(self, bucket_name):
+        # the bucket state is unknown if the request fails
+        BUCKETS_EXISTENCE_CACHE.forget(self._bucket_cache_key(bucket_name))
         self.client.delete_bucket(Bucket=bucket_name)
+        BUCKETS_EXISTENCE_CACHE.set(self._bucket_cache_key(bucket_name),
+                                    False)
 
     def add_lambda_event_source(self, bucket: str, lambda_arn: str,
                                 event_source: dict):
@@ -213,43 +532,8 @@ class S3Connection(object):
             - filter_rules (optional): list[dict] - list of S3 event filters:
                 {'Name': 'prefix'|'suffix', 'Value': 'string'}
         """
-        config = self.get_bucket_notification(bucket_name=bucket)
-        config.pop('ResponseMetadata')
-
-        if 'LambdaFunctionConfigurations' not in config:
-            config['LambdaFunctionConfigurations'] = []
-
-        # for some reason filter rule's name value is in uppercase when
-        # should be in lower according to the documentation
-        for lambda_config in config['LambdaFunctionConfigurations']:
-            filter_rules = deep_get(
-                lambda_config, ['Filter', 'Key', 'FilterRules'], [])
-            for filter_rule in filter_rules:
-                filter_rule['Name'] = filter_rule['Name'].lower()
-
-        params = {
-            'LambdaFunctionArn': lambda_arn,
-            'Events': event_source['s3_events']
-        }
-        if event_source.get('filter_rules'):
-            params.update({
-                'Filter': {
-                    'Key': {
-                        'FilterRules': event_source['filter_rules']
-                    }
-                }
-            })
-        # add event notification to remote if it is not already present
-        for remote_event_source in config['LambdaFunctionConfigurations']:
-            remote_event_source_copy = remote_event_source.copy()
-            remote_event_source_copy.pop('Id')
-            if remote_event_source_copy == params:
-                break
-        else:
-            config['LambdaFunctionConfigurations'].append(params)
-
-        self.put_bucket_notification(
-            bucket_name=bucket, notification_configuration=config)
+        self.update_lambda_event_sources(bucket, lambda_arn,
+                                         to_add=[event_source])
 
     def remove_lambda_event_source(self, bucket: str, lambda_arn: str,
                                    event_source: dict):
@@ -259,29 +543,38 @@ class S3Connection(object):
 
         :param bucket:
         :param lambda_arn:
-        :param event_source:
-            - s3_events: list[str] - list of S3 event types:
-                's3:ReducedRedundancyLostObject'
-                's3:ObjectCreated:*'
-                's3:ObjectCreated:Put'
-                's3:ObjectCreated:Post'
-                's3:ObjectCreated:Copy'
-                's3:ObjectCreated:CompleteMultipartUpload'
-                's3:ObjectRemoved:*'
-                's3:ObjectRemoved:Delete'
-                's3:ObjectRemoved:DeleteMarkerCreated'
-            - filter_rules (optional): list[dict] - list of S3 event filters:
-                {'Name': 'prefix'|'suffix', 'Value': 'string'}
+        :param event_source: the same as for `add_lambda_event_source`
+        """
+        self.update_lambda_event_sources(bucket, lambda_arn,
+                                         to_remove=[event_source])
+
+    def update_lambda_event_sources(self, bucket: str, lambda_arn: str,
+                                    to_add: list = None,
+                                    to_remove: list = None):
+        """ Removes and adds the lambda event notifications of the bucket
+        with a single read and a single write of the bucket notification
+        configuration
+
+        :param bucket:
+        :param lambda_arn:
+        :param to_add: list of event sources to add, see
+            `add_lambda_event_source`
+        :param to_remove: list of event sources to remove
         """
+        to_add = to_add or []
+        to_remove = to_remove or []
+        if not to_add and not to_remove:
+            return
         config = self.get_bucket_notification(bucket_name=bucket)
         config.pop('ResponseMetadata')
 
-        if 'LambdaFunctionConfigurations' not in config:
+        lambda_configs = config.get('LambdaFunctionConfigurations', [])
+        if not lambda_configs and not to_add:
             _LOG.info('No lambda event source to remove')
             return
 
         saved_lambda_configs = []
-        for lambda_config in config['LambdaFunctionConfigurations']:
+        for lambda_config in lambda_configs:
             # for some reason filter rule's name value is in uppercase when
             # should be in lower according to the documentation
             filter_rules = deep_get(
@@ -289,13 +582,34 @@ class S3Connection(object):
             for filter_rule in filter_rules:
                 filter_rule['Name'] = filter_rule['Name'].lower()
 
-            current_lambda = (lambda_config['LambdaFunctionArn'] == lambda_arn)
-            same_filters = filter_rules == event_source.get('filter_rules', [])
-            same_events = lambda_config['Events'] == event_source['s3_events']
-            # save config if something is different from current meta
-            if not current_lambda or not same_filters or not same_events:
+            # save config if something is different from removed meta
+            if not any(_is_lambda_notification_of(
+                    lambda_config, lambda_arn, event_source)
+                    for event_source in to_remove):
                 saved_lambda_configs.append(lambda_config)
 
+        for event_source in to_add:
+            params = {
+                'LambdaFunctionArn': lambda_arn,
+                'Events': event_source['s3_events']
+            }
+            if event_source.get('filter_rules'):
+                params.update({
+                    'Filter': {
+                        'Key': {
+                            'FilterRules': event_source['filter_rules']
+                        }
+                    }
+                })
+            # add event notification to remote if it is not already present
+            for remote_event_source in saved_lambda_configs:
+                remote_event_source_copy = remote_event_source.copy()
+                remote_event_source_copy.pop('Id', None)
+                if remote_event_source_copy == params:
+                    break
+            else:
+                saved_lambda_configs.append(params)
+
         config['LambdaFunctionConfigurations'] = saved_lambda_configs
         self.put_bucket_notification(
             bucket_name=bucket, notification_configuration=config)
@@ -492,9 +806,13 @@ class S3Connection(object):
                 } for i in delete_markers])
         return bucket_objects
 
-    def retrieve_object_metadata(self, bucket_name, key):
+    def retrieve_object_metadata(self, bucket_name, key,
+                                 with_checksums=False):
+        params = dict(Bucket=bucket_name, Key=key)
+        if with_checksums:
+            params['ChecksumMode'] = 'ENABLED'
         try:
-            return self.client.head_object(Bucket=bucket_name, Key=key)
+            return self.client.head_object(**params)
         except ClientError as e:
             if 'HeadObject' in str(e):
                 pass  # valid exception
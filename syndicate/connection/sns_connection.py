@@ -15,6 +15,7 @@
 """
 import uuid
 from json import dumps, loads
+from threading import Lock
 
 from boto3 import client
 from botocore.exceptions import ClientError
@@ -26,6 +27,37 @@ from syndicate.connection.helper import apply_methods_decorator, retry
 
 _LOG = get_logger(__name__)
 
+TOPICS_INDEX = 'topics'
+APPLICATIONS_INDEX = 'applications'
+
+# name -> arn indexes of the topics and platform applications by the index
+# kind, region and access key, each one is built with a single listing and
+# kept up to date on create and delete
+_INDEXES = {}
+_INDEXES_LOCK = Lock()
+_INDEX_BUILD_LOCKS = {}
+
+
+def build_topic_arn(region, account_id, name):
+    return f'arn:aws:sns:{region}:{account_id}:{name}'
+
+
+def build_platform_application_arn(region, account_id, platform, name):
+    return f'arn:aws:sns:{region}:{account_id}:app/{platform}/{name}'
+
+
+def _topic_name(topic_arn):
+    return topic_arn.split(':')[-1]
+
+
+def _application_name(application_arn):
+    return application_arn.split(':')[-1].split('/')[-1]
+
+
+def _is_not_found(error):
+    return error.response['Error']['Code'] in ('NotFound',
+                                               'NotFoundException')
+
 
 @apply_methods_decorator(retry())
 class SNSConnection(object):
@@ -35,6 +67,8 @@ class SNSConnection(object):
                              aws_access_key_id=aws_access_key_id,
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
+        self.region = self.client.meta.region_name
+        self._index_key = (self.region, aws_access_key_id)
         _LOG.debug('Opened new SNS connection.')
 
     def create_topic(self, name, tags):
@@ -48,7 +82,9 @@ class SNSConnection(object):
         )
         if tags:
             params['Tags'] = tags
-        return self.client.create_topic(**params)['TopicArn']
+        topic_arn = self.client.create_topic(**params)['TopicArn']
+        self._update_index(TOPICS_INDEX, name, topic_arn)
+        return topic_arn
 
     def subscribe(self, endpoint, topic_name, protocol):
         """
@@ -87,26 +123,73 @@ class SNSConnection(object):
                               Endpoint=endpoint)
         return topic_arn
 
-    def get_topic_arn(self, name):
-        """ Get topic arn by name.
+    def get_topic_arn(self, name, account_id=None):
+        """ Get topic arn by name. The arn is built if the account id is
+        given, so the topic existence is checked with a single call,
+        otherwise the topics index of the region is used.
 
         :type name: str
+        :type account_id: str
         """
-        topics = self.get_topics()
-        for each in topics:
-            if name == each['TopicArn'].split(':')[-1]:
-                return each['TopicArn']
-
-    def get_platform_application(self, name):
-        """ Get application arn by name.
+        if account_id:
+            topic_arn = build_topic_arn(self.region, account_id, name)
+            if self.get_topic_attributes_if_exists(topic_arn):
+                return topic_arn
+            return
+        return self._get_index(TOPICS_INDEX).get(name)
+
+    def get_platform_application(self, name, account_id=None,
+                                 platform=None):
+        """ Get application arn by name. The arn is built if the account id
+        and the platform are given, so the application existence is checked
+        with a single call, otherwise the applications index of the region
+        is used.
 
         :type name: str
+        :type account_id: str
+        :type platform: str
         """
-        applications = self.get_platform_applications()
-        for each in applications:
-            resolved_item = each['PlatformApplicationArn'].split(':')[-1]
-            if name == resolved_item.split('/')[-1]:
-                return each['PlatformApplicationArn']
+        if account_id and platform:
+            application_arn = build_platform_application_arn(
+                self.region, account_id, platform, name)
+            try:
+                self.get_platform_application_attributes(application_arn)
+            except ClientError as e:
+                if _is_not_found(e):
+                    return
+                raise e
+            return application_arn
+        return self._get_index(APPLICATIONS_INDEX).get(name)
+
+    def _get_index(self, kind):
+        key = (kind, *self._index_key)
+        with _INDEXES_LOCK:
+            build_lock = _INDEX_BUILD_LOCKS.setdefault(key, Lock())
+        with build_lock:
+            if key not in _INDEXES:
+                if kind == TOPICS_INDEX:
+                    index = {_topic_name(topic['TopicArn']): topic['TopicArn']
+                             for topic in self.get_topics()}
+                else:
+                    index = {
+                        _application_name(app['PlatformApplicationArn']):
+                            app['PlatformApplicationArn']
+                        for app in self.get_platform_applications()}
+                with _INDEXES_LOCK:
+                    _INDEXES[key] = index
+            return _INDEXES[key]
+
+    def _update_index(self, kind, name, arn=None):
+        """ Adds the arn to the index if it is built, removes the name from
+        the index if the arn is not given """
+        with _INDEXES_LOCK:
+            index = _INDEXES.get((kind, *self._index_key))
+            if index is None:
+                return
+            if arn:
+                index[name] = arn
+            else:
+                index.pop(name, None)
 
     def is_user_subscribed(self, endpoint, topic_name):
         topic_arn = self.get_topic_arn(topic_name)
@@ -163,6 +246,7 @@ class SNSConnection(object):
         # make get api call first, because the delete function is idempotent
         if self.get_topic_attributes(topic_arn):
             self.client.delete_topic(TopicArn=topic_arn)
+            self._update_index(TOPICS_INDEX, _topic_name(topic_arn))
 
     def remove_topic_by_name(self, topic_name):
         """ Remove topic by arn.
@@ -172,6 +256,7 @@ class SNSConnection(object):
         arn = self.get_topic_arn(topic_name)
         if arn:
             self.client.delete_topic(TopicArn=arn)
+            self._update_index(TOPICS_INDEX, topic_name)
 
     def set_topic_attribute(self, topic_arn, attr_name, attr_value):
         self.client.set_topic_attributes(
@@ -203,6 +288,14 @@ class SNSConnection(object):
             TopicArn=topic_arn
         )
 
+    def get_topic_attributes_if_exists(self, topic_arn):
+        try:
+            return self.get_topic_attributes(topic_arn)
+        except ClientError as e:
+            if _is_not_found(e):
+                return
+            raise e
+
     def get_platform_application_attributes(self, application_arn):
         return self.client.get_platform_application_attributes(
             PlatformApplicationArn=application_arn
@@ -260,7 +353,9 @@ class SNSConnection(object):
     def create_platform_application(self, name, platform, attributes):
         response = self.client.create_platform_application(
             Name=name, Platform=platform, Attributes=attributes)
-        return response.get('PlatformApplicationArn')
+        application_arn = response.get('PlatformApplicationArn')
+        self._update_index(APPLICATIONS_INDEX, name, application_arn)
+        return application_arn
 
     def remove_application_by_arn(self, application_arn,
                                   log_not_found_error=True):
@@ -272,6 +367,8 @@ class SNSConnection(object):
         """
         self.client.delete_platform_application(
             PlatformApplicationArn=application_arn)
+        self._update_index(APPLICATIONS_INDEX,
+                           _application_name(application_arn))
 
     def list_subscriptions(self):
         paginator = self.client.get_paginator('list_subscriptions')
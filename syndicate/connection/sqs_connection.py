@@ -14,17 +14,83 @@
     limitations under the License.
 """
 import json
+import threading
 
 from boto3 import client
 from botocore.exceptions import ClientError
 
 from syndicate.exceptions import InvalidValueError
 from syndicate.commons.log_helper import get_logger, get_user_logger
-from syndicate.connection.helper import apply_methods_decorator, retry
+from syndicate.connection.helper import apply_methods_decorator, retry, \
+    RateLimiter
 
 _LOG = get_logger(__name__)
 USER_LOG = get_user_logger()
 
+JSON_ATTRIBUTES = ('Policy', 'RedrivePolicy', 'RedriveAllowPolicy')
+BOOLEAN_ATTRIBUTES = ('ContentBasedDeduplication', 'FifoQueue')
+
+# the queues are updated concurrently, the connections to the same region
+# share the limiter
+SQS_REQUESTS_PER_SECOND = 50
+_SQS_RATE_LIMITERS = {}
+_SQS_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_sqs_rate_limiter(region):
+    with _SQS_RATE_LIMITERS_LOCK:
+        if region not in _SQS_RATE_LIMITERS:
+            _SQS_RATE_LIMITERS[region] = RateLimiter(
+                rate=SQS_REQUESTS_PER_SECOND)
+        return _SQS_RATE_LIMITERS[region]
+
+
+def _canonical_json(value):
+    """ Brings the policy document to the form SQS returns it in: the
+    keys are sorted and the single item lists are replaced with the item """
+    if isinstance(value, dict):
+        return {key: _canonical_json(value[key]) for key in sorted(value)}
+    if isinstance(value, list):
+        items = [_canonical_json(item) for item in value]
+        return items[0] if len(items) == 1 else items
+    return value
+
+
+def normalize_queue_attribute(name, value):
+    """ Returns the comparable form of the queue attribute value set by
+    syndicate or returned by GetQueueAttributes """
+    if value is None:
+        return
+    if name in JSON_ATTRIBUTES:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return value
+        return json.dumps(_canonical_json(value), sort_keys=True)
+    if name in BOOLEAN_ATTRIBUTES:
+        return str(value).lower()
+    return str(value)
+
+
+def diff_queue_attributes(desired, current):
+    """ :returns the desired attributes which differ from the current
+    ones """
+    return {
+        name: value for name, value in desired.items()
+        if normalize_queue_attribute(name, value) !=
+        normalize_queue_attribute(name, current.get(name))
+    }
+
+
+def diff_queue_tags(desired, current):
+    """ :returns tuple of the tags to set and the tag keys to remove """
+    desired, current = desired or {}, current or {}
+    to_set = {key: value for key, value in desired.items()
+              if current.get(key) != value}
+    to_remove = [key for key in current if key not in desired]
+    return to_set, to_remove
+
 
 @apply_methods_decorator(retry())
 class SqsConnection(object):
@@ -38,6 +104,8 @@ class SqsConnection(object):
                              aws_access_key_id=aws_access_key_id,
                              aws_secret_access_key=aws_secret_access_key,
                              aws_session_token=aws_session_token)
+        _get_sqs_rate_limiter(self.client.meta.region_name).register(
+            self.client)
         _LOG.debug('Opened new SQS connection.')
 
     def create_queue(self, queue_name, delay_seconds=None,
@@ -153,7 +221,15 @@ class SqsConnection(object):
                      visibility_timeout: int = None,
                      kms_master_key_id: str = None,
                      kms_data_key_reuse_period_seconds: int = None,
-                     content_based_deduplication=None, tags: dict = None):
+                     content_based_deduplication=None, tags: dict = None,
+                     current_attributes: dict = None):
+        """ Sets only the attributes and the tags which differ from the
+        current ones, so the unchanged queue is not touched.
+
+        :param current_attributes: the queue attributes returned by
+            GetQueueAttributes, fetched if not given
+        :returns the changed attributes
+        """
         errors = []
         attributes = dict()
 
@@ -202,7 +278,7 @@ class SqsConnection(object):
             attributes['Policy'] = policy
 
         if redrive_policy:
-            if isinstance(policy, dict):
+            if isinstance(redrive_policy, dict):
                 redrive_policy = json.dumps(redrive_policy)
             attributes['RedrivePolicy'] = redrive_policy
 
@@ -233,19 +309,27 @@ class SqsConnection(object):
 
         if errors:
             raise InvalidValueError(';\n'.join(errors))
-        response = self.client.set_queue_attributes(
-            QueueUrl=queue_url,
-            Attributes=attributes
-        )
+        if current_attributes is None:
+            current_attributes = (self.get_queue_attributes(queue_url)
+                                  or {}).get('Attributes', {})
+        changed_attributes = diff_queue_attributes(attributes,
+                                                   current_attributes)
+        if changed_attributes:
+            _LOG.debug(f'Changed attributes of the queue {queue_url}: '
+                       f'{list(changed_attributes)}')
+            self.client.set_queue_attributes(
+                QueueUrl=queue_url,
+                Attributes=changed_attributes
+            )
 
-        existing_tags = self.list_queue_tags(queue_url)
-        tags_to_remove = [key for key in existing_tags if key not in tags]
+        tags_to_set, tags_to_remove = diff_queue_tags(
+            tags, self.list_queue_tags(queue_url))
         if tags_to_remove:
             self.untag_queue(queue_url, tags_to_remove)
-        if tags:
-            self.tag_queue(queue_url, tags)
+        if tags_to_set:
+            self.tag_queue(queue_url, tags_to_set)
 
-        return response
+        return changed_attributes
 
     def list_queue_tags(self, queue_url):
         try:
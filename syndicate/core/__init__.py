@@ -21,6 +21,7 @@ from botocore.exceptions import ClientError
 
 from syndicate.exceptions import InternalError, ConfigurationError
 from syndicate.commons.log_helper import get_logger, get_user_logger
+from syndicate.commons.tracing import TRACER
 from syndicate.connection import ConnectionProvider
 from syndicate.connection.sts_connection import STSConnection
 from syndicate.core.conf.processor import ConfigHolder
@@ -108,6 +109,9 @@ def initialize_connection():
 
     CONFIG = ConfigHolder(CONF_PATH)
     CONFIG.deploy_target_bucket_view = uri_bucket_view
+    # clients copy the session event handlers on creation, so the tracer
+    # must be installed before any connection is created
+    TRACER.install()
     sts = STSConnection(CONFIG.region, CONFIG.aws_access_key_id,
                         CONFIG.aws_secret_access_key, CONFIG.aws_session_token)
     try:
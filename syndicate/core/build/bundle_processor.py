@@ -23,6 +23,7 @@ from botocore.exceptions import ClientError
 from syndicate.exceptions import ProjectStateError, ConfigurationError
 from syndicate.commons.log_helper import get_logger, get_user_logger
 from syndicate.connection import S3Connection
+from syndicate.connection.s3_connection import ARTIFACT_CHECKSUM_ALGORITHM
 from syndicate.core.build.helper import _json_serial, resolve_bundle_directory, \
     resolve_all_bundles_directory, assert_bundle_bucket_exists
 from syndicate.core.build.meta_processor import validate_deployment_packages, \
@@ -313,7 +314,8 @@ def load_bundle(bundle_name, src_account_id, src_bucket_region,
     _LOG.info('Going to find S3 keys for bundle: {0}'.format(bundle_name))
     objects = src_s3_conn.list_objects(bucket_name=src_bucket_name,
                                        prefix=bundle_name)
-    artifacts_names = [meta['Key'] for meta in objects]
+    artifacts_sizes = {meta['Key']: meta.get('Size') for meta in objects}
+    artifacts_names = list(artifacts_sizes)
     _LOG.info('Found {0} artifacts: {1}'.format(len(artifacts_names),
                                                 artifacts_names))
 
@@ -334,15 +336,16 @@ def load_bundle(bundle_name, src_account_id, src_bucket_region,
             'conn': src_s3_conn,
             'bucket_name': src_bucket_name,
             'key': key,
-            'path': build_path(CONFIG.project_path, ARTIFACTS_FOLDER, key)
+            'path': build_path(CONFIG.project_path, ARTIFACTS_FOLDER, key),
+            'size': artifacts_sizes[key]
         }
         futures.append(executor.submit(_download_package_from_s3, arg))
     return futures
 
 
 @unpack_kwargs
-def _download_package_from_s3(conn, bucket_name, key, path):
-    conn.download_file(bucket_name, key, path)
+def _download_package_from_s3(conn, bucket_name, key, path, size=None):
+    conn.download_file(bucket_name, key, path, size=size)
 
 
 @unpack_kwargs
@@ -350,8 +353,9 @@ def _put_package_to_s3(path, path_to_package):
     from syndicate.core import CONN, CONFIG
     key_compound = PurePath(CONFIG.deploy_target_bucket_key_compound,
                             path).as_posix()
-    CONN.s3().upload_single_file(path_to_package, key_compound,
-                                 CONFIG.deploy_target_bucket)
+    CONN.s3().upload_single_file(
+        path_to_package, key_compound, CONFIG.deploy_target_bucket,
+        checksum_algorithm=ARTIFACT_CHECKSUM_ALGORITHM)
 
 
 def remove_bundle_dir_locally(bundle_name: str, force_upload: bool):
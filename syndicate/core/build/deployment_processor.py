@@ -22,6 +22,7 @@ from typing import Any
 
 from syndicate.exceptions import ResourceProcessingError, ProjectStateError
 from syndicate.commons.log_helper import get_logger, get_user_logger
+from syndicate.commons.tracing import TRACER
 from syndicate.core.build.bundle_processor import create_deploy_output, \
     load_deploy_output, load_failed_deploy_output, load_meta_resources, \
     remove_failed_deploy_output, load_latest_deploy_output, \
@@ -58,6 +59,9 @@ def _process_resources(
     errors = []
     args = []
     resource_type = None
+    # the consecutive resource types with the same handler are processed as
+    # one stage, so the handler can pipeline the dependent resources
+    stage_types = []
     is_succeeded = True
     try:
         for res_name, res_meta in resources:
@@ -65,17 +69,24 @@ def _process_resources(
 
             if resource_type is None:
                 resource_type = current_res_type
+                stage_types.append(current_res_type)
 
-            if current_res_type == resource_type:
+            if current_res_type == resource_type or \
+                    handlers_mapping.get(current_res_type) == \
+                    handlers_mapping.get(resource_type):
+                if current_res_type not in stage_types:
+                    stage_types.append(current_res_type)
                 args.append(_build_args(name=res_name,
                                         meta=res_meta,
                                         context=output,
                                         pass_context=pass_context))
                 continue
             elif current_res_type != resource_type:
-                USER_LOG.info(f'Processing {resource_type} resources')
+                USER_LOG.info(
+                    f'Processing {", ".join(stage_types)} resources')
                 func = handlers_mapping[resource_type]
-                response = func(args)
+                with TRACER.stage(resource_type):
+                    response = func(args)
                 response_errors = process_response(response=response,
                                                    output=output)
                 errors.extend(response_errors)
@@ -86,11 +97,13 @@ def _process_resources(
                                         context=output,
                                         pass_context=pass_context))
                 resource_type = current_res_type
+                stage_types = [current_res_type]
         if args:
-            USER_LOG.info(f'Processing {resource_type} resources')
+            USER_LOG.info(f'Processing {", ".join(stage_types)} resources')
             func = handlers_mapping[resource_type]
 
-            response = func(args)
+            with TRACER.stage(resource_type):
+                response = func(args)
             response_errors = process_response(response=response,
                                                output=output)
             errors.extend(response_errors)
@@ -188,7 +201,8 @@ def _process_resources_with_dependencies(resources, handlers_mapping,
                 USER_LOG.info(f'Processing {resource_type} resources')
                 current_resource_type = resource_type
             func = handlers_mapping[resource_type]
-            response = func(args)
+            with TRACER.stage(resource_type):
+                response = func(args)
             response_errors = process_response(response=response,
                                                output=output)
             errors.extend(response_errors)
@@ -343,7 +357,8 @@ def clean_resources(output):
         elif res_type != resource_type:
             USER_LOG.info('Removing {0} resources ...'.format(resource_type))
             func = PROCESSOR_FACADE.remove_handlers()[resource_type]
-            result = func(args)
+            with TRACER.stage(resource_type):
+                result = func(args)
             response_errors = process_response(result, clean_output)
             errors.extend(response_errors)
             del args[:]
@@ -352,7 +367,8 @@ def clean_resources(output):
     if args:
         USER_LOG.info('Removing {0} resources ...'.format(resource_type))
         func = PROCESSOR_FACADE.remove_handlers()[resource_type]
-        result = func(args)
+        with TRACER.stage(resource_type):
+            result = func(args)
         response_errors = process_response(result, clean_output)
         errors.extend(response_errors)
 
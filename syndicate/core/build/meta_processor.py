@@ -36,6 +36,7 @@ from syndicate.core.constants import (API_GATEWAY_TYPE, ARTIFACTS_FOLDER,
                                       RESOURCES_FILE_NAME, RESOURCE_LIST,
                                       IAM_ROLE, LAMBDA_LAYER_TYPE,
                                       S3_PATH_NAME, APPSYNC_CONFIG_FILE_NAME,
+                                      CODE_SHA256,
                                       LAMBDA_LAYER_CONFIG_FILE_NAME,
                                       WEB_SOCKET_API_GATEWAY_TYPE,
                                       OAS_V3_FILE_NAME,
@@ -46,7 +47,8 @@ from syndicate.core.generators.contents import FILE_POM
 from syndicate.core.groups import JAVA_ROOT_DIR_JAPP, RUNTIME_JAVA
 from syndicate.core.helper import (build_path, prettify_json,
                                    resolve_aliases_for_string,
-                                   write_content_to_file, validate_tags)
+                                   write_content_to_file, validate_tags,
+                                   compute_file_base64_hash, is_zip_empty)
 from syndicate.core.resources.helper import resolve_dynamic_identifier, \
     detect_unresolved_aliases
 
@@ -293,6 +295,24 @@ def _populate_s3_path_swagger_ui(meta, bundle_name):
         meta[S3_PATH_NAME] = build_path(bundle_name, deployment_package)
 
 
+def populate_layers_code_sha256(overall_meta, bundle_dir):
+    """ Saves the hashes of the lambda layers deployment packages to the meta
+    so the layer content can be compared with the deployed layer versions
+    without downloading the package.
+    """
+    for name, meta in overall_meta.items():
+        if meta.get('resource_type') != LAMBDA_LAYER_TYPE:
+            continue
+        package_path = build_path(bundle_dir,
+                                  meta.get('deployment_package', ''))
+        # an empty package is reported on the layer deployment
+        if not os.path.isfile(package_path) or is_zip_empty(package_path):
+            continue
+        meta[CODE_SHA256] = compute_file_base64_hash(package_path)
+        _LOG.debug(f'Lambda layer \'{name}\' package hash: '
+                   f'{meta[CODE_SHA256]}')
+
+
 def populate_s3_paths(overall_meta, bundle_name):
     for name, meta in overall_meta.items():
         resource_type = meta.get('resource_type')
@@ -547,6 +567,7 @@ def create_meta(project_path: str, bundle_name: str) -> None:
     overall_meta = create_resource_json(project_path=project_path,
                                         bundle_name=bundle_name)
     bundle_dir = resolve_bundle_directory(bundle_name=bundle_name)
+    populate_layers_code_sha256(overall_meta, bundle_dir)
     write_content_to_file(bundle_dir, BUILD_META_FILE_NAME, overall_meta)
 
     PROJECT_STATE.refresh_state()
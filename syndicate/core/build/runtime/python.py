@@ -21,7 +21,7 @@ import platform
 import shutil
 import subprocess
 import sys
-from concurrent.futures import FIRST_EXCEPTION
+from collections import namedtuple
 from concurrent.futures import FIRST_EXCEPTION
 from concurrent.futures.thread import ThreadPoolExecutor
 from itertools import chain
@@ -54,6 +54,23 @@ REQ_HASH_SUFFIX = 'r_hash'
 EMPTY_FILE_HASH = 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'
 TMP_DIR = 'tmp'
 
+ARTIFACT_OPTIMIZATION_PARAM = 'artifact_optimization'
+DEFAULT_ARTIFACT_EXCLUDES = (
+    '**/__pycache__', '**/*.py[co]', '**/*.pyi', '**/*.dist-info/RECORD',
+    '**/tests', '**/*.md', '**/*.rst'
+)
+NATIVE_EXTENSION_PATTERNS = ('**/*.so', '**/*.so.*')
+STRIP_BATCH_SIZE = 100
+# the paths the artifacts are extracted to by Lambda, the compiled files
+# refer to them so that the tracebacks show the source lines
+LAMBDA_TASK_ROOT = '/var/task'
+LAMBDA_LAYER_PYTHON_ROOT = '/opt/python'
+
+ArtifactOptimizationReport = namedtuple(
+    'ArtifactOptimizationReport',
+    ('size_before', 'size_after', 'removed_files', 'stripped_files',
+     'compiled_versions'))
+
 
 def assemble_python_lambdas(
     runtime_root_dir: str, 
@@ -132,6 +149,7 @@ def build_python_lambda_layer(
     _LOG.info(f"Going to assemble lambda layer '{layer_config['name']}'")
     package_name = zip_ext(layer_config['deployment_package'])
     python_versions = ', '.join(layer_config.get('runtimes', [])) or None
+    optimization = resolve_artifact_optimization(layer_config)
 
     r_hash_name = f'.{artifact_name}_{REQ_HASH_SUFFIX}'
     artifact_cache_path = Path(cache_dir_path, artifact_name)
@@ -153,6 +171,9 @@ def build_python_lambda_layer(
     if current_req_hash != EMPTY_FILE_HASH:
         if python_versions:
             current_req_hash += compute_string_hash(python_versions)
+        if optimization:
+            current_req_hash += compute_string_hash(
+                json.dumps(optimization, sort_keys=True))
         if prev_req_hash != current_req_hash:
             _LOG.debug(f'Artifacts cache path: {artifact_cache_path}')
             os.makedirs(artifact_cache_path, exist_ok=True)
@@ -161,6 +182,11 @@ def build_python_lambda_layer(
                                     to=artifact_cache_path,
                                     config=layer_config,
                                     errors_allowed=errors_allowed)
+            if optimization:
+                optimize_python_artifact(
+                    artifact_cache_path, optimization,
+                    _get_python_versions(layer_config),
+                    LAMBDA_LAYER_PYTHON_ROOT, f'{artifact_name} dependencies')
 
             _LOG.debug('Zipping 3-rd party dependencies')
             zip_dir(str(artifact_cache_path),
@@ -191,6 +217,11 @@ def build_python_lambda_layer(
         _install_local_req(tmp_artifact_path, local_requirements_path,
                            runtime_root_dir)
         _LOG.info('Local dependencies were installed successfully')
+        if optimization:
+            optimize_python_artifact(
+                tmp_artifact_path, optimization,
+                _get_python_versions(layer_config),
+                LAMBDA_LAYER_PYTHON_ROOT, artifact_name)
 
         # making zip archive
         _LOG.info(
@@ -211,6 +242,8 @@ def build_python_lambda_layer(
             f"Layer package cannot be empty. "
             f"Please check the layer '{layer_config['name']}' configuration.")
 
+    if optimization:
+        _report_package_size(Path(bundle_dir, package_name))
     _LOG.info(f'Package \'{package_name}\' was successfully created')
 
     # remove unused folder
@@ -244,6 +277,7 @@ def _build_python_artifact(
     _LOG.info(f"Going to assemble lambda '{lambda_name}'")
     package_name = build_py_package_name(lambda_name, lambda_config["version"])
     python_version = lambda_config['runtime']
+    optimization = resolve_artifact_optimization(lambda_config)
 
     r_hash_name = f'.{artifact_name}_{REQ_HASH_SUFFIX}'
     artifact_cache_path = Path(cache_dir_path, artifact_name)
@@ -266,6 +300,9 @@ def _build_python_artifact(
 
     if current_req_hash != EMPTY_FILE_HASH:
         current_req_hash += compute_string_hash(python_version)
+        if optimization:
+            current_req_hash += compute_string_hash(
+                json.dumps(optimization, sort_keys=True))
         if prev_req_hash != current_req_hash:
             _LOG.debug(f'Artifacts cache path: {artifact_cache_path}')
             os.makedirs(artifact_cache_path, exist_ok=True)
@@ -273,6 +310,11 @@ def _build_python_artifact(
                                         to=artifact_cache_path,
                                         config=lambda_config,
                                         errors_allowed=errors_allowed)
+            if optimization:
+                optimize_python_artifact(
+                    artifact_cache_path, optimization,
+                    _get_python_versions(lambda_config), LAMBDA_TASK_ROOT,
+                    f'{artifact_name} dependencies')
             _LOG.debug(
                 f'Zipping 3-rd party dependencies in {artifact_cache_path}')
             zip_dir(str(artifact_cache_path),
@@ -313,6 +355,11 @@ def _build_python_artifact(
     # copy lambda's handler to artifacts folder
     _LOG.info(f'Copying lambda\'s handler from {root} to {tmp_artifact_path}')
     _copy_py_files(root, tmp_artifact_path)
+    if optimization:
+        optimize_python_artifact(
+            tmp_artifact_path, optimization,
+            _get_python_versions(lambda_config), LAMBDA_TASK_ROOT,
+            artifact_name)
 
     # making zip archive
     _LOG.info(f'Packaging artifacts by {tmp_artifact_path} to {package_name}')
@@ -330,6 +377,8 @@ def _build_python_artifact(
         shutil.copy2(str(Path(artifact_path, package_name)),
                      str(Path(target_folder, package_name)))
 
+    if optimization:
+        _report_package_size(Path(target_folder, package_name))
     _LOG.info(f'Package \'{package_name}\' was successfully created')
 
     # remove unused folder
@@ -639,3 +688,182 @@ def is_python_package(path: Union[Path, str]) -> bool:
     """A file is considered to be a package if it's a directory containing
     __init__.py"""
     return os.path.isdir(path) and os.path.exists(Path(path, '__init__.py'))
+
+
+def resolve_artifact_optimization(config: dict) -> Optional[dict]:
+    """
+    Returns the settings of the artifact optimization from the lambda or
+    layer config with the defaults applied, or None if it is not enabled:
+    "artifact_optimization": {
+        "exclude": ["**/tests", "**/__pycache__"],
+        "strip": true,
+        "compile": true
+    }
+    `"artifact_optimization": true` enables it with the default settings.
+    """
+    settings = config.get(ARTIFACT_OPTIMIZATION_PARAM)
+    if not settings:
+        return
+    if settings is True:
+        settings = {}
+    if not isinstance(settings, dict):
+        raise InvalidTypeError(
+            f'Parameter \'{ARTIFACT_OPTIMIZATION_PARAM}\' must be type of '
+            f'dict or bool')
+    exclude = settings.get('exclude', DEFAULT_ARTIFACT_EXCLUDES)
+    if isinstance(exclude, str):
+        exclude = [exclude]
+    return {
+        'exclude': list(exclude),
+        'strip': bool(settings.get('strip', False)),
+        'compile': bool(settings.get('compile', True))
+    }
+
+
+def optimize_python_artifact(
+    path: Union[str, Path],
+    settings: dict,
+    python_versions: List[str],
+    target_root: str,
+    artifact_name: str
+) -> ArtifactOptimizationReport:
+    """
+    Post-processes the content of the artifact before it is zipped:
+    removes the files matching the exclusion globs, strips the debug symbols
+    of the native extensions and compiles the sources to bytecode of the
+    lambda python versions.
+
+    :param target_root: the path the content is extracted to by Lambda
+    """
+    size_before = _get_dir_size(path)
+    removed_files = _remove_excluded_files(path, settings['exclude'])
+    stripped_files = _strip_native_extensions(path) \
+        if settings['strip'] else 0
+    compiled_versions = [
+        version for version in python_versions
+        if _compile_python_files(path, version, target_root)
+    ] if settings['compile'] else []
+    report = ArtifactOptimizationReport(
+        size_before=size_before,
+        size_after=_get_dir_size(path),
+        removed_files=removed_files,
+        stripped_files=stripped_files,
+        compiled_versions=compiled_versions)
+    USER_LOG.info(
+        f"Artifact '{artifact_name}' size: "
+        f"{_format_size(report.size_before)} -> "
+        f"{_format_size(report.size_after)} (removed files: "
+        f"{report.removed_files}, stripped native extensions: "
+        f"{report.stripped_files}, compiled for python: "
+        f"{', '.join(report.compiled_versions) or '-'})")
+    return report
+
+
+def _get_python_versions(config: dict) -> List[str]:
+    runtimes = config.get('runtime') or config.get('runtimes') or []
+    if isinstance(runtimes, str):
+        runtimes = [runtimes]
+    return sorted({
+        ''.join(ch for ch in runtime if ch.isdigit() or ch == '.')
+        for runtime in runtimes
+    })
+
+
+def _get_dir_size(path: Union[str, Path]) -> int:
+    size = 0
+    for root, _, files in os.walk(path, followlinks=True):
+        for file_name in files:
+            file_path = os.path.join(root, file_name)
+            if os.path.isfile(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+
+def _report_package_size(package_path: Path) -> None:
+    USER_LOG.info(f"Package '{package_path.name}' size: "
+                  f"{_format_size(os.path.getsize(package_path))}")
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.1f} {unit}' if unit != 'B' else f'{size} {unit}'
+        size /= 1024
+    return f'{size:.1f} GB'
+
+
+def _remove_excluded_files(path: Union[str, Path],
+                           patterns: List[str]) -> int:
+    removed = 0
+    for pattern in patterns:
+        for item in list(Path(path).glob(pattern)):
+            # the item could be removed along with the matched directory
+            if item.is_symlink() or item.is_file():
+                item.unlink()
+                removed += 1
+            elif item.is_dir():
+                removed += sum(len(files) for _, _, files in os.walk(item))
+                shutil.rmtree(item)
+    _LOG.debug(f'{removed} files excluded from the artifact in {path}')
+    return removed
+
+
+def _strip_native_extensions(path: Union[str, Path]) -> int:
+    strip = shutil.which('strip')
+    if not strip:
+        USER_LOG.warning(
+            'Native extensions were not stripped because the \'strip\' tool '
+            'was not found')
+        return 0
+    extensions = sorted({
+        str(item) for pattern in NATIVE_EXTENSION_PATTERNS
+        for item in Path(path).glob(pattern)
+        if item.is_file() and not item.is_symlink()
+    })
+    stripped = 0
+    for i in range(0, len(extensions), STRIP_BATCH_SIZE):
+        batch = extensions[i:i + STRIP_BATCH_SIZE]
+        # -S removes the debug symbols only, the binaries stay loadable
+        result = subprocess.run([strip, '-S', *batch], capture_output=True,
+                                text=True)
+        if result.returncode != 0:
+            USER_LOG.warning(
+                f'Failed to strip native extensions in {path}: '
+                f'{result.stderr.strip()}')
+            continue
+        stripped += len(batch)
+    return stripped
+
+
+def _find_python_interpreter(version: str) -> Optional[str]:
+    if version == f'{sys.version_info.major}.{sys.version_info.minor}':
+        return sys.executable
+    return shutil.which(f'python{version}')
+
+
+def _compile_python_files(path: Union[str, Path], version: str,
+                          target_root: str) -> bool:
+    """
+    Compiles the sources with the interpreter of the given python version.
+    The bytecode is not checked against the sources at runtime because the
+    modification time of the extracted files is not kept, so it is never
+    recompiled on cold start.
+    """
+    interpreter = _find_python_interpreter(version)
+    if not interpreter:
+        USER_LOG.warning(
+            f'Artifact in {path} was not compiled because python {version} '
+            f'interpreter was not found')
+        return False
+    command = [
+        interpreter, '-m', 'compileall', '-q', '-f', '-j', '0',
+        '--invalidation-mode', 'unchecked-hash',
+        '-s', str(path), '-p', target_root, str(path)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        # the files which failed to compile are imported from the sources
+        USER_LOG.warning(
+            f'Some files in {path} were not compiled for python {version}:'
+            f'\n{result.stdout}{result.stderr}')
+    return True
@@ -51,6 +51,8 @@ RDS_DB_CLUSTER_TYPE = 'rds_db_cluster'
 RDS_DB_INSTANCE_TYPE = 'rds_db_instance'
 
 S3_PATH_NAME = 's3_path'
+# base64 encoded sha256 of the deployment package, as AWS reports CodeSha256
+CODE_SHA256 = 'code_sha256'
 EXPORT_DIR_NAME = 'export'
 
 MVN_TARGET_DIR_NAME = 'target'
@@ -183,18 +185,19 @@ UPDATE_RESOURCE_TYPE_PRIORITY = {
     RDS_DB_INSTANCE_TYPE: 4,
     RDS_DB_CLUSTER_TYPE: 5,
     SQS_QUEUE_TYPE: 6,
-    LAMBDA_LAYER_TYPE: 7,
-    LAMBDA_TYPE: 8,
-    API_GATEWAY_TYPE: 9,
-    API_GATEWAY_OAS_V3_TYPE: 10,
-    EC2_LAUNCH_TEMPLATE_TYPE: 11,
-    BATCH_JOBDEF_TYPE: 12,
-    BATCH_COMPENV_TYPE: 13,
-    SWAGGER_UI_TYPE: 14,
-    APPSYNC_TYPE: 15,
-    STEP_FUNCTION_TYPE: 16,
-    CLOUD_WATCH_DASHBOARD_TYPE: 17,
-    EVENT_BRIDGE_SCHEDULE_TYPE: 18,
+    KINESIS_STREAM_TYPE: 7,
+    LAMBDA_LAYER_TYPE: 8,
+    LAMBDA_TYPE: 9,
+    API_GATEWAY_TYPE: 10,
+    API_GATEWAY_OAS_V3_TYPE: 11,
+    EC2_LAUNCH_TEMPLATE_TYPE: 12,
+    BATCH_JOBDEF_TYPE: 13,
+    BATCH_COMPENV_TYPE: 14,
+    SWAGGER_UI_TYPE: 15,
+    APPSYNC_TYPE: 16,
+    STEP_FUNCTION_TYPE: 17,
+    CLOUD_WATCH_DASHBOARD_TYPE: 18,
+    EVENT_BRIDGE_SCHEDULE_TYPE: 19,
 }
 
 RESOURCE_LIST = list(DEPLOY_RESOURCE_TYPE_PRIORITY.keys())
@@ -57,6 +57,7 @@ from syndicate.core.helper import (create_bundle_callback,
                                    generate_default_bundle_name,
                                    resolve_and_verify_bundle_callback,
                                    param_to_lower, verbose_option,
+                                   trace_option,
                                    validate_incompatible_options,
                                    failed_status_code_on_exception,
                                    AliasedCommandsGroup, MultiWordOption,
@@ -346,6 +347,7 @@ def transform(bundle_name, dsl, output_dir):
               help='Flag to automatically clean deployed resources if the'
                    ' deployment is unsuccessful')
 @verbose_option
+@trace_option
 @check_deploy_name_for_duplicates
 @check_deploy_bucket_exists
 @check_bundle_deploy_names_for_existence()
@@ -461,6 +463,7 @@ def deploy(
               help='The flag, to apply updates even if the latest deployment '
                    'failed')
 @verbose_option
+@trace_option
 @check_deploy_name_for_duplicates
 @check_deploy_bucket_exists
 @check_bundle_deploy_names_for_existence()
@@ -557,6 +560,7 @@ def update(
               cls=MultiWordOption, is_flag=True,
               help='Preserve deploy output json file after resources removal')
 @verbose_option
+@trace_option
 def clean(
         clean_only_types: tuple | None = None,
         clean_only_resources: tuple | None = None,
@@ -59,6 +59,8 @@ USER_LOG = get_user_logger()
 
 CONF_PATH = os.environ.get('SDCT_CONF')
 
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+
 
 def unpack_kwargs(handler_func):
     """ Decorator for unpack kwargs.
@@ -1036,16 +1038,69 @@ def verbose_option(func):
     return wrapper
 
 
-def compute_file_hash(file_path: Union[str, Path],
-                      algorithm: str = 'sha256') -> str:
+def enable_api_tracing(ctx, param, value):
+    if not value:
+        return
+    from syndicate.commons.tracing import TRACER
+    TRACER.start(action=ctx.info_name)
+    ctx.call_on_close(export_api_trace)
+
+
+def export_api_trace():
+    """ Stops the AWS API calls tracer, writes the chrome trace file next to
+    the log file and prints the summary of the collected calls.
+    """
+    from syndicate.commons.log_helper import log_file_path
+    from syndicate.commons.tracing import TRACER
+    TRACER.stop()
+    try:
+        trace_path = TRACER.export(os.path.dirname(log_file_path))
+    except OSError as e:
+        USER_LOG.warning(f'Unable to save the trace file: {e}')
+        return
+    USER_LOG.info(
+        f'AWS API calls: {TRACER.calls_count}. Timeline was saved to '
+        f'\'{trace_path}\', open it in https://ui.perfetto.dev or '
+        f'chrome://tracing')
+    summary = TRACER.format_summary()
+    if summary:
+        USER_LOG.info(f'AWS API calls summary:\n{summary}')
+
+
+def trace_option(func):
+    @click.option('--trace', is_flag=True, callback=enable_api_tracing,
+                  expose_value=False, is_eager=True,
+                  help='Flag to trace AWS API calls and save the timeline '
+                       'of the command execution in Chrome trace format')
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _hash_file(file_path: Union[str, Path], algorithm: str):
     hash_obj = hashlib.new(algorithm)
     with open(file_path, 'rb') as f:
         while True:
-            chunk = f.read(4096)
+            chunk = f.read(FILE_HASH_CHUNK_SIZE)
             if not chunk:
                 break
             hash_obj.update(chunk)
-    return hash_obj.hexdigest()
+    return hash_obj
+
+
+def compute_file_hash(file_path: Union[str, Path],
+                      algorithm: str = 'sha256') -> str:
+    return _hash_file(file_path, algorithm).hexdigest()
+
+
+def compute_file_base64_hash(file_path: Union[str, Path],
+                             algorithm: str = 'sha256') -> str:
+    """ Returns the file digest in the format AWS uses for the code hashes,
+    e.g. `CodeSha256` of a lambda or a lambda layer version """
+    import base64
+    return base64.b64encode(_hash_file(file_path, algorithm).digest()).decode()
 
 
 def compute_string_hash(input_string: str,
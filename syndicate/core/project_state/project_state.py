@@ -14,6 +14,7 @@
     limitations under the License.
 """
 import getpass
+import json
 import os
 import re
 import sys
@@ -45,6 +46,7 @@ STATE_LAMBDAS = 'lambdas'
 STATE_BUILD_PROJECT_MAPPING = 'build_projects_mapping'
 STATE_LOG_EVENTS = 'events'
 STATE_LATEST_DEPLOY = 'latest_deploy'
+STATE_LAMBDA_LAYERS = 'lambda_layers'
 LOCK_LOCKED_TILL = 'locked_till'
 LOCK_IS_LOCKED = 'is_locked'
 LOCK_LAST_MODIFICATION_DATE = 'last_modification_date'
@@ -53,6 +55,8 @@ LOCK_INITIATOR = 'initiator'
 MODIFICATION_LOCK = 'modification_lock'
 WARMUP_LOCK = 'warm_up_lock'
 PROJECT_STATE_FILE = '.syndicate'
+# the execution events are kept apart from the state, one json per line
+PROJECT_EVENTS_FILE = '.syndicate_events'
 LAMBDA_CONFIG_FILE = 'lambda_config.json'
 
 BUILD_MAPPINGS = {
@@ -74,10 +78,39 @@ OPERATION_LOCK_MAPPINGS = {
 }
 KEEP_EVENTS_DAYS = 30
 LEAVE_LATEST_EVENTS = 20
+# the events log is compacted by the retention when it outgrows the size
+EVENTS_LOG_COMPACTION_SIZE = 256 * 1024
+
+# libyaml based loaders and dumper are used when PyYAML is built with it
+YAML_SAFE_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_UNSAFE_LOADER = getattr(yaml, 'CUnsafeLoader', yaml.UnsafeLoader)
+YAML_DUMPER = getattr(yaml, 'CDumper', yaml.Dumper)
 
 _LOG = get_logger(__name__)
 
 
+def retain_events(events: list, now: datetime = None) -> list:
+    """ Drops the events ended more than KEEP_EVENTS_DAYS days ago, but
+    keeps at least LEAVE_LATEST_EVENTS latest events.
+
+    :param events: events sorted from the latest
+    """
+    now = now or datetime.fromtimestamp(time.time())
+    # the timestamps of the format are ordered as strings
+    expired_before = (now - timedelta(days=KEEP_EVENTS_DAYS + 1)).strftime(
+        DATE_FORMAT_ISO_8601)
+    index_out_days = next(
+        (i for i, event in enumerate(events)
+         if (event.get('time_end') or '') <= expired_before), None)
+    if index_out_days is None:
+        return events
+    return events[:max(index_out_days, LEAVE_LATEST_EVENTS)]
+
+
+def _event_key(event: dict) -> str:
+    return json.dumps(event, sort_keys=True, default=str)
+
+
 class ProjectState:
 
     def __init__(self, project_path: str = None, dct: dict = None):
@@ -91,12 +124,17 @@ class ProjectState:
             raise InternalError(
                 "Either 'project_path' or 'dct' of both must be specified!"
             )
+        self.events_path = None
         if project_path:
             self.project_path = project_path
             self.state_path = os.path.join(CONF_PATH, PROJECT_STATE_FILE)
+            self.events_path = os.path.join(CONF_PATH, PROJECT_EVENTS_FILE)
         self.dct = dct if dct else self.__load_project_state_file()
+        self._events = None
         self._current_deploy = None
         self._current_bundle = None
+        if self.events_path and STATE_LOG_EVENTS in self.dct:
+            self.__move_events_to_log()
 
     @staticmethod
     def generate(project_path, project_name):
@@ -132,7 +170,8 @@ class ProjectState:
         s3 = CONN.s3()
         remote_project_state = s3.load_file_body(bucket_name=bucket_name,
                                                  key=key_compound)
-        remote_project_state = yaml.unsafe_load(remote_project_state)
+        remote_project_state = yaml.load(remote_project_state,
+                                         Loader=YAML_UNSAFE_LOADER)
         _LOG.info(f'Unsafely loaded project state file from S3 bucket. The '
                   f'retrieved object has type: '
                   f'{type(remote_project_state).__name__}')
@@ -147,21 +186,23 @@ class ProjectState:
         return remote_project_state
 
     def save_to_remote(self, project_state_to_save: 'ProjectState' = None):
-        dict_to_save = project_state_to_save.dct if \
-            project_state_to_save else self.dct
+        # the remote state keeps the events inline
+        dict_to_save = (project_state_to_save or self).dct_with_events
         from syndicate.core import CONN, CONFIG
         bucket_name = CONFIG.deploy_target_bucket
         key_compound = PurePath(CONFIG.deploy_target_bucket_key_compound,
                                 PROJECT_STATE_FILE).as_posix()
         s3 = CONN.s3()
-        s3.put_object(file_obj=yaml.dump(dict_to_save, sort_keys=False),
+        s3.put_object(file_obj=yaml.dump(dict_to_save, Dumper=YAML_DUMPER,
+                                         sort_keys=False),
                       key=key_compound,
                       bucket=bucket_name,
                       content_type='application/x-yaml')
 
     def save(self):
         with open(self.state_path, 'w') as state_file:
-            yaml.dump(self.dct, state_file, sort_keys=False)
+            yaml.dump(self.dct, state_file, Dumper=YAML_DUMPER,
+                      sort_keys=False)
 
     @property
     def name(self):
@@ -198,8 +239,25 @@ class ProjectState:
             return dict()
         return lambdas
 
+    @property
+    def lambda_layers(self):
+        """ Index of the deployed lambda layers versions:
+        {layer arn: {code sha256: layer version arn}} """
+        lambda_layers = self.dct.get(STATE_LAMBDA_LAYERS)
+        if not lambda_layers:
+            lambda_layers = dict()
+            self.dct.update({STATE_LAMBDA_LAYERS: lambda_layers})
+        return lambda_layers
+
     @property
     def events(self):
+        """ Execution events sorted from the latest. The events of the
+        local project state are read from the events log on first access.
+        """
+        if self.events_path:
+            if self._events is None:
+                self._events = self.__load_events_log()
+            return self._events
         events = self.dct.get(STATE_LOG_EVENTS)
         if not events:
             events = []
@@ -208,7 +266,16 @@ class ProjectState:
 
     @events.setter
     def events(self, events):
-        self.dct.update({STATE_LOG_EVENTS: events})
+        if self.events_path:
+            self._events = events
+        else:
+            self.dct.update({STATE_LOG_EVENTS: events})
+
+    @property
+    def dct_with_events(self) -> dict:
+        if not self.events_path:
+            return self.dct
+        return {**self.dct, STATE_LOG_EVENTS: self.events}
 
     @property
     def latest_deploy(self):
@@ -362,6 +429,12 @@ class ProjectState:
         elif remote_deploy:
             self.latest_deploy = remote_deploy
 
+    def actualize_lambda_layers(self, other_project_state: 'ProjectState'):
+        for layer_arn, versions in other_project_state.lambda_layers.items():
+            local_versions = self.lambda_layers.setdefault(layer_arn, {})
+            for code_sha256, version_arn in versions.items():
+                local_versions.setdefault(code_sha256, version_arn)
+
     def refresh_state(self):
         """
         Refreshes current Project State, be resolving
@@ -622,6 +695,10 @@ class ProjectState:
         kwargs = {
             key: value for key, value in kwargs.items() if value is not None
         }
+        if self.events_path:
+            self.__append_event(kwargs)
+            self.save()
+            return
         self.events.insert(0, kwargs)
         self.__save_events()
 
@@ -638,10 +715,17 @@ class ProjectState:
         self.save_to_remote(project_state_to_save=remote_project_state)
 
     def add_execution_events(self, events):
-        for event in events:
-            if event not in self.events:
-                self.events.append(event)
-        self.events.sort(key=lambda e: e.get('time_end'), reverse=True)
+        known_events = {_event_key(event) for event in self.events}
+        new_events = [event for event in events
+                      if _event_key(event) not in known_events]
+        if not new_events:
+            return
+        self.events.extend(new_events)
+        self.events.sort(key=lambda e: e.get('time_end') or '', reverse=True)
+        if self.events_path:
+            self.events = retain_events(self.events)
+            self.__write_events_log()
+            return
         self.__save_events()
 
     def __modify_lock_state(self, lock_name, locked):
@@ -680,23 +764,56 @@ class ProjectState:
                 f"There is no '.syndicate' file in '{CONF_PATH}'"
             )
         with open(self.state_path) as state_file:
-            return yaml.safe_load(state_file.read())
+            return yaml.load(state_file, Loader=YAML_SAFE_LOADER)
 
     def __save_events(self):
-        current_time = datetime.fromtimestamp(time.time())
-        index_out_days = None
-        for i, event in enumerate(self.events):
-            if (current_time -
-                datetime.strptime(event.get('time_end'),
-                                  DATE_FORMAT_ISO_8601)).days > KEEP_EVENTS_DAYS:
-                index_out_days = i
-                break
-
-        if index_out_days:
-            if index_out_days >= LEAVE_LATEST_EVENTS:
-                self.events = self.events[:index_out_days]
-            else:
-                self.events = self.events[:LEAVE_LATEST_EVENTS]
+        self.events = retain_events(self.events)
+        if getattr(self, 'state_path', None):
+            self.save()
+
+    def __load_events_log(self) -> list:
+        events = []
+        if not os.path.exists(self.events_path):
+            return events
+        with open(self.events_path) as events_file:
+            for line in events_file:
+                if not line.strip():
+                    continue
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # e.g. the line was being written when the run was killed
+                    _LOG.warning(f'Skipping malformed event in '
+                                 f'{self.events_path}: {line.strip()}')
+        # the log is written from the earliest event
+        events.reverse()
+        events.sort(key=lambda e: e.get('time_end') or '', reverse=True)
+        return retain_events(events)
+
+    def __write_events_log(self):
+        tmp_path = f'{self.events_path}.tmp'
+        with open(tmp_path, 'w') as events_file:
+            for event in reversed(self.events):
+                events_file.write(json.dumps(event, default=str) + '\n')
+        os.replace(tmp_path, self.events_path)
+
+    def __append_event(self, event: dict):
+        if self._events is not None:
+            self._events.insert(0, event)
+        with open(self.events_path, 'a') as events_file:
+            events_file.write(json.dumps(event, default=str) + '\n')
+        if os.path.getsize(self.events_path) > EVENTS_LOG_COMPACTION_SIZE:
+            _LOG.debug(f'Compacting the events log {self.events_path}')
+            self.events = retain_events(self.events)
+            self.__write_events_log()
+
+    def __move_events_to_log(self):
+        """ Moves the events kept in the state file by the previous
+        versions to the events log """
+        legacy_events = self.dct.pop(STATE_LOG_EVENTS) or []
+        _LOG.info(f'Moving {len(legacy_events)} events from the project '
+                  f'state to {self.events_path}')
+        self.add_execution_events(legacy_events)
         self.save()
 
     @staticmethod
@@ -1,22 +1,25 @@
-import io
+import hashlib
 import os.path
 import posixpath
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
-from zipfile import ZipFile
 
 from botocore.exceptions import ClientError
 
 from syndicate.exceptions import ArtifactError, \
     ResourceProcessingError, ResourceNotFoundError, ParameterError
 from syndicate.commons.log_helper import get_logger, get_user_logger
+from syndicate.connection.appsync_connection import \
+    DATA_SOURCE_TYPE_CONFIG_MAPPING as API_DATA_SOURCE_CONFIG_KEYS, \
+    SCHEMA_CREATION_TIMEOUT_SEC
 from syndicate.core.constants import ARTIFACTS_FOLDER
 from syndicate.core.helper import build_path, unpack_kwargs, \
     dict_keys_to_camel_case
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import validate_params, \
-    build_description_obj
+    build_description_obj, extract_deployment_package
 
 _LOG = get_logger(__name__)
 USER_LOG = get_user_logger()
@@ -45,6 +48,69 @@ DATA_SOURCE_TYPE_CONFIG_MAPPING = {
 
 ONE_DAY_IN_SECONDS = 86400
 
+# the hash of the last applied schema is kept in the API tags, so the
+# unchanged schema is not uploaded again
+SCHEMA_SHA256_TAG = 'syndicate:schema_sha256'
+# number of the concurrent reads of the API entities; the changes of one
+# API are applied one by one, AppSync rejects the concurrent ones with
+# ConcurrentModificationException
+RECONCILE_WORKERS = 8
+CODE_DEFINITION_KEYS = ('code', 'requestMappingTemplate',
+                        'responseMappingTemplate')
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def normalize_definition(definition: dict) -> dict:
+    """ Brings the definition of a data source, function or resolver in
+    the AppSync API shape to the comparable form: the empty values are
+    dropped and the code and mapping templates are replaced with their
+    hashes.
+    """
+    result = {}
+    for key, value in definition.items():
+        if value is None:
+            continue
+        if key in CODE_DEFINITION_KEYS and isinstance(value, str):
+            value = _sha256(value)
+        result[key] = value
+    return result
+
+
+def _is_subset(desired, existing) -> bool:
+    if isinstance(desired, dict):
+        return isinstance(existing, dict) and all(
+            _is_subset(value, existing.get(key))
+            for key, value in desired.items())
+    return desired == existing
+
+
+def is_definition_changed(desired: dict, existing: dict) -> bool:
+    """ The existing definition contains the defaults and the read-only
+    attributes, so only the values set in the desired one are compared """
+    return not _is_subset(normalize_definition(desired),
+                          normalize_definition(existing))
+
+
+def _data_source_definition(params: dict) -> dict:
+    definition = {
+        'name': params['name'],
+        'type': params['source_type'],
+        'description': params.get('description'),
+        'serviceRoleArn': params.get('service_role_arn')
+    }
+    config_key = API_DATA_SOURCE_CONFIG_KEYS.get(params['source_type'])
+    if config_key and params.get('source_config'):
+        definition[config_key] = dict_keys_to_camel_case(
+            params['source_config'])
+    return definition
+
+
+def _resolver_key(definition: dict) -> tuple:
+    return definition['typeName'], definition['fieldName']
+
 
 class AppSyncResource(BaseResource):
 
@@ -67,7 +133,7 @@ class AppSyncResource(BaseResource):
 
         :type args: list
         """
-        return self.create_pool(self._create_graphql_api_from_meta, args, 1)
+        return self.create_pool(self._create_graphql_api_from_meta, args)
 
     @unpack_kwargs
     def _create_graphql_api_from_meta(self, name, meta):
@@ -142,53 +208,13 @@ class AppSyncResource(BaseResource):
             self.appsync_conn.create_api_key(api_id, expires=api_key_expires)
 
         if schema_path := meta.get('schema_path'):
-            schema_full_path = build_path(extract_to, schema_path)
-            if not extract_to or not os.path.exists(schema_full_path):
-                raise ArtifactError(
-                    f'\'{schema_full_path}\' file not found for '
-                    f'AppSync \'{name}\''
-                )
+            self._apply_schema(
+                name, api_id, self.build_graphql_api_arn(api_id),
+                build_path(extract_to, schema_path), extract_to,
+                timeout=meta.get('schema_creation_timeout',
+                                 SCHEMA_CREATION_TIMEOUT_SEC))
 
-            with open(schema_full_path, 'r', encoding='utf-8') as file:
-                schema_definition = file.read()
-
-            status, details = \
-                self.appsync_conn.create_schema(api_id, schema_definition)
-            if status != 'SUCCESS':
-                error_message = (
-                    f"An error occurred when creating schema. "
-                    f"Operation status: '{status}'. ")
-                if details:
-                    error_message += f"Details: '{details}'"
-                raise ResourceProcessingError(error_message)
-            else:
-                _LOG.info(
-                    f"Schema of the AppSync '{name}' created successfully")
-
-        data_sources_meta = meta.get('data_sources', [])
-        for data_source_meta in data_sources_meta:
-            params = self._build_data_source_params_from_meta(data_source_meta)
-            if not params:
-                continue
-            self.appsync_conn.create_data_source(api_id, **params)
-
-        functions_config = []
-        functions_meta = meta.get('functions', [])
-        for func_meta in functions_meta:
-            params = self._build_function_params_from_meta(
-                func_meta, extract_to)
-            if not params:
-                continue
-            func_config = self.appsync_conn.create_function(api_id, params)
-            functions_config.append(func_config)
-
-        resolvers_meta = meta.get('resolvers', [])
-        for resolver_meta in resolvers_meta:
-            params = self._build_resolver_params_from_meta(
-                resolver_meta, extract_to, functions_config)
-            if not params:
-                continue
-            self.appsync_conn.create_resolver(api_id, **params)
+        self._reconcile_api_entities(name, api_id, meta, extract_to)
 
         if extract_to:
             shutil.rmtree(extract_to, ignore_errors=True)
@@ -492,7 +518,7 @@ class AppSyncResource(BaseResource):
                 raise e
 
     def update_graphql_api(self, args):
-        return self.create_pool(self._update_graphql_api, args, 1)
+        return self.create_pool(self._update_graphql_api, args)
 
     @unpack_kwargs
     def _update_graphql_api(self, name, meta, context):
@@ -563,157 +589,202 @@ class AppSyncResource(BaseResource):
                     api_id, expires=api_key_expires)
 
         if schema_path := meta.get('schema_path'):
-            schema_full_path = build_path(extract_to, schema_path)
-            if not extract_to or not os.path.exists(schema_full_path):
-                raise ArtifactError(
-                    f'\'{schema_full_path}\' file not found for '
-                    f'AppSync \'{name}\'')
-
-            with open(schema_full_path, 'r', encoding='utf-8') as file:
-                schema_definition = file.read()
-
-            status, details = \
-                self.appsync_conn.create_schema(api_id, schema_definition)
-            if status != 'SUCCESS':
-                error_message = (
-                    f"An error occurred when updating schema. "
-                    f"Operation status: '{status}'. ")
-                if details:
-                    error_message += f"Details: '{details}'"
-                raise ResourceProcessingError(error_message)
-            else:
-                _LOG.info(
-                    f"Schema of the AppSync '{name}' updated successfully")
-
-        existent_sources = self.appsync_conn.list_data_sources(api_id)
-        data_sources_meta = meta.get('data_sources', [])
-        for source_meta in data_sources_meta:
-            to_create = True
-            for source in existent_sources:
-                if source['name'] == source_meta['name']:
-                    # update an existent one
-                    to_create = False
-                    params = self._build_data_source_params_from_meta(
-                        source_meta)
-                    if not params:
-                        break
-                    _LOG.debug(f"Updating data source '{source['name']}'")
-                    self.appsync_conn.update_data_source(api_id, **params)
-                    existent_sources.remove(source)
-                    break
-
-            # create a new one
-            if to_create:
-                params = self._build_data_source_params_from_meta(source_meta)
-                if not params:
-                    continue
-                _LOG.debug(f"Creating data source '{source_meta['name']}'")
-                self.appsync_conn.create_data_source(api_id, **params)
-
-        for source in existent_sources:
-            self.appsync_conn.delete_data_source(api_id, source['name'])
-
-        actual_funcs = []
-        existent_funcs = self.appsync_conn.list_functions(api_id)
-        funcs_meta = meta.get('functions', [])
-        for func_meta in funcs_meta:
-            to_create = True
-            for func_conf in existent_funcs:
-                if func_meta['name'] == func_conf['name']:
-                    # update an existent one
-                    to_create = False
-                    params = self._build_function_params_from_meta(
-                        func_meta, extract_to
-                    )
-                    if not params:
-                        break
-                    _LOG.debug(f"Updating function '{func_conf['name']}'")
-                    actual_funcs.append(
-                        self.appsync_conn.update_function(
-                            api_id, func_conf['functionId'], params))
-                    existent_funcs.remove(func_conf)
-                    break
-            # create a new one
-            if to_create:
-                params = self._build_function_params_from_meta(
-                    func_meta, extract_to
-                )
-                if not params:
-                    break
-                _LOG.debug(f"Creating function '{func_meta['name']}'")
-                actual_funcs.append(
-                    self.appsync_conn.create_function(api_id, params))
-
-        types = self.appsync_conn.list_types(api_id)
-        existent_resolvers = []
-        for t in types:
-            existent_resolvers.extend(
-                self.appsync_conn.list_resolvers(api_id, t['name']))
-        resolvers_meta = meta.get('resolvers', [])
-
-        for resolver_meta in resolvers_meta:
-            to_create = True
-            for resolver in existent_resolvers:
-                if resolver['typeName'] == resolver_meta['type_name'] and \
-                        resolver['fieldName'] == resolver_meta['field_name']:
-                    # update an existent one
-                    to_create = False
-                    params = self._build_resolver_params_from_meta(
-                            resolver_meta, extract_to, actual_funcs)
-                    if not params:
-                        break
-                    _LOG.debug(
-                        f"Updating resolver for type '{resolver['typeName']}' "
-                        f"and field '{resolver['fieldName']}'")
-                    self.appsync_conn.update_resolver(api_id, **params)
-                    existent_resolvers.remove(resolver)
-                    break
-
-            # create a new one
-            if to_create:
-                params = self._build_resolver_params_from_meta(
-                            resolver_meta, extract_to, actual_funcs)
-                if not params:
-                    continue
-                _LOG.debug(
-                    f"Creating resolver for type '{resolver_meta['typeName']}' "
-                    f"and field '{resolver_meta['fieldName']}'")
-                self.appsync_conn.create_resolver(api_id, **params)
-
-        for resolver in existent_resolvers:
-            self.appsync_conn.delete_resolver(api_id,
-                                              type_name=resolver['typeName'],
-                                              field_name=resolver['fieldName'])
-
-        for func_conf in existent_funcs:
-            self.appsync_conn.delete_function(api_id, func_conf['functionId'])
+            self._apply_schema(
+                name, api_id, api['arn'], build_path(extract_to, schema_path),
+                extract_to,
+                applied_sha256=(api.get('tags') or {}).get(SCHEMA_SHA256_TAG),
+                timeout=meta.get('schema_creation_timeout',
+                                 SCHEMA_CREATION_TIMEOUT_SEC),
+                is_update=True)
+
+        self._reconcile_api_entities(name, api_id, meta, extract_to,
+                                     self._get_api_entities(api_id))
 
         _LOG.info(f'Updated AppSync GraphQL API {api_id}')
         return self.describe_graphql_api(name=name, meta=meta, api_id=api_id)
 
+    def _apply_schema(self, name, api_id, api_arn, schema_full_path,
+                      artifacts_path, applied_sha256=None,
+                      timeout=SCHEMA_CREATION_TIMEOUT_SEC, is_update=False):
+        if not artifacts_path or not os.path.exists(schema_full_path):
+            raise ArtifactError(
+                f'\'{schema_full_path}\' file not found for '
+                f'AppSync \'{name}\'')
+
+        with open(schema_full_path, 'r', encoding='utf-8') as file:
+            schema_definition = file.read()
+        schema_sha256 = _sha256(schema_definition)
+        if schema_sha256 == applied_sha256:
+            _LOG.info(f"Schema of the AppSync '{name}' is not changed, "
+                      f"skipping its update")
+            return
+
+        def log_progress(status, details):
+            _LOG.debug(f"Schema of the AppSync '{name}' status: '{status}'. "
+                       f"{details}")
+
+        status, details = self.appsync_conn.create_schema(
+            api_id, schema_definition, timeout=timeout,
+            progress_callback=log_progress)
+        if status != 'SUCCESS':
+            error_message = (
+                f"An error occurred when "
+                f"{'updating' if is_update else 'creating'} schema. "
+                f"Operation status: '{status}'. ")
+            if details:
+                error_message += f"Details: '{details}'"
+            raise ResourceProcessingError(error_message)
+        _LOG.info(f"Schema of the AppSync '{name}' "
+                  f"{'updated' if is_update else 'created'} successfully")
+        try:
+            self.appsync_conn.tag_graphql_api(
+                api_arn, {SCHEMA_SHA256_TAG: schema_sha256})
+        except ClientError as e:
+            _LOG.warning(f"The hash of the AppSync '{name}' schema is not "
+                         f"saved, the schema will be uploaded on the next "
+                         f"update: {e}")
+
+    def _get_api_entities(self, api_id):
+        """ Fetches the data sources, functions and resolvers of the API
+        concurrently.
+
+        :returns tuple of the data sources, functions and resolvers lists
+        """
+        data_sources, functions, types = self._run_concurrently(
+            lambda list_entities: list_entities(api_id),
+            [self.appsync_conn.list_data_sources,
+             self.appsync_conn.list_functions,
+             self.appsync_conn.list_types])
+        resolvers_by_type = self._run_concurrently(
+            lambda type_: self.appsync_conn.list_resolvers(
+                api_id, type_['name']),
+            types or [])
+        resolvers = [resolver for type_resolvers in resolvers_by_type
+                     for resolver in type_resolvers or []]
+        return data_sources or [], functions or [], resolvers
+
+    def _reconcile_api_entities(self, name, api_id, meta, artifacts_path,
+                                existing_entities=None):
+        """ Creates and updates the data sources, functions and resolvers
+        which differ from the existing ones and removes the ones absent in
+        meta. The independent requests are made concurrently.
+
+        :param existing_entities: tuple of the existing data sources,
+            functions and resolvers, None for a new API
+        """
+        sources, funcs, resolvers = existing_entities or ([], [], [])
+        conn = self.appsync_conn
+
+        sources_params = [
+            params for params in map(self._build_data_source_params_from_meta,
+                                     meta.get('data_sources', []))
+            if params]
+        _, stale_sources = self._reconcile(
+            name, 'data sources', sources_params, sources,
+            definition=_data_source_definition,
+            key=lambda definition: definition['name'],
+            create=lambda params, _: conn.create_data_source(
+                api_id, **params),
+            update=lambda params, _: conn.update_data_source(
+                api_id, **params))
+
+        funcs_params = [
+            params for params in (
+                self._build_function_params_from_meta(func_meta,
+                                                      artifacts_path)
+                for func_meta in meta.get('functions', []))
+            if params]
+        actual_funcs, stale_funcs = self._reconcile(
+            name, 'functions', funcs_params, funcs,
+            definition=dict_keys_to_camel_case,
+            key=lambda definition: definition['name'],
+            create=lambda params, _: conn.create_function(api_id, params),
+            update=lambda params, current: conn.update_function(
+                api_id, current['functionId'], params))
+
+        resolvers_params = [
+            params for params in (
+                self._build_resolver_params_from_meta(
+                    resolver_meta, artifacts_path, actual_funcs)
+                for resolver_meta in meta.get('resolvers', []))
+            if params]
+        _, stale_resolvers = self._reconcile(
+            name, 'resolvers', resolvers_params, resolvers,
+            definition=dict_keys_to_camel_case, key=_resolver_key,
+            create=lambda params, _: conn.create_resolver(api_id, **params),
+            update=lambda params, _: conn.update_resolver(api_id, **params))
+
+        # the stale entities are removed after their dependants
+        for resolver in stale_resolvers:
+            conn.delete_resolver(api_id, type_name=resolver['typeName'],
+                                 field_name=resolver['fieldName'])
+        for func in stale_funcs:
+            conn.delete_function(api_id, func['functionId'])
+        for source in stale_sources:
+            conn.delete_data_source(api_id, source['name'])
+
+    def _reconcile(self, name, entities_type, desired_params, existing,
+                   definition, key, create, update):
+        """ Applies the desired params of the entities of one type.
+
+        :param definition: function converting the params to the AppSync
+            API shape
+        :param key: function returning the identity of the definition
+        :param create: function of the params and None
+        :param update: function of the params and the existing entity
+        :returns tuple of the actual entities and the not desired
+            existing ones
+        """
+        existing_by_key = {key(entity): entity for entity in existing}
+        actual, changes = [], []
+        for params in desired_params:
+            desired = definition(params)
+            current = existing_by_key.pop(key(desired), None)
+            if current is None:
+                changes.append((create, params, None))
+            elif is_definition_changed(desired, current):
+                changes.append((update, params, current))
+            else:
+                actual.append(current)
+        _LOG.info(f"AppSync '{name}' {entities_type}: "
+                  f"{len(changes)} to create or update, "
+                  f"{len(actual)} not changed, "
+                  f"{len(existing_by_key)} to remove")
+        # the changes of the same API can not be applied concurrently
+        results = [apply(params, current)
+                   for apply, params, current in changes]
+        actual.extend(result for result in results if result)
+        return actual, list(existing_by_key.values())
+
+    @staticmethod
+    def _run_concurrently(func, items):
+        """ Applies the function to the items in a thread pool.
+
+        :returns the results in the order of the items
+        """
+        items = list(items)
+        if len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(min(RECONCILE_WORKERS, len(items))) \
+                as executor:
+            return list(executor.map(func, items))
+
     def _extract_zip(self, path: str, name: str):
         from syndicate.core import PROJECT_STATE
 
         extract_to = PurePath(self.conf_path, ARTIFACTS_FOLDER,
                               name).as_posix()
+        artifact_key = posixpath.join(PROJECT_STATE.current_bundle, path)
         artifact_src_path = posixpath.join(
-            self.deploy_target_bucket_key_compound,
-            PROJECT_STATE.current_bundle, path)
+            self.deploy_target_bucket_key_compound, artifact_key)
 
-        if not self.s3_conn.is_file_exists(self.deploy_target_bucket,
-                                           artifact_src_path):
+        _LOG.info(f'Extracting an artifact for Appsync \'{name}\'')
+        if not extract_deployment_package(
+                self.s3_conn, self.deploy_target_bucket, artifact_src_path,
+                artifact_key, extract_to):
             raise ArtifactError(
                 f"Deployment package for Appsync '{name}' not found by the "
                 f"path '{artifact_src_path}'")
-
-        _LOG.info(f'Downloading an artifact for Appsync \'{name}\'')
-        with io.BytesIO() as artifact:
-            self.s3_conn.download_to_file(
-                    bucket_name=self.deploy_target_bucket,
-                    key=artifact_src_path,
-                    file=artifact)
-            with ZipFile(artifact, 'r') as zf:
-                zf.extractall(extract_to)
         return extract_to
 
     def _process_extra_auth(self, extra_auth_types, api_name):
@@ -15,11 +15,13 @@
 """
 import concurrent
 import traceback
-from concurrent.futures import ALL_COMPLETED
+from concurrent.futures import ALL_COMPLETED, Future
 from concurrent.futures.thread import ThreadPoolExecutor
 from botocore.exceptions import ClientError, BotoCoreError
 
 from syndicate.commons import deep_get
+from syndicate.commons.tracing import TRACER
+from syndicate.connection.helper import resolved
 from syndicate.exceptions import SyndicateBaseError
 from syndicate.commons.log_helper import get_logger
 
@@ -35,53 +37,106 @@ class BaseResource:
         :type parameters: iterable
         :type job: func
         """
-        exceptions = []
         executor = ThreadPoolExecutor(
             workers) if workers else ThreadPoolExecutor()
         futures_dict = {}
         try:
             # futures = [executor.submit(func, i, kwargs) for i in args]
-            futures = []
             for param_chunk in parameters:
                 param_chunk['self'] = self
-                future = executor.submit(job, param_chunk)
-                futures.append(future)
+                future = executor.submit(self._traced_job, job, param_chunk)
                 futures_dict[future] = param_chunk
-            concurrent.futures.wait(futures, return_when=ALL_COMPLETED)
-            responses = {}
-            for future in futures:
-                try:
-                    result = future.result()
-                    if result:
-                        responses.update(result)
-                except Exception as e:
-                    param_chunk = futures_dict[future]
-                    resource_name = (
-                            param_chunk.get('name') or
-                            deep_get(
-                                param_chunk,
-                                ['config', 'resource_name'],
-                                'Unknown'))
-                    if isinstance(e, (ClientError, BotoCoreError)):
-                        exceptions.append(
-                            f'When processing the resource {resource_name} {e}'
-                        )
-                    elif isinstance(e, SyndicateBaseError):
-                        exceptions.append(
-                            f'When processing the resource {resource_name} '
-                            f'occurred {e.__class__.__name__} {e}'
-                        )
-                    else:
-                        exceptions.append(
-                            f'When processing the resource {resource_name} '
-                            f'occurred an unexpected error '
-                            f'({e.__class__.__name__}) {e}'
-                        )
-                    _LOG.exception(
-                        f'An error occurred when processing the resource '
-                        f'\'{resource_name}\'. {traceback.format_exc()}'
-                    )
-
-            return (responses, exceptions) if exceptions else responses
+            return self.collect_pool_results(futures_dict)
         finally:
             executor.shutdown(wait=True)
+
+    def submit_when_ready(self, executor, job, param_chunk, ready=None):
+        """ Submits the job to the executor as soon as the `ready` future is
+        done, the failure of `ready` fails the job. The job may return a
+        future, e.g. of a resource being watched, then its result is the
+        result of the job, so no worker is blocked while waiting for it.
+
+        :type executor: ThreadPoolExecutor
+        :type job: func
+        :type param_chunk: dict
+        :type ready: Future
+        :returns Future of the job result
+        """
+        param_chunk['self'] = self
+        result = Future()
+
+        def on_job_done(future):
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+            elif isinstance(future.result(), Future):
+                future.result().add_done_callback(on_job_done)
+            else:
+                result.set_result(future.result())
+
+        def on_ready(future):
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+                return
+            executor.submit(self._traced_job, job, param_chunk) \
+                .add_done_callback(on_job_done)
+
+        (ready or resolved()).add_done_callback(on_ready)
+        return result
+
+    @staticmethod
+    def collect_pool_results(futures_dict):
+        """ Waits for the futures of the jobs and merges their results.
+
+        :param futures_dict: the futures of the jobs to their parameters
+        :type futures_dict: dict
+        :returns the merged results or tuple of them and the errors
+        """
+        exceptions = []
+        concurrent.futures.wait(futures_dict, return_when=ALL_COMPLETED)
+        responses = {}
+        for future, param_chunk in futures_dict.items():
+            try:
+                result = future.result()
+                if result:
+                    responses.update(result)
+            except Exception as e:
+                resource_name = (
+                        param_chunk.get('name') or
+                        deep_get(
+                            param_chunk,
+                            ['config', 'resource_name'],
+                            'Unknown'))
+                if isinstance(e, (ClientError, BotoCoreError)):
+                    exceptions.append(
+                        f'When processing the resource {resource_name} {e}'
+                    )
+                elif isinstance(e, SyndicateBaseError):
+                    exceptions.append(
+                        f'When processing the resource {resource_name} '
+                        f'occurred {e.__class__.__name__} {e}'
+                    )
+                else:
+                    exceptions.append(
+                        f'When processing the resource {resource_name} '
+                        f'occurred an unexpected error '
+                        f'({e.__class__.__name__}) {e}'
+                    )
+                _LOG.exception(
+                    f'An error occurred when processing the resource '
+                    f'\'{resource_name}\'. {traceback.format_exc()}'
+                )
+
+        return (responses, exceptions) if exceptions else responses
+
+    @staticmethod
+    def _traced_job(job, param_chunk):
+        if not TRACER.enabled:
+            return job(param_chunk)
+        meta = param_chunk.get('meta') or \
+            deep_get(param_chunk, ['config', 'resource_meta'], {})
+        resource_type = meta.get('resource_type') \
+            if isinstance(meta, dict) else None
+        resource_name = param_chunk.get('name') or deep_get(
+            param_chunk, ['config', 'resource_name'], job.__name__)
+        with TRACER.span(name=resource_name, resource_type=resource_type):
+            return job(param_chunk)
@@ -13,11 +13,12 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-from botocore.waiter import WaiterError
+from concurrent.futures import ThreadPoolExecutor
 
 from syndicate.exceptions import ResourceNotFoundError, \
     InvalidValueError
 from syndicate.commons.log_helper import get_logger
+from syndicate.connection.helper import then
 from syndicate.core.helper import unpack_kwargs
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import build_description_obj
@@ -37,8 +38,19 @@ class BatchComputeEnvironmentResource(BaseResource):
         self.account_id = account_id
 
     def create_compute_environment(self, args):
-        return self.create_pool(self._create_compute_environment_from_meta,
-                                args)
+        """ The environments are requested by the pool at once and their
+        statuses are polled together by the compute environments watcher.
+        """
+        with ThreadPoolExecutor() as executor:
+            return self.collect_pool_results(
+                self.submit_compute_environments(executor, args))
+
+    def submit_compute_environments(self, executor, args):
+        """ :returns dict of the futures of the environments descriptions,
+        resolved when the environments are VALID, to their parameters """
+        return {self.submit_when_ready(
+            executor, self._create_compute_environment_from_meta, arg): arg
+            for arg in args}
 
     def describe_compute_environment(self, name, meta):
         response = self.batch_conn.describe_compute_environments(name)
@@ -123,14 +135,17 @@ class BatchComputeEnvironmentResource(BaseResource):
             role_name=params['service_role'])
 
         self.batch_conn.create_compute_environment(**params)
-        try:
-            waiter = self.batch_conn.get_compute_environment_waiter()
-            waiter.wait(computeEnvironments=[name])
-        except WaiterError as e:
-            _LOG.error(e)
-
+        # the worker does not wait for the environment, its status is
+        # polled by the compute environments watcher thread
+        return then(self.batch_conn.watch_compute_environments([name]),
+                    lambda descriptions: self._describe_created(
+                        name, meta, descriptions[name]))
+
+    @staticmethod
+    def _describe_created(name, meta, description):
         _LOG.info(f'Created Batch Compute Environment {name}.')
-        return self.describe_compute_environment(name, meta)
+        return {description['computeEnvironmentArn']: build_description_obj(
+            {'computeEnvironments': [description]}, name, meta)}
 
     def _is_compute_env_exist(self, compute_environment_name):
         response = self.batch_conn.describe_compute_environments(
@@ -13,11 +13,15 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
 
 from botocore.exceptions import WaiterError
 
 from syndicate.commons.log_helper import get_logger
+from syndicate.connection.helper import Poller, gather
+from syndicate.exceptions import ResourceProcessingError, \
+    ResourceProcessingTimeoutError
+from syndicate.core.constants import BATCH_COMPENV_TYPE
 from syndicate.core.helper import unpack_kwargs
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import build_description_obj
@@ -25,14 +29,59 @@ from syndicate.core.resources.helper import build_description_obj
 _LOG = get_logger(__name__)
 
 DEFAULT_STATE = 'ENABLED'
+JOB_QUEUE_UPDATE_TIMEOUT_SEC = 120
 
 
 class BatchJobQueueResource(BaseResource):
-    def __init__(self, batch_conn):
+    def __init__(self, batch_conn, compenv_resource=None):
         self.batch_conn = batch_conn
+        self.compenv_resource = compenv_resource
 
     def create_job_queue(self, args):
-        return self.create_pool(self._create_job_queue_from_meta, args)
+        return self.create_compute_environments_and_job_queues(args)
+
+    def create_compute_environments_and_job_queues(self, args):
+        """ Creates the compute environments and the job queues of one
+        deploy stage. Every job queue is created as soon as its own compute
+        environments are VALID, without waiting for the rest of the
+        environments.
+        """
+        environments, queues = [], []
+        for arg in args:
+            is_environment = \
+                arg['meta'].get('resource_type') == BATCH_COMPENV_TYPE
+            (environments if is_environment else queues).append(arg)
+        with ThreadPoolExecutor() as executor:
+            futures = self.compenv_resource.submit_compute_environments(
+                executor, environments) if environments else {}
+            created = {arg['name']: future
+                       for future, arg in futures.items()}
+            for arg in queues:
+                ready = self._environments_valid(arg['meta'], created)
+                futures[self.submit_when_ready(
+                    executor, self._create_job_queue_from_meta, arg,
+                    ready)] = arg
+            return self.collect_pool_results(futures)
+
+    def _environments_valid(self, meta, created):
+        """ :returns Future resolved when the compute environments of the
+        queue are VALID. The environments created at the same stage are
+        awaited by their futures, the other ones are checked by the compute
+        environments watcher.
+        """
+        environments = [
+            item.get('compute_environment') or item.get('computeEnvironment')
+            for item in meta.get('compute_environment_order') or []]
+        # the environments are referenced both by names and ARNs
+        pending = [created[environment.split('/')[-1]]
+                   for environment in environments
+                   if environment.split('/')[-1] in created]
+        existing = [environment for environment in environments
+                    if environment.split('/')[-1] not in created]
+        if existing:
+            pending.append(
+                self.batch_conn.watch_compute_environments(existing))
+        return gather(pending)
 
     def describe_job_queue(self, name, meta):
         response = self.batch_conn.describe_job_queue(name)
@@ -56,7 +105,16 @@ class BatchJobQueueResource(BaseResource):
             compute_environment_order=[]
         )
 
-        sleep(5)  # to avoid exception while resource is being modified
+        # the queue can not be deleted while it is being modified
+        result = Poller(interval=1, max_interval=5,
+                        timeout=JOB_QUEUE_UPDATE_TIMEOUT_SEC).poll(
+            lambda: self.batch_conn.describe_job_queue(arn)['jobQueues'],
+            is_done=lambda queues: not queues or
+            queues[0]['status'] != 'UPDATING')
+        if not result.done:
+            raise ResourceProcessingTimeoutError(
+                f'Batch Job Queue {job_queue_name} is not disabled in '
+                f'{JOB_QUEUE_UPDATE_TIMEOUT_SEC}s')
 
         self.batch_conn.delete_job_queue(job_queue=arn)
         _LOG.info(f'Batch Job Queue {job_queue_name} was removed.')
@@ -77,12 +135,14 @@ class BatchJobQueueResource(BaseResource):
         if not state:
             params['state'] = DEFAULT_STATE
 
+        # the job is submitted when the environments of the queue are VALID
         self.batch_conn.create_job_queue(**params)
         try:
             waiter = self.batch_conn.get_job_queue_waiter()
             waiter.wait(jobQueues=[name])
         except WaiterError as e:
-            _LOG.error(e)
+            raise ResourceProcessingError(
+                f'Batch Job Queue {name} is not VALID: {e}') from e
 
         _LOG.info('Created Batch Job Queue %s.', name)
         return self.describe_job_queue(name, meta)
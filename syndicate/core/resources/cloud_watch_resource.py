@@ -17,6 +17,7 @@ import time
 
 from botocore.exceptions import ClientError
 
+from syndicate.connection.cloud_watch_connection import build_rule_target
 from syndicate.exceptions import InvalidValueError
 from syndicate.commons.log_helper import get_logger
 from syndicate.core.conf.validator import ALL_REGIONS
@@ -28,6 +29,9 @@ from syndicate.core.resources.helper import (build_description_obj,
 
 _LOG = get_logger(__name__)
 ARN_KEY = 'Arn'
+# marks the tenant event bus targets attached by syndicate, only they are
+# removed when the account is dropped from `event_bus_accounts`
+EVENT_BUS_TARGET_ID_PREFIX = 'syndicate-event-bus-'
 
 
 def _create_ec2_rule(rule_name, rule_meta, cw_conn):
@@ -127,6 +131,8 @@ class CloudWatchResource(BaseResource):
         response = self._cw_events_conn_builder(region).get_rule(name)
         if response:
             _LOG.warn('%s rule exists in %s.', name, region)
+            if event_buses:
+                self._attach_tenant_rule_targets(name, region, event_buses)
             return self.describe_rule(name=name, meta=meta, region=region,
                                       response=response)
         try:
@@ -147,20 +153,28 @@ class CloudWatchResource(BaseResource):
                 'schedule|ec2|api_call.'.format(rule_type, name))
 
     def _attach_tenant_rule_targets(self, rule_name, region, event_buses):
-        for event_bus in event_buses:
-            target_arn = get_event_bus_arn(event_bus=event_bus,
-                                           region=region)
-            existing_targets = self._cw_events_conn_builder(
-                region).list_targets_by_rule(
-                rule_name=rule_name)
-            for target in existing_targets:
-                if target[ARN_KEY] == target_arn:
-                    _LOG.debug('Target to event bus %s is already attached',
-                               target_arn)
-                    return
-            self._cw_events_conn_builder(region).add_rule_target(
-                rule_name=rule_name,
-                target_arn=target_arn)
+        """ Makes the event buses of the tenant accounts the only event bus
+        targets of the rule attached by syndicate, the targets added outside
+        of it are kept. The targets are listed once and the difference is
+        applied in batches. """
+        cw_conn = self._cw_events_conn_builder(region)
+        desired_arns = {get_event_bus_arn(event_bus=event_bus, region=region)
+                        for event_bus in event_buses}
+        existing_targets = cw_conn.list_targets_by_rule(rule_name=rule_name)
+        existing_arns = {target[ARN_KEY] for target in existing_targets}
+        to_remove = [
+            target['Id'] for target in existing_targets
+            if target['Id'].startswith(EVENT_BUS_TARGET_ID_PREFIX)
+            and target[ARN_KEY] not in desired_arns
+        ]
+        to_add = [build_rule_target(arn, id_prefix=EVENT_BUS_TARGET_ID_PREFIX)
+                  for arn in sorted(desired_arns - existing_arns)]
+        _LOG.debug('Rule %s event bus targets: %s to add, %s to remove',
+                   rule_name, len(to_add), len(to_remove))
+        if to_remove:
+            cw_conn.remove_rule_targets(rule_name, to_remove)
+        if to_add:
+            cw_conn.put_rule_targets(rule_name, to_add)
 
     def _handle_deactivation_for_cw_resources(self, cw_conn, region,
                                               rule_name):
@@ -168,17 +182,16 @@ class CloudWatchResource(BaseResource):
         home_eb_arn = f'arn:aws:events:' \
                       f'{region}:{self.account_id}:event-bus/default'
         _LOG.debug('Home account event bus arn: %s', home_eb_arn)
-        for target in targets:
-            resource_arn = target[ARN_KEY]
-            if resource_arn == home_eb_arn:
-                cw_conn.remove_targets(rule_name, [target['Id']])
-                _LOG.debug('Target %s removed', resource_arn)
-        targets = cw_conn.list_targets_by_rule(rule_name)
-        if targets:
+        home_target_ids = [target['Id'] for target in targets
+                           if target[ARN_KEY] == home_eb_arn]
+        if home_target_ids:
+            cw_conn.remove_rule_targets(rule_name, home_target_ids)
+            _LOG.debug('Target %s removed', home_eb_arn)
+        if len(targets) > len(home_target_ids):
             _LOG.debug('Will not remove rule, targets attached')
         else:
             _LOG.debug('Going to remove rule %s', rule_name)
-            cw_conn.remove_rule(rule_name)
+            cw_conn.delete_rule(rule_name)
             _LOG.debug('Rule %s removed', rule_name)
 
     def remove_cloud_watch_rules(self, args):
@@ -56,24 +56,61 @@ class DynamoDBResource(AbstractExternalResource, BaseResource):
                                 parameters=args, workers=step)
 
     def update_tables(self, args, step=10):
-        """ Only 10 tables can be created, updated or deleted simultaneously.
+        """ The pool of `step` workers plans and starts the tables updates,
+        the next steps of every update are made by the tables watcher
+        thread, so the workers are not blocked while the tables are being
+        updated.
 
         :param args: list of tables configurations meta
         :type args: list
-        :param step: how many tables to update simultaneously
+        :param step: how many tables to start updating simultaneously
         :type step: int
         :returns tables update results as list
         """
-        return self.create_pool(job=self._update_dynamodb_table_from_meta,
-                                parameters=args, workers=step)
+        started = self.create_pool(job=self._start_dynamodb_table_update,
+                                   parameters=args, workers=step)
+        started, exceptions = started if isinstance(started, tuple) \
+            else (started, [])
+        responses = {}
+        for name, (meta, update) in started.items():
+            try:
+                responses.update(self.describe_table(name, meta,
+                                                     update.result()))
+            except Exception as e:
+                exceptions.append(
+                    f'When processing the resource {name} occurred '
+                    f'{e.__class__.__name__} {e}')
+                _LOG.exception(f'An error occurred when updating the table '
+                               f'\'{name}\'')
+        return (responses, exceptions) if exceptions else responses
 
     def remove_dynamodb_tables(self, args, step=10):
-        return self.create_pool(self._remove_tables_from_meta, args,
-                                workers=step)
+        """ Keeps up to `step` tables being deleted, the removals are
+        awaited by the tables watcher thread. The alarms of the removed
+        tables are removed by the pool.
+
+        :param args: list of tables removal configurations
+        :type args: list
+        :param step: how many tables to delete simultaneously
+        :type step: int
+        """
+        by_name = {arg['config']['resource_name']: arg for arg in args}
+        removed_tables, errors = self.dynamodb_conn.remove_tables_by_names(
+            list(by_name), log_not_found_error=False, max_in_progress=step)
+        if removed_tables:
+            _LOG.info(f'Dynamo DB tables {str(removed_tables)} were removed')
+        result = self.create_pool(
+            self._remove_table_alarms_from_meta,
+            [by_name[name] for name in removed_tables], workers=step)
+        if not errors:
+            return result
+        responses, exceptions = result if isinstance(result, tuple) \
+            else (result, [])
+        return responses, exceptions + errors
 
     @unpack_kwargs
-    def _update_dynamodb_table_from_meta(self, name, meta, context):
-        """ Update Dynamo DB table from meta description, specifically:
+    def _start_dynamodb_table_update(self, name, meta, context):
+        """ Start Dynamo DB table update from meta description, specifically:
         capacity (billing) mode, table or gsi capacity units,
         gsi to create or delete, ttl.
 
@@ -81,7 +118,8 @@ class DynamoDBResource(AbstractExternalResource, BaseResource):
         :type name: str
         :param meta: table configuration information
         :type meta: dict
-        :returns table update result as dict
+        :returns dict of the table name to the meta and the future of the
+            table description after the update
         """
         table = self.dynamodb_conn.get_table_by_name(name)
         if not table:
@@ -115,7 +153,14 @@ class DynamoDBResource(AbstractExternalResource, BaseResource):
                 f"Updating the table '{name}'. It may take up to 20 minutes, "
                 f"please wait.")
 
-        response = self.dynamodb_conn.update_table_capacity(
+        # ttl update does not change the table status, so it is made
+        # before the planned updates without waiting
+        self.dynamodb_conn.update_table_ttl(
+            table_name=name,
+            ttl_attribute_name=meta.get('ttl_attribute_name')
+        )
+
+        plan = self.dynamodb_conn.plan_table_update(
             table_name=name,
             billing_mode=billing_mode,
             read_capacity=meta.get('read_capacity'),
@@ -123,32 +168,15 @@ class DynamoDBResource(AbstractExternalResource, BaseResource):
             existing_billing_mode=existing_billing_mode,
             existing_provisioned_throughput=provisioned_throughput,
             existing_on_demand_throughput=on_demand_throughput,
-            existing_global_indexes=table.global_secondary_indexes or []
-        )
-        if response:
-            table = response
-
-        self.dynamodb_conn.update_table_ttl(
-            table_name=name,
-            ttl_attribute_name=meta.get('ttl_attribute_name')
-        )
-
-        table_read_capacity = \
-            read_capacity or on_demand_throughput.get('MaxReadRequestUnits')
-        table_write_capacity = \
-            write_capacity or on_demand_throughput.get('MaxWriteRequestUnits')
-
-        global_indexes_meta = meta.get('global_indexes', [])
-        self.dynamodb_conn.update_global_indexes(
-            table_name=name,
-            global_indexes_meta=global_indexes_meta,
             existing_global_indexes=table.global_secondary_indexes or [],
-            table_read_capacity=table_read_capacity,
-            table_write_capacity=table_write_capacity,
-            existing_capacity_mode=existing_billing_mode
+            global_indexes_meta=meta.get('global_indexes', []),
+            table_read_capacity=read_capacity or on_demand_throughput.get(
+                'MaxReadRequestUnits'),
+            table_write_capacity=write_capacity or on_demand_throughput.get(
+                'MaxWriteRequestUnits')
         )
-
-        return self.describe_table(name, meta)
+        return {name: (meta, self.dynamodb_conn.start_table_update(name,
+                                                                   plan))}
 
     def describe_table(self, name, meta, response=None):
         if not response:
@@ -408,15 +436,7 @@ class DynamoDBResource(AbstractExternalResource, BaseResource):
         return resource_id
 
     @unpack_kwargs
-    def _remove_tables_from_meta(self, arn, config):
-        db_name = config['resource_name']
-        removed_tables, errors = self.dynamodb_conn.remove_tables_by_names(
-            [db_name],
-            log_not_found_error=False)
-        if errors:
-            raise ResourceProcessingError('; '.join(errors))
-        _LOG.info(f'Dynamo DB tables {str(removed_tables)} were removed')
-
+    def _remove_table_alarms_from_meta(self, arn, config):
         alarm_args = []
         autoscaling = config['description'].get('Autoscaling')
         if autoscaling:
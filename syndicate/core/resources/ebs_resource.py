@@ -18,6 +18,7 @@ from uuid import uuid1
 from pathlib import PurePath
 from botocore.exceptions import ClientError
 
+from syndicate.connection.helper import Poller, RateLimiter
 from syndicate.exceptions import ResourceNotFoundError, ArtifactError
 from syndicate.commons.log_helper import get_logger
 from syndicate.core.build.meta_processor import S3_PATH_NAME
@@ -27,6 +28,13 @@ from syndicate.core.resources.helper import build_description_obj
 
 _LOG = get_logger(__name__)
 
+APP_REMOVAL_TIMEOUT_SEC = 180
+ENV_LAUNCH_TIMEOUT_SEC = 360
+ENV_LAUNCH_POLL_INTERVAL_SEC = 10
+ENV_LAUNCH_POLL_MAX_INTERVAL_SEC = 30
+# the status polls of all the apps being deployed share the API quota
+EBS_POLL_RATE_LIMITER = RateLimiter(rate=5)
+
 
 class EbsResource(BaseResource):
 
@@ -164,12 +172,14 @@ class EbsResource(BaseResource):
 
         env_name = meta["env_name"] + str(int(time()))
 
-        start = time()
-        end = start + 180
-        while end > time():
-            describe_app_result = self.ebs_conn.describe_applications([name])
-            if not describe_app_result:
-                break
+        # the app with the same name can still be being removed
+        result = Poller(
+            interval=2, timeout=APP_REMOVAL_TIMEOUT_SEC,
+            rate_limiter=EBS_POLL_RATE_LIMITER).poll(
+            lambda: self.ebs_conn.describe_applications([name]),
+            is_done=lambda apps: not apps)
+        _LOG.debug(f'Checked EBS app {name} absence with {result.calls} '
+                   f'calls in {result.elapsed:.1f}s')
 
         # create APP
         response = self.ebs_conn.create_application(name,
@@ -201,18 +211,19 @@ class EbsResource(BaseResource):
                                          tags=meta.get('tags'))
         _LOG.debug(f'Waiting for beanstalk env {env_name}')
         # wait for env creation
-        start = time()
-        status = {}
-        end = start + 360  # end in 6 min
-        while end > time():
-            status = self.ebs_conn.describe_environment_health(
-                env_name=env_name,
-                attr_names=[
-                    'Status'])
-            if status['Status'] == 'Ready':
-                _LOG.info('Launching env took %s.', time() - start)
-                break
-        if status['Status'] != 'Ready':
+        result = Poller(
+            interval=ENV_LAUNCH_POLL_INTERVAL_SEC,
+            max_interval=ENV_LAUNCH_POLL_MAX_INTERVAL_SEC,
+            timeout=ENV_LAUNCH_TIMEOUT_SEC,
+            rate_limiter=EBS_POLL_RATE_LIMITER).poll(
+            lambda: self.ebs_conn.describe_environment_health(
+                env_name=env_name, attr_names=['Status']),
+            is_done=lambda health: health['Status'] == 'Ready')
+        status = result.value
+        if result.done:
+            _LOG.info(f'Launching env took {result.elapsed:.1f}s, '
+                      f'{result.calls} status checks.')
+        else:
             _LOG.error(f'Env status: {status}. Failed to create env.')
         # deploy new app version
         self.ebs_conn.deploy_env_version(name, env_name, version_label)
@@ -13,12 +13,17 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+import io
 import json
+import os
 import re
+import threading
+from zipfile import ZipFile
 
 from syndicate.exceptions import ParameterError, ResourceProcessingError, InvalidValueError
 from syndicate.commons.log_helper import get_logger, get_user_logger
 from syndicate.core.conf.processor import GLOBAL_AWS_SERVICES
+from syndicate.core.helper import build_path, compute_file_base64_hash
 from typing import TypeVar, Optional, Iterable
 from datetime import datetime
 
@@ -222,3 +227,79 @@ def if_updated(new: T, old: T) -> Optional[T]:
     If it does not, None is returned. They must be comparable
     """
     return new if new != old else None
+
+
+class LocalArtifactsCache:
+    """ Run-scoped index of the deployment packages of the local bundles.
+    A package is taken from the local bundle only when its hash matches the
+    SHA256 checksum S3 computed on upload, so the deploy running where the
+    bundle was built does not download it.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def get_local_path(self, artifact_key, metadata):
+        """ Returns the path of the verified local copy of the package.
+
+        :param artifact_key: key of the package relative to the bundles
+            folder, it starts with the bundle name
+        :param metadata: HeadObject response of the uploaded package with
+            the checksums
+        :returns the path or None if there is no such local copy
+        """
+        with self._lock:
+            if artifact_key in self._paths:
+                return self._paths[artifact_key]
+        from syndicate.core.build.helper import resolve_all_bundles_directory
+        path = build_path(resolve_all_bundles_directory(), artifact_key)
+        checksum = metadata.get('ChecksumSHA256')
+        # the checksum of the package uploaded in parts is not its hash
+        verifiable = checksum and '-' not in checksum and \
+            metadata.get('ChecksumType') != 'COMPOSITE'
+        local_path = None
+        if verifiable and os.path.isfile(path) and \
+                os.path.getsize(path) == metadata.get('ContentLength') and \
+                compute_file_base64_hash(path) == checksum:
+            local_path = path
+        with self._lock:
+            self._paths[artifact_key] = local_path
+        return local_path
+
+    def clear(self):
+        with self._lock:
+            self._paths.clear()
+
+
+LOCAL_ARTIFACTS_CACHE = LocalArtifactsCache()
+
+
+def extract_deployment_package(s3_conn, bucket_name, key, artifact_key,
+                               extract_to):
+    """ Extracts the deployment package uploaded to the deploy bucket. The
+    local bundle copy of the package is used when it has the same hash.
+
+    :param key: object key of the package
+    :param artifact_key: key of the package relative to the bundles folder
+    :returns False if the package does not exist in the bucket
+    """
+    metadata = s3_conn.retrieve_object_metadata(bucket_name, key,
+                                                with_checksums=True)
+    if not metadata:
+        return False
+    local_path = LOCAL_ARTIFACTS_CACHE.get_local_path(artifact_key, metadata)
+    if local_path:
+        _LOG.info(f'Using the local copy of the artifact \'{artifact_key}\'')
+        with ZipFile(local_path, 'r') as zf:
+            zf.extractall(extract_to)
+        return True
+
+    _LOG.info(f'Downloading the artifact \'{artifact_key}\'')
+    with io.BytesIO() as artifact:
+        s3_conn.download_to_file(bucket_name=bucket_name, key=key,
+                                 file=artifact,
+                                 size=metadata.get('ContentLength'))
+        with ZipFile(artifact, 'r') as zf:
+            zf.extractall(extract_to)
+    return True
@@ -14,6 +14,7 @@
     limitations under the License.
 """
 import re
+import threading
 from typing import Optional
 
 from botocore.exceptions import ClientError
@@ -36,6 +37,10 @@ class IamResource(BaseResource):
         self.iam_conn = iam_conn
         self.account_id = account_id
         self.region = region
+        # names to arns of all the account policies, listed once per run
+        # only if a policy can not be resolved another way
+        self._policies_arns = None
+        self._policies_arns_lock = threading.Lock()
 
     def remove_policies(self, args):
         return self.create_pool(self._remove_policy, args)
@@ -106,6 +111,7 @@ class IamResource(BaseResource):
                                 parameters=args)
 
     def create_roles(self, args):
+        self._policies_arns = None
         return self.create_pool(job=self._create_role_from_meta,
                                 parameters=args)
 
@@ -176,12 +182,10 @@ class IamResource(BaseResource):
             # attach policies
         if policies:
             for policy in policies:
-                arn = self.iam_conn.get_policy_arn(policy)
-                if not arn:
-                    raise ResourceNotFoundError(
-                        f"Can not get policy arn: '{policy}'"
-                    )
-                self.iam_conn.attach_policy(name, arn)
+                self._attach_role_policy(
+                    name, policy,
+                    self._resolve_policy_arn(policy, custom_policies),
+                    custom_policies)
         else:
             raise InvalidValueError(
                 f"There are no policies for role: '{name}'."
@@ -230,12 +234,8 @@ class IamResource(BaseResource):
         if not permissions_boundary.startswith('arn:aws'):
             _LOG.warn(f'Resolving permissions boundary arn from policy '
                       f'name \'{permissions_boundary}\'')
-            permissions_boundary = self.iam_conn.get_policy_arn(
+            permissions_boundary = self._resolve_policy_arn(
                 permissions_boundary)
-            if not permissions_boundary:
-                raise ResourceNotFoundError(
-                    f"Can not get policy arn: '{permissions_boundary}'"
-                )
         _LOG.info(f'Adding permissions boundary \'{permissions_boundary}\''
                   f' to role \'{role_name}\'')
         self.iam_conn.put_role_permissions_boundary(
@@ -243,6 +243,7 @@ class IamResource(BaseResource):
             policy_arn=permissions_boundary)
 
     def update_iam_role(self, args):
+        self._policies_arns = None
         return self.create_pool(self._update_role_from_meta, args)
 
     def update_iam_policy(self, args):
@@ -307,20 +308,7 @@ class IamResource(BaseResource):
                     else:
                         raise e
 
-        # attach policies
-        existing_policies = self.iam_conn.get_role_attached_policies(
-            role_name=name)
-        for existing_policy in existing_policies:
-            self.iam_conn.detach_policy(role_name=name,
-                                        policy_arn=existing_policy.arn)
-        if policies:
-            for policy in policies:
-                arn = self.iam_conn.get_policy_arn(policy)
-                if not arn:
-                    raise ResourceNotFoundError(
-                        f"Can not get policy arn: '{policy}'"
-                    )
-                self.iam_conn.attach_policy(name, arn)
+        self._reconcile_role_policies(name, policies, custom_policies)
         _LOG.info(f'Updated IAM role {name}.')
         if permissions_boundary:
             self._attach_permissions_boundary_to_role(permissions_boundary,
@@ -331,6 +319,98 @@ class IamResource(BaseResource):
             self.iam_conn.delete_role_permissions_boundary(role_name=name)
         return self.describe_role(name=name, meta=meta)
 
+    def _reconcile_role_policies(self, role_name, policies,
+                                 custom_policies):
+        """ Attaches the policies which are absent and then detaches the
+        ones which are not in meta anymore, so the role does not lose the
+        permissions it keeps even for a moment.
+        """
+        attached = {}
+        for attached_policy in self.iam_conn.get_role_attached_policies(
+                role_name=role_name):
+            # the name is a part of the arn, so it is not requested
+            attached[attached_policy.arn.split('/')[-1]] = attached_policy.arn
+        desired = {}
+        for policy in policies:
+            desired[self._resolve_policy_arn(
+                policy, custom_policies, known_arns=attached)] = policy
+
+        attached_arns = set(attached.values())
+        to_attach = [arn for arn in desired if arn not in attached_arns]
+        to_detach = [arn for arn in attached_arns if arn not in desired]
+        if not to_attach and not to_detach:
+            _LOG.debug(f'Policies of the role {role_name} are up to date')
+            return
+
+        while to_attach:
+            arn = to_attach[0]
+            try:
+                self._attach_role_policy(role_name, desired[arn], arn,
+                                         custom_policies)
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'LimitExceeded' or \
+                        not to_detach:
+                    raise e
+                # the quota of the policies attached to the role is reached,
+                # the space has to be freed first
+                _LOG.warning(f'Can not attach policy {arn} to the role '
+                             f'{role_name} before the removed policies are '
+                             f'detached: {e}')
+                self._detach_role_policies(role_name, to_detach)
+                to_detach = []
+                continue
+            to_attach.pop(0)
+        self._detach_role_policies(role_name, to_detach)
+
+    def _detach_role_policies(self, role_name, policies_arns):
+        for arn in policies_arns:
+            self.iam_conn.detach_policy(role_name=role_name, policy_arn=arn)
+            _LOG.info(f'Policy {arn} detached from the role {role_name}')
+
+    def _attach_role_policy(self, role_name, policy, arn, custom_policies):
+        try:
+            self.iam_conn.attach_policy(role_name, arn)
+        except ClientError as e:
+            # the arn of a custom policy is built without the policy path,
+            # look for the policy if it has one
+            if e.response['Error']['Code'] != 'NoSuchEntity' or \
+                    policy not in custom_policies:
+                raise e
+            listed_arn = self._get_policies_arns().get(policy)
+            if not listed_arn or listed_arn == arn:
+                raise ResourceNotFoundError(
+                    f"Can not get policy arn: '{policy}'"
+                )
+            self.iam_conn.attach_policy(role_name, listed_arn)
+        _LOG.info(f'Policy {policy} attached to the role {role_name}')
+
+    def _resolve_policy_arn(self, policy, custom_policies=(),
+                            known_arns=None):
+        """ Resolves the policy arn without listing the policies if
+        possible: the arns of the custom policies are built locally and the
+        arns of the attached policies are already known.
+
+        :param known_arns: map of the policies names to their arns
+        """
+        if policy.startswith('arn:'):
+            return policy
+        if known_arns and policy in known_arns:
+            return known_arns[policy]
+        if policy in custom_policies:
+            return self._build_policy_arn(policy)
+        arn = self._get_policies_arns().get(policy)
+        if not arn:
+            raise ResourceNotFoundError(
+                f"Can not get policy arn: '{policy}'"
+            )
+        return arn
+
+    def _get_policies_arns(self):
+        with self._policies_arns_lock:
+            if self._policies_arns is None:
+                self._policies_arns = self.iam_conn.get_policies_arns()
+            return self._policies_arns
+
     @unpack_kwargs
     def _update_policy_from_meta(self, name, meta, context):
         arn = self._build_policy_arn(name)
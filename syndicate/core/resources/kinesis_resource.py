@@ -13,10 +13,11 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-import time
-
 from syndicate.commons.log_helper import get_logger
+from syndicate.connection.kinesis_connection import \
+    PROVISIONED_STREAM_MODE, shard_count_steps
 from syndicate.core import ClientError
+from syndicate.exceptions import ResourceNotFoundError
 from syndicate.core.helper import unpack_kwargs
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import build_description_obj
@@ -41,6 +42,7 @@ class KinesisResource(BaseResource):
         try:
             self.kin_conn.remove_stream(stream_name=stream_name,
                                         log_not_found_error=False)
+            self.kin_conn.wait_for_stream_deleted(stream_name)
             _LOG.info('Kinesis stream %s was removed.', stream_name)
             return {arn: config}
         except ClientError as e:
@@ -54,21 +56,59 @@ class KinesisResource(BaseResource):
     def _create_kinesis_stream_from_meta(self, name, meta):
         response = self.kin_conn.get_stream(name)
         if response:
-            stream_status = response['StreamDescription']['StreamStatus']
+            stream_status = response['StreamStatus']
             if stream_status == 'DELETING':
                 _LOG.debug('Waiting for deletion kinesis stream %s...', name)
-                time.sleep(120)
+                self.kin_conn.wait_for_stream_deleted(name)
             else:
                 _LOG.warn('%s kinesis stream exists', name)
                 return {
                     response['StreamARN']: build_description_obj(response,
                                                                  name, meta)
                 }
-        self.kin_conn.create_stream(stream_name=name,
-                                    shard_count=meta['shard_count'])
+        self.kin_conn.create_stream(
+            stream_name=name, shard_count=meta.get('shard_count'),
+            stream_mode=meta.get('stream_mode', PROVISIONED_STREAM_MODE))
+        self.kin_conn.wait_for_stream_active(name)
         _LOG.info('Created kinesis stream %s.', name)
         return self.describe_kinesis_stream(name=name, meta=meta)
 
+    def update_kinesis_stream(self, args):
+        return self.create_pool(self._update_kinesis_stream_from_meta, args)
+
+    @unpack_kwargs
+    def _update_kinesis_stream_from_meta(self, name, meta, context):
+        """ Changes the capacity mode and the shard count of the existing
+        stream in place """
+        summary = self.kin_conn.get_stream_summary(name)
+        if not summary:
+            raise ResourceNotFoundError(
+                f"'{name}' kinesis stream does not exist.")
+        if summary['StreamStatus'] != 'ACTIVE':
+            _LOG.debug(f'Waiting for kinesis stream {name} activation...')
+            self.kin_conn.wait_for_stream_active(name)
+
+        stream_mode = meta.get('stream_mode', PROVISIONED_STREAM_MODE)
+        current_mode = summary.get('StreamModeDetails', {}).get(
+            'StreamMode', PROVISIONED_STREAM_MODE)
+        if stream_mode != current_mode:
+            self.kin_conn.update_stream_mode(summary['StreamARN'],
+                                             stream_mode)
+            self.kin_conn.wait_for_stream_active(name)
+            _LOG.info(f'Changed kinesis stream {name} capacity mode from '
+                      f'{current_mode} to {stream_mode}.')
+
+        shard_count = meta.get('shard_count')
+        if stream_mode == PROVISIONED_STREAM_MODE and shard_count and \
+                shard_count != summary['OpenShardCount']:
+            for step in shard_count_steps(summary['OpenShardCount'],
+                                          shard_count):
+                self.kin_conn.update_shard_count(name, step)
+                self.kin_conn.wait_for_stream_active(name)
+            _LOG.info(f'Changed kinesis stream {name} shard count from '
+                      f'{summary["OpenShardCount"]} to {shard_count}.')
+        return self.describe_kinesis_stream(name=name, meta=meta)
+
     def describe_kinesis_stream(self, name, meta):
         response = self.kin_conn.get_stream(name)
         if response:
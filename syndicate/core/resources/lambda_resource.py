@@ -15,7 +15,9 @@
 """
 import json
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import PurePath
 from typing import Optional, Dict
 
@@ -24,7 +26,10 @@ from botocore.exceptions import ClientError
 from syndicate.exceptions import ArtifactError, ResourceNotFoundError, \
     ParameterError, InvalidValueError
 from syndicate.commons.log_helper import get_logger, get_user_logger
+from syndicate.commons.tracing import TRACER
 from syndicate.connection.helper import retry
+from syndicate.connection.s3_connection import \
+    SINGLE_REQUEST_TRANSFER_MAX_SIZE
 from syndicate.core.build.bundle_processor import load_latest_deploy_output
 from syndicate.core.build.meta_processor import S3_PATH_NAME
 from syndicate.core.constants import DEFAULT_LOGS_EXPIRATION, \
@@ -32,10 +37,10 @@ from syndicate.core.constants import DEFAULT_LOGS_EXPIRATION, \
     S3_TRIGGER, SNS_TOPIC_TRIGGER, KINESIS_TRIGGER, SQS_TRIGGER, \
     DYNAMODB_TRIGGER_REQUIRED_PARAMS, SQS_TRIGGER_REQUIRED_PARAMS, \
     CLOUD_WATCH_TRIGGER_REQUIRED_PARAMS, S3_TRIGGER_REQUIRED_PARAMS, \
-    SNS_TRIGGER_REQUIRED_PARAMS, KINESIS_TRIGGER_REQUIRED_PARAMS
+    SNS_TRIGGER_REQUIRED_PARAMS, KINESIS_TRIGGER_REQUIRED_PARAMS, CODE_SHA256
 from syndicate.core.decorators import threading_lock
 from syndicate.core.helper import unpack_kwargs, is_zip_empty, \
-    deterministic_uuid
+    deterministic_uuid, compute_file_base64_hash
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import (
     build_description_obj, validate_params, assert_required_params, if_updated)
@@ -67,6 +72,12 @@ _MIN_SNAP_START_SUPPORTED_RUNTIME = {
 
 NOT_AVAILABLE = 'N/A'
 
+# size of a zip archive without files
+EMPTY_ZIP_SIZE = 22
+
+# triggers which are configured as lambda event source mappings
+EVENT_SOURCE_TRIGGERS = (DYNAMO_DB_TRIGGER, SQS_TRIGGER, KINESIS_TRIGGER)
+
 _DOTNET_LAMBDA_SHARED_STORE_ENV = {
     'DOTNET_SHARED_STORE': '/opt/dotnetcore/store/'
 }
@@ -93,6 +104,10 @@ class LambdaResource(BaseResource):
         self.region = region
         self.account_id = account_id
         self.deploy_target_bucket = deploy_target_bucket
+        # event source mappings by the lambda arn they are listed for
+        self._event_sources_index = {}
+        self._event_sources_lock = threading.Lock()
+        self._latest_deploy_output = None
 
         self.dynamic_params_resolvers = {
             ('cognito_idp', 'id'):
@@ -206,7 +221,14 @@ class LambdaResource(BaseResource):
         return self.create_pool(self._create_lambda_from_meta, args)
 
     def update_lambda(self, args):
-        return self.create_pool(self._update_lambda, args)
+        # the previous triggers of all the lambdas are taken from the same
+        # deploy output, so it is loaded once
+        _, latest_output = load_latest_deploy_output(failsafe=True)
+        self._latest_deploy_output = latest_output or {}
+        try:
+            return self.create_pool(self._update_lambda, args)
+        finally:
+            self._latest_deploy_output = None
 
     def update_lambda_layer(self, args):
         return self.create_pool(self._update_lambda_layer, args)
@@ -422,7 +444,9 @@ class LambdaResource(BaseResource):
         _LOG.debug(f'Resolved lambda arn: {arn}')
 
         event_sources_meta = meta.get('event_sources', [])
-        self.create_lambda_triggers(name, arn, role_name, event_sources_meta)
+        # just created lambda has no event source mappings to look for
+        self.create_lambda_triggers(name, arn, role_name, event_sources_meta,
+                                    event_sources=[])
 
         if meta.get('max_retries') is not None:
             _LOG.debug('Setting lambda event invoke config')
@@ -807,17 +831,97 @@ class LambdaResource(BaseResource):
         parts = function_arn.split(':')
         return parts[-1]
 
+    def build_lambda_layer_arn(self, name):
+        return f'arn:aws:lambda:{self.region}:{self.account_id}:layer:{name}'
+
     def _is_equal_lambda_layer(self, new_layer_sha, old_layer_name):
-        import base64
+        """ Returns the layer version with the same content if it exists.
+        The versions are looked up in the layers index of the project
+        state, the hashes of the versions absent in the index are fetched
+        once and saved to it.
+
+        :param new_layer_sha: base64 encoded sha256 of the layer package
+        """
+        from syndicate.core import PROJECT_STATE
+        layer_index = PROJECT_STATE.lambda_layers.setdefault(
+            self.build_lambda_layer_arn(old_layer_name), {})
+
+        version_arn = layer_index.get(new_layer_sha)
+        if version_arn:
+            old_layer = self._get_lambda_layer_if_exists(version_arn)
+            if old_layer and \
+                    old_layer['Content']['CodeSha256'] == new_layer_sha:
+                return old_layer
+
         versions = self.lambda_conn.list_lambda_layer_versions(
             name=old_layer_name)
+        existing_arns = {version['LayerVersionArn'] for version in versions}
+        # forget the versions that were deleted
+        for code_sha256, version_arn in list(layer_index.items()):
+            if version_arn not in existing_arns:
+                layer_index.pop(code_sha256)
+
+        indexed_arns = set(layer_index.values())
         for version in versions:
-            old_layer = self.lambda_conn.get_lambda_layer_by_arn(
+            if version['LayerVersionArn'] in indexed_arns:
+                continue
+            old_layer = self._get_lambda_layer_if_exists(
                 version['LayerVersionArn'])
-            if new_layer_sha == base64.b64decode(
-                    old_layer['Content']['CodeSha256']):
+            if not old_layer:
+                continue
+            code_sha256 = old_layer['Content']['CodeSha256']
+            layer_index.setdefault(code_sha256, version['LayerVersionArn'])
+            if code_sha256 == new_layer_sha:
                 return old_layer
 
+    def _get_lambda_layer_if_exists(self, arn):
+        try:
+            return self.lambda_conn.get_lambda_layer_by_arn(arn)
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                return
+            raise e
+
+    def _index_lambda_layer(self, name, response):
+        from syndicate.core import PROJECT_STATE
+        PROJECT_STATE.lambda_layers.setdefault(
+            self.build_lambda_layer_arn(name), {})[
+            response['Content']['CodeSha256']] = response['LayerVersionArn']
+
+    def _resolve_layer_code_sha256(self, name, meta):
+        """ Returns the hash of the layer package saved to the meta on build
+        or the SHA256 checksum S3 computed on upload, otherwise downloads
+        the package to compute it.
+
+        :return: the hash and the error message if the package is empty
+        """
+        from syndicate.core import CONFIG
+        if meta.get(CODE_SHA256):
+            return meta[CODE_SHA256], None
+
+        key = meta[S3_PATH_NAME]
+        key_compound = PurePath(CONFIG.deploy_target_bucket_key_compound,
+                                key).as_posix()
+        checksums = self.s3_conn.get_object_checksums(
+            self.deploy_target_bucket, key_compound)
+        code_sha256 = checksums.get('ChecksumSHA256')
+        size = checksums.get('ContentLength', 0)
+        # the checksum of the package uploaded in parts is not its hash
+        if code_sha256 and '-' not in code_sha256 and \
+                checksums.get('ChecksumType') != 'COMPOSITE' and \
+                EMPTY_ZIP_SIZE < size < SINGLE_REQUEST_TRANSFER_MAX_SIZE:
+            return code_sha256, None
+
+        file_name = key.split('/')[-1]
+        self.s3_conn.download_file(self.deploy_target_bucket, key_compound,
+                                   file_name)
+        if is_zip_empty(file_name):
+            message = f'Can not create layer \'{name}\' because of empty ' \
+                      f'deployment package zip file.'
+            _LOG.error(message)
+            return None, message
+        return compute_file_base64_hash(file_name), None
+
     def __describe_lambda_by_version(self, name):
         versions = self.lambda_conn.versions_list(name)
         # find the last created version
@@ -851,22 +955,22 @@ class LambdaResource(BaseResource):
 
         stream = self.dynamodb_conn.get_table_stream_arn(table_name)
         # TODO support another sub type
-        event_source = next(iter(self.lambda_conn.list_event_sources(
-            event_source_arn=stream, function_name=lambda_arn)), None)
+        event_source = self._find_event_source(lambda_arn, stream)
         if event_source:
             _LOG.info(f'Lambda event source mapping for source arn '
                       f'{stream} and lambda arn {lambda_arn} was found. '
                       f'Updating it')
-            self.lambda_conn.update_event_source(
+            response = self.lambda_conn.update_event_source(
                 event_source['UUID'], function_name=lambda_arn,
                 batch_size=batch_size,
                 batch_window=batch_window, filters=filters)
         else:
-            self.lambda_conn.add_event_source(
+            response = self.lambda_conn.add_event_source(
                 lambda_arn, stream, batch_size=batch_size,
                 batch_window=batch_window, start_position='LATEST',
                 filters=filters
             )
+        self._index_event_source(lambda_arn, response)
         # start_position='LATEST' - in case we did not remove tables before
         _LOG.info('Lambda %s subscribed to dynamodb table %s', lambda_name,
                   table_name)
@@ -891,22 +995,22 @@ class LambdaResource(BaseResource):
                                                      self.account_id,
                                                      target_queue)
 
-        event_source = next(iter(self.lambda_conn.list_event_sources(
-            event_source_arn=queue_arn, function_name=lambda_arn)), None)
+        event_source = self._find_event_source(lambda_arn, queue_arn)
         if event_source:
             _LOG.info(f'Lambda event source mapping for source arn '
                       f'{queue_arn} and lambda arn {lambda_arn} was found. '
                       f'Updating it')
-            self.lambda_conn.update_event_source(
+            response = self.lambda_conn.update_event_source(
                 event_source['UUID'], function_name=lambda_arn,
                 batch_size=batch_size,
                 batch_window=batch_window,
                 function_response_types=function_response_types)
         else:
-            self.lambda_conn.add_event_source(
+            response = self.lambda_conn.add_event_source(
                 lambda_arn, queue_arn, batch_size, batch_window,
                 function_response_types=function_response_types
             )
+        self._index_event_source(lambda_arn, response)
 
         _LOG.info('Lambda %s subscribed to SQS queue %s', lambda_name,
                   target_queue)
@@ -944,36 +1048,56 @@ class LambdaResource(BaseResource):
                       f'to cloudwatch rule {rule_name} as a target')
 
     @retry()
-    # allow only sequential s3 trigger creation because it is done via 'put'
-    # operation which will override any other concurrent request otherwise
+    # allow only sequential s3 triggers configuration because it is done via
+    # 'put' operation which will override any other concurrent request
+    # otherwise
     @threading_lock
-    def _create_s3_trigger_from_meta(self, lambda_name, lambda_arn, role_name,
-                                     trigger_meta):
-        validate_params(lambda_name, trigger_meta, S3_TRIGGER_REQUIRED_PARAMS)
-        target_bucket = trigger_meta['target_bucket']
-
-        if not self.s3_conn.is_bucket_exists(target_bucket):
+    def _apply_s3_triggers(self, lambda_name, lambda_arn, target_bucket,
+                           to_add, to_remove):
+        """ Removes and adds the lambda triggers of the bucket with a single
+        bucket notification configuration update """
+        for trigger_meta in to_add + to_remove:
+            validate_params(lambda_name, trigger_meta,
+                            S3_TRIGGER_REQUIRED_PARAMS)
+
+        bucket_exists = self.s3_conn.is_bucket_exists(target_bucket)
+        if to_add and not bucket_exists:
             _LOG.warning(f'S3 bucket {target_bucket} does not exist '
                          f'and could not be configured as a trigger '
                          f'for lambda {lambda_name} ')
-            return
-
-        bucket_arn = f'arn:aws:s3:::{target_bucket}'
-        self.lambda_conn.add_invocation_permission(
-            name=lambda_arn,
-            principal='s3.amazonaws.com',
-            source_arn=bucket_arn,
-            statement_id=deterministic_uuid(bucket_arn),
-            exists_ok=True
-        )
-        _LOG.debug(f'Waiting for activation of invoke-permission '
-                   f'of {bucket_arn}')
-        time.sleep(5)
-
-        self.s3_conn.add_lambda_event_source(
-            target_bucket, lambda_arn, trigger_meta)
-        _LOG.info(f'Lambda {lambda_name} subscribed to '
-                  f'S3 bucket {target_bucket}')
+            to_add = []
+        if to_add:
+            bucket_arn = f'arn:aws:s3:::{target_bucket}'
+            permission = self.lambda_conn.add_invocation_permission(
+                name=lambda_arn,
+                principal='s3.amazonaws.com',
+                source_arn=bucket_arn,
+                statement_id=deterministic_uuid(bucket_arn),
+                exists_ok=True
+            )
+            # the permission already exists if nothing is returned
+            if permission:
+                _LOG.debug(f'Waiting for activation of invoke-permission '
+                           f'of {bucket_arn}')
+                time.sleep(5)
+
+        if bucket_exists:
+            self.s3_conn.update_lambda_event_sources(
+                target_bucket, lambda_arn, to_add=to_add, to_remove=to_remove)
+            if to_remove:
+                _LOG.info(f'Lambda {lambda_name} unsubscribed from '
+                          f's3 bucket {target_bucket}')
+            if to_add:
+                _LOG.info(f'Lambda {lambda_name} subscribed to '
+                          f'S3 bucket {target_bucket}')
+
+        if to_remove and not to_add:
+            # remove s3 permission to invoke lambda
+            # to remove this trigger from lambda triggers section
+            self.remove_permissions_by_resource_name(
+                lambda_arn, target_bucket, all_permissions=False)
+            _LOG.info(f'Removed s3 bucket {target_bucket} permissions to '
+                      f'invoke lambda {lambda_name}')
 
     @retry()
     def _create_sns_topic_trigger_from_meta(self, lambda_name, lambda_arn,
@@ -1014,7 +1138,7 @@ class LambdaResource(BaseResource):
         if stream_status != 'ACTIVE':
             _LOG.debug('Kinesis stream %s is not in active state,'
                        ' waiting for activation...', stream_name)
-            time.sleep(120)
+            self.kinesis_conn.wait_for_stream_active(stream_name)
 
         # TODO policy should be moved to meta
         policy_name = '{0}KinesisTo{1}Lambda'.format(stream_name, lambda_name)
@@ -1066,7 +1190,6 @@ class LambdaResource(BaseResource):
         DYNAMO_DB_TRIGGER: _create_dynamodb_trigger_from_meta,
         CLOUD_WATCH_RULE_TRIGGER: _create_cloud_watch_trigger_from_meta,
         EVENT_BRIDGE_RULE_TRIGGER: _create_cloud_watch_trigger_from_meta,
-        S3_TRIGGER: _create_s3_trigger_from_meta,
         SNS_TOPIC_TRIGGER: _create_sns_topic_trigger_from_meta,
         KINESIS_TRIGGER: _create_kinesis_stream_trigger_from_meta,
         SQS_TRIGGER: _create_sqs_trigger_from_meta
@@ -1125,27 +1248,6 @@ class LambdaResource(BaseResource):
         _LOG.info(f'Removed sns topic {target_topic} permissions to invoke '
                   f'lambda {lambda_name}')
 
-    @retry()
-    # allow only sequential s3 trigger deletion because it is done via 'put'
-    # operation which will override any other concurrent request otherwise
-    @threading_lock
-    def _remove_s3_trigger(self, lambda_name, lambda_arn, trigger_meta):
-        validate_params(lambda_name, trigger_meta, S3_TRIGGER_REQUIRED_PARAMS)
-
-        target_bucket = trigger_meta['target_bucket']
-        if self.s3_conn.is_bucket_exists(target_bucket):
-            self.s3_conn.remove_lambda_event_source(
-                target_bucket, lambda_arn, trigger_meta)
-            _LOG.info(f'Lambda {lambda_name} unsubscribed from '
-                      f's3 bucket {target_bucket}')
-
-        # remove s3 permission to invoke lambda
-        # to remove this trigger from lambda triggers section
-        self.remove_permissions_by_resource_name(
-            lambda_arn, target_bucket, all_permissions=False)
-        _LOG.info(f'Removed s3 bucket {target_bucket} permissions to invoke '
-                  f'lambda {lambda_name}')
-
     @retry()
     def _remove_sqs_trigger(self, lambda_name, lambda_arn, trigger_meta):
         validate_params(lambda_name, trigger_meta, SQS_TRIGGER_REQUIRED_PARAMS)
@@ -1181,13 +1283,13 @@ class LambdaResource(BaseResource):
         SQS, DynamoDB, Kinezis, Kafka and MQ resources are considered
         as event sources according to AWS """
         uuid = None
-        event_sources = self.lambda_conn.triggers_list(lambda_name=lambda_arn)
-        for event_source in event_sources:
+        for event_source in self._get_event_sources(lambda_arn):
             if event_source_name in event_source['EventSourceArn']:
                 uuid = event_source['UUID']
                 break
         if uuid:
             self.lambda_conn.remove_event_source(uuid=uuid)
+            self._unindex_event_source(lambda_arn, uuid)
             _LOG.info(f'Lambda {lambda_name} unsubscribed from '
                       f'event source {event_source_name}')
         else:
@@ -1198,21 +1300,56 @@ class LambdaResource(BaseResource):
         DYNAMO_DB_TRIGGER: _remove_dynamodb_trigger,
         CLOUD_WATCH_RULE_TRIGGER: _remove_cloud_watch_trigger,
         EVENT_BRIDGE_RULE_TRIGGER: _remove_cloud_watch_trigger,
-        S3_TRIGGER: _remove_s3_trigger,
         SNS_TOPIC_TRIGGER: _remove_sns_topic_trigger,
         KINESIS_TRIGGER: _remove_kinesis_stream_trigger,
         SQS_TRIGGER: _remove_sqs_trigger
     }
 
-    def create_lambda_triggers(self, name, arn, role_name, event_sources_meta):
-        for event_source in event_sources_meta:
-            resource_type = event_source['resource_type']
-            func = self.CREATE_TRIGGER[resource_type]
-            func(self, name, arn, role_name, event_source)
+    def _get_event_sources(self, lambda_arn):
+        """ Returns the event source mappings of the lambda. They are listed
+        once per lambda reconciliation and then kept up to date by the
+        trigger handlers """
+        event_sources = self._event_sources_index.get(lambda_arn)
+        if event_sources is None:
+            event_sources = self._event_sources_index.setdefault(
+                lambda_arn,
+                self.lambda_conn.triggers_list(lambda_name=lambda_arn))
+        return event_sources
+
+    def _find_event_source(self, lambda_arn, event_source_arn):
+        return next((event_source for event_source
+                     in self._get_event_sources(lambda_arn)
+                     if event_source['EventSourceArn'] == event_source_arn),
+                    None)
+
+    def _index_event_source(self, lambda_arn, event_source):
+        self._unindex_event_source(lambda_arn, event_source['UUID'])
+        with self._event_sources_lock:
+            self._get_event_sources(lambda_arn).append(event_source)
+
+    def _unindex_event_source(self, lambda_arn, uuid):
+        with self._event_sources_lock:
+            event_sources = self._get_event_sources(lambda_arn)
+            event_sources[:] = [event_source for event_source in event_sources
+                                if event_source['UUID'] != uuid]
+
+    def create_lambda_triggers(self, name, arn, role_name, event_sources_meta,
+                               event_sources=None):
+        """ Creates or updates the lambda triggers.
+
+        :param event_sources: already known event source mappings of the
+            lambda, e.g. an empty list for just created lambda. Listed if
+            not given.
+        """
+        self._reconcile_lambda_triggers(
+            name, arn, role_name, to_create=event_sources_meta,
+            event_sources=event_sources)
 
     def update_lambda_triggers(self, name, arn, role_name, event_sources_meta):
-        _, latest_output = load_latest_deploy_output(
-            failsafe=True)
+        latest_output = self._latest_deploy_output
+        if latest_output is None:
+            _, latest_output = load_latest_deploy_output(
+                failsafe=True)
         latest_output = latest_output or {}
 
         prev_event_sources_meta = []
@@ -1226,17 +1363,91 @@ class LambdaResource(BaseResource):
         # remove triggers that are absent or changed in new meta
         to_remove = [event_source for event_source in prev_event_sources_meta
                      if event_source not in event_sources_meta]
-        self.remove_lambda_triggers(name, arn, to_remove)
-
-        # create/update triggers
-        self.create_lambda_triggers(name, arn, role_name, event_sources_meta)
+        self._reconcile_lambda_triggers(
+            name, arn, role_name, to_create=event_sources_meta,
+            to_remove=to_remove)
 
     def remove_lambda_triggers(self, lambda_name, lambda_arn,
                                event_sources_meta):
-        for event_source in event_sources_meta:
-            resource_type = event_source['resource_type']
-            func = self.REMOVE_TRIGGER[resource_type]
-            func(self, lambda_name, lambda_arn, event_source)
+        self._reconcile_lambda_triggers(
+            lambda_name, lambda_arn, role_name=None,
+            to_remove=event_sources_meta)
+
+    def _reconcile_lambda_triggers(self, name, arn, role_name, to_create=None,
+                                   to_remove=None, event_sources=None):
+        """ Removes and then creates the lambda triggers. Triggers of
+        different types are processed concurrently, triggers of the same
+        type - one after another. S3 triggers of the same bucket are merged
+        into a single bucket notification update.
+        """
+        to_create = to_create or []
+        to_remove = to_remove or []
+        if event_sources is None:
+            self._event_sources_index.pop(arn, None)
+            if any(trigger_meta['resource_type'] in EVENT_SOURCE_TRIGGERS
+                   for trigger_meta in to_create + to_remove):
+                # list the mappings before the concurrent trigger jobs
+                self._get_event_sources(arn)
+        else:
+            self._event_sources_index[arn] = list(event_sources)
+
+        s3_triggers = {}
+        for trigger_meta in to_remove:
+            if trigger_meta['resource_type'] == S3_TRIGGER:
+                s3_triggers.setdefault(
+                    trigger_meta.get('target_bucket'),
+                    ([], []))[1].append(trigger_meta)
+        for trigger_meta in to_create:
+            if trigger_meta['resource_type'] == S3_TRIGGER:
+                s3_triggers.setdefault(
+                    trigger_meta.get('target_bucket'),
+                    ([], []))[0].append(trigger_meta)
+
+        self._run_trigger_jobs(name, self._group_trigger_jobs(
+            name, arn, role_name, to_remove, self.REMOVE_TRIGGER))
+        jobs = self._group_trigger_jobs(name, arn, role_name, to_create,
+                                        self.CREATE_TRIGGER)
+        jobs[S3_TRIGGER] = [
+            (self._apply_s3_triggers, (name, arn, bucket, to_add, removed))
+            for bucket, (to_add, removed) in s3_triggers.items()
+        ]
+        self._run_trigger_jobs(name, jobs)
+
+    def _group_trigger_jobs(self, name, arn, role_name, triggers_meta,
+                            handlers):
+        jobs = {}
+        for trigger_meta in triggers_meta:
+            resource_type = trigger_meta['resource_type']
+            if resource_type == S3_TRIGGER:
+                continue
+            func = handlers[resource_type]
+            args = (self, name, arn, trigger_meta) \
+                if handlers is self.REMOVE_TRIGGER \
+                else (self, name, arn, role_name, trigger_meta)
+            jobs.setdefault(resource_type, []).append((func, args))
+        return jobs
+
+    @staticmethod
+    def _run_trigger_jobs(lambda_name, jobs):
+        jobs = {resource_type: type_jobs
+                for resource_type, type_jobs in jobs.items() if type_jobs}
+        if not jobs:
+            return
+
+        def run_jobs(resource_type, type_jobs):
+            with TRACER.span(f'{lambda_name}:{resource_type}',
+                             resource_type='lambda'):
+                for func, args in type_jobs:
+                    func(*args)
+
+        if len(jobs) == 1:
+            run_jobs(*next(iter(jobs.items())))
+            return
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(run_jobs, resource_type, type_jobs)
+                       for resource_type, type_jobs in jobs.items()]
+        for future in futures:
+            future.result()
 
     def remove_lambdas(self, args):
         return self.create_pool(self._remove_lambda, args)
@@ -1280,30 +1491,16 @@ class LambdaResource(BaseResource):
         from syndicate.core import CONFIG
         validate_params(name, meta, LAMBDA_LAYER_REQUIRED_PARAMS)
 
-        key = meta[S3_PATH_NAME]
-        key_compound = PurePath(CONFIG.deploy_target_bucket_key_compound,
-                                key).as_posix()
-        file_name = key.split('/')[-1]
-        self.s3_conn.download_file(self.deploy_target_bucket, key_compound,
-                                   file_name)
-        if is_zip_empty(file_name):
-            message = f'Can not create layer \'{name}\' because of empty ' \
-                      f'deployment package zip file.'
-            _LOG.error(message)
-            return {}, [message]
+        code_sha256, error = self._resolve_layer_code_sha256(name, meta)
+        if error:
+            return {}, [error]
 
         layer_arn = self.lambda_conn.get_lambda_layer_arn(name)
         if layer_arn:
             _LOG.warn(f"Layer '{name}' exists. Returning")
             return self.describe_lambda_layer(name, meta)
 
-        with open(file_name, 'rb') as file_data:
-            file_body = file_data.read()
-        import hashlib
-        hash_object = hashlib.sha256()
-        hash_object.update(file_body)
-        existing_version = self._is_equal_lambda_layer(hash_object.digest(),
-                                                       name)
+        existing_version = self._is_equal_lambda_layer(code_sha256, name)
         if existing_version:
             existing_layer_arn = existing_version['LayerVersionArn']
             _LOG.info(f'Layer {name} with same content already '
@@ -1326,6 +1523,7 @@ class LambdaResource(BaseResource):
         if meta.get('architectures'):
             args['architectures'] = meta['architectures']
         response = self.lambda_conn.create_layer(**args)
+        self._index_lambda_layer(name, response)
 
         _LOG.info(f'Lambda Layer {name} version {response["Version"]} '
                   f'was successfully created')
@@ -1347,17 +1545,9 @@ class LambdaResource(BaseResource):
         from syndicate.core import CONFIG
         validate_params(name, meta, LAMBDA_LAYER_REQUIRED_PARAMS)
 
-        key = meta[S3_PATH_NAME]
-        key_compound = PurePath(CONFIG.deploy_target_bucket_key_compound,
-                                key).as_posix()
-        file_name = key.split('/')[-1]
-        self.s3_conn.download_file(self.deploy_target_bucket, key_compound,
-                                   file_name)
-        if is_zip_empty(file_name):
-            message = f'Can not create layer \'{name}\' because of empty ' \
-                      f'deployment package zip file.'
-            _LOG.error(message)
-            return {}, [message]
+        code_sha256, error = self._resolve_layer_code_sha256(name, meta)
+        if error:
+            return {}, [error]
 
         layer_arn = self.lambda_conn.get_lambda_layer_arn(name)
         if not layer_arn:
@@ -1365,13 +1555,7 @@ class LambdaResource(BaseResource):
                 f"Lambda layer '{name}' does not exist."
             )
 
-        with open(file_name, 'rb') as file_data:
-            file_body = file_data.read()
-        import hashlib
-        hash_object = hashlib.sha256()
-        hash_object.update(file_body)
-        existing_version = self._is_equal_lambda_layer(hash_object.digest(),
-                                                       name)
+        existing_version = self._is_equal_lambda_layer(code_sha256, name)
         if existing_version:
             existing_layer_arn = existing_version['LayerVersionArn']
             _LOG.info(f'Layer {name} with same content already '
@@ -1394,6 +1578,7 @@ class LambdaResource(BaseResource):
         if meta.get('architectures'):
             args['architectures'] = meta['architectures']
         response = self.lambda_conn.create_layer(**args)
+        self._index_lambda_layer(name, response)
 
         _LOG.info(f'Lambda Layer {name} version {response["Version"]} '
                   f'was successfully created')
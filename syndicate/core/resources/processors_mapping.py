@@ -85,11 +85,14 @@ class ProcessorFacade:
                 self.resources_provider.ec2().create_ec2,
             EC2_LAUNCH_TEMPLATE_TYPE:
                 self.resources_provider.ec2().create_launch_template,
+            # the job queues are created at the same stage as the compute
+            # environments as soon as their own environments are VALID
             BATCH_COMPENV_TYPE:
-                self.resources_provider.batch_compenv()
-                    .create_compute_environment,
+                self.resources_provider.batch_jobqueue()
+                    .create_compute_environments_and_job_queues,
             BATCH_JOBQUEUE_TYPE:
-                self.resources_provider.batch_jobqueue().create_job_queue,
+                self.resources_provider.batch_jobqueue()
+                    .create_compute_environments_and_job_queues,
             BATCH_JOBDEF_TYPE:
                 self.resources_provider.batch_jobdef().register_job_definition,
             DOCUMENTDB_CLUSTER_TYPE:
@@ -107,10 +110,14 @@ class ProcessorFacade:
             create_update_swagger_ui,
             APPSYNC_TYPE:
                 self.resources_provider.appsync().create_graphql_api,
+            # the instances are created at the same stage as the clusters as
+            # soon as their own clusters are available
             RDS_DB_CLUSTER_TYPE:
-                self.resources_provider.rds_db_cluster().create_db_cluster,
+                self.resources_provider.rds_db_instance()
+                    .create_db_clusters_and_instances,
             RDS_DB_INSTANCE_TYPE:
-                self.resources_provider.rds_db_instance().create_db_instance
+                self.resources_provider.rds_db_instance()
+                    .create_db_clusters_and_instances
         }
 
     def describe_handlers(self):
@@ -282,6 +289,8 @@ class ProcessorFacade:
                 self.resources_provider.iam().update_iam_policy,
             SQS_QUEUE_TYPE:
                 self.resources_provider.sqs().update_sqs_queue,
+            KINESIS_STREAM_TYPE:
+                self.resources_provider.kinesis().update_kinesis_stream,
             LAMBDA_TYPE:
                 self.resources_provider.lambda_resource().update_lambda,
             LAMBDA_LAYER_TYPE:
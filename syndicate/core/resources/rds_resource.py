@@ -1,7 +1,13 @@
 import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
 
 from syndicate.commons.log_helper import get_logger, get_user_logger
+from syndicate.commons.tracing import TRACER
+from syndicate.connection.helper import then
 from syndicate.connection.rds_connection import RDSConnection
+from syndicate.core.constants import RDS_DB_CLUSTER_TYPE, \
+    RDS_DB_INSTANCE_TYPE
 from syndicate.core.helper import unpack_kwargs, dict_keys_to_upper_camel_case
 from syndicate.core.resources.base_resource import BaseResource
 from syndicate.core.resources.helper import validate_params, \
@@ -245,11 +251,23 @@ class RDSDBClusterResource(BaseResource):
         self.rds_conn = rds_conn
 
     def create_db_cluster(self, args: list) -> dict | tuple:
-        """ Create RDS cluster in pool in sub processes.
+        """ Create RDS cluster in pool in sub processes. All the clusters
+        are requested at once and their statuses are polled together by the
+        clusters watcher thread, so no worker waits for them.
 
         :type args: list
         """
-        return self.create_pool(self._create_db_cluster_from_meta, args, 1)
+        with ThreadPoolExecutor() as executor:
+            return self.collect_pool_results(
+                self.submit_db_clusters(executor, args))
+
+    def submit_db_clusters(self, executor: ThreadPoolExecutor,
+                           args: list) -> dict:
+        """ :returns dict of the futures of the clusters descriptions,
+        resolved when the clusters are available, to their parameters """
+        return {self.submit_when_ready(
+            executor, self._create_db_cluster_from_meta, arg): arg
+            for arg in args}
 
     @unpack_kwargs
     def _create_db_cluster_from_meta(self, name: str, meta: dict) -> dict:
@@ -284,17 +302,30 @@ class RDSDBClusterResource(BaseResource):
         if iam_db_auth is not None:
             params['EnableIAMDatabaseAuthentication'] = iam_db_auth
 
-        description = self.rds_conn.create_db_cluster(
-            name=name,
-            params=params
-        )
+        started_at = perf_counter()
+        with TRACER.span(f'{name}:requested',
+                         resource_type=RDS_DB_CLUSTER_TYPE):
+            self.rds_conn.create_db_cluster(
+                name=name,
+                params=params
+            )
 
         USER_LOG.info(
             f"Waiting for the DB cluster '{name}' to become available...")
-        waiter = self.rds_conn.get_waiter('db_cluster_available')
-        waiter.wait(
-            DBClusterIdentifier=name
-        )
+        creating_started_at = perf_counter()
+        return then(
+            self.rds_conn.watch_db_clusters_available([name]),
+            lambda descriptions: self._on_db_cluster_available(
+                name, meta, descriptions[name], started_at,
+                creating_started_at))
+
+    def _on_db_cluster_available(self, name: str, meta: dict,
+                                 description: dict, started_at: float,
+                                 creating_started_at: float) -> dict:
+        TRACER.record(f'{name}:creating', creating_started_at,
+                      resource_type=RDS_DB_CLUSTER_TYPE)
+        USER_LOG.info(f"RDS DB cluster '{name}' is available in "
+                      f"{perf_counter() - started_at:.0f}s")
 
         USER_LOG.info(f'Endpoint: {description["Endpoint"]}')
         USER_LOG.info(
@@ -430,15 +461,56 @@ class RDSDBClusterResource(BaseResource):
 
 class RDSDBInstanceResource(BaseResource):
 
-    def __init__(self, rds_conn: RDSConnection) -> None:
+    def __init__(self, rds_conn: RDSConnection,
+                 cluster_resource: RDSDBClusterResource = None) -> None:
         self.rds_conn = rds_conn
+        self.cluster_resource = cluster_resource
 
     def create_db_instance(self, args: list) -> dict | tuple:
-        """ Create RDS db instance in pool in sub processes.
+        return self.create_db_clusters_and_instances(args)
+
+    def create_db_clusters_and_instances(self, args: list) -> dict | tuple:
+        """ Create RDS DB clusters and instances of one deploy stage. Every
+        instance is requested as soon as its own cluster is available, the
+        statuses of all the clusters and instances are polled together by
+        the watchers threads, so no worker waits for them.
 
         :type args: list
         """
-        return self.create_pool(self._create_db_instance_from_meta, args, 1)
+        clusters, instances = [], []
+        for arg in args:
+            is_cluster = \
+                arg['meta'].get('resource_type') == RDS_DB_CLUSTER_TYPE
+            (clusters if is_cluster else instances).append(arg)
+        with ThreadPoolExecutor() as executor:
+            futures = self.cluster_resource.submit_db_clusters(
+                executor, clusters) if clusters else {}
+            created = {arg['name'].lower(): future
+                       for future, arg in futures.items()}
+            for arg in instances:
+                ready = self._db_cluster_available(arg['name'], arg['meta'],
+                                                   created)
+                futures[self.submit_when_ready(
+                    executor, self._create_db_instance_from_meta, arg,
+                    ready)] = arg
+            return self.collect_pool_results(futures)
+
+    def _db_cluster_available(self, name: str, meta: dict,
+                              created: dict) -> Future | None:
+        """ :returns Future resolved when the cluster of the instance is
+        available. The cluster created at the same stage is awaited by its
+        future, the existing one is checked by the clusters watcher.
+        """
+        cluster_name = meta.get('cluster_name')
+        if cluster_name is None:
+            return None
+        # the instance can be added only to the available cluster
+        cluster = created.get(cluster_name.lower()) or \
+            self.rds_conn.watch_db_clusters_available([cluster_name])
+        started_at = perf_counter()
+        return then(cluster, lambda _: TRACER.record(
+            f'{name}:pending', started_at,
+            resource_type=RDS_DB_INSTANCE_TYPE))
 
     @unpack_kwargs
     def _create_db_instance_from_meta(self, name: str, meta: dict) -> dict:
@@ -488,19 +560,33 @@ class RDSDBInstanceResource(BaseResource):
         if db_subnet_group_name is not None:
             params['DBSubnetGroupName'] = db_subnet_group_name
 
-        description = self.rds_conn.create_db_instance(
-            name=name,
-            params=params
-        )
+        # the job is submitted when the cluster of the instance is available
+        started_at = perf_counter()
+        with TRACER.span(f'{name}:requested',
+                         resource_type=RDS_DB_INSTANCE_TYPE):
+            self.rds_conn.create_db_instance(
+                name=name,
+                params=params
+            )
 
         USER_LOG.info(
             f"Waiting for the DB instance '{name}' to become available. This "
             f"may take up to 15 minutes. Please refrain from interrupting."
         )
-        waiter = self.rds_conn.get_waiter('db_instance_available')
-        waiter.wait(
-            DBInstanceIdentifier=name
-        )
+        creating_started_at = perf_counter()
+        return then(
+            self.rds_conn.watch_db_instances_available([name]),
+            lambda descriptions: self._on_db_instance_available(
+                name, meta, descriptions[name], started_at,
+                creating_started_at))
+
+    def _on_db_instance_available(self, name: str, meta: dict,
+                                  description: dict, started_at: float,
+                                  creating_started_at: float) -> dict:
+        TRACER.record(f'{name}:creating', creating_started_at,
+                      resource_type=RDS_DB_INSTANCE_TYPE)
+        USER_LOG.info(f"RDS DB instance '{name}' is available in "
+                      f"{perf_counter() - started_at:.0f}s")
 
         return self.describe_db_instance(
             name=name,
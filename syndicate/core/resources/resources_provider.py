@@ -147,7 +147,8 @@ class ResourceProvider:
             if not self._sns_resource:
                 self._sns_resource = SnsResource(
                     conn_provider=self._conn_provider,
-                    region=self.credentials.get('region'))
+                    region=self.credentials.get('region'),
+                    account_id=self.config.account_id)
             return self._sns_resource
 
         def api_gw(self) -> ApiGatewayResource:
@@ -337,7 +338,8 @@ class ResourceProvider:
         def batch_jobqueue(self):
             if not self._batch_jobqueue_resource:
                 self._batch_jobqueue_resource = BatchJobQueueResource(
-                    batch_conn=self._conn_provider.batch()
+                    batch_conn=self._conn_provider.batch(),
+                    compenv_resource=self.batch_compenv()
                 )
             return self._batch_jobqueue_resource
 
@@ -400,6 +402,7 @@ class ResourceProvider:
         def rds_db_instance(self):
             if not self._rds_db_instance_resource:
                 self._rds_db_instance_resource = RDSDBInstanceResource(
-                    rds_conn=self._conn_provider.rds()
+                    rds_conn=self._conn_provider.rds(),
+                    cluster_resource=self.rds_db_cluster()
                 )
             return self._rds_db_instance_resource
@@ -13,10 +13,13 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 from botocore.exceptions import ClientError
 
 from syndicate.exceptions import InvalidValueError
 from syndicate.commons.log_helper import get_logger
+from syndicate.connection.sns_connection import build_topic_arn
 from syndicate.core.conf.validator import ALL_REGIONS
 from syndicate.core.helper import unpack_kwargs, deterministic_uuid
 from syndicate.core.resources.base_resource import BaseResource
@@ -27,14 +30,18 @@ from syndicate.core.resources.helper import (build_description_obj,
 
 SNS_CLOUDWATCH_TRIGGER_REQUIRED_PARAMS = ['target_rule']
 
+# the regions of a resource are described concurrently
+DESCRIBE_REGIONS_WORKERS = 8
+
 _LOG = get_logger(__name__)
 
 
 class SnsResource(BaseResource):
 
-    def __init__(self, conn_provider, region) -> None:
+    def __init__(self, conn_provider, region, account_id=None) -> None:
         self.connection_provider = conn_provider
         self.region = region
+        self.account_id = account_id
         self.create_trigger = {
             'cloudwatch_rule_trigger':
                 self._create_cloud_watch_trigger_from_meta,
@@ -44,7 +51,9 @@ class SnsResource(BaseResource):
 
     def describe_sns(self, name, meta, region, arn=None):
         if not arn:
-            arn = self.connection_provider.sns(region).get_topic_arn(name)
+            arn = build_topic_arn(region, self.account_id, name) \
+                if self.account_id else \
+                self.connection_provider.sns(region).get_topic_arn(name)
         response = self.connection_provider.sns(region).get_topic_attributes(
             arn)
         return {
@@ -52,38 +61,26 @@ class SnsResource(BaseResource):
         }
 
     def describe_sns_from_meta(self, name, meta):
-        new_region_args = create_args_for_multi_region(
-            [
-                {
-                    'name': name,
-                    'meta': meta
-                }
-            ],
-            ALL_REGIONS)
-        responses = []
-        for arg in new_region_args:
-            region = arg['region']
-            topic_arn = self.connection_provider.sns(region).get_topic_arn(
-                name)
+        def describe_in_region(region):
+            conn = self.connection_provider.sns(region)
+            if self.account_id:
+                # the topic existence is checked by the attributes call
+                topic_arn = build_topic_arn(region, self.account_id, name)
+                return topic_arn, conn.get_topic_attributes_if_exists(
+                    topic_arn)
+            topic_arn = conn.get_topic_arn(name)
             if not topic_arn:
-                continue
-            response = self.connection_provider.sns(
-                region).get_topic_attributes(
-                topic_arn)
-            if response:
-                responses.append({'arn': topic_arn, 'response': response})
-        description = {}
-        for topic in responses:
-            description.update({
-                topic['arn']: build_description_obj(
-                    topic['response'], name, meta)
-            })
-        return description
+                return topic_arn, None
+            return topic_arn, conn.get_topic_attributes(topic_arn)
+
+        return self._describe_in_regions(name, meta, describe_in_region)
 
     def describe_sns_application(self, name, meta, region, arn=None):
         if not arn:
             arn = self.connection_provider.sns(
-                region).get_platform_application(name)
+                region).get_platform_application(
+                name, account_id=self.account_id,
+                platform=meta.get('platform'))
         response = self.connection_provider.sns(
             region).get_platform_application_attributes(arn)
         return {
@@ -91,6 +88,24 @@ class SnsResource(BaseResource):
         }
 
     def describe_sns_application_from_meta(self, name, meta):
+        def describe_in_region(region):
+            conn = self.connection_provider.sns(region)
+            app_arn = conn.get_platform_application(
+                name, account_id=self.account_id,
+                platform=meta.get('platform'))
+            if not app_arn:
+                return app_arn, None
+            return app_arn, conn.get_platform_application_attributes(app_arn)
+
+        return self._describe_in_regions(name, meta, describe_in_region)
+
+    @staticmethod
+    def _describe_in_regions(name, meta, describe_in_region):
+        """ Describes the resource in all its regions concurrently
+
+        :param describe_in_region: function which takes the region and
+            returns the arn and the description of the resource there
+        """
         new_region_args = create_args_for_multi_region(
             [
                 {
@@ -99,25 +114,18 @@ class SnsResource(BaseResource):
                 }
             ],
             ALL_REGIONS)
-        responses = []
-        for arg in new_region_args:
-            region = arg['region']
-            app_arn = self.connection_provider.sns(
-                region).get_platform_application(
-                name)
-            if not app_arn:
-                continue
-            response = self.connection_provider.sns(
-                region).get_platform_application_attributes(
-                app_arn)
-            if response:
-                responses.append({'arn': app_arn, 'response': response})
+        regions = [arg['region'] for arg in new_region_args]
+        if len(regions) > 1:
+            with ThreadPoolExecutor(
+                    min(len(regions), DESCRIBE_REGIONS_WORKERS)) as executor:
+                responses = list(executor.map(describe_in_region, regions))
+        else:
+            responses = [describe_in_region(region) for region in regions]
         description = {}
-        for topic in responses:
-            description.update({
-                topic['arn']: build_description_obj(
-                    topic['response'], name, meta)
-            })
+        for arn, response in responses:
+            if arn and response:
+                description[arn] = build_description_obj(response, name,
+                                                         meta)
         return description
 
     def create_sns_topic(self, args):
@@ -140,7 +148,8 @@ class SnsResource(BaseResource):
 
     @unpack_kwargs
     def _create_sns_topic_from_meta(self, name, meta, region):
-        arn = self.connection_provider.sns(region).get_topic_arn(name)
+        arn = self.connection_provider.sns(region).get_topic_arn(
+            name, account_id=self.account_id)
         if arn:
             _LOG.warn(
                 '{0} sns topic exists in region {1}.'.format(name, region))
@@ -217,7 +226,7 @@ class SnsResource(BaseResource):
         rule_name = trigger_meta['target_rule']
 
         topic_arn = self.connection_provider.sns(region).get_topic_arn(
-            topic_name)
+            topic_name, account_id=self.account_id)
         self.connection_provider.cw_events(region).add_rule_target(
             rule_name, topic_arn)
         self.connection_provider.sns(region).allow_service_invoke(
@@ -269,7 +278,7 @@ class SnsResource(BaseResource):
         required_parameters = ['platform', 'attributes']
         validate_params(name, meta, required_parameters)
         arn = self.connection_provider.sns(region).get_platform_application(
-            name)
+            name, account_id=self.account_id, platform=meta['platform'])
         if arn:
             _LOG.warn(
                 '{0} SNS platform application exists in region {1}.'.format(
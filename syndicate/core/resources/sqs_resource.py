@@ -38,9 +38,11 @@ class SqsResource(BaseResource):
     def create_sqs_queue(self, args):
         return self.create_pool(self._create_sqs_queue_from_meta, args)
 
-    def describe_queue(self, queue_url, name, meta, resource_name, region):
-        response = self.sqs_conn_builder(region).get_queue_attributes(
-            queue_url)
+    def describe_queue(self, queue_url, name, meta, resource_name, region,
+                       response=None):
+        if not response:
+            response = self.sqs_conn_builder(region).get_queue_attributes(
+                queue_url)
         arn = self._build_queue_arn(resource_name=resource_name, region=region)
         return {arn: build_description_obj(response, name, meta)}
 
@@ -159,7 +161,12 @@ class SqsResource(BaseResource):
         if not queue_url:
             raise ResourceNotFoundError(f"'{name}' SQS queue does not exist.")
 
-        sqs_conn.update_queue(
+        # the live attributes are fetched once, they are used both to find
+        # the changed attributes and to describe the unchanged queue
+        response = sqs_conn.get_queue_attributes(queue_url)
+        if not response:
+            raise ResourceNotFoundError(f"'{name}' SQS queue does not exist.")
+        changed_attributes = sqs_conn.update_queue(
             queue_url, delay_seconds=meta.get('delay_seconds'),
             maximum_message_size=meta.get('maximum_message_size'),
             message_retention_period=meta.get('message_retention_period'),
@@ -173,9 +180,14 @@ class SqsResource(BaseResource):
                 'kms_data_key_reuse_period_seconds'),
             content_based_deduplication=meta.get(
                 'content_based_deduplication'),
-            tags=meta.get('tags')
+            tags=meta.get('tags'),
+            current_attributes=response['Attributes']
         )
 
+        if not changed_attributes:
+            _LOG.info(f"SQS queue '{name}' attributes are up to date.")
+            return self.describe_queue(queue_url, name, meta, name,
+                                       self.region, response)
         _LOG.info(f"Updated SQS queue '{name}' configuration.")
         return self.describe_queue(queue_url, name, meta, name, self.region)
 
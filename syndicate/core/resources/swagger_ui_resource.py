@@ -13,27 +13,33 @@
     See the License for the specific language governing permissions and
     limitations under the License.
 """
-import io
+import gzip
 import json
+import mimetypes
 import os
 import posixpath
 from functools import cached_property
 from pathlib import PurePath
 from shutil import rmtree
 from typing import Optional
-from zipfile import ZipFile
 
 from syndicate.commons import deep_get
-from syndicate.exceptions import ResourceNotFoundError, ParameterError
+from syndicate.exceptions import ResourceNotFoundError, ParameterError, \
+    ArtifactError
 from syndicate.commons.log_helper import get_logger, get_user_logger
 from syndicate.core.constants import ARTIFACTS_FOLDER, S3_PATH_NAME, \
     SWAGGER_UI_SPEC_NAME_TEMPLATE, API_GATEWAY_TYPE, RESOURCE_TYPE_PARAM, \
     RESOURCE_NAME_PARAM, PARAMETER_NAME_PARAM, PARAMETER_TYPE_PARAM
 from syndicate.core.helper import build_path, unpack_kwargs
 from syndicate.core.resources.base_resource import BaseResource
-from syndicate.core.resources.helper import build_description_obj
+from syndicate.core.resources.helper import build_description_obj, \
+    extract_deployment_package
 
 INDEX_FILE_NAME = 'index.html'
+COMPRESSIBLE_EXTENSIONS = ('.html', '.json', '.yaml', '.yml', '.js', '.css')
+# the files keep their names between the deployments, so the browsers have
+# to revalidate them by the ETag
+CACHE_CONTROL = 'no-cache'
 X_SYNDICATE_SERVER_PARAM = 'x-syndicate-server'
 # example:
 # "x-syndicate-server": {
@@ -50,6 +56,31 @@ _LOG = get_logger(__name__)
 USER_LOG = get_user_logger()
 
 
+def build_upload_file(path: str, key: str) -> tuple[str, str, dict]:
+    """ Compresses the text file with gzip and builds its headers. The
+    compression is deterministic, so the unchanged file has the same ETag.
+
+    :returns tuple of the path to upload, the object key and the extra args
+    """
+    extra_args = {
+        'ContentType': mimetypes.guess_type(key)[0] or
+        'application/octet-stream',
+        'CacheControl': CACHE_CONTROL
+    }
+    if key == INDEX_FILE_NAME:
+        extra_args['ContentDisposition'] = f'inline;filename={INDEX_FILE_NAME}'
+    if os.path.splitext(key)[1] in COMPRESSIBLE_EXTENSIONS:
+        with open(path, 'rb') as file:
+            content = file.read()
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) < len(content):
+            path = f'{path}.gz'
+            with open(path, 'wb') as file:
+                file.write(compressed)
+            extra_args['ContentEncoding'] = 'gzip'
+    return path, key, extra_args
+
+
 class SwaggerUIResource(BaseResource):
 
     def __init__(self, s3_conn, deploy_target_bucket,
@@ -101,34 +132,27 @@ class SwaggerUIResource(BaseResource):
         artifact_src_path = posixpath.join(
             self.deploy_target_bucket_key_compound, artifact_path)
 
-        _LOG.info(f'Downloading an artifact for Swagger UI \'{name}\'')
-        with io.BytesIO() as artifact:
-            self.s3_conn.download_to_file(
-                bucket_name=self.deploy_target_bucket,
-                key=artifact_src_path,
-                file=artifact)
-            extract_to = build_path(artifact_dir, name)
-            with ZipFile(artifact, 'r') as zf:
-                zf.extractall(extract_to)
+        _LOG.info(f'Extracting an artifact for Swagger UI \'{name}\'')
+        extract_to = build_path(artifact_dir, name)
+        if not extract_deployment_package(
+                self.s3_conn, self.deploy_target_bucket, artifact_src_path,
+                artifact_path, extract_to):
+            raise ArtifactError(
+                f'Deployment package for Swagger UI \'{name}\' not found by '
+                f'the path \'{artifact_src_path}\'')
 
-        _LOG.info(f'Uploading files for Swagger UI \'{name}\' to target '
-                  f'bucket \'{target_bucket}\'')
+        files = []
         for file in os.listdir(extract_to):
-            extra_args = None
-            if file == INDEX_FILE_NAME:
-                extra_args = {
-                    'ContentType': 'text/html',
-                    'ContentDisposition': f'inline;filename={INDEX_FILE_NAME}'
-                }
-            elif file.endswith('.json'):
-                filepath = PurePath(extract_to, file)
+            filepath = PurePath(extract_to, file).as_posix()
+            if file.endswith('.json'):
                 self.resolve_api_url(filepath, meta)
+            files.append(build_upload_file(filepath, file))
 
-            self.s3_conn.upload_single_file(path=PurePath(extract_to,
-                                                          file).as_posix(),
-                                            key=file,
-                                            bucket=target_bucket,
-                                            extra_args=extra_args)
+        _LOG.info(f'Uploading files for Swagger UI \'{name}\' to target '
+                  f'bucket \'{target_bucket}\'')
+        uploaded = self.s3_conn.upload_files(files, target_bucket)
+        _LOG.info(f'Uploaded {len(uploaded)} of {len(files)} files for '
+                  f'Swagger UI \'{name}\', the rest are not changed')
 
         _LOG.info(f'Removing temporary directory \'{artifact_dir}\'')
         rmtree(artifact_dir)
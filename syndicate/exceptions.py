@@ -111,6 +111,13 @@ class ResourceNotFoundError(ResourceProcessingError):
     pass
 
 
+class ResourceProcessingTimeoutError(ResourceProcessingError):
+    """
+    The resource did not reach the expected state in time.
+    """
+    pass
+
+
 # -----------------------------------------------------------------------------
 class ResourceMetadataError(ResourceProcessingError):
     """
@@ -0,0 +1,24 @@
+from unittest.mock import patch
+
+
+class FakeClock:
+    """ Clock for the pollers, time passes only when it sleeps """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def patch_description(test_case, module):
+    """ Patches `build_description_obj` of the resource module, which needs
+    the project config """
+    patcher = patch(f'{module}.build_description_obj', return_value={})
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
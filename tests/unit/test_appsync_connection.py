@@ -0,0 +1,62 @@
+import unittest
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+import syndicate.core # noqa: F401
+from syndicate.connection.appsync_connection import AppSyncConnection
+from syndicate.connection.helper import Poller
+from syndicate.exceptions import ResourceProcessingTimeoutError
+from tests.unit import FakeClock
+
+
+class TestCreateSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = AppSyncConnection.__new__(AppSyncConnection)
+        self.conn.client = MagicMock()
+        self.conn.client.start_schema_creation.return_value = {
+            'status': 'PROCESSING'}
+        self.clock = FakeClock()
+        patcher = patch(
+            'syndicate.connection.appsync_connection.Poller',
+            partial(Poller, jitter=0, clock=self.clock,
+                    sleep=self.clock.sleep))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_status_polled_with_backoff(self):
+        statuses = [{'status': 'PROCESSING'}] * 5 + [
+            {'status': 'SUCCESS', 'details': 'done'}]
+        self.conn.client.get_schema_creation_status.side_effect = statuses
+        progress = MagicMock()
+
+        result = self.conn.create_schema('api-id', 'type Query',
+                                         progress_callback=progress)
+
+        self.assertEqual(result, ('SUCCESS', 'done'))
+        self.assertEqual(progress.call_count, 6)
+        # 1 + 1.5 + 2.25 + 3.375 + 5.0625 seconds instead of 10 at 2s step
+        self.assertAlmostEqual(self.clock.now, 13.1875)
+
+    def test_stuck_schema_raises_timeout(self):
+        self.conn.client.get_schema_creation_status.return_value = {
+            'status': 'PROCESSING', 'details': 'in progress'}
+
+        with self.assertRaises(ResourceProcessingTimeoutError):
+            self.conn.create_schema('api-id', 'type Query', timeout=120)
+
+        self.assertEqual(self.clock.now, 120)
+        self.assertLess(
+            self.conn.client.get_schema_creation_status.call_count, 20)
+
+    def test_not_polled_when_created_at_once(self):
+        self.conn.client.start_schema_creation.return_value = {
+            'status': 'SUCCESS'}
+
+        self.assertEqual(self.conn.create_schema('api-id', 'type Query'),
+                         ('SUCCESS', ''))
+        self.conn.client.get_schema_creation_status.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
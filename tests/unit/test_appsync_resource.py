@@ -0,0 +1,198 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.core.resources.appsync_resource import AppSyncResource, \
+    SCHEMA_SHA256_TAG, is_definition_changed
+
+API_ID = 'api-id'
+API_ARN = f'arn:aws:appsync:eu-west-1:123456789012:apis/{API_ID}'
+CODE = 'export function request(ctx) { return {}; }'
+
+
+def _resolver(field_name, code=CODE, **kwargs):
+    return dict(typeName='Query', fieldName=field_name, kind='UNIT',
+                dataSourceName='table', code=code,
+                runtime={'name': 'APPSYNC_JS', 'runtimeVersion': '1.0.0'},
+                resolverArn=f'{API_ARN}/types/Query/resolvers/{field_name}',
+                maxBatchSize=0, **kwargs)
+
+
+def _resolver_meta(field_name):
+    return {'type_name': 'Query', 'field_name': field_name,
+            'data_source_name': 'table', 'runtime': 'JS',
+            'code_path': f'{field_name}.js'}
+
+
+class TestIsDefinitionChanged(unittest.TestCase):
+
+    def test_remote_defaults_ignored(self):
+        desired = {'name': 'table', 'type': 'AMAZON_DYNAMODB',
+                   'dynamodbConfig': {'tableName': 'table'}}
+        existing = {'name': 'table', 'type': 'AMAZON_DYNAMODB',
+                    'dataSourceArn': 'arn',
+                    'dynamodbConfig': {'tableName': 'table',
+                                       'awsRegion': 'eu-west-1',
+                                       'useCallerCredentials': False}}
+
+        self.assertFalse(is_definition_changed(desired, existing))
+        desired['dynamodbConfig']['tableName'] = 'other'
+        self.assertTrue(is_definition_changed(desired, existing))
+
+    def test_code_compared(self):
+        desired = {'typeName': 'Query', 'fieldName': 'get', 'code': CODE}
+
+        self.assertFalse(is_definition_changed(desired, _resolver('get')))
+        self.assertTrue(is_definition_changed(
+            desired, _resolver('get', code=CODE + ' ')))
+
+
+class TestAppSyncReconciliation(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = AppSyncResource.__new__(AppSyncResource)
+        self.resource.appsync_conn = MagicMock()
+        self.resource.account_id = '123456789012'
+        self.artifacts = tempfile.TemporaryDirectory()
+        self.addCleanup(self.artifacts.cleanup)
+        for field_name in ('get', 'list', 'search'):
+            with open(os.path.join(self.artifacts.name, f'{field_name}.js'),
+                      'w') as file:
+                file.write(CODE)
+
+    def test_only_differences_applied(self):
+        conn = self.resource.appsync_conn
+        conn.update_resolver.side_effect = \
+            lambda api_id, **params: _resolver(params['field_name'])
+        conn.create_resolver.side_effect = \
+            lambda api_id, **params: _resolver(params['field_name'])
+        existing = (
+            [{'name': 'table', 'type': 'NONE'},
+             {'name': 'stale', 'type': 'NONE'}],
+            [],
+            [_resolver('get'), _resolver('list', code='old'),
+             _resolver('stale')])
+        meta = {
+            'data_sources': [{'name': 'table', 'type': 'NONE'}],
+            'resolvers': [_resolver_meta(field_name)
+                          for field_name in ('get', 'list', 'search')]
+        }
+
+        self.resource._reconcile_api_entities(
+            'api', API_ID, meta, self.artifacts.name, existing)
+
+        conn.create_data_source.assert_not_called()
+        conn.update_data_source.assert_not_called()
+        conn.delete_data_source.assert_called_once_with(API_ID, 'stale')
+        self.assertEqual(
+            [each.kwargs['field_name']
+             for each in conn.update_resolver.call_args_list], ['list'])
+        self.assertEqual(
+            [each.kwargs['field_name']
+             for each in conn.create_resolver.call_args_list], ['search'])
+        conn.delete_resolver.assert_called_once_with(
+            API_ID, type_name='Query', field_name='stale')
+
+    def test_changes_of_api_not_applied_concurrently(self):
+        conn = self.resource.appsync_conn
+        lock = threading.Lock()
+        in_progress = []
+
+        def modify(api_id, **params):
+            # AppSync rejects the change while another one is in progress
+            with lock:
+                if in_progress:
+                    raise ClientError(
+                        {'Error': {'Code': 'ConcurrentModificationException',
+                                   'Message': 'Another modification is in '
+                                              'progress'}},
+                        'CreateResolver')
+                in_progress.append(params)
+            time.sleep(0.01)
+            with lock:
+                in_progress.remove(params)
+            return _resolver(params['field_name'])
+
+        conn.create_resolver.side_effect = modify
+        conn.delete_resolver.side_effect = \
+            lambda api_id, **params: modify(api_id, field_name='deleted')
+        existing = ([], [], [_resolver('stale'), _resolver('old')])
+        meta = {'resolvers': [_resolver_meta(field_name)
+                              for field_name in ('get', 'list', 'search')]}
+
+        self.resource._reconcile_api_entities(
+            'api', API_ID, meta, self.artifacts.name, existing)
+
+        self.assertEqual(conn.create_resolver.call_count, 3)
+        self.assertEqual(conn.delete_resolver.call_count, 2)
+
+    def test_pipeline_resolver_uses_unchanged_function_id(self):
+        conn = self.resource.appsync_conn
+        with open(os.path.join(self.artifacts.name, 'func.js'), 'w') as file:
+            file.write(CODE)
+        existing = ([], [{'name': 'func', 'functionId': 'func-id',
+                          'dataSourceName': 'table', 'code': CODE,
+                          'runtime': {'name': 'APPSYNC_JS',
+                                      'runtimeVersion': '1.0.0'}}], [])
+        meta = {
+            'functions': [{'name': 'func', 'data_source_name': 'table',
+                           'runtime': 'JS', 'code_path': 'func.js'}],
+            'resolvers': [{'type_name': 'Query', 'field_name': 'get',
+                           'kind': 'PIPELINE', 'runtime': 'JS',
+                           'code_path': 'get.js',
+                           'pipeline_config': {'functions': ['func']}}]
+        }
+
+        self.resource._reconcile_api_entities(
+            'api', API_ID, meta, self.artifacts.name, existing)
+
+        conn.update_function.assert_not_called()
+        self.assertEqual(
+            conn.create_resolver.call_args.kwargs['pipeline_config'],
+            {'functions': ['func-id']})
+
+    def test_resolvers_of_all_types_fetched(self):
+        conn = self.resource.appsync_conn
+        conn.list_data_sources.return_value = []
+        conn.list_functions.return_value = []
+        conn.list_types.return_value = [{'name': 'Query'},
+                                        {'name': 'Mutation'}]
+        conn.list_resolvers.side_effect = \
+            lambda api_id, type_name: [{'typeName': type_name}]
+
+        _, _, resolvers = self.resource._get_api_entities(API_ID)
+
+        self.assertEqual(sorted(each['typeName'] for each in resolvers),
+                         ['Mutation', 'Query'])
+
+    def test_unchanged_schema_not_uploaded(self):
+        schema_path = os.path.join(self.artifacts.name, 'schema.graphql')
+        with open(schema_path, 'w', encoding='utf-8') as file:
+            file.write('type Query { get: String }')
+        schema_sha256 = hashlib.sha256(
+            b'type Query { get: String }').hexdigest()
+        conn = self.resource.appsync_conn
+        conn.create_schema.return_value = ('SUCCESS', '')
+
+        self.resource._apply_schema('api', API_ID, API_ARN, schema_path,
+                                    self.artifacts.name,
+                                    applied_sha256=schema_sha256)
+        conn.create_schema.assert_not_called()
+
+        self.resource._apply_schema('api', API_ID, API_ARN, schema_path,
+                                    self.artifacts.name,
+                                    applied_sha256='old')
+        conn.create_schema.assert_called_once()
+        conn.tag_graphql_api.assert_called_once_with(
+            API_ARN, {SCHEMA_SHA256_TAG: schema_sha256})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import syndicate.core # noqa: F401
+from syndicate.connection.batch_connection import ComputeEnvironmentsWatcher
+from syndicate.exceptions import ResourceNotFoundError, \
+    ResourceProcessingError, ResourceProcessingTimeoutError
+from tests.unit import FakeClock
+
+
+def _environment(name, status, reason=None):
+    return {'computeEnvironmentName': name,
+            'computeEnvironmentArn': f'arn:aws:batch:compute-environment/'
+                                     f'{name}',
+            'status': status, 'statusReason': reason}
+
+
+class TestComputeEnvironmentsWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.batch_conn = MagicMock()
+        self.statuses = {}
+
+        def describe(environments):
+            return {'computeEnvironments': [
+                _environment(name, self.statuses[name].pop(0))
+                for name in environments if name in self.statuses]}
+
+        self.batch_conn.describe_compute_environments.side_effect = describe
+        self.watcher = ComputeEnvironmentsWatcher(
+            self.batch_conn, interval=3, clock=self.clock,
+            sleep=self.clock.sleep)
+
+    def test_waits_until_valid(self):
+        self.statuses = {'first': ['CREATING', 'CREATING', 'VALID']}
+
+        descriptions = self.watcher.wait(['first'])
+
+        self.assertEqual(descriptions['first']['status'], 'VALID')
+        self.assertEqual(
+            self.batch_conn.describe_compute_environments.call_count, 3)
+        self.assertEqual(self.clock.now, 6)
+
+    def test_invalid_environment_raised(self):
+        self.batch_conn.describe_compute_environments.side_effect = None
+        self.batch_conn.describe_compute_environments.return_value = {
+            'computeEnvironments': [
+                _environment('first', 'INVALID', 'no subnets')]}
+
+        with self.assertRaisesRegex(ResourceProcessingError, 'no subnets'):
+            self.watcher.wait(['first'])
+
+    def test_timeout_raised(self):
+        self.statuses = {'first': ['CREATING'] * 10}
+
+        with self.assertRaises(ResourceProcessingTimeoutError):
+            self.watcher.wait(['first'], timeout=10)
+
+    def test_missing_environment_raised(self):
+        self.statuses = {'first': ['CREATING'] * 10}
+
+        with self.assertRaisesRegex(ResourceNotFoundError, 'frist'):
+            self.watcher.wait(['first', 'frist'])
+        self.assertEqual(
+            self.batch_conn.describe_compute_environments.call_count, 1)
+
+    def test_polled_once_with_zero_timeout(self):
+        self.statuses = {'first': ['VALID']}
+
+        descriptions = self.watcher.wait(['first'], timeout=0)
+
+        self.assertEqual(descriptions['first']['status'], 'VALID')
+
+    def test_waiting_threads_share_polls(self):
+        polls = []
+
+        def describe(environments):
+            polls.append(sorted(environments))
+            status = 'VALID' if len(polls) > 1 else 'CREATING'
+            return {'computeEnvironments': [
+                _environment(name, status) for name in environments]}
+
+        def sleep(seconds):
+            # the next poll is made after the second thread joins the wait
+            while 'second' not in watcher._waited:
+                time.sleep(0.01)
+
+        self.batch_conn.describe_compute_environments.side_effect = describe
+        watcher = ComputeEnvironmentsWatcher(self.batch_conn,
+                                             clock=FakeClock(), sleep=sleep)
+        results = {}
+        threads = [threading.Thread(
+            target=lambda env=env: results.update(watcher.wait([env])))
+            for env in ('first', 'second')]
+        threads[0].start()
+        while not polls:
+            time.sleep(0.01)
+        threads[1].start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(polls, [['first'], ['first', 'second']])
+        self.assertEqual(results['first']['status'], 'VALID')
+        self.assertEqual(results['second']['status'], 'VALID')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+from botocore.exceptions import WaiterError
+
+import syndicate.core # noqa: F401
+from syndicate.core.resources.batch_compenv_resource import \
+    BatchComputeEnvironmentResource
+from syndicate.core.resources.batch_jobqueue_resource import \
+    BatchJobQueueResource
+from syndicate.exceptions import ResourceProcessingError
+from tests.unit import patch_description
+
+
+def _environment_meta():
+    return {'resource_type': 'batch_compenv',
+            'compute_environment_type': 'MANAGED',
+            'service_role': 'role'}
+
+
+def _queue_meta(*environments):
+    return {'resource_type': 'batch_jobqueue', 'priority': 1,
+            'compute_environment_order': [
+                {'order': order, 'compute_environment': environment}
+                for order, environment in enumerate(environments, 1)]}
+
+
+def _valid(*environments):
+    future = Future()
+    future.set_result({environment: {
+        'computeEnvironmentName': environment,
+        'computeEnvironmentArn': f'arn:aws:batch:compute-environment/'
+                                 f'{environment}',
+        'status': 'VALID'} for environment in environments})
+    return future
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestCreateJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_conn = MagicMock()
+        self.batch_conn.describe_job_queue.return_value = {'jobQueues': []}
+        self.batch_conn.describe_compute_environments.return_value = {
+            'computeEnvironments': []}
+        self.watched = {}
+
+        def watch(environments):
+            future = self.watched[tuple(environments)] = Future()
+            return future
+
+        self.batch_conn.watch_compute_environments.side_effect = watch
+        compenv_resource = BatchComputeEnvironmentResource(
+            self.batch_conn, MagicMock(), 'eu-west-1', '123456789012')
+        self.resource = BatchJobQueueResource(self.batch_conn,
+                                              compenv_resource)
+        for module in ('batch_jobqueue_resource', 'batch_compenv_resource'):
+            patch_description(self, f'syndicate.core.resources.{module}')
+
+    def _created_queues(self):
+        return [call.kwargs['job_queue_name'] for call in
+                self.batch_conn.create_job_queue.call_args_list]
+
+    def test_queue_created_when_own_environments_valid(self):
+        args = [{'name': 'first', 'meta': _environment_meta()},
+                {'name': 'second', 'meta': _environment_meta()},
+                {'name': 'first-queue', 'meta': _queue_meta('first')},
+                {'name': 'second-queue', 'meta': _queue_meta(
+                    'arn:aws:batch:compute-environment/second')}]
+        results = []
+        stage = threading.Thread(target=lambda: results.append(
+            self.resource.create_compute_environments_and_job_queues(args)))
+        stage.start()
+        _wait_until(lambda: len(self.watched) == 2)
+
+        self.watched[('first',)].set_result(_valid('first').result())
+        _wait_until(lambda: self._created_queues())
+        self.assertEqual(self._created_queues(), ['first-queue'])
+
+        self.watched[('second',)].set_result(_valid('second').result())
+        stage.join(5)
+        self.assertCountEqual(self._created_queues(),
+                              ['first-queue', 'second-queue'])
+        self.assertEqual(
+            self.batch_conn.create_compute_environment.call_count, 2)
+        self.assertNotIsInstance(results[0], tuple)
+
+    def test_existing_environments_watched(self):
+        self.batch_conn.watch_compute_environments.side_effect = \
+            lambda environments: _valid(*environments)
+
+        self.resource.create_compute_environments_and_job_queues([
+            {'name': 'queue', 'meta': _queue_meta('first', 'second')}])
+
+        self.batch_conn.watch_compute_environments.assert_called_once_with(
+            ['first', 'second'])
+        self.assertEqual(self._created_queues(), ['queue'])
+
+    def test_invalid_environment_stops_queue_creation(self):
+        def watch(environments):
+            future = Future()
+            future.set_exception(ResourceProcessingError('INVALID'))
+            return future
+
+        self.batch_conn.watch_compute_environments.side_effect = watch
+
+        _, errors = self.resource.create_compute_environments_and_job_queues(
+            [{'name': 'first', 'meta': _environment_meta()},
+             {'name': 'queue', 'meta': _queue_meta('first')}])
+
+        self.assertEqual(len(errors), 2)
+        self.batch_conn.create_job_queue.assert_not_called()
+
+    def test_waiter_failure_raised(self):
+        self.batch_conn.watch_compute_environments.side_effect = \
+            lambda environments: _valid(*environments)
+        self.batch_conn.get_job_queue_waiter.return_value.wait.side_effect = \
+            WaiterError('JobQueueWaiter', 'Waiter encountered a terminal '
+                                          'failure state', {})
+
+        _, errors = self.resource.create_compute_environments_and_job_queues(
+            [{'name': 'queue', 'meta': _queue_meta('first')}])
+
+        self.assertIn('ResourceProcessingError', errors[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock
+
+import syndicate.core # noqa: F401
+from syndicate.connection.cloud_watch_connection import EventConnection, \
+    LogsConnection, build_rule_target
+from syndicate.core.resources.cloud_watch_resource import \
+    CloudWatchResource, get_event_bus_arn
+from syndicate.exceptions import ResourceProcessingError
+
+REGION = 'eu-west-1'
+LAMBDA_ARN = 'arn:aws:lambda:eu-west-1:123456789012:function:func'
+
+
+class TestLogGroupByLambdaName(unittest.TestCase):
+
+    def test_group_of_other_lambda_not_matched(self):
+        connection = LogsConnection.__new__(LogsConnection)
+        connection.client = MagicMock()
+        connection.client.describe_log_groups.return_value = {
+            'logGroups': [{'logGroupName': '/aws/lambda/api-handler'}]}
+
+        self.assertIsNone(connection.get_log_group_by_lambda_name('api'))
+        connection.client.describe_log_groups.assert_called_once_with(
+            logGroupNamePrefix='/aws/lambda/api')
+
+
+class TestEventConnectionBatches(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = EventConnection.__new__(EventConnection)
+        self.connection.client = MagicMock()
+        self.connection.client.put_targets.return_value = {
+            'FailedEntryCount': 0}
+        self.connection.client.remove_targets.return_value = {
+            'FailedEntryCount': 0}
+
+    def test_targets_put_in_batches_of_ten(self):
+        targets = [build_rule_target(f'arn:{i}') for i in range(25)]
+
+        self.connection.put_rule_targets('rule', targets)
+
+        calls = self.connection.client.put_targets.call_args_list
+        self.assertEqual([len(c.kwargs['Targets']) for c in calls],
+                         [10, 10, 5])
+
+    def test_failed_entries_raised(self):
+        self.connection.client.remove_targets.return_value = {
+            'FailedEntryCount': 1, 'FailedEntries': [{'TargetId': '1'}]}
+
+        with self.assertRaises(ResourceProcessingError):
+            self.connection.remove_rule_targets('rule', ['1'])
+
+
+class TestTenantRuleTargets(unittest.TestCase):
+
+    def setUp(self):
+        self.cw_conn = MagicMock()
+        self.resource = CloudWatchResource(lambda region=None: self.cw_conn,
+                                           account_id='123456789012')
+
+    def test_targets_listed_once_and_diff_applied(self):
+        self.cw_conn.list_targets_by_rule.return_value = [
+            {'Id': 'syndicate-event-bus-kept',
+             'Arn': get_event_bus_arn('111', REGION)},
+            {'Id': 'syndicate-event-bus-stale',
+             'Arn': get_event_bus_arn('222', REGION)},
+            {'Id': 'external', 'Arn': get_event_bus_arn('555', REGION)},
+            {'Id': 'lambda', 'Arn': LAMBDA_ARN}
+        ]
+
+        self.resource._attach_tenant_rule_targets(
+            'rule', REGION, ['111', '333', '444'])
+
+        self.cw_conn.list_targets_by_rule.assert_called_once()
+        # the event bus target added outside of syndicate is kept
+        self.cw_conn.remove_rule_targets.assert_called_once_with(
+            'rule', ['syndicate-event-bus-stale'])
+        rule_name, targets = self.cw_conn.put_rule_targets.call_args.args
+        self.assertEqual([target['Arn'] for target in targets],
+                         [get_event_bus_arn('333', REGION),
+                          get_event_bus_arn('444', REGION)])
+        self.assertTrue(all(target['Id'].startswith('syndicate-event-bus-')
+                            for target in targets))
+
+    def test_rule_without_other_targets_deactivated(self):
+        self.cw_conn.list_targets_by_rule.return_value = [
+            {'Id': 'home',
+             'Arn': get_event_bus_arn('123456789012', REGION)}]
+
+        self.resource._handle_deactivation_for_cw_resources(
+            self.cw_conn, REGION, 'rule')
+
+        self.cw_conn.list_targets_by_rule.assert_called_once()
+        self.cw_conn.remove_rule_targets.assert_called_once_with(
+            'rule', ['home'])
+        self.cw_conn.delete_rule.assert_called_once_with('rule')
+
+
+if __name__ == '__main__':
+    unittest.main()
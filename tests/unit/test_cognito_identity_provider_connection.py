@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import syndicate.core # noqa: F401
+from syndicate.connection.cognito_identity_provider_connection import \
+    CognitoIdentityProviderConnection
+
+
+class TestUserPoolsIndex(unittest.TestCase):
+
+    def setUp(self):
+        for name in ('_POOLS_INDEXES', '_CLIENTS_INDEXES'):
+            patcher = patch('syndicate.connection.'
+                            f'cognito_identity_provider_connection.{name}',
+                            {})
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.connection = CognitoIdentityProviderConnection.__new__(
+            CognitoIdentityProviderConnection)
+        self.connection.client = MagicMock()
+        self.connection.region = 'eu-west-1'
+        self.connection._index_key = ('eu-west-1', None)
+        self.pools_paginator = MagicMock()
+        self.pools_paginator.paginate.return_value = [
+            {'UserPools': [{'Name': 'first', 'Id': 'first-id'},
+                           {'Name': 'twin', 'Id': 'twin-1'}]},
+            {'UserPools': [{'Name': 'twin', 'Id': 'twin-2'}]}
+        ]
+        self.clients_paginator = MagicMock()
+        self.clients_paginator.paginate.return_value = [
+            {'UserPoolClients': [{'ClientId': 'client-id'}]}]
+        self.connection.client.get_paginator.side_effect = \
+            lambda operation: self.pools_paginator \
+            if operation == 'list_user_pools' else self.clients_paginator
+
+    def test_pools_listed_once_with_max_page_size(self):
+        self.assertEqual(self.connection.if_pool_exists_by_name('first'),
+                         'first-id')
+        self.assertIsNone(self.connection.if_pool_exists_by_name('twin'))
+        self.assertIsNone(self.connection.if_pool_exists_by_name('absent'))
+
+        self.pools_paginator.paginate.assert_called_once_with(
+            PaginationConfig={'PageSize': 60})
+
+    def test_index_updated_on_create_and_remove(self):
+        self.connection.if_pool_exists_by_name('first')
+        self.connection.client.create_user_pool.return_value = {
+            'UserPool': {'Id': 'new-id'}}
+        self.connection.client.create_user_pool_client.return_value = {
+            'UserPoolClient': {'ClientId': 'new-client-id'}}
+
+        self.connection.create_user_pool('new')
+        self.connection.create_user_pool_client('new-id', 'client')
+        self.connection.remove_user_pool('first-id')
+
+        self.assertEqual(self.connection.if_pool_exists_by_name('new'),
+                         'new-id')
+        self.assertEqual(self.connection.if_cup_client_exist('new'),
+                         'new-client-id')
+        self.assertIsNone(self.connection.if_pool_exists_by_name('first'))
+        self.pools_paginator.paginate.assert_called_once()
+        self.clients_paginator.paginate.assert_not_called()
+
+    def test_clients_listed_once_per_pool(self):
+        for _ in range(3):
+            self.assertEqual(self.connection.if_cup_client_exist('first'),
+                             'client-id')
+
+        self.clients_paginator.paginate.assert_called_once_with(
+            UserPoolId='first-id', PaginationConfig={'PageSize': 60})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from syndicate.connection.helper import ConcurrencyBudget, Poller, \
+    RateLimiter, backoff_delay
+from tests.unit import FakeClock
+
+
+class TestBackoffDelay(unittest.TestCase):
+
+    def test_exponential_and_capped(self):
+        self.assertEqual(backoff_delay(0, base=1, jitter=False), 1)
+        self.assertEqual(backoff_delay(3, base=1, jitter=False), 8)
+        self.assertEqual(backoff_delay(10, base=1, cap=5, jitter=False), 5)
+        self.assertLessEqual(backoff_delay(3, base=1), 8)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    @patch('syndicate.connection.helper.sleep')
+    @patch('syndicate.connection.helper.monotonic', return_value=100.0)
+    def test_waits_when_burst_is_spent(self, _, sleep):
+        limiter = RateLimiter(rate=2, burst=2)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        self.assertEqual([each.args[0] for each in sleep.call_args_list],
+                         [0.5, 1.0])
+
+
+class TestPoller(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _poller(self, **kwargs):
+        return Poller(jitter=0, clock=self.clock, sleep=self.clock.sleep,
+                      **kwargs)
+
+    def test_interval_grows_up_to_max(self):
+        results = iter([False] * 5 + [True])
+
+        result = self._poller(interval=2, max_interval=5, backoff=2).poll(
+            lambda: next(results), is_done=bool)
+
+        self.assertTrue(result.done)
+        self.assertEqual(result.calls, 6)
+        self.assertEqual(self.clock.sleeps, [2, 4, 5, 5, 5])
+        self.assertEqual(result.elapsed, 21)
+
+    def test_stops_at_deadline(self):
+        poller = self._poller(interval=10, max_interval=30, timeout=60)
+
+        result = poller.poll(lambda: 'Launching',
+                             is_done=lambda status: status == 'Ready')
+
+        self.assertFalse(result.done)
+        self.assertEqual(result.value, 'Launching')
+        self.assertEqual(result.elapsed, 60)
+        # 10 + 15 + 22.5 and the rest of the timeout
+        self.assertEqual(result.calls, 5)
+        self.assertEqual(poller.calls, 5)
+
+    def test_rate_limiter_acquired_per_call(self):
+        limiter = MagicMock()
+        results = iter([False, False, True])
+
+        self._poller(interval=1, rate_limiter=limiter).poll(
+            lambda: next(results), is_done=bool)
+
+        self.assertEqual(limiter.acquire.call_count, 3)
+
+
+class TestConcurrencyBudget(unittest.TestCase):
+
+    def test_units_capped_by_capacity(self):
+        budget = ConcurrencyBudget(4)
+
+        with budget.reserve(10) as units:
+            self.assertEqual(units, 4)
+        self.assertEqual(budget.acquire(2), 2)
+
+    def test_waits_for_released_units(self):
+        budget = ConcurrencyBudget(2)
+        budget.acquire(2)
+        acquired = threading.Event()
+
+        def acquire():
+            budget.acquire(1)
+            acquired.set()
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        budget.release(2)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import MagicMock
+
+import syndicate.core # noqa: F401
+from syndicate.core.build.deployment_processor import _process_resources
+
+
+def _resources(*types):
+    return [(f'{resource_type}-{i}', {'resource_type': resource_type})
+            for i, resource_type in enumerate(types)]
+
+
+class TestProcessResources(unittest.TestCase):
+
+    def setUp(self):
+        self.stages = []
+
+    def _handler(self, response):
+        # the args list is reused by the next stage
+        return MagicMock(side_effect=lambda args: self.stages.append(
+            [arg['name'] for arg in args]) or response)
+
+    def test_types_with_same_handler_processed_as_one_stage(self):
+        pipeline = self._handler({'arn': {}})
+        handlers = {'environment': pipeline, 'queue': pipeline,
+                    'definition': self._handler({})}
+
+        succeeded, output = _process_resources(
+            resources=_resources('environment', 'environment', 'queue',
+                                 'definition'),
+            handlers_mapping=handlers)
+
+        self.assertTrue(succeeded)
+        self.assertEqual(self.stages, [
+            ['environment-0', 'environment-1', 'queue-2'], ['definition-3']])
+        self.assertEqual(output, {'arn': {}})
+
+    def test_types_with_different_handlers_processed_one_by_one(self):
+        handlers = {'environment': self._handler({}),
+                    'queue': self._handler({})}
+
+        _process_resources(resources=_resources('environment', 'queue'),
+                           handlers_mapping=handlers)
+
+        self.assertEqual(self.stages, [['environment-0'], ['queue-1']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.dynamo_connection import DynamoConnection
+from syndicate.connection.helper import ExistenceCache
+from syndicate.exceptions import ResourceProcessingError
+
+
+class DynamoConnectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = DynamoConnection.__new__(DynamoConnection)
+        self.connection.conn = MagicMock()
+        self.connection.client = MagicMock()
+        self.connection._cache_key_prefix = ('eu-west-1', None, None)
+        sleep_patcher = patch(
+            'syndicate.connection.dynamo_connection.time.sleep')
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        cache_patcher = patch(
+            'syndicate.connection.dynamo_connection.TABLES_EXISTENCE_CACHE',
+            ExistenceCache())
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+
+class TestItemsBatchGet(DynamoConnectionTestCase):
+
+    def test_keys_chunked_and_deduplicated(self):
+        self.connection.conn.batch_get_item.side_effect = lambda \
+            RequestItems: {'Responses': {
+                'table': RequestItems['table']['Keys']}}
+
+        items = self.connection.items_batch_get(
+            'table', 'id', list(range(250)) + [0, 1])
+
+        self.assertEqual(len(items), 250)
+        sizes = [len(call.kwargs['RequestItems']['table']['Keys'])
+                 for call in
+                 self.connection.conn.batch_get_item.call_args_list]
+        self.assertEqual(sizes, [100, 100, 50])
+
+    def test_only_unprocessed_keys_requested_again(self):
+        unprocessed = {'table': {'Keys': [{'id': 2}]}}
+        self.connection.conn.batch_get_item.side_effect = [
+            {'Responses': {'table': [{'id': 1}]},
+             'UnprocessedKeys': unprocessed},
+            {'Responses': {'table': [{'id': 2}]}}
+        ]
+
+        items = self.connection.items_batch_get('table', 'id', [1, 2])
+
+        self.assertEqual(items, [{'id': 1}, {'id': 2}])
+        retry_call = self.connection.conn.batch_get_item.call_args_list[1]
+        self.assertEqual(retry_call.kwargs['RequestItems'], unprocessed)
+        self.sleep.assert_called_once()
+
+    def test_error_when_keys_stay_unprocessed(self):
+        self.connection.conn.batch_get_item.return_value = {
+            'UnprocessedKeys': {'table': {'Keys': [{'id': 1}]}}}
+
+        with self.assertRaises(ResourceProcessingError):
+            self.connection.items_batch_get('table', 'id', [1])
+
+
+class TestBatchWrite(DynamoConnectionTestCase):
+
+    def test_unprocessed_items_written_again(self):
+        unprocessed = {'table': [{'PutRequest': {'Item': {'id': 29}}}]}
+        self.connection.conn.batch_write_item.side_effect = [
+            {'UnprocessedItems': unprocessed}, {}, {}]
+
+        self.connection.items_batch_write(
+            'table', [{'id': i} for i in range(30)])
+
+        calls = self.connection.conn.batch_write_item.call_args_list
+        self.assertEqual(len(calls[0].kwargs['RequestItems']['table']), 25)
+        self.assertEqual(calls[1].kwargs['RequestItems'], unprocessed)
+        self.assertEqual(len(calls[2].kwargs['RequestItems']['table']), 5)
+
+    def test_remove_items(self):
+        self.connection.conn.batch_write_item.return_value = {}
+
+        self.connection.batch_remove_items('table', [{'id': 1}])
+
+        self.connection.conn.batch_write_item.assert_called_once_with(
+            RequestItems={'table': [{'DeleteRequest': {'Key': {'id': 1}}}]})
+
+
+class TestSegmentedScan(DynamoConnectionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.table = MagicMock()
+        self.connection.conn.Table.return_value = self.table
+
+        def scan(**kwargs):
+            segment = kwargs.get('Segment', 0)
+            if 'ExclusiveStartKey' not in kwargs:
+                return {'Items': [{'id': f'{segment}-0'}],
+                        'LastEvaluatedKey': {'id': f'{segment}-0'}}
+            return {'Items': [{'id': f'{segment}-1'}]}
+
+        self.table.scan.side_effect = scan
+
+    def test_all_segments_merged(self):
+        items = self.connection.get_all_items('table', total_segments=3)
+
+        self.assertEqual(
+            sorted(item['id'] for item in items),
+            ['0-0', '0-1', '1-0', '1-1', '2-0', '2-1'])
+        segments = {call.kwargs['Segment']
+                    for call in self.table.scan.call_args_list}
+        self.assertEqual(segments, {0, 1, 2})
+
+    def test_single_segment_scan(self):
+        items = self.connection.get_all_items('table', total_segments=1)
+
+        self.assertEqual([item['id'] for item in items], ['0-0', '0-1'])
+        self.assertNotIn('Segment', self.table.scan.call_args.kwargs)
+
+    def test_segment_error_raised(self):
+        self.table.scan.side_effect = ValueError('scan failed')
+
+        with self.assertRaises(ValueError):
+            self.connection.get_all_items('table', total_segments=2)
+
+
+class TestRemoveTablesByNames(DynamoConnectionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.in_progress = 0
+        self.max_in_progress = 0
+        self.removals = []
+        self.lock = threading.Lock()
+        self.connection.tables_watcher = MagicMock()
+
+        def delete_table(TableName):
+            with self.lock:
+                self.in_progress += 1
+                self.max_in_progress = max(self.max_in_progress,
+                                           self.in_progress)
+
+        def watch_table(table_name, is_ready, timeout):
+            removal = Future()
+            with self.lock:
+                self.removals.append(removal)
+            return removal
+
+        self.connection.client.delete_table.side_effect = delete_table
+        self.connection.tables_watcher.watch_table.side_effect = watch_table
+        # the watcher removes the tables one by one
+        stopped = threading.Event()
+        self.addCleanup(stopped.set)
+        threading.Thread(target=self._remove_tables, args=(stopped,),
+                         daemon=True).start()
+
+    def _remove_tables(self, stopped):
+        while not stopped.is_set():
+            with self.lock:
+                removal = self.removals.pop(0) if self.removals else None
+                if removal:
+                    self.in_progress -= 1
+            if removal:
+                removal.set_result(None)
+            else:
+                stopped.wait(0.001)
+
+    def test_all_tables_removed_within_window(self):
+        names = [f'table-{i}' for i in range(25)]
+
+        removed, errors = self.connection.remove_tables_by_names(
+            names, max_in_progress=4)
+
+        self.assertEqual(sorted(removed), sorted(names))
+        self.assertEqual(errors, [])
+        self.assertLessEqual(self.max_in_progress, 4)
+
+    def test_specified_tables_removed(self):
+        names = [f'table-{i}' for i in range(12)]
+
+        self.connection.remove_specified_tables(names)
+
+        self.assertEqual(
+            sorted(call.kwargs['TableName'] for call in
+                   self.connection.client.delete_table.call_args_list),
+            sorted(names))
+
+
+class TestTableExists(DynamoConnectionTestCase):
+
+    def test_checked_with_describe_and_cached(self):
+        self.connection.client.describe_table.side_effect = ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException'}},
+            'DescribeTable')
+
+        self.assertFalse(self.connection.table_exists('table'))
+        self.assertFalse(self.connection.table_exists('table'))
+
+        self.connection.client.describe_table.assert_called_once_with(
+            TableName='table')
+        self.connection.client.list_tables.assert_not_called()
+
+    def test_cache_updated_on_create_and_remove(self):
+        self.connection.create_table('table', 'id', 'S', 'PAY_PER_REQUEST',
+                                     wait=False)
+        self.assertTrue(self.connection.table_exists('table'))
+
+        self.connection.tables_watcher = MagicMock()
+        removal = Future()
+        removal.set_result(None)
+        self.connection.tables_watcher.watch_table.return_value = removal
+        self.connection.remove_table('table')
+        self.assertFalse(self.connection.table_exists('table'))
+
+        self.connection.client.describe_table.assert_not_called()
+
+    def test_other_errors_raised(self):
+        self.connection.client.describe_table.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDeniedException'}}, 'DescribeTable')
+
+        with self.assertRaises(ClientError):
+            self.connection.table_exists('table')
+
+
+if __name__ == '__main__':
+    unittest.main()
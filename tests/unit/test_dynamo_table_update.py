@@ -0,0 +1,167 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.dynamo_connection import DynamoConnection, \
+    TablesWatcher, TableUpdateStep
+from syndicate.exceptions import ResourceNotFoundError, \
+    ResourceProcessingError
+
+
+def _index(name, status='ACTIVE', backfilling=False):
+    return {'IndexName': name, 'IndexStatus': status,
+            'Backfilling': backfilling}
+
+
+def _gsi_meta(name):
+    return {'name': name, 'index_key_name': name, 'index_key_type': 'S'}
+
+
+class TestPlanTableUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = DynamoConnection.__new__(DynamoConnection)
+        self.connection.client = MagicMock()
+
+    def test_deletes_capacity_and_creates_ordered(self):
+        plan = self.connection.plan_table_update(
+            table_name='table',
+            billing_mode='PROVISIONED',
+            read_capacity=10,
+            write_capacity=10,
+            existing_billing_mode='PAY_PER_REQUEST',
+            existing_provisioned_throughput={},
+            existing_on_demand_throughput={
+                'MaxReadRequestUnits': -1, 'MaxWriteRequestUnits': -1},
+            existing_global_indexes=[{'IndexName': 'kept'},
+                                     {'IndexName': 'old'}],
+            global_indexes_meta=[_gsi_meta('kept'), _gsi_meta('first'),
+                                 _gsi_meta('second')])
+
+        updates = [step.params.get('GlobalSecondaryIndexUpdates')
+                   for step in plan]
+        self.assertEqual(updates[0], [{'Delete': {'IndexName': 'old'}}])
+        # the capacity of the deleted index is not updated
+        self.assertEqual(plan[1].params['BillingMode'], 'PROVISIONED')
+        self.assertEqual([update['Update']['IndexName']
+                          for update in updates[1]], ['kept'])
+        self.assertEqual(
+            [update[0]['Create']['IndexName'] for update in updates[2:]],
+            ['first', 'second'])
+        self.assertIn('ProvisionedThroughput', updates[2][0]['Create'])
+
+    def test_nothing_planned_without_changes(self):
+        plan = self.connection.plan_table_update(
+            table_name='table',
+            billing_mode='PROVISIONED',
+            read_capacity=5,
+            write_capacity=5,
+            existing_billing_mode='PROVISIONED',
+            existing_provisioned_throughput={
+                'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5},
+            existing_on_demand_throughput={},
+            existing_global_indexes=[{'IndexName': 'kept'}],
+            global_indexes_meta=[_gsi_meta('kept')])
+
+        self.assertEqual(plan, [])
+
+
+class TestTablesWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = DynamoConnection.__new__(DynamoConnection)
+        self.connection.client = MagicMock()
+        self.client = self.connection.client
+        self.watcher = TablesWatcher(self.connection, interval=0.01,
+                                     max_interval=0.05)
+        self.connection.tables_watcher = self.watcher
+
+    def test_tables_polled_from_single_thread(self):
+        polls = {'first': 0, 'second': 0}
+        threads = set()
+
+        def describe_table(TableName):
+            threads.add(threading.current_thread().name)
+            polls[TableName] += 1
+            status = 'ACTIVE' if polls[TableName] > 2 else 'UPDATING'
+            return {'Table': {'TableName': TableName, 'TableStatus': status,
+                              'GlobalSecondaryIndexes': [_index('index')]}}
+
+        self.client.describe_table.side_effect = describe_table
+
+        tables = [self.watcher.watch_table(
+            name, lambda table: table['TableStatus'] == 'ACTIVE', timeout=5)
+            for name in polls]
+
+        self.assertEqual(tables[0].result(5)['TableName'], 'first')
+        self.assertEqual(tables[1].result(5)['TableName'], 'second')
+        self.assertEqual(polls, {'first': 3, 'second': 3})
+        self.assertEqual(threads, {'table watcher'})
+
+    def test_update_steps_made_by_watcher(self):
+        statuses = []
+        threads = []
+
+        def describe_table(TableName):
+            return {'Table': {'TableName': TableName,
+                              'TableStatus': statuses.pop(0)}}
+
+        def update_table(TableName, **params):
+            threads.append(threading.current_thread().name)
+            statuses.extend(['UPDATING', 'ACTIVE'])
+
+        self.client.describe_table.side_effect = describe_table
+        self.client.update_table.side_effect = update_table
+        step = TableUpdateStep(
+            description='updated', params={},
+            is_ready=lambda table: table['TableStatus'] == 'ACTIVE',
+            timeout=5)
+
+        update = self.connection.start_table_update('table', [step, step])
+
+        self.assertEqual(update.result(5)['TableStatus'], 'ACTIVE')
+        # only the first step is made by the calling thread
+        self.assertEqual(threads, [threading.current_thread().name,
+                                   'table watcher'])
+
+    def test_timeout(self):
+        self.client.describe_table.return_value = {
+            'Table': {'TableStatus': 'UPDATING'}}
+
+        with self.assertRaises(ResourceProcessingError):
+            self.watcher.watch_table('table', lambda table: False,
+                                     timeout=0.03).result(5)
+
+    def test_describe_error_raised_to_waiter(self):
+        self.client.describe_table.side_effect = ValueError('failed')
+
+        with self.assertRaises(ValueError):
+            self.watcher.watch_table('table', lambda table: True,
+                                     timeout=5).result(5)
+
+    def test_missing_table_raised(self):
+        self.client.describe_table.side_effect = ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException'}},
+            'DescribeTable')
+
+        with self.assertRaises(ResourceNotFoundError):
+            self.watcher.watch_table('table', lambda table: True,
+                                     timeout=5).result(5)
+
+    def test_removal_waiter_resolved_when_table_not_found(self):
+        self.client.describe_table.side_effect = [
+            {'Table': {'TableStatus': 'DELETING'}},
+            ClientError({'Error': {'Code': 'ResourceNotFoundException'}},
+                        'DescribeTable')
+        ]
+
+        self.assertIsNone(
+            self.watcher.watch_table('table', None, timeout=5).result(5))
+        self.assertEqual(self.client.describe_table.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import unittest
+from collections import Counter
+from functools import partial
+from unittest.mock import MagicMock, patch
+
+from botocore.awsrequest import AWSResponse
+
+import syndicate.core # noqa: F401
+from syndicate.connection.elastic_beanstalk_connection import \
+    BeanstalkConnection
+from syndicate.connection.helper import Poller
+from syndicate.core.resources.ebs_resource import EbsResource
+from tests.unit import FakeClock
+
+try:
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+APP_ARN = 'arn:aws:elasticbeanstalk:eu-west-1:123456789012:application/app'
+# responses for the operations moto does not implement
+STUBBED_OPERATIONS = {
+    'CreateApplicationVersion': {},
+    'DescribeEnvironmentHealth': {'Status': 'Launching'},
+    'UpdateEnvironment': {}
+}
+
+
+class TestCreateEbsAppEnv(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = EbsResource.__new__(EbsResource)
+        self.resource.ebs_conn = MagicMock()
+        self.resource.ebs_conn.describe_available_solutions_stack_names \
+            .return_value = ['stack']
+        self.resource.ebs_conn.describe_applications.side_effect = [
+            [], [], [{'ApplicationArn': APP_ARN}]]
+        self._set_up_resource()
+
+    def _set_up_resource(self):
+        self.resource.ec2_conn = MagicMock()
+        self.resource.iam_conn = MagicMock()
+        self.resource.s3_conn = MagicMock()
+        self.resource.sns_conn = MagicMock()
+        self.resource.deploy_target_bucket = 'bucket'
+        self.resource.region = 'eu-west-1'
+        self.resource.account_id = '123456789012'
+        self.resource.ec2_conn.get_default_vpc_id.return_value = None
+        self.clock = FakeClock()
+        for target, value in (
+                ('syndicate.core.CONFIG',
+                 MagicMock(deploy_target_bucket_key_compound='')),
+                ('syndicate.core.resources.ebs_resource.Poller',
+                 partial(Poller, jitter=0, clock=self.clock,
+                         sleep=self.clock.sleep)),
+                ('syndicate.core.resources.ebs_resource.'
+                 'EBS_POLL_RATE_LIMITER', None)):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.meta = {'resource_type': 'beanstalk_app', 'env_settings': [],
+                     'ec2_key_pair': 'key', 'ec2_role': 'role',
+                     'ebs_service_role': 'service',
+                     'stack': 'stack', 'env_name': 'env', 'tier': {},
+                     's3_path': 'bundle/app.zip'}
+
+    def test_env_status_polled_with_growing_interval(self):
+        health = self.resource.ebs_conn.describe_environment_health
+        health.side_effect = [{'Status': 'Launching'}] * 4 + [
+            {'Status': 'Ready'}]
+
+        self.resource._create_ebs_app_env_from_meta(
+            {'self': self.resource, 'name': 'app', 'meta': self.meta})
+
+        self.assertEqual(health.call_count, 5)
+        # 10 + 15 + 22.5 + 30 seconds instead of a busy loop
+        self.assertEqual(self.clock.now, 77.5)
+        self.resource.ebs_conn.deploy_env_version.assert_called_once()
+
+    def test_env_status_polling_bounded_by_timeout(self):
+        health = self.resource.ebs_conn.describe_environment_health
+        health.return_value = {'Status': 'Launching'}
+
+        self.resource._create_ebs_app_env_from_meta(
+            {'self': self.resource, 'name': 'app', 'meta': self.meta})
+
+        self.assertEqual(health.call_count, 15)
+        self.assertEqual(self.clock.now, 360)
+
+
+@unittest.skipIf(mock_aws is None, 'moto is not installed')
+class TestCreateEbsAppEnvMoto(TestCreateEbsAppEnv):
+    """ The same deployment against the moto Elastic Beanstalk """
+
+    def setUp(self):
+        patcher = patch.dict(os.environ, {
+            'AWS_ACCESS_KEY_ID': 'testing',
+            'AWS_SECRET_ACCESS_KEY': 'testing',
+            'AWS_SESSION_TOKEN': 'testing'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        mock = mock_aws()
+        mock.start()
+        self.addCleanup(mock.stop)
+
+        self.resource = EbsResource.__new__(EbsResource)
+        self.resource.ebs_conn = BeanstalkConnection('eu-west-1')
+        self.calls = Counter()
+        self.responses = {operation: [response] for operation, response
+                          in STUBBED_OPERATIONS.items()}
+        events = self.resource.ebs_conn.client.meta.events
+        events.register('provide-client-params.elasticbeanstalk',
+                        self._count_call)
+        for operation in STUBBED_OPERATIONS:
+            events.register(f'before-call.elasticbeanstalk.{operation}',
+                            self._stub_response)
+        self._set_up_resource()
+        self.meta['stack'] = self.resource.ebs_conn \
+            .describe_available_solutions_stack_names()[0]
+
+    def _count_call(self, model, **kwargs):
+        self.calls[model.name] += 1
+
+    def _stub_response(self, model, **kwargs):
+        # the last response is repeated
+        responses = self.responses[model.name]
+        response = responses.pop(0) if len(responses) > 1 else responses[0]
+        return AWSResponse('', 200, {}, None), dict(response)
+
+    def test_env_status_polled_with_growing_interval(self):
+        self.responses['DescribeEnvironmentHealth'] = \
+            [{'Status': 'Launching'}] * 4 + [{'Status': 'Ready'}]
+
+        result = self.resource._create_ebs_app_env_from_meta(
+            {'self': self.resource, 'name': 'app', 'meta': self.meta})
+
+        self.assertEqual(self.calls['DescribeEnvironmentHealth'], 5)
+        self.assertEqual(self.clock.now, 77.5)
+        self.assertEqual(self.calls['UpdateEnvironment'], 1)
+        self.assertIn(APP_ARN, result)
+
+    def test_env_status_polling_bounded_by_timeout(self):
+        self.resource._create_ebs_app_env_from_meta(
+            {'self': self.resource, 'name': 'app', 'meta': self.meta})
+
+        self.assertEqual(self.calls['DescribeEnvironmentHealth'], 15)
+        self.assertEqual(self.clock.now, 360)
+        # the existence check, one absence check and the description
+        self.assertEqual(self.calls['DescribeApplications'], 3)
+        self.assertEqual(self.calls['CreateApplication'], 1)
+        self.assertEqual(self.calls['CreateEnvironment'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
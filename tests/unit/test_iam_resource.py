@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import MagicMock, call
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.core.resources.iam_resource import IamResource
+
+ACCOUNT_ID = '123456789012'
+AWS_POLICY_ARN = 'arn:aws:iam::aws:policy/service-role/AWSLambdaRole'
+
+
+def _policy_arn(name):
+    return f'arn:aws:iam::{ACCOUNT_ID}:policy/{name}'
+
+
+def _attached(*arns):
+    return [MagicMock(arn=arn) for arn in arns]
+
+
+class TestReconcileRolePolicies(unittest.TestCase):
+
+    def setUp(self):
+        self.iam_conn = MagicMock()
+        self.iam_conn.get_policies_arns.return_value = {
+            'AWSLambdaRole': AWS_POLICY_ARN}
+        self.resource = IamResource(self.iam_conn, ACCOUNT_ID, 'eu-west-1')
+
+    def test_nothing_changed(self):
+        self.iam_conn.get_role_attached_policies.return_value = _attached(
+            _policy_arn('custom'), AWS_POLICY_ARN)
+
+        self.resource._reconcile_role_policies(
+            'role', {'custom', 'AWSLambdaRole'}, ['custom'])
+
+        self.iam_conn.attach_policy.assert_not_called()
+        self.iam_conn.detach_policy.assert_not_called()
+        self.iam_conn.get_policies_arns.assert_not_called()
+
+    def test_attached_before_detached(self):
+        self.iam_conn.get_role_attached_policies.return_value = _attached(
+            _policy_arn('old'))
+
+        self.resource._reconcile_role_policies(
+            'role', {'new', 'AWSLambdaRole'}, ['new'])
+
+        attached = {each.args[1]
+                    for each in self.iam_conn.attach_policy.call_args_list}
+        self.assertEqual(attached, {_policy_arn('new'), AWS_POLICY_ARN})
+        self.iam_conn.detach_policy.assert_called_once_with(
+            role_name='role', policy_arn=_policy_arn('old'))
+        calls = [each[0] for each in self.iam_conn.method_calls
+                 if each[0] in ('attach_policy', 'detach_policy')]
+        self.assertEqual(calls[-1], 'detach_policy')
+        self.iam_conn.get_policies_arns.assert_called_once()
+
+    def test_detached_first_when_quota_reached(self):
+        self.iam_conn.get_role_attached_policies.return_value = _attached(
+            _policy_arn('old'))
+        self.iam_conn.attach_policy.side_effect = [
+            ClientError({'Error': {'Code': 'LimitExceeded'}},
+                        'AttachRolePolicy'),
+            None
+        ]
+
+        self.resource._reconcile_role_policies('role', {'new'}, ['new'])
+
+        self.assertEqual(self.iam_conn.method_calls[1:], [
+            call.attach_policy('role', _policy_arn('new')),
+            call.detach_policy(role_name='role',
+                               policy_arn=_policy_arn('old')),
+            call.attach_policy('role', _policy_arn('new'))
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import WaiterError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.kinesis_connection import KinesisConnection, \
+    shard_count_steps
+from syndicate.core.resources.kinesis_resource import KinesisResource
+from syndicate.exceptions import ResourceProcessingTimeoutError
+from tests.unit import patch_description
+
+ARN = 'arn:aws:kinesis:eu-west-1:123456789012:stream/stream'
+RESOURCE_TYPE = {'resource_type': 'kinesis_stream'}
+
+
+def _stream(status='ACTIVE'):
+    return {'StreamARN': ARN, 'StreamStatus': status}
+
+
+def _summary(mode='PROVISIONED', shards=2, status='ACTIVE'):
+    return {'StreamARN': ARN, 'StreamStatus': status,
+            'StreamModeDetails': {'StreamMode': mode},
+            'OpenShardCount': shards}
+
+
+class TestCreateKinesisStream(unittest.TestCase):
+
+    def setUp(self):
+        self.kin_conn = MagicMock()
+        self.resource = KinesisResource(self.kin_conn)
+        patch_description(self, 'syndicate.core.resources.kinesis_resource')
+
+    def _create(self, meta):
+        return self.resource._create_kinesis_stream_from_meta(
+            {'self': self.resource, 'name': 'stream',
+             'meta': dict(meta, **RESOURCE_TYPE)})
+
+    def test_deleting_stream_waited_before_creation(self):
+        self.kin_conn.get_stream.side_effect = [_stream('DELETING'),
+                                                _stream()]
+
+        result = self._create({'shard_count': 1})
+
+        self.kin_conn.wait_for_stream_deleted.assert_called_once_with(
+            'stream')
+        self.kin_conn.create_stream.assert_called_once_with(
+            stream_name='stream', shard_count=1, stream_mode='PROVISIONED')
+        self.kin_conn.wait_for_stream_active.assert_called_once_with(
+            'stream')
+        self.assertIn(ARN, result)
+
+    def test_on_demand_stream_created_without_shards(self):
+        self.kin_conn.get_stream.side_effect = [None, _stream()]
+
+        self._create({'stream_mode': 'ON_DEMAND'})
+
+        self.kin_conn.create_stream.assert_called_once_with(
+            stream_name='stream', shard_count=None, stream_mode='ON_DEMAND')
+
+
+class TestUpdateKinesisStream(unittest.TestCase):
+
+    def setUp(self):
+        self.kin_conn = MagicMock()
+        self.kin_conn.get_stream.return_value = _stream()
+        self.resource = KinesisResource(self.kin_conn)
+        patch_description(self, 'syndicate.core.resources.kinesis_resource')
+
+    def _update(self, meta):
+        return self.resource._update_kinesis_stream_from_meta(
+            {'self': self.resource, 'name': 'stream',
+             'meta': dict(meta, **RESOURCE_TYPE), 'context': None})
+
+    def test_shard_count_updated_in_place(self):
+        self.kin_conn.get_stream_summary.return_value = _summary(shards=2)
+
+        self._update({'shard_count': 4})
+
+        self.kin_conn.update_shard_count.assert_called_once_with('stream', 4)
+        self.kin_conn.update_stream_mode.assert_not_called()
+        self.kin_conn.remove_stream.assert_not_called()
+        self.kin_conn.create_stream.assert_not_called()
+
+    def test_shard_count_changed_in_steps(self):
+        self.kin_conn.get_stream_summary.return_value = _summary(shards=2)
+
+        self._update({'shard_count': 10})
+
+        steps = [call.args for call in
+                 self.kin_conn.update_shard_count.call_args_list]
+        self.assertEqual(steps, [('stream', 4), ('stream', 8),
+                                 ('stream', 10)])
+        self.assertEqual(self.kin_conn.wait_for_stream_active.call_count, 3)
+
+    def test_switched_to_on_demand(self):
+        self.kin_conn.get_stream_summary.return_value = _summary(shards=2)
+
+        self._update({'stream_mode': 'ON_DEMAND', 'shard_count': 4})
+
+        self.kin_conn.update_stream_mode.assert_called_once_with(
+            ARN, 'ON_DEMAND')
+        self.kin_conn.update_shard_count.assert_not_called()
+
+    def test_unchanged_stream_not_updated(self):
+        self.kin_conn.get_stream_summary.return_value = _summary(shards=2)
+
+        self._update({'shard_count': 2})
+
+        self.kin_conn.update_stream_mode.assert_not_called()
+        self.kin_conn.update_shard_count.assert_not_called()
+        self.kin_conn.wait_for_stream_active.assert_not_called()
+
+
+class TestShardCountSteps(unittest.TestCase):
+
+    def test_scaled_up_at_most_twice(self):
+        self.assertEqual(shard_count_steps(3, 13), [6, 12, 13])
+
+    def test_scaled_down_at_most_by_half(self):
+        self.assertEqual(shard_count_steps(10, 1), [5, 3, 2, 1])
+
+    def test_unchanged(self):
+        self.assertEqual(shard_count_steps(4, 4), [])
+
+
+class TestStreamWaiters(unittest.TestCase):
+
+    def test_waiter_failure_raised_as_timeout(self):
+        connection = KinesisConnection.__new__(KinesisConnection)
+        connection.client = MagicMock()
+        waiter = connection.client.get_waiter.return_value
+        waiter.wait.side_effect = WaiterError(
+            'StreamExists', 'Max attempts exceeded', {})
+
+        with self.assertRaises(ResourceProcessingTimeoutError):
+            connection.wait_for_stream_active('stream', timeout=10)
+
+        connection.client.get_waiter.assert_called_once_with('stream_exists')
+        self.assertEqual(waiter.wait.call_args.kwargs['WaiterConfig'],
+                         {'Delay': 2, 'MaxAttempts': 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import syndicate.core # noqa: F401
+from syndicate.core.build.meta_processor import populate_layers_code_sha256
+from syndicate.core.helper import compute_file_base64_hash
+from syndicate.core.project_state.project_state import ProjectState
+from syndicate.core.resources.lambda_resource import LambdaResource
+
+LAYER_ARN = 'arn:aws:lambda:eu-west-1:123456789012:layer:layer'
+
+
+def _layer(version, code_sha256):
+    return {'LayerVersionArn': f'{LAYER_ARN}:{version}',
+            'Content': {'CodeSha256': code_sha256}}
+
+
+class TestEqualLambdaLayer(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = LambdaResource.__new__(LambdaResource)
+        self.resource.lambda_conn = MagicMock()
+        self.resource.region = 'eu-west-1'
+        self.resource.account_id = '123456789012'
+        self.project_state = ProjectState(dct={'name': 'project'})
+        patcher = patch('syndicate.core.PROJECT_STATE', self.project_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_indexed_version_checked_with_single_call(self):
+        self.project_state.lambda_layers[LAYER_ARN] = {
+            'sha': f'{LAYER_ARN}:3'}
+        self.resource.lambda_conn.get_lambda_layer_by_arn.return_value = \
+            _layer(3, 'sha')
+
+        layer = self.resource._is_equal_lambda_layer('sha', 'layer')
+
+        self.assertEqual(layer['LayerVersionArn'], f'{LAYER_ARN}:3')
+        self.resource.lambda_conn.list_lambda_layer_versions \
+            .assert_not_called()
+
+    def test_unknown_versions_indexed(self):
+        self.project_state.lambda_layers[LAYER_ARN] = {
+            'old': f'{LAYER_ARN}:1', 'deleted': f'{LAYER_ARN}:0'}
+        self.resource.lambda_conn.list_lambda_layer_versions.return_value = [
+            {'LayerVersionArn': f'{LAYER_ARN}:2'},
+            {'LayerVersionArn': f'{LAYER_ARN}:1'}
+        ]
+        self.resource.lambda_conn.get_lambda_layer_by_arn.return_value = \
+            _layer(2, 'new')
+
+        layer = self.resource._is_equal_lambda_layer('other', 'layer')
+
+        self.assertIsNone(layer)
+        self.resource.lambda_conn.get_lambda_layer_by_arn \
+            .assert_called_once_with(f'{LAYER_ARN}:2')
+        self.assertEqual(self.project_state.lambda_layers[LAYER_ARN],
+                         {'old': f'{LAYER_ARN}:1', 'new': f'{LAYER_ARN}:2'})
+
+
+class TestResolveLayerCodeSha256(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = LambdaResource.__new__(LambdaResource)
+        self.resource.s3_conn = MagicMock()
+        self.resource.deploy_target_bucket = 'bucket'
+        patcher = patch('syndicate.core.CONFIG', MagicMock(
+            deploy_target_bucket_key_compound=''))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_checksum_of_uploaded_package_used(self):
+        self.resource.s3_conn.get_object_checksums.return_value = {
+            'ChecksumSHA256': 'sha', 'ContentLength': 1024}
+
+        result = self.resource._resolve_layer_code_sha256(
+            'layer', {'s3_path': 'bundle/layer.zip'})
+
+        self.assertEqual(result, ('sha', None))
+        self.resource.s3_conn.download_file.assert_not_called()
+
+    def test_package_uploaded_in_parts_downloaded(self):
+        self.resource.s3_conn.get_object_checksums.return_value = {
+            'ChecksumSHA256': 'sha-3', 'ContentLength': 1024}
+
+        with patch('syndicate.core.resources.lambda_resource.is_zip_empty',
+                   return_value=False), \
+                patch('syndicate.core.resources.lambda_resource.'
+                      'compute_file_base64_hash', return_value='hash'):
+            result = self.resource._resolve_layer_code_sha256(
+                'layer', {'s3_path': 'bundle/layer.zip'})
+
+        self.assertEqual(result, ('hash', None))
+        self.resource.s3_conn.download_file.assert_called_once()
+
+
+class TestPopulateLayersCodeSha256(unittest.TestCase):
+
+    def test_hash_saved_for_not_empty_package(self):
+        with tempfile.TemporaryDirectory() as bundle_dir:
+            package_path = os.path.join(bundle_dir, 'layer.zip')
+            with zipfile.ZipFile(package_path, 'w') as package:
+                package.writestr('python/module.py', 'VALUE = 1')
+            with zipfile.ZipFile(os.path.join(bundle_dir, 'empty.zip'),
+                                 'w'):
+                pass
+            meta = {
+                'layer': {'resource_type': 'lambda_layer',
+                          'deployment_package': 'layer.zip'},
+                'empty': {'resource_type': 'lambda_layer',
+                          'deployment_package': 'empty.zip'}
+            }
+
+            populate_layers_code_sha256(meta, bundle_dir)
+
+            self.assertEqual(meta['layer']['code_sha256'],
+                             compute_file_base64_hash(package_path))
+            self.assertNotIn('code_sha256', meta['empty'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.lambda_connection import LambdaConnection
+from syndicate.connection.s3_connection import S3Connection
+from syndicate.core.resources.lambda_resource import LambdaResource
+from syndicate.exceptions import ResourceProcessingError
+
+LAMBDA_ARN = 'arn:aws:lambda:eu-west-1:123456789012:function:func'
+QUEUE_ARN = 'arn:aws:sqs:eu-west-1:123456789012:queue'
+
+
+class TestTriggersList(unittest.TestCase):
+
+    def test_function_filter_kept_on_next_pages(self):
+        connection = LambdaConnection.__new__(LambdaConnection)
+        connection.client = MagicMock()
+        connection.client.list_event_source_mappings.side_effect = [
+            {'EventSourceMappings': [{'UUID': '1'}], 'NextMarker': 'm'},
+            {'EventSourceMappings': [{'UUID': '2'}]}
+        ]
+
+        mappings = connection.triggers_list('func')
+
+        self.assertEqual([m['UUID'] for m in mappings], ['1', '2'])
+        self.assertEqual(
+            connection.client.list_event_source_mappings.call_args.kwargs,
+            {'FunctionName': 'func', 'Marker': 'm'})
+
+
+def _conflict(message):
+    return ClientError({'Error': {'Code': 'ResourceConflictException',
+                                  'Message': message}}, 'AddPermission')
+
+
+class TestAddInvocationPermission(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = LambdaConnection.__new__(LambdaConnection)
+        self.connection.client = MagicMock()
+
+    def _add(self, name=LAMBDA_ARN):
+        return self.connection.add_invocation_permission(
+            name=name, principal='s3.amazonaws.com', exists_ok=True)
+
+    def test_existing_statement_ignored(self):
+        self.connection.client.add_permission.side_effect = _conflict(
+            'The statement id (id) provided already exists. Please provide '
+            'a new statement id, or remove the existing statement.')
+
+        self.assertIsNone(self._add())
+
+    @patch('syndicate.connection.helper.sleep')
+    def test_update_in_progress_retried(self, sleep):
+        self.connection.client.add_permission.side_effect = _conflict(
+            'The operation cannot be performed at this time. An update is '
+            'in progress for resource: ' + LAMBDA_ARN)
+
+        with self.assertRaises(ResourceProcessingError):
+            self._add()
+        self.assertGreater(
+            self.connection.client.add_permission.call_count, 1)
+
+    @patch('syndicate.connection.helper.sleep')
+    def test_permissions_of_function_added_one_by_one(self, sleep):
+        running = []
+
+        def add_permission(**kwargs):
+            if running:
+                raise _conflict('An update is in progress')
+            running.append(kwargs)
+            time.sleep(0.01)
+            running.pop()
+            return {'Statement': '{}'}
+
+        self.connection.client.add_permission.side_effect = add_permission
+        results = []
+        threads = [threading.Thread(
+            target=lambda name=name: results.append(self._add(name)))
+            for name in (LAMBDA_ARN, 'func', f'{LAMBDA_ARN}:alias')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(results, [{'Statement': '{}'}] * 3)
+        # not retried after a conflict
+        self.assertEqual(
+            self.connection.client.add_permission.call_count, 3)
+
+
+class TestUpdateLambdaEventSources(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = S3Connection.__new__(S3Connection)
+        self.connection.client = MagicMock()
+        self.connection.client.get_bucket_notification_configuration \
+            .return_value = {
+                'ResponseMetadata': {},
+                'LambdaFunctionConfigurations': [{
+                    'Id': 'old',
+                    'LambdaFunctionArn': LAMBDA_ARN,
+                    'Events': ['s3:ObjectRemoved:*']
+                }]
+            }
+
+    def test_removed_and_added_with_single_put(self):
+        self.connection.update_lambda_event_sources(
+            'bucket', LAMBDA_ARN,
+            to_add=[{'s3_events': ['s3:ObjectCreated:*']}],
+            to_remove=[{'s3_events': ['s3:ObjectRemoved:*']}])
+
+        put = self.connection.client.put_bucket_notification_configuration
+        put.assert_called_once()
+        configs = put.call_args.kwargs['NotificationConfiguration'][
+            'LambdaFunctionConfigurations']
+        self.assertEqual(configs, [{'LambdaFunctionArn': LAMBDA_ARN,
+                                    'Events': ['s3:ObjectCreated:*']}])
+
+
+class TestReconcileLambdaTriggers(unittest.TestCase):
+
+    def setUp(self):
+        self.resource = LambdaResource.__new__(LambdaResource)
+        self.resource.lambda_conn = MagicMock()
+        self.resource.s3_conn = MagicMock()
+        self.resource.sqs_conn = MagicMock()
+        self.resource.region = 'eu-west-1'
+        self.resource.account_id = '123456789012'
+        self.resource._event_sources_index = {}
+        self.resource._event_sources_lock = threading.Lock()
+        self.resource._latest_deploy_output = None
+        self.resource.lambda_conn.add_invocation_permission.return_value = \
+            None
+
+    def test_s3_triggers_merged_per_bucket(self):
+        triggers = [
+            {'resource_type': 's3_trigger', 'target_bucket': 'bucket',
+             's3_events': ['s3:ObjectCreated:*']},
+            {'resource_type': 's3_trigger', 'target_bucket': 'bucket',
+             's3_events': ['s3:ObjectRemoved:*']}
+        ]
+
+        self.resource.create_lambda_triggers('func', LAMBDA_ARN, 'role',
+                                             triggers)
+
+        update = self.resource.s3_conn.update_lambda_event_sources
+        update.assert_called_once_with('bucket', LAMBDA_ARN,
+                                       to_add=triggers, to_remove=[])
+
+    def test_event_sources_listed_once(self):
+        self.resource.lambda_conn.triggers_list.return_value = [
+            {'UUID': 'uuid', 'EventSourceArn': QUEUE_ARN}]
+        self.resource.lambda_conn.update_event_source.return_value = {
+            'UUID': 'uuid', 'EventSourceArn': QUEUE_ARN}
+        trigger = {'resource_type': 'sqs_trigger', 'target_queue': 'queue',
+                   'batch_size': 10}
+
+        self.resource._reconcile_lambda_triggers(
+            'func', LAMBDA_ARN, 'role', to_create=[trigger],
+            to_remove=[dict(trigger, batch_size=5)])
+
+        self.resource.lambda_conn.triggers_list.assert_called_once_with(
+            lambda_name=LAMBDA_ARN)
+        self.resource.lambda_conn.remove_event_source.assert_called_once_with(
+            uuid='uuid')
+        self.resource.lambda_conn.update_event_source.assert_not_called()
+        self.resource.lambda_conn.add_event_source.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
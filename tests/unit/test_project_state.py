@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import yaml
+
+import syndicate.core # noqa: F401
+from syndicate.core.constants import DATE_FORMAT_ISO_8601, BUILD_ACTION, \
+    OK_RETURN_CODE, SUCCEEDED_STATUS
+from syndicate.core.project_state.project_state import ProjectState, \
+    PROJECT_EVENTS_FILE, PROJECT_STATE_FILE, LEAVE_LATEST_EVENTS, \
+    retain_events
+
+
+def _event(days_ago, operation=BUILD_ACTION):
+    time_end = (datetime.now() - timedelta(days=days_ago)).strftime(
+        DATE_FORMAT_ISO_8601)
+    return {'operation': operation, 'time_end': time_end,
+            'status': SUCCEEDED_STATUS}
+
+
+class ProjectStateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        conf_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(conf_dir.cleanup)
+        self.conf_path = conf_dir.name
+        patcher = patch('syndicate.core.CONF_PATH', self.conf_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.state_path = os.path.join(self.conf_path, PROJECT_STATE_FILE)
+        self.events_path = os.path.join(self.conf_path, PROJECT_EVENTS_FILE)
+
+    def _write_state(self, dct):
+        with open(self.state_path, 'w') as state_file:
+            yaml.dump(dct, state_file)
+
+    def _read_state(self):
+        with open(self.state_path) as state_file:
+            return yaml.safe_load(state_file)
+
+    def _events_log_lines(self):
+        with open(self.events_path) as events_file:
+            return events_file.readlines()
+
+
+class TestEventsLog(ProjectStateTestCase):
+
+    def test_legacy_events_moved_to_log(self):
+        events = [_event(1), _event(2)]
+        self._write_state({'name': 'project', 'events': events})
+
+        project_state = ProjectState(project_path='project')
+
+        self.assertNotIn('events', self._read_state())
+        self.assertEqual(len(self._events_log_lines()), 2)
+        self.assertEqual(project_state.events, events)
+        self.assertEqual(project_state.dct_with_events['events'], events)
+
+    def test_event_appended_without_reading_log(self):
+        self._write_state({'name': 'project',
+                           'latest_deploy': {'deploy_name': 'deploy'}})
+        project_state = ProjectState(project_path='project')
+
+        with patch.object(ProjectState,
+                          '_ProjectState__load_events_log') as load:
+            project_state.log_execution_event(operation=BUILD_ACTION,
+                                              status=OK_RETURN_CODE,
+                                              time_end='2024-01-01T00:00:00Z')
+            self.assertEqual(project_state.latest_deployed_deploy_name,
+                             'deploy')
+            load.assert_not_called()
+
+        self.assertEqual(len(self._events_log_lines()), 1)
+        self.assertEqual(ProjectState(project_path='project').events,
+                         [{'operation': BUILD_ACTION,
+                           'status': SUCCEEDED_STATUS,
+                           'time_end': '2024-01-01T00:00:00Z'}])
+
+    def test_remote_events_merged(self):
+        self._write_state({'name': 'project', 'events': [_event(2)]})
+        project_state = ProjectState(project_path='project')
+        remote_events = [_event(1), _event(2)]
+
+        project_state.add_execution_events(remote_events)
+
+        self.assertEqual(ProjectState(project_path='project').events,
+                         remote_events)
+
+
+class TestRetainEvents(unittest.TestCase):
+
+    def test_expired_events_dropped(self):
+        recent = [_event(1)] * (LEAVE_LATEST_EVENTS + 5)
+
+        self.assertEqual(retain_events(recent + [_event(40), _event(41)]),
+                         recent)
+
+    def test_latest_events_kept(self):
+        events = [_event(40 + days) for days in range(30)]
+
+        self.assertEqual(retain_events(events),
+                         events[:LEAVE_LATEST_EVENTS])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import marshal
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import syndicate.core # noqa: F401
+from syndicate.core.build.runtime.python import (
+    DEFAULT_ARTIFACT_EXCLUDES, optimize_python_artifact,
+    resolve_artifact_optimization)
+from syndicate.exceptions import InvalidTypeError
+
+PYTHON_VERSION = f'{sys.version_info.major}.{sys.version_info.minor}'
+
+
+def _write(path, content=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+class TestResolveArtifactOptimization(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(resolve_artifact_optimization({}))
+
+    def test_defaults_applied(self):
+        self.assertEqual(
+            resolve_artifact_optimization({'artifact_optimization': True}),
+            {'exclude': list(DEFAULT_ARTIFACT_EXCLUDES), 'strip': False,
+             'compile': True})
+        self.assertEqual(
+            resolve_artifact_optimization({'artifact_optimization': {
+                'exclude': '**/docs', 'compile': False}}),
+            {'exclude': ['**/docs'], 'strip': False, 'compile': False})
+
+    def test_invalid_type(self):
+        with self.assertRaises(InvalidTypeError):
+            resolve_artifact_optimization({'artifact_optimization': 'yes'})
+
+
+class TestOptimizePythonArtifact(unittest.TestCase):
+
+    def setUp(self):
+        self.artifact_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.artifact_dir.cleanup)
+        self.path = Path(self.artifact_dir.name)
+        _write(self.path / 'handler.py', 'VALUE = 1\n')
+        _write(self.path / 'package' / '__init__.py')
+        _write(self.path / 'package' / '__init__.pyi', 'VALUE: int\n')
+        _write(self.path / 'package' / 'tests' / 'test_package.py')
+        _write(self.path / 'package' / '__pycache__' /
+               '__init__.cpython-38.pyc', 'stale')
+        _write(self.path / 'package-1.0.dist-info' / 'RECORD', 'record')
+        _write(self.path / 'package-1.0.dist-info' / 'METADATA', 'metadata')
+
+    def test_excluded_files_removed_and_sources_compiled(self):
+        settings = resolve_artifact_optimization(
+            {'artifact_optimization': True})
+
+        report = optimize_python_artifact(self.path, settings,
+                                          [PYTHON_VERSION], '/var/task',
+                                          'artifact')
+
+        self.assertEqual(report.removed_files, 4)
+        self.assertEqual(report.compiled_versions, [PYTHON_VERSION])
+        self.assertTrue((self.path / 'package-1.0.dist-info' /
+                         'METADATA').exists())
+        self.assertFalse((self.path / 'package' / 'tests').exists())
+        compiled = list((self.path / '__pycache__').glob('handler.*.pyc'))
+        self.assertEqual(len(compiled), 1)
+        with open(compiled[0], 'rb') as file:
+            # header: magic, flags, source hash
+            file.read(16)
+            code = marshal.load(file)
+        self.assertEqual(code.co_filename, '/var/task/handler.py')
+
+    def test_missing_interpreter_skipped(self):
+        settings = {'exclude': [], 'strip': False, 'compile': True}
+
+        with patch('syndicate.core.build.runtime.python.shutil.which',
+                   return_value=None):
+            report = optimize_python_artifact(self.path, settings, ['2.7'],
+                                              '/var/task', 'artifact')
+
+        self.assertEqual(report.compiled_versions, [])
+        self.assertEqual(report.removed_files, 0)
+        self.assertEqual(report.size_before, report.size_after)
+
+
+if __name__ == '__main__':
+    unittest.main()
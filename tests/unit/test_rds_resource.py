@@ -0,0 +1,180 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock
+
+import syndicate.core # noqa: F401
+from syndicate.connection.rds_connection import DBInstancesWatcher, \
+    RDSConnection
+from syndicate.core.resources.rds_resource import RDSDBClusterResource, \
+    RDSDBInstanceResource
+from syndicate.exceptions import ResourceProcessingError
+from tests.unit import patch_description
+
+CLUSTER = {'DBClusterArn': 'arn:aws:rds:cluster:cluster', 'Status':
+           'available', 'Endpoint': 'writer', 'ReaderEndpoint': 'reader'}
+INSTANCE = {'DBInstanceArn': 'arn:aws:rds:db:instance',
+            'DBInstanceStatus': 'available'}
+
+
+def _available(descriptions):
+    future = Future()
+    future.set_result(descriptions)
+    return future
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestCreateDBCluster(unittest.TestCase):
+
+    def setUp(self):
+        self.rds_conn = MagicMock()
+        self.rds_conn.get_db_cluster_description.return_value = {}
+        self.rds_conn.watch_db_clusters_available.side_effect = \
+            lambda names: _available({name: CLUSTER for name in names})
+        self.resource = RDSDBClusterResource(self.rds_conn)
+        patch_description(self, 'syndicate.core.resources.rds_resource')
+
+    def test_clusters_requested_at_once(self):
+        args = [{'name': name, 'meta': {'resource_type': 'rds_db_cluster',
+                                        'engine': 'aurora-postgresql'}}
+                for name in ('first', 'second', 'third')]
+
+        self.resource.create_db_cluster(args)
+
+        self.assertEqual(self.rds_conn.create_db_cluster.call_count, 3)
+        watched = [call.args[0] for call in self.rds_conn
+                   .watch_db_clusters_available.call_args_list]
+        self.assertCountEqual(watched, [['first'], ['second'], ['third']])
+        self.rds_conn.get_waiter.assert_not_called()
+
+
+class TestCreateDBInstance(unittest.TestCase):
+
+    def setUp(self):
+        self.rds_conn = MagicMock()
+        self.rds_conn.get_db_cluster_description.return_value = {}
+        self.rds_conn.get_db_instance_description.return_value = {}
+        self.clusters = {}
+
+        def watch_clusters(names):
+            future = self.clusters[tuple(names)] = Future()
+            return future
+
+        self.rds_conn.watch_db_clusters_available.side_effect = \
+            watch_clusters
+        self.rds_conn.watch_db_instances_available.side_effect = \
+            lambda names: _available({name: INSTANCE for name in names})
+        self.resource = RDSDBInstanceResource(
+            self.rds_conn, RDSDBClusterResource(self.rds_conn))
+        patch_description(self, 'syndicate.core.resources.rds_resource')
+
+    @staticmethod
+    def _instance(name, cluster_name):
+        return {'name': name, 'meta': {'resource_type': 'rds_db_instance',
+                                       'engine': 'aurora-postgresql',
+                                       'instance_class': 'db.r6g.large',
+                                       'cluster_name': cluster_name}}
+
+    @staticmethod
+    def _cluster(name):
+        return {'name': name, 'meta': {'resource_type': 'rds_db_cluster',
+                                       'engine': 'aurora-postgresql'}}
+
+    def _created_instances(self):
+        return [call.kwargs['name'] for call in
+                self.rds_conn.create_db_instance.call_args_list]
+
+    def test_created_when_own_cluster_available(self):
+        args = [self._cluster('first'), self._cluster('second'),
+                self._instance('first-instance', 'first'),
+                self._instance('second-instance', 'second')]
+        results = []
+        stage = threading.Thread(target=lambda: results.append(
+            self.resource.create_db_clusters_and_instances(args)))
+        stage.start()
+        _wait_until(lambda: len(self.clusters) == 2)
+
+        self.clusters[('first',)].set_result({'first': CLUSTER})
+        _wait_until(lambda: self._created_instances())
+        self.assertEqual(self._created_instances(), ['first-instance'])
+        params = self.rds_conn.create_db_instance.call_args.kwargs['params']
+        self.assertEqual(params['DBClusterIdentifier'], 'first')
+
+        self.clusters[('second',)].set_result({'second': CLUSTER})
+        stage.join(5)
+        self.assertCountEqual(self._created_instances(),
+                              ['first-instance', 'second-instance'])
+        self.assertNotIsInstance(results[0], tuple)
+
+    def test_existing_cluster_watched(self):
+        self.rds_conn.watch_db_clusters_available.side_effect = \
+            lambda names: _available({name: CLUSTER for name in names})
+
+        self.resource.create_db_clusters_and_instances(
+            [self._instance('instance', 'cluster')])
+
+        self.rds_conn.watch_db_clusters_available.assert_called_once_with(
+            ['cluster'])
+        self.rds_conn.watch_db_instances_available.assert_called_once_with(
+            ['instance'])
+
+    def test_failed_cluster_stops_creation(self):
+        def watch_clusters(names):
+            future = Future()
+            future.set_exception(ResourceProcessingError('failed'))
+            return future
+
+        self.rds_conn.watch_db_clusters_available.side_effect = \
+            watch_clusters
+
+        _, errors = self.resource.create_db_clusters_and_instances(
+            [self._cluster('cluster'), self._instance('instance', 'cluster')])
+
+        self.assertEqual(len(errors), 2)
+        self.rds_conn.create_db_instance.assert_not_called()
+
+
+class TestDBInstancesWatcher(unittest.TestCase):
+
+    def test_instances_described_with_one_request(self):
+        client = MagicMock()
+        client.get_paginator.return_value.paginate.return_value = [{
+            'DBInstances': [
+                {'DBInstanceIdentifier': 'first',
+                 'DBInstanceStatus': 'available'},
+                {'DBInstanceIdentifier': 'second',
+                 'DBInstanceStatus': 'storage-full'}]}]
+        watcher = DBInstancesWatcher(client)
+
+        with self.assertRaisesRegex(ResourceProcessingError, 'second'):
+            watcher.wait(['first', 'second'], ready_statuses=('available',),
+                         failed_statuses=('storage-full',))
+
+        client.get_paginator.return_value.paginate.assert_called_once()
+
+    def test_mixed_case_names_matched(self):
+        connection = RDSConnection.__new__(RDSConnection)
+        client = MagicMock()
+        paginate = client.get_paginator.return_value.paginate
+        paginate.return_value = [{'DBInstances': [
+            {'DBInstanceIdentifier': 'myinstance',
+             'DBInstanceStatus': 'available'}]}]
+        connection.db_instances_watcher = DBInstancesWatcher(client)
+
+        descriptions = connection.wait_for_db_instances_available(
+            ['MyInstance'])
+
+        self.assertEqual(descriptions['MyInstance']['DBInstanceStatus'],
+                         'available')
+        self.assertEqual(paginate.call_args.kwargs['Filters'][0]['Values'],
+                         ['myinstance'])
+
+
+if __name__ == '__main__':
+    unittest.main()
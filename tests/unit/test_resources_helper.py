@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import syndicate.core # noqa: F401
+from syndicate.core.helper import compute_file_base64_hash
+from syndicate.core.resources.helper import LocalArtifactsCache, \
+    extract_deployment_package
+
+ARTIFACT_KEY = 'bundle/appsync.zip'
+
+
+class TestExtractDeploymentPackage(unittest.TestCase):
+
+    def setUp(self):
+        self.bundles = tempfile.TemporaryDirectory()
+        self.addCleanup(self.bundles.cleanup)
+        os.makedirs(os.path.join(self.bundles.name, 'bundle'))
+        self.package_path = os.path.join(self.bundles.name, ARTIFACT_KEY)
+        with zipfile.ZipFile(self.package_path, 'w') as package:
+            package.writestr('schema.graphql', 'type Query { get: String }')
+        self.metadata = {
+            'ChecksumSHA256': compute_file_base64_hash(self.package_path),
+            'ChecksumType': 'FULL_OBJECT',
+            'ContentLength': os.path.getsize(self.package_path)
+        }
+        self.s3_conn = MagicMock()
+        self.s3_conn.retrieve_object_metadata.return_value = self.metadata
+        self.extract_to = os.path.join(self.bundles.name, 'api')
+        for target, value in (
+                ('syndicate.core.build.helper.resolve_all_bundles_directory',
+                 MagicMock(return_value=self.bundles.name)),
+                ('syndicate.core.resources.helper.LOCAL_ARTIFACTS_CACHE',
+                 LocalArtifactsCache())):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _extract(self):
+        return extract_deployment_package(
+            self.s3_conn, 'bucket', f'prefix/{ARTIFACT_KEY}', ARTIFACT_KEY,
+            self.extract_to)
+
+    def test_local_copy_used(self):
+        self.assertTrue(self._extract())
+
+        self.s3_conn.download_to_file.assert_not_called()
+        self.assertTrue(os.path.isfile(
+            os.path.join(self.extract_to, 'schema.graphql')))
+
+    def test_changed_local_copy_not_used(self):
+        self.metadata['ChecksumSHA256'] = 'other'
+        with open(self.package_path, 'rb') as package:
+            content = package.read()
+        self.s3_conn.download_to_file.side_effect = \
+            lambda file, **kwargs: file.write(content)
+
+        self.assertTrue(self._extract())
+
+        self.s3_conn.download_to_file.assert_called_once()
+
+    def test_missing_package(self):
+        self.s3_conn.retrieve_object_metadata.return_value = None
+
+        self.assertFalse(self._extract())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.helper import ExistenceCache
+from syndicate.connection.s3_connection import S3Connection, \
+    build_transfer_config, MB
+from syndicate.exceptions import ResourceProcessingError
+
+
+def _version(key, version_id='v1'):
+    return {'Key': key, 'VersionId': version_id}
+
+
+class TestEmptyBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = S3Connection.__new__(S3Connection)
+        self.connection.client = MagicMock()
+        self.connection.client.get_bucket_versioning.return_value = {
+            'Status': 'Enabled'}
+        self.pages = {
+            '': [{'CommonPrefixes': [{'Prefix': 'a/'}, {'Prefix': 'b/'}],
+                  'Versions': [_version('root')]}],
+            'a/': [{'Versions': [_version(f'a/{i}') for i in range(1000)]},
+                   {'Versions': [_version('a/last')],
+                    'DeleteMarkers': [_version('a/0', 'marker')]}],
+            'b/': [{'DeleteMarkers': [_version('b/0', 'marker')]}]
+        }
+        paginator = MagicMock()
+        paginator.paginate.side_effect = lambda **kwargs: \
+            self.pages[kwargs['Prefix']]
+        self.connection.client.get_paginator.return_value = paginator
+        self.deleted = []
+
+        def delete_objects(Bucket, Delete):
+            self.deleted.extend(Delete['Objects'])
+            return {}
+
+        self.connection.client.delete_objects.side_effect = delete_objects
+        sleep_patcher = patch('syndicate.connection.s3_connection.sleep')
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def test_versions_and_markers_deleted_by_prefixes(self):
+        deleted = self.connection.empty_bucket('bucket', workers=3)
+
+        self.assertEqual(deleted, 1004)
+        self.assertEqual(len(self.deleted), 1004)
+        self.assertIn({'Key': 'a/0', 'VersionId': 'marker'}, self.deleted)
+        self.connection.client.get_paginator.assert_called_with(
+            'list_object_versions')
+        batches = [len(call.kwargs['Delete']['Objects']) for call in
+                   self.connection.client.delete_objects.call_args_list]
+        self.assertTrue(all(size <= 1000 for size in batches))
+
+    def test_slowed_down_keys_deleted_again(self):
+        self.pages = {'': [{'Versions': [_version('first'),
+                                         _version('second')]}]}
+        self.connection.client.delete_objects.side_effect = [
+            {'Errors': [dict(_version('second'), Code='SlowDown')]},
+            ClientError({'Error': {'Code': 'SlowDown'}}, 'DeleteObjects'),
+            {}
+        ]
+
+        deleted = self.connection.empty_bucket('bucket')
+
+        self.assertEqual(deleted, 2)
+        retry_call = self.connection.client.delete_objects.call_args_list[2]
+        self.assertEqual(retry_call.kwargs['Delete']['Objects'],
+                         [_version('second')])
+        self.assertEqual(self.sleep.call_count, 2)
+
+    def test_not_retryable_error_raised(self):
+        self.pages = {'': [{'Versions': [_version('first')]}]}
+        self.connection.client.delete_objects.side_effect = None
+        self.connection.client.delete_objects.return_value = {
+            'Errors': [dict(_version('first'), Code='AccessDenied',
+                            Message='Access Denied')]}
+
+        with self.assertRaises(ResourceProcessingError):
+            self.connection.empty_bucket('bucket')
+
+
+class TestTransferConfig(unittest.TestCase):
+
+    def test_small_file_sent_with_single_request(self):
+        config = build_transfer_config(MB)
+
+        self.assertFalse(config.use_threads)
+        self.assertEqual(config.max_concurrency, 1)
+
+    def test_large_file_parts_within_limit(self):
+        size = 200 * 1024 * MB
+        config = build_transfer_config(size)
+
+        self.assertLessEqual(size / config.multipart_chunksize, 10000)
+        self.assertGreater(config.max_concurrency,
+                           build_transfer_config().max_concurrency)
+
+
+class TestUploadSingleFile(unittest.TestCase):
+
+    @patch('syndicate.connection.s3_connection.os.path.getsize',
+           return_value=MB)
+    def test_checksum_requested(self, _):
+        connection = S3Connection.__new__(S3Connection)
+        connection.client = MagicMock()
+
+        connection.upload_single_file('package.zip', 'key', 'bucket',
+                                      checksum_algorithm='SHA256')
+
+        kwargs = connection.client.upload_file.call_args.kwargs
+        self.assertEqual(kwargs['ExtraArgs'], {'ChecksumAlgorithm': 'SHA256'})
+        self.assertEqual(kwargs['Config'].max_concurrency, 1)
+
+
+class TestUploadFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = S3Connection.__new__(S3Connection)
+        self.connection.client = MagicMock()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.files = []
+        for name in ('index.html', 'app.js', 'spec.json'):
+            path = os.path.join(self.directory.name, name)
+            with open(path, 'w') as file:
+                file.write(name)
+            self.files.append((path, name, None))
+
+    def test_unchanged_files_skipped(self):
+        def head_object(Bucket, Key):
+            if Key == 'spec.json':
+                return {'ETag': '"outdated"', 'ContentLength': 9}
+            return {'ETag': f'"{hashlib.md5(Key.encode()).hexdigest()}"',
+                    'ContentLength': len(Key)}
+        self.connection.client.head_object.side_effect = head_object
+
+        uploaded = self.connection.upload_files(self.files, 'bucket')
+
+        self.assertEqual(uploaded, ['spec.json'])
+        self.connection.client.upload_file.assert_called_once()
+
+    def test_object_with_other_headers_uploaded(self):
+        self.connection.client.head_object.side_effect = \
+            lambda Bucket, Key: {
+                'ETag': f'"{hashlib.md5(Key.encode()).hexdigest()}"',
+                'ContentLength': len(Key), 'CacheControl': 'no-cache'}
+        files = [(path, key, {'CacheControl': 'no-cache'})
+                 for path, key, _ in self.files]
+        files[0] = (files[0][0], files[0][1], {'ContentEncoding': 'gzip'})
+
+        uploaded = self.connection.upload_files(files, 'bucket')
+
+        self.assertEqual(uploaded, ['index.html'])
+
+    def test_multipart_object_uploaded(self):
+        self.connection.client.head_object.return_value = {
+            'ETag': '"abc-2"', 'ContentLength': 10}
+
+        uploaded = self.connection.upload_files(self.files, 'bucket')
+
+        self.assertEqual(uploaded, ['index.html', 'app.js', 'spec.json'])
+
+
+class TestIsBucketExists(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = S3Connection.__new__(S3Connection)
+        self.connection.client = MagicMock()
+        self.connection.region = 'eu-west-1'
+        self.connection.aws_access_key_id = None
+        patcher = patch(
+            'syndicate.connection.s3_connection.BUCKETS_EXISTENCE_CACHE',
+            ExistenceCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_checked_with_head_and_cached(self):
+        self.assertTrue(self.connection.is_bucket_exists('bucket'))
+        self.assertTrue(self.connection.is_bucket_exists('bucket'))
+
+        self.connection.client.head_bucket.assert_called_once_with(
+            Bucket='bucket')
+        self.connection.client.list_buckets.assert_not_called()
+
+    def test_missing_and_forbidden_buckets(self):
+        for code in ('404', '403'):
+            self.connection.client.head_bucket.side_effect = ClientError(
+                {'Error': {'Code': code}}, 'HeadBucket')
+            self.assertFalse(self.connection.is_bucket_exists(
+                f'bucket-{code}'))
+
+        self.connection.client.head_bucket.side_effect = ClientError(
+            {'Error': {'Code': '400'}}, 'HeadBucket')
+        with self.assertRaises(ClientError):
+            self.connection.is_bucket_exists('bucket-400')
+
+    def test_cache_updated_on_create_and_delete(self):
+        self.connection.create_bucket('bucket')
+        self.assertTrue(self.connection.is_bucket_exists('bucket'))
+        self.connection.delete_bucket('bucket')
+        self.assertFalse(self.connection.is_bucket_exists('bucket'))
+
+        self.connection.client.head_bucket.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
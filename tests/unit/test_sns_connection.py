@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+import syndicate.core # noqa: F401
+from syndicate.connection.sns_connection import SNSConnection
+from syndicate.core.resources.sns_resource import SnsResource
+
+TOPIC_ARN = 'arn:aws:sns:eu-west-1:123456789012:{0}'
+
+
+def _not_found():
+    return ClientError({'Error': {'Code': 'NotFound'}}, 'GetTopicAttributes')
+
+
+class SnsConnectionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('syndicate.connection.sns_connection._INDEXES', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.connection = SNSConnection.__new__(SNSConnection)
+        self.connection.client = MagicMock()
+        self.connection.region = 'eu-west-1'
+        self.connection._index_key = ('eu-west-1', None)
+
+
+class TestTopicsIndex(SnsConnectionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.connection.client.list_topics.side_effect = [
+            {'Topics': [{'TopicArn': TOPIC_ARN.format('first')}],
+             'NextToken': 'token'},
+            {'Topics': [{'TopicArn': TOPIC_ARN.format('second')}]}
+        ]
+
+    def test_topics_listed_once(self):
+        self.assertEqual(self.connection.get_topic_arn('second'),
+                         TOPIC_ARN.format('second'))
+        self.assertIsNone(self.connection.get_topic_arn('third'))
+        self.assertEqual(self.connection.client.list_topics.call_count, 2)
+
+    def test_index_updated_on_create_and_remove(self):
+        self.connection.get_topic_arn('first')
+        self.connection.client.create_topic.return_value = {
+            'TopicArn': TOPIC_ARN.format('third')}
+
+        self.connection.create_topic('third', tags=None)
+        self.connection.remove_topic_by_arn(TOPIC_ARN.format('first'))
+
+        self.assertEqual(self.connection.get_topic_arn('third'),
+                         TOPIC_ARN.format('third'))
+        self.assertIsNone(self.connection.get_topic_arn('first'))
+        self.assertEqual(self.connection.client.list_topics.call_count, 2)
+
+
+class TestTopicArnByAccount(SnsConnectionTestCase):
+
+    def test_arn_checked_with_single_call(self):
+        arn = self.connection.get_topic_arn('topic',
+                                            account_id='123456789012')
+
+        self.assertEqual(arn, TOPIC_ARN.format('topic'))
+        self.connection.client.get_topic_attributes.assert_called_once_with(
+            TopicArn=TOPIC_ARN.format('topic'))
+        self.connection.client.list_topics.assert_not_called()
+
+    def test_missing_topic(self):
+        self.connection.client.get_topic_attributes.side_effect = \
+            _not_found()
+
+        self.assertIsNone(self.connection.get_topic_arn(
+            'topic', account_id='123456789012'))
+
+
+class TestDescribeSnsFromMeta(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch('syndicate.core.CONFIG',
+                        MagicMock(region='eu-west-1'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_regions_described_with_attributes_call_only(self):
+        connections = {}
+
+        def sns(region):
+            connection = connections.setdefault(region, MagicMock())
+            connection.get_topic_attributes_if_exists.return_value = \
+                None if region == 'us-east-1' else {'Attributes': {}}
+            return connection
+
+        provider = MagicMock()
+        provider.sns.side_effect = sns
+        resource = SnsResource(provider, 'eu-west-1',
+                               account_id='123456789012')
+
+        description = resource.describe_sns_from_meta(
+            'topic', {'resource_type': 'sns_topic',
+                      'region': ['eu-west-1', 'us-east-1']})
+
+        self.assertEqual(list(description), [TOPIC_ARN.format('topic')])
+        for connection in connections.values():
+            connection.get_topic_arn.assert_not_called()
+            connection.get_topic_attributes_if_exists.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+import syndicate.core # noqa: F401
+from syndicate.connection.sqs_connection import SqsConnection, \
+    diff_queue_attributes, diff_queue_tags
+
+POLICY = {
+    'Version': '2012-10-17',
+    'Statement': [{
+        'Effect': 'Allow',
+        'Principal': {'AWS': '*'},
+        'Action': ['sqs:SendMessage'],
+        'Resource': 'arn:aws:sqs:eu-west-1:123456789012:queue'
+    }]
+}
+# the way SQS returns the policy: compacted, single item lists unwrapped
+LIVE_POLICY = json.dumps({
+    'Statement': {
+        'Resource': 'arn:aws:sqs:eu-west-1:123456789012:queue',
+        'Action': 'sqs:SendMessage',
+        'Principal': {'AWS': '*'},
+        'Effect': 'Allow'
+    },
+    'Version': '2012-10-17'
+}, separators=(',', ':'))
+
+
+class TestDiffQueueAttributes(unittest.TestCase):
+
+    def test_equal_values_of_other_types_not_changed(self):
+        changed = diff_queue_attributes(
+            {'DelaySeconds': '10', 'ContentBasedDeduplication': 'True',
+             'Policy': json.dumps(POLICY)},
+            {'DelaySeconds': '10', 'ContentBasedDeduplication': 'true',
+             'Policy': LIVE_POLICY})
+
+        self.assertEqual(changed, {})
+
+    def test_changed_and_missing_values(self):
+        changed = diff_queue_attributes(
+            {'DelaySeconds': '10', 'VisibilityTimeout': '30'},
+            {'DelaySeconds': '5'})
+
+        self.assertEqual(changed, {'DelaySeconds': '10',
+                                   'VisibilityTimeout': '30'})
+
+    def test_tags_delta(self):
+        to_set, to_remove = diff_queue_tags(
+            {'team': 'core', 'env': 'prod'}, {'team': 'core', 'env': 'dev',
+                                              'owner': 'someone'})
+
+        self.assertEqual(to_set, {'env': 'prod'})
+        self.assertEqual(to_remove, ['owner'])
+
+
+class TestUpdateQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = SqsConnection.__new__(SqsConnection)
+        self.connection.client = MagicMock()
+        self.connection.client.list_queue_tags.return_value = {
+            'Tags': {'team': 'core'}}
+
+    def test_unchanged_queue_not_updated(self):
+        changed = self.connection.update_queue(
+            'url', delay_seconds=10, policy=POLICY, tags={'team': 'core'},
+            current_attributes={'DelaySeconds': '10',
+                                'Policy': LIVE_POLICY})
+
+        self.assertEqual(changed, {})
+        self.connection.client.set_queue_attributes.assert_not_called()
+        self.connection.client.tag_queue.assert_not_called()
+        self.connection.client.untag_queue.assert_not_called()
+        self.connection.client.get_queue_attributes.assert_not_called()
+
+    def test_only_changed_attributes_sent(self):
+        self.connection.client.get_queue_attributes.return_value = {
+            'Attributes': {'DelaySeconds': '10', 'VisibilityTimeout': '30'}}
+
+        changed = self.connection.update_queue(
+            'url', delay_seconds=10, visibility_timeout=60,
+            redrive_policy={'deadLetterTargetArn': 'arn',
+                            'maxReceiveCount': 5})
+
+        self.assertEqual(set(changed), {'VisibilityTimeout', 'RedrivePolicy'})
+        self.connection.client.set_queue_attributes.assert_called_once_with(
+            QueueUrl='url', Attributes=changed)
+        self.connection.client.get_queue_attributes.assert_called_once()
+
+    def test_tags_removed_when_not_given(self):
+        self.connection.update_queue('url', current_attributes={})
+
+        self.connection.client.untag_queue.assert_called_once_with(
+            QueueUrl='url', TagKeys=['team'])
+        self.connection.client.tag_queue.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+import syndicate.core # noqa: F401
+from syndicate.core.resources.swagger_ui_resource import build_upload_file
+
+
+class TestBuildUploadFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_spec_compressed_with_headers(self):
+        content = '{"openapi": "3.0.1", "paths": {}}' * 100
+        path = self._write('spec.json', content)
+
+        upload_path, key, extra_args = build_upload_file(path, 'spec.json')
+
+        self.assertEqual(key, 'spec.json')
+        self.assertEqual(extra_args, {'ContentType': 'application/json',
+                                      'CacheControl': 'no-cache',
+                                      'ContentEncoding': 'gzip'})
+        with open(upload_path, 'rb') as file:
+            self.assertEqual(gzip.decompress(file.read()).decode(), content)
+
+    def test_compression_is_deterministic(self):
+        path = self._write('index.html', '<html></html>' * 100)
+
+        first_path, _, extra_args = build_upload_file(path, 'index.html')
+        with open(first_path, 'rb') as file:
+            first = file.read()
+        second_path, _, _ = build_upload_file(path, 'index.html')
+        with open(second_path, 'rb') as file:
+            self.assertEqual(file.read(), first)
+        self.assertEqual(extra_args['ContentDisposition'],
+                         'inline;filename=index.html')
+
+    def test_not_compressible_file_uploaded_as_is(self):
+        path = self._write('index.html', '<p>')
+
+        upload_path, _, extra_args = build_upload_file(path, 'index.html')
+
+        self.assertEqual(upload_path, path)
+        self.assertNotIn('ContentEncoding', extra_args)
+
+
+if __name__ == '__main__':
+    unittest.main()
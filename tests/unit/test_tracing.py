@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from time import perf_counter
+
+import boto3
+from botocore.stub import Stubber
+
+from syndicate.commons.tracing import ApiCallTracer
+
+
+class TestApiCallTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = ApiCallTracer()
+        self.session = boto3.Session(aws_access_key_id='key',
+                                     aws_secret_access_key='secret',
+                                     region_name='us-east-1')
+        self.tracer.install(self.session)
+        self.client = self.session.client('dynamodb')
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+
+    def tearDown(self):
+        self.stubber.deactivate()
+
+    def _describe_table(self, table_name):
+        self.stubber.add_response('describe_table', {},
+                                  {'TableName': table_name})
+        self.client.describe_table(TableName=table_name)
+
+    def test_calls_not_recorded_when_disabled(self):
+        self._describe_table('table')
+        self.assertEqual(self.tracer.calls_count, 0)
+
+    def test_call_recorded(self):
+        self.tracer.start(action='deploy')
+        with self.tracer.stage('dynamodb_table'):
+            self._describe_table('table')
+        self.tracer.stop()
+
+        self.assertEqual(self.tracer.calls_count, 1)
+        call = self.tracer.calls[0]
+        self.assertEqual(call['service'], 'dynamodb')
+        self.assertEqual(call['operation'], 'DescribeTable')
+        self.assertEqual(call['resource'], 'table')
+        self.assertEqual(call['resource_type'], 'dynamodb_table')
+        self.assertFalse(call['throttled'])
+
+    def test_job_resource_type_takes_precedence(self):
+        self.tracer.start()
+        with self.tracer.stage('iam_role'):
+            with self.tracer.span('table', resource_type='dynamodb_table'):
+                self._describe_table('table')
+        self.assertEqual(self.tracer.calls[0]['resource_type'],
+                         'dynamodb_table')
+        self.assertEqual(len(self.tracer.spans), 2)
+
+    def test_span_ended_in_another_thread_recorded(self):
+        self.tracer.start()
+        started_at = perf_counter()
+        thread = threading.Thread(
+            target=self.tracer.record, name='watcher',
+            args=('cluster:creating', started_at),
+            kwargs={'resource_type': 'rds_db_cluster'})
+        thread.start()
+        thread.join()
+
+        span = self.tracer.spans[0]
+        self.assertEqual(span['name'], 'cluster:creating')
+        self.assertEqual(span['resource_type'], 'rds_db_cluster')
+        self.assertEqual(span['thread'], 'watcher')
+
+    def test_throttled_error_recorded(self):
+        self.tracer.start()
+        self.stubber.add_client_error(
+            'describe_table', service_error_code='ThrottlingException')
+        with self.assertRaises(Exception):
+            self.client.describe_table(TableName='table')
+        self.assertTrue(self.tracer.calls[0]['throttled'])
+
+    def test_summary(self):
+        self.tracer.start()
+        for _ in range(3):
+            self._describe_table('table')
+        rows = self.tracer.summary('operation')
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['operation'], 'dynamodb.DescribeTable')
+        self.assertEqual(rows[0]['calls'], 3)
+        self.assertIn('Dynamodb.DescribeTable'.lower(),
+                      self.tracer.format_summary().lower())
+
+    def test_export_chrome_trace(self):
+        self.tracer.start(action='clean')
+        with self.tracer.span('table', resource_type='dynamodb_table'):
+            self._describe_table('table')
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.tracer.export(directory)
+            self.assertTrue(os.path.basename(path).startswith('trace-clean'))
+            with open(path) as trace_file:
+                trace = json.load(trace_file)
+        complete = [event for event in trace['traceEvents']
+                    if event['ph'] == 'X']
+        self.assertEqual({event['cat'] for event in complete},
+                         {'job', 'aws'})
+        self.assertTrue(all(event['dur'] >= 0 for event in complete))
+
+
+if __name__ == '__main__':
+    unittest.main()